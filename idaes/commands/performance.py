@@ -0,0 +1,109 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""Commandline interface for the performance test suite"""
+import os
+import sys
+
+import click
+
+from idaes.commands import cb
+
+
+@cb.command(
+    name="performance-suite",
+    help="Run the performance tests in PATHS (default: the idaes package), "
+    "record the results in a history file and compare them with a baseline run.",
+)
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.option(
+    "-k", "--pattern", default=None, help="Only run tests whose id contains PATTERN"
+)
+@click.option(
+    "-r", "--repeat", default=3, show_default=True, help="Number of runs of each test"
+)
+@click.option(
+    "--timeout", default=None, type=float, help="Time limit for each test process (s)"
+)
+@click.option(
+    "--history",
+    default="performance_history.jsonl",
+    show_default=True,
+    help="History file to append the results to",
+)
+@click.option("--label", default=None, help="Name of this run in the history file")
+@click.option(
+    "--baseline",
+    default=None,
+    help="Label or git commit of the baseline run in the history file "
+    "(default: the last run)",
+)
+@click.option(
+    "--rel-tol",
+    default=0.2,
+    show_default=True,
+    help="Relative increase of a metric flagged as a regression",
+)
+@click.option(
+    "--abs-tol",
+    default=0.05,
+    show_default=True,
+    help="Smallest absolute increase of a metric flagged as a regression",
+)
+@click.option("--list", "list_only", is_flag=True, help="List the tests and exit")
+def performance_suite(
+    paths,
+    pattern,
+    repeat,
+    timeout,
+    history,
+    label,
+    baseline,
+    rel_tol,
+    abs_tol,
+    list_only,
+):
+    # pylint: disable=import-outside-toplevel
+    import idaes
+    from idaes.core.util import performance_suite as suite
+
+    if not paths:
+        paths = [os.path.dirname(idaes.__file__)]
+    tests = suite.find_performance_tests(paths, pattern=pattern)
+    if list_only:
+        for test in tests:
+            click.echo(test)
+        return
+
+    results = suite.run_performance_tests(tests, repeat=repeat, timeout=timeout)
+    summary = suite.summarize(results)
+    click.echo(summary.to_string(index=False))
+
+    failed = results[~results["outcome"].isin(["passed", "skipped"])]
+    for test in failed["test"].unique():
+        click.echo(f"FAILED: {test}")
+
+    past = suite.load_history(history)
+    base = suite.baseline_from_history(past, -1 if baseline is None else baseline)
+    suite.append_history(history, summary, label=label)
+    if base is None:
+        click.echo(f"No baseline run in {history}, results recorded.")
+        return
+    regressions = suite.find_regressions(
+        summary, base, rel_tol=rel_tol, abs_tol=abs_tol
+    )
+    if len(regressions) == 0:
+        click.echo("No regressions.")
+        return
+    click.echo("Regressions:")
+    click.echo(regressions.to_string(index=False))
+    sys.exit(1)
@@ -30,7 +30,15 @@ from click.testing import CliRunner
 import pytest
 
 # package
-from idaes.commands import examples, extensions, convergence, config, env_info, base
+from idaes.commands import (
+    examples,
+    extensions,
+    convergence,
+    config,
+    env_info,
+    base,
+    performance,
+)
 from . import create_module_scratch, rmtree_scratch
 import idaes
 
@@ -222,6 +230,52 @@ def test_conf_set(runner):
 ##############
 
 
+PERFORMANCE_TEST = """
+import pytest
+import pyomo.common.unittest as unittest
+from idaes.core.util.performance import PerformanceBaseClass
+
+
+@pytest.mark.performance
+class TestBuild(PerformanceBaseClass, unittest.TestCase):
+    def test_performance(self):
+        self.recordData("build model", {value})
+"""
+
+
+@pytest.mark.component
+def test_performance_suite(runner, tmp_path):
+    test_file = tmp_path / "test_perf.py"
+    test_file.write_text(PERFORMANCE_TEST.format(value=1.0))
+    # the option is defined by the idaes conftest for tests in idaes
+    (tmp_path / "conftest.py").write_text(
+        "def pytest_addoption(parser):\n"
+        "    parser.addoption('--performance', action='store_true')\n"
+    )
+    history = str(tmp_path / "history.jsonl")
+    args = [str(tmp_path), "-r", "1", "--history", history]
+
+    result = runner.invoke(performance.performance_suite, [str(tmp_path), "--list"])
+    assert result.exit_code == 0
+    assert result.output.strip() == f"{test_file}::TestBuild"
+
+    result = runner.invoke(performance.performance_suite, args + ["--label", "base"])
+    assert result.exit_code == 0
+    assert "No baseline run" in result.output
+
+    result = runner.invoke(performance.performance_suite, args)
+    assert result.exit_code == 0
+    assert "No regressions." in result.output
+
+    test_file.write_text(PERFORMANCE_TEST.format(value=2.0))
+    result = runner.invoke(performance.performance_suite, args + ["--baseline", "base"])
+    assert result.exit_code == 1
+    assert "Regressions:" in result.output
+    assert "build model" in result.output.split("Regressions:")[1]
+    with open(history, "r", encoding="utf-8") as f:
+        assert len(f.readlines()) == 3
+
+
 @pytest.mark.unit
 def test_env_info1(runner):
     result = runner.invoke(env_info.environment_info)
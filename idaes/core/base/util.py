@@ -21,6 +21,7 @@ from idaes.core.util.exceptions import (
     PropertyNotSupportedError,
     BurntToast,
 )
+from idaes.core.util import build_profiler
 
 
 __author__ = "John Eslick, Andrew Lee"
@@ -217,7 +218,11 @@ def build_on_demand(self, attr):
     # If this fails, it should return a meaningful error.
     if callable(f):
         try:
-            f()
+            profiler = build_profiler.active_profiler()
+            if profiler is None:
+                f()
+            else:
+                profiler.profile(self, attr, f)
         except Exception:
             # Clear call list and reraise error
             clear_call_list(self, attr)
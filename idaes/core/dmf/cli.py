@@ -38,6 +38,7 @@ import click
 # package
 from idaes.core.dmf import DMF, DMFConfig, resource, workspace, create_configuration
 from idaes.core.dmf.resource import Predicates
+from idaes.core.dmf import commands
 from idaes.core.dmf import errors
 from idaes.core.dmf.workspace import Fields
 from idaes.core.dmf import util
@@ -1135,6 +1136,33 @@ def load_data(datadir, global_):
     echolog(f"Loaded data in '{data_directory}' into the DMF")
 
 
+@click.command(
+    help="Move the resources of the workspace to an indexed (SQLite) database, "
+    "for faster searches in large workspaces"
+)
+@click.option(
+    "--db-file",
+    default="resourcedb.sqlite",
+    help="File name, in the workspace, of the new database",
+)
+def migrate(db_file):
+    try:
+        d = DMF()
+    except errors.WorkspaceError as err:
+        click.echo(f"Cannot open workspace: {err}")
+        sys.exit(Code.WORKSPACE_NOT_FOUND.value)
+    old_db_file = d.db_file
+    try:
+        count = commands.workspace_migrate_db(d.root, db_file=db_file)
+    except errors.CommandError as err:
+        click.echo(f"Cannot migrate resource database: {err}")
+        sys.exit(Code.DMF_OPER.value)
+    click.echo(
+        f"Copied {count} resources from '{old_db_file}' to '{db_file}'. "
+        f"The workspace now uses '{db_file}', and '{old_db_file}' can be removed."
+    )
+
+
 ######################################################################################
 
 
@@ -1395,6 +1423,7 @@ base_command.add_command(info)
 base_command.add_command(related)
 base_command.add_command(rm)
 base_command.add_command(load_data)
+base_command.add_command(migrate)
 
 # if __name__ == '__main__':
 #     base_command()
@@ -48,8 +48,10 @@ from .errors import (
     WorkspaceConfNotFoundError,
     WorkspaceError,
     BadResourceError,
+    FileError,
 )
 from . import resource
+from . import resourcedb
 from .workspace import Workspace, find_workspaces
 
 __author__ = "Dan Gunter"
@@ -244,6 +246,39 @@ def workspace_import(path, patterns, exit_on_error):
         return count
 
 
+def workspace_migrate_db(path, db_file="resourcedb.sqlite"):
+    # type: (str, str) -> int
+    """Copy the resources of a workspace from its TinyDB resource database to
+    a new SQLite one, and use that from now on.
+
+    The old database file is not removed.
+
+    Args:
+        path (str): Workspace directory
+        db_file (str): File name, in the workspace, of the SQLite database
+
+    Returns:
+        int: Number of resources copied
+    Raises:
+        CommandError, if the workspace database is already SQLite, or it
+            can't be copied
+    """
+    d = DMF(path)
+    src = os.path.join(d.root, d.db_file)
+    dest = os.path.join(d.root, db_file)
+    if resourcedb.is_sqlite_file(src):
+        raise CommandError(
+            "migrate", "check resource database", f"'{src}' is already SQLite"
+        )
+    try:
+        count = resourcedb.migrate_tinydb(src, dest)
+    except FileError as err:
+        raise CommandError("migrate", "copy resources", str(err))
+    d.db_file = db_file  # saved in the workspace configuration
+    _log.info(f"Workspace {d.root} now uses resource database '{db_file}'")
+    return count
+
+
 def list_workspaces(root, stream=None):
     """List workspaces found from a given root path.
 
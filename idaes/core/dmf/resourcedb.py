@@ -12,11 +12,20 @@
 #################################################################################
 """
 Resource database.
+
+There are two implementations: :class:`ResourceDB` stores the resources in a
+JSON file with TinyDB, and :class:`SQLiteResourceDB` stores them in an SQLite
+database with indexes, for workspaces with many resources. Use
+:func:`open_resource_db` to open either one, and :func:`migrate_tinydb` to copy
+the resources of a TinyDB database into an SQLite one.
 """
 # system
 from datetime import datetime
+import json
 import logging
+import os
 import re
+import sqlite3
 
 # third party
 from tinydb import TinyDB, Query
@@ -411,3 +420,545 @@ class ResourceDB(object):
                 changed[k] = v
         _log.debug(f"update resource {id_} with new values: {changed}")
         self._db.update(changed, self._create_filter_expr(id_cond))
+
+
+#: File name extensions of SQLite resource databases
+SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+
+# First bytes of every SQLite database file
+_sqlite_header = b"SQLite format 3\x00"
+
+
+def is_sqlite_file(dbfile) -> bool:
+    """Whether a resource DB file is (or, if it does not exist yet, should be) an
+    SQLite database.
+
+    Args:
+        dbfile (str): DB location
+    Returns:
+        True if the file is an SQLite database, or does not exist and has one of
+        the extensions in :data:`SQLITE_EXTENSIONS`.
+    """
+    try:
+        with open(dbfile, "rb") as fp:
+            header = fp.read(len(_sqlite_header))
+    except FileNotFoundError:
+        return os.path.splitext(str(dbfile))[1].lower() in SQLITE_EXTENSIONS
+    except IOError:
+        return False
+    if header:
+        return header == _sqlite_header
+    # an empty file is a new SQLite database only if it is named like one
+    return os.path.splitext(str(dbfile))[1].lower() in SQLITE_EXTENSIONS
+
+
+def open_resource_db(dbfile):
+    """Open a resource DB, with the implementation that matches its file.
+
+    Args:
+        dbfile (str): DB location
+    Returns:
+        SQLiteResourceDB if :func:`is_sqlite_file` is true, otherwise ResourceDB
+    Raises:
+        errors.FileError, if the DB cannot be opened
+    """
+    if is_sqlite_file(dbfile):
+        return SQLiteResourceDB(dbfile)
+    return ResourceDB(dbfile)
+
+
+class SQLiteResourceDB(ResourceDB):
+    """A database interface to all the resources within a given DMF workspace,
+    stored in SQLite.
+
+    The resources are stored as JSON, along with indexed columns and tables for
+    the identifier, type, creation and modification times, names ("aliases")
+    and tags of each resource, and a table of their relations. Queries on these
+    fields only look at the matching resources, and :meth:`find_related` follows
+    the relations table from the starting resource, instead of reading all the
+    resources. Filters have the same syntax and results as for
+    :class:`ResourceDB`.
+    """
+
+    #: Version of the database tables, stored as the SQLite "user_version"
+    SCHEMA_VERSION = 1
+
+    # Indexed columns of resources table, for fields with a single value
+    _columns = (Resource.ID_FIELD, Resource.TYPE_FIELD, "created", "modified")
+    # Indexed tables for fields with a list of values
+    _list_tables = ("aliases", "tags")
+
+    _schema = f"""
+    CREATE TABLE IF NOT EXISTS resources (
+        doc_id INTEGER PRIMARY KEY,
+        {Resource.ID_FIELD} TEXT COLLATE NOCASE,
+        {Resource.TYPE_FIELD},
+        created,
+        modified,
+        value TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS resources_id ON resources ({Resource.ID_FIELD});
+    CREATE INDEX IF NOT EXISTS resources_type ON resources ({Resource.TYPE_FIELD});
+    CREATE INDEX IF NOT EXISTS resources_created ON resources (created);
+    CREATE INDEX IF NOT EXISTS resources_modified ON resources (modified);
+    CREATE TABLE IF NOT EXISTS aliases (doc_id INTEGER NOT NULL, value);
+    CREATE INDEX IF NOT EXISTS aliases_value ON aliases (value);
+    CREATE INDEX IF NOT EXISTS aliases_doc_id ON aliases (doc_id);
+    CREATE TABLE IF NOT EXISTS tags (doc_id INTEGER NOT NULL, value);
+    CREATE INDEX IF NOT EXISTS tags_value ON tags (value);
+    CREATE INDEX IF NOT EXISTS tags_doc_id ON tags (doc_id);
+    CREATE TABLE IF NOT EXISTS relations (
+        doc_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        subject TEXT,
+        predicate TEXT,
+        object TEXT
+    );
+    CREATE INDEX IF NOT EXISTS relations_subject ON relations (subject);
+    CREATE INDEX IF NOT EXISTS relations_object ON relations (object);
+    CREATE INDEX IF NOT EXISTS relations_doc_id ON relations (doc_id);
+    """
+
+    def __init__(self, dbfile=None, connection=None):
+        """Open (or create) the database.
+
+        Args:
+            dbfile (str): DB location
+            connection (sqlite3.Connection): If non-empty, this is an
+                existing connection that should be re-used, instead of
+                trying to connect to the location in `dbfile`.
+
+        Raises:
+            errors.FileError, if the DB cannot be opened, or is from a newer
+            version of this class
+        """
+        self._db = None
+        self._gr = None
+        if connection is not None:
+            self._db = connection
+        elif dbfile is not None:
+            try:
+                self._db = sqlite3.connect(str(dbfile))
+            except sqlite3.Error as err:
+                raise errors.FileError(f'Cannot open resource DB "{dbfile}": {err}')
+        if self._db is None:
+            return
+        try:
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if version > self.SCHEMA_VERSION:
+                raise errors.FileError(
+                    f'Resource DB "{dbfile}" has version {version}, newer than '
+                    f"the supported version {self.SCHEMA_VERSION}"
+                )
+            with self._db:
+                self._db.executescript(self._schema)
+                self._db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        except sqlite3.DatabaseError as err:
+            raise errors.FileError(f'Cannot open resource DB "{dbfile}": {err}')
+
+    def close(self):
+        """Close the connection to the database."""
+        self._db.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def find(self, filter_dict, id_only=False, flags=0):
+        """Find and return records based on the provided filter.
+
+        Args:
+            filter_dict (dict): Search filter. For syntax, see docs in
+                                :meth:`.dmf.DMF.find`.
+            id_only (bool): If true, return only the identifier of each
+                resource; otherwise a Resource object is returned.
+            flags (int): Flag values for, e.g., regex searches
+
+        Returns:
+            generator of int|Resource, depending on the value of `id_only`
+        """
+        # (get all the results first, so callers can change the DB while
+        # iterating over them, as they can with TinyDB)
+        if not filter_dict:
+            if id_only:
+                rows = self._db.execute(
+                    "SELECT doc_id FROM resources ORDER BY doc_id"
+                ).fetchall()
+                results = [doc_id for doc_id, in rows]
+            else:
+                rows = self._db.execute(
+                    "SELECT doc_id, value FROM resources ORDER BY doc_id"
+                ).fetchall()
+                results = [_as_resource(doc_id, json.loads(v)) for doc_id, v in rows]
+        else:
+            _log.debug(f"Find resources matching: {filter_dict}")
+            results = [
+                doc_id if id_only else _as_resource(doc_id, value)
+                for doc_id, value in self._search(filter_dict, flags)
+            ]
+        for r in results:
+            yield r
+
+    def _search(self, filter_dict, flags=0):
+        """Get (doc_id, value) of the resources that match a filter.
+
+        Conditions on the indexed fields select the candidate resources in
+        SQL. The filter is then applied to each candidate, exactly as it is
+        for TinyDB.
+        """
+        filter_expr = self._create_filter_expr(filter_dict, flags)
+        where, params = self._sql_filter(filter_dict, flags)
+        sql = "SELECT doc_id, value FROM resources"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY doc_id"
+        results = []
+        for doc_id, text in self._db.execute(sql, params).fetchall():
+            value = json.loads(text)
+            if filter_expr is None or filter_expr(value):
+                results.append((doc_id, value))
+        return results
+
+    @classmethod
+    def _sql_filter(cls, filter_dict, flags=0):
+        """SQL conditions for the indexed fields of a filter.
+
+        The conditions select (at least) all the resources that match the
+        filter, so fields and values that can't be expressed exactly in SQL,
+        e.g. nested fields, are left out.
+
+        Returns:
+            (list of conditions, list of parameters)
+        """
+        where, params = [], []
+        for k, v in filter_dict.items():
+            if not k:
+                continue
+            qry_all = False
+            if isinstance(v, list) and k.endswith("!"):
+                k, qry_all = k[:-1], True
+            if k in cls._list_tables:
+                values = v if isinstance(v, list) else []
+                if not values or not all(_is_sql_scalar(x) for x in values):
+                    continue
+                subquery = f"doc_id IN (SELECT doc_id FROM {k} WHERE value IN "
+                if qry_all:
+                    for x in values:
+                        where.append(subquery + "(?))")
+                        params.append(x)
+                else:
+                    marks = ", ".join("?" * len(values))
+                    where.append(subquery + f"({marks}))")
+                    params.extend(values)
+            elif k in cls._columns:
+                if isinstance(v, dict):
+                    for op_key, op_value in v.items():
+                        tv = cls._value_transform(op_value)
+                        op = _sql_ops.get(op_key, None)
+                        # identifiers are indexed without case, so only the
+                        # order of other fields is the same as in Python
+                        if op and _is_sql_scalar(tv) and k != Resource.ID_FIELD:
+                            where.append(f"{k} {op} ?")
+                            params.append(tv)
+                    continue
+                tv = cls._value_transform(v)
+                if v is True or tv is False:
+                    continue  # (fields with a null value also exist)
+                if hasattr(tv, "match"):  # regex
+                    prefix = _regex_prefix(tv.pattern)
+                    if prefix and k == Resource.ID_FIELD:
+                        # (LIKE ignores case, as the index does)
+                        where.append(f"{k} LIKE ? ESCAPE '\\'")
+                        params.append(_like_escape(prefix) + "%")
+                elif _is_sql_scalar(tv):
+                    where.append(f"{k} = ?")
+                    params.append(tv)
+        return where, params
+
+    def find_related(self, id_, filter_dict=None, outgoing=True, maxdepth=0, meta=None):
+        """Find all resources connected to the identified one.
+
+        Args:
+            id_ (str): Unique ID of target resource.
+            filter_dict (dict): Filter to these resources
+            outgoing:
+            maxdepth:
+            meta (List[str]): Metadata fields to extract
+        Returns:
+            Generator of (depth, relation, metadata)
+        Raises:
+            KeyError if the resource is not found.
+        """
+        if maxdepth <= 0:
+            maxdepth = 9223372036854775807
+        filter_expr = self._create_filter_expr(filter_dict) if filter_dict else None
+        end = "subject" if outgoing else "object"
+        sql = (
+            "SELECT relations.subject, relations.predicate, relations.object, "
+            "resources.value FROM relations JOIN resources "
+            "ON relations.doc_id = resources.doc_id "
+            f"WHERE relations.{end} = ? "
+            "ORDER BY relations.doc_id, relations.position"
+        )
+
+        def relations(uuid):
+            """Relations from (or to) a resource, stored in the resources at
+            their other end, like the adjacency list of ResourceDB.find_related()
+            """
+            result = []
+            for subj, pred, obj, text in self._db.execute(sql, (uuid,)).fetchall():
+                rsrc = json.loads(text)
+                if rsrc[Resource.ID_FIELD] == uuid:
+                    continue
+                if filter_expr is not None and not filter_expr(rsrc):
+                    continue
+                meta_info = {k: rsrc[k] for k in meta}
+                result.append((subj, pred, obj, meta_info))
+            return result
+
+        start = relations(id_)
+        # stop if there are no connections
+        if not start:
+            return
+        # Do a breadth-first search through the edges, yield-ing
+        # the relations as we go
+        q, depth, visited = list(start), 0, {id_}
+        while len(q) > 0 and depth < maxdepth:
+            depth += 1
+            # visit all the nodes in the queue
+            n = len(q)
+            for i in range(n):
+                relation = Triple(*q[i][:3])
+                yield (depth, relation, q[i][3])
+                if depth < maxdepth:
+                    next_id = relation.object if outgoing else relation.subject
+                    if next_id not in visited:
+                        next_relations = relations(next_id)
+                        if next_relations:
+                            q.extend(next_relations)
+                            visited.add(next_id)
+            q = q[n:]  # pop off all the nodes we just visited
+
+    def get(self, identifier):
+        """Get a resource by identifier.
+
+        Args:
+          identifier: Internal identifier
+
+        Returns:
+            (Resource) A resource or None
+        """
+        row = self._db.execute(
+            "SELECT value FROM resources WHERE doc_id = ?", (identifier,)
+        ).fetchone()
+        if row is None:
+            return None
+        return _as_resource(identifier, json.loads(row[0]))
+
+    def put(self, resource):
+        """Put this resource into the database.
+
+        Args:
+            resource (Resource): The resource to add
+
+        Returns:
+            None
+
+        Raises:
+            errors.DuplicateResourceError: If there is already a resource
+                in the database with the same "id".
+        """
+        _log.debug(f"put resource id={resource.id}")
+        if self._search({Resource.ID_FIELD: resource.id}):
+            raise errors.DuplicateResourceError("put", resource.id)
+        with self._db:
+            self._insert(resource.v)
+
+    def _insert(self, value, doc_id=None):
+        """Insert a resource value (and its indexed values), in a transaction."""
+        cursor = self._db.execute(
+            "INSERT INTO resources (doc_id, value) VALUES (?, ?)",
+            (doc_id, json.dumps(value)),
+        )
+        self._index(cursor.lastrowid, value)
+        return cursor.lastrowid
+
+    def _index(self, doc_id, value):
+        """Set the indexed values of a resource, in a transaction."""
+        columns = [value.get(k, None) for k in self._columns]
+        columns = [x if _is_sql_scalar(x) else None for x in columns]
+        self._db.execute(
+            f"UPDATE resources SET {', '.join(c + ' = ?' for c in self._columns)} "
+            "WHERE doc_id = ?",
+            columns + [doc_id],
+        )
+        for table in self._list_tables + ("relations",):
+            self._db.execute(f"DELETE FROM {table} WHERE doc_id = ?", (doc_id,))
+        for table in self._list_tables:
+            values = value.get(table, None)
+            if isinstance(values, list):
+                self._db.executemany(
+                    f"INSERT INTO {table} (doc_id, value) VALUES (?, ?)",
+                    [(doc_id, x) for x in values if _is_sql_scalar(x)],
+                )
+        rows = []
+        uuid = value.get(Resource.ID_FIELD, None)
+        for position, rrel in enumerate(value.get("relations", None) or []):
+            try:
+                rel = triple_from_resource_relations(uuid, rrel)
+            except (KeyError, TypeError):
+                continue
+            rows.append((doc_id, position, rel.subject, rel.predicate, rel.object))
+        self._db.executemany(
+            "INSERT INTO relations (doc_id, position, subject, predicate, object) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def delete(self, id_=None, idlist=None, filter_dict=None, internal_ids=False):
+        """Delete one or more resources with given identifiers.
+
+        Args:
+            id_ (Union[str,int]): If given, delete this id.
+            idlist (list): If given, delete ids in this list
+            filter_dict (dict): If given, perform a search and
+                           delete ids it finds.
+            internal_ids (bool): If True, treat identifiers as numeric
+                (internal) identifiers. Otherwise treat them as
+                resource (string) indentifiers.
+        Returns:
+            (list[str]) Identifiers
+        """
+        if internal_ids:
+            doc_ids = idlist if idlist else [id_]
+        else:
+            ID = Resource.ID_FIELD
+            if filter_dict:
+                cond = filter_dict
+            elif id_:
+                cond = {ID: id_}
+            elif idlist:
+                cond = {ID: [idlist]}
+            else:
+                return
+            doc_ids = [doc_id for doc_id, _ in self._search(cond)]
+        with self._db:
+            for table in ("resources", "relations") + self._list_tables:
+                self._db.executemany(
+                    f"DELETE FROM {table} WHERE doc_id = ?",
+                    [(doc_id,) for doc_id in doc_ids],
+                )
+
+    def update(self, id_, new_dict):
+        """Update the identified resource with new values.
+
+        Args:
+            id_ (int): Identifier of resource to update
+            new_dict (dict): New dictionary of resource values
+        Returns:
+            None
+        Raises:
+            ValueError: If new resource is of wrong type
+            KeyError: If old resource is not found
+        """
+        _log.debug("update.start")
+        matches = self._search({Resource.ID_FIELD: id_})
+        if not matches:
+            raise errors.NoSuchResourceError(id_=id_)
+        old = _as_resource(*matches[0])
+        T = Resource.TYPE_FIELD
+        if old.v[T] != new_dict[T]:
+            raise ValueError(
+                'New resource type="{}" does not '
+                'match current resource type "{}"'.format(new_dict[T], old.v[T])
+            )
+        changed = {}
+        for k, v in new_dict.items():
+            if k not in old.v:
+                changed[k] = v
+            elif old.v[k] != v:
+                changed[k] = v
+        _log.debug(f"update resource {id_} with new values: {changed}")
+        if not changed:
+            return
+        with self._db:
+            for doc_id, value in matches:
+                value.update(changed)
+                self._db.execute(
+                    "UPDATE resources SET value = ? WHERE doc_id = ?",
+                    (json.dumps(value), doc_id),
+                )
+                self._index(doc_id, value)
+
+
+def migrate_tinydb(src, dest) -> int:
+    """Copy the resources in a TinyDB resource DB to a new SQLite resource DB.
+
+    The resources keep their internal (numeric) identifiers.
+
+    Args:
+        src (str): Location of the TinyDB resource DB
+        dest (str): Location of the new SQLite resource DB
+
+    Returns:
+        Number of resources copied
+
+    Raises:
+        errors.FileError, if `src` can't be read, or `dest` already exists
+    """
+    if os.path.exists(dest):
+        raise errors.FileError(f'Resource DB "{dest}" already exists')
+    if is_sqlite_file(src):
+        raise errors.FileError(f'Resource DB "{src}" is not a TinyDB database')
+    try:
+        tinydb = TinyDB(src)
+    except (IOError, ValueError) as err:
+        raise errors.FileError(f'Cannot open resource DB "{src}": {err}')
+    try:
+        documents = tinydb.table("resources", cache_size=0).all()
+    except ValueError as err:
+        raise errors.FileError(f'Cannot read resource DB "{src}": {err}')
+    finally:
+        tinydb.close()
+    db = SQLiteResourceDB(dest)
+    try:
+        with db._db:
+            for doc in documents:
+                db._insert(dict(doc), doc_id=doc.doc_id)
+    finally:
+        db.close()
+    _log.info(f"Copied {len(documents)} resources from {src} to {dest}")
+    return len(documents)
+
+
+# SQL operators for the inequalities in filters
+_sql_ops = {"$gt": ">", "$ge": ">=", "$lt": "<", "$le": "<="}
+
+
+def _is_sql_scalar(x) -> bool:
+    """Whether a value is stored as itself in an SQL column."""
+    return isinstance(x, (str, int, float)) and not (
+        isinstance(x, float) and x != x  # NaN
+    )
+
+
+def _regex_prefix(pattern: str) -> str:
+    """Literal prefix of all the strings that a regex matches (at their start,
+    as with re.match), or an empty string."""
+    if "|" in pattern:
+        return ""
+    n = 0
+    while n < len(pattern) and pattern[n].isascii() and pattern[n].isalnum():
+        n += 1
+    if n < len(pattern) and pattern[n] in "*?{":
+        n -= 1  # the last character is optional
+    return pattern[:n]
+
+
+def _like_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _as_resource(doc_id, value):
+    rsrc = Resource(value=value)
+    rsrc.v["doc_id"] = doc_id
+    return rsrc
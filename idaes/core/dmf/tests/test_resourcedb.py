@@ -0,0 +1,303 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for idaes.core.dmf.resourcedb module
+"""
+# stdlib
+from datetime import datetime
+from pathlib import Path
+import re
+import tempfile
+
+# third-party
+import pytest
+import pyomo.common.unittest as unittest
+from pyomo.common.timing import TicTocTimer
+
+# package
+from idaes.core.dmf import commands, errors, resource, resourcedb, DMF
+from idaes.core.dmf.resource import Predicates
+from idaes.core.util.performance import PerformanceBaseClass
+
+# for testing
+from .util import init_logging
+
+init_logging()
+
+# === Data ===
+
+types = [resource.ResourceTypes.data, resource.ResourceTypes.code, "other"]
+
+
+def make_resources(n):
+    """Resources with different types, names, tags and dates, where each
+    resource uses the previous one, and every third resource is derived
+    from the first."""
+    resources = []
+    for i in range(n):
+        r = resource.Resource(
+            {
+                "aliases": [f"r{i}", f"group{i % 4}"],
+                "tags": [f"tag{i % 3}"] + (["even"] if i % 2 == 0 else []),
+                "desc": f"resource number {i}",
+                "created": 1000.0 + i,
+                "modified": 2000.0 - i,
+                "data": {"index": i, "nested": {"parity": i % 2}},
+            },
+            type_=types[i % 3],
+        )
+        if i % 5 == 0:
+            r.v["flag"] = True
+        if i > 0:
+            resource.create_relation(r, Predicates.uses, resources[-1])
+        if i % 3 == 0 and i > 0:
+            resource.create_relation(resources[0], Predicates.derived, r)
+        resources.append(r)
+    return resources
+
+
+def make_db(kind, path, resources):
+    if kind == "tinydb":
+        db = resourcedb.ResourceDB(str(path / "resourcedb.json"))
+    else:
+        db = resourcedb.SQLiteResourceDB(str(path / "resourcedb.sqlite"))
+    for r in resources:
+        db.put(r)
+    return db
+
+
+@pytest.fixture(scope="module")
+def sample():
+    return make_resources(30)
+
+
+@pytest.fixture(scope="module")
+def dbs(sample, tmp_path_factory):
+    return {
+        kind: make_db(kind, tmp_path_factory.mktemp(kind), sample)
+        for kind in ("tinydb", "sqlite")
+    }
+
+
+def filters(sample):
+    r5 = sample[5]
+    return [
+        ({}, 0),
+        ({resource.Resource.ID_FIELD: r5.id}, 0),
+        ({resource.Resource.ID_FIELD: r5.id.upper()}, 0),
+        ({resource.Resource.ID_FIELD: "~" + r5.id[:6] + "[a-z]*"}, re.IGNORECASE),
+        ({resource.Resource.ID_FIELD: "~" + r5.id[:6].upper() + "[a-z]*"}, 0),
+        ({resource.Resource.ID_FIELD: "~" + r5.id[:6].upper() + "[a-z]*"}, re.I),
+        ({resource.Resource.ID_FIELD: "~.*" + r5.id[-4:]}, 0),
+        ({"type": resource.ResourceTypes.code}, 0),
+        ({"type": "~oth"}, 0),
+        ({"aliases": ["r3", "r7"]}, 0),
+        ({"aliases!": ["r4", "group0"]}, 0),
+        ({"aliases": ["nothing"]}, 0),
+        ({"tags": ["tag1"], "type": "other"}, 0),
+        ({"tags!": ["tag0", "even"]}, 0),
+        ({"created": {"$ge": 1010, "$lt": 1020.5}}, 0),
+        ({"modified": {"$gt": datetime.fromtimestamp(1990)}}, 0),
+        ({"created": {"$ne": 1003.0}}, 0),
+        ({"created": 1007.0}, 0),
+        ({"flag": True}, 0),
+        ({"flag": False}, 0),
+        ({"flag": "@true"}, 0),
+        ({"data.index": {"$le": 3}}, 0),
+        ({"data.nested.parity": 1, "tags": ["tag2"]}, 0),
+        ({"desc": "~resource number 1"}, 0),
+        ({"desc": "~RESOURCE"}, re.IGNORECASE),
+    ]
+
+
+# === Tests ===
+
+
+@pytest.mark.unit
+def test_find(sample, dbs):
+    for filter_dict, flags in filters(sample):
+        expected = [r.v for r in dbs["tinydb"].find(filter_dict.copy(), flags=flags)]
+        result = [r.v for r in dbs["sqlite"].find(filter_dict.copy(), flags=flags)]
+        assert result == expected, filter_dict
+        ids = list(dbs["sqlite"].find(filter_dict.copy(), id_only=True, flags=flags))
+        assert ids == [v["doc_id"] for v in expected]
+    assert len(list(dbs["sqlite"].find({"aliases": ["r3", "r7"]}))) == 2
+    assert len(dbs["sqlite"]) == len(dbs["tinydb"]) == len(sample)
+
+
+@pytest.mark.unit
+def test_find_related(sample, dbs):
+    meta = [resource.Resource.ID_FIELD, "aliases"]
+    for start in (sample[0], sample[3], sample[29]):
+        for outgoing in (True, False):
+            for maxdepth in (0, 1, 2):
+                for filter_dict in (None, {"tags": ["even"]}):
+                    kwargs = dict(
+                        filter_dict=filter_dict,
+                        outgoing=outgoing,
+                        maxdepth=maxdepth,
+                        meta=meta,
+                    )
+                    expected = list(dbs["tinydb"].find_related(start.id, **kwargs))
+                    result = list(dbs["sqlite"].find_related(start.id, **kwargs))
+                    assert result == expected
+    assert list(dbs["sqlite"].find_related("unknown", meta=meta)) == []
+
+
+@pytest.mark.unit
+def test_indexes(dbs):
+    db = dbs["sqlite"]
+    for sql, params, index in (
+        ("id_ = ?", ["abc"], "resources_id"),
+        ("id_ LIKE ? ESCAPE '\\'", ["abc%"], "resources_id"),
+        ("type = ?", ["data"], "resources_type"),
+        ("created > ?", [3], "resources_created"),
+    ):
+        plan = db._db.execute(
+            f"EXPLAIN QUERY PLAN SELECT doc_id FROM resources WHERE {sql}", params
+        ).fetchall()
+        assert index in str(plan)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("kind", ["tinydb", "sqlite"])
+def test_put_update_delete(kind, tmp_path):
+    rsrc = make_resources(6)
+    db = make_db(kind, tmp_path, rsrc)
+    with pytest.raises(errors.DuplicateResourceError):
+        db.put(rsrc[0])
+    # update
+    r = db.find_one({resource.Resource.ID_FIELD: rsrc[1].id})
+    r.v["tags"] = ["new"]
+    r.v["desc"] = "changed"
+    db.update(r.id, r.v)
+    assert [x.id for x in db.find({"tags": ["new"]})] == [rsrc[1].id]
+    assert db.get(r.v["doc_id"]).v["desc"] == "changed"
+    assert [x.id for x in db.find({"tags": ["tag1"]})] == [rsrc[4].id]
+    r.v["type"] = "changed"
+    with pytest.raises(ValueError):
+        db.update(r.id, r.v)
+    with pytest.raises(errors.NoSuchResourceError):
+        db.update("0" * 32, r.v)
+    # delete
+    db.delete(id_=rsrc[0].id)
+    assert db.find_one({resource.Resource.ID_FIELD: rsrc[0].id}) is None
+    db.delete(filter_dict={"tags": ["even"]})
+    assert len(db) == 3
+    doc_ids = list(db.find({}, id_only=True))
+    db.delete(idlist=doc_ids[:2], internal_ids=True)
+    assert [x.id for x in db.find({})] == [rsrc[5].id]
+    assert db.get(doc_ids[0]) is None
+    # relations of deleted resources are not followed
+    meta = [resource.Resource.ID_FIELD]
+    assert [m for _, _, m in db.find_related(rsrc[5].id, meta=meta)] == []
+
+
+@pytest.mark.unit
+def test_open_resource_db(tmp_path):
+    assert resourcedb.is_sqlite_file(tmp_path / "new.sqlite")
+    assert not resourcedb.is_sqlite_file(tmp_path / "new.json")
+    db = resourcedb.open_resource_db(str(tmp_path / "db.sqlite"))
+    assert isinstance(db, resourcedb.SQLiteResourceDB)
+    db.close()
+    # the contents of an existing file decide the type
+    (tmp_path / "db.sqlite").rename(tmp_path / "db.json")
+    db = resourcedb.open_resource_db(str(tmp_path / "db.json"))
+    assert isinstance(db, resourcedb.SQLiteResourceDB)
+    db.close()
+    db = resourcedb.open_resource_db(str(tmp_path / "resourcedb.json"))
+    assert not isinstance(db, resourcedb.SQLiteResourceDB)
+    # not a database
+    (tmp_path / "bad.sqlite").write_text("x" * 100)
+    with pytest.raises(errors.FileError):
+        resourcedb.SQLiteResourceDB(str(tmp_path / "bad.sqlite"))
+
+
+@pytest.mark.unit
+def test_migrate_tinydb(tmp_path):
+    rsrc = make_resources(10)
+    old = make_db("tinydb", tmp_path, rsrc)
+    old.delete(id_=rsrc[2].id)  # so the internal ids are not consecutive
+    src, dest = tmp_path / "resourcedb.json", tmp_path / "migrated.sqlite"
+    assert resourcedb.migrate_tinydb(str(src), str(dest)) == 9
+    new = resourcedb.SQLiteResourceDB(str(dest))
+    assert [r.v for r in new.find({})] == [r.v for r in old.find({})]
+    meta = [resource.Resource.ID_FIELD]
+    assert list(new.find_related(rsrc[0].id, meta=meta)) == list(
+        old.find_related(rsrc[0].id, meta=meta)
+    )
+    new.close()
+    with pytest.raises(errors.FileError):
+        resourcedb.migrate_tinydb(str(src), str(dest))
+    with pytest.raises(errors.FileError):
+        resourcedb.migrate_tinydb(str(dest), str(tmp_path / "other.sqlite"))
+
+
+@pytest.mark.unit
+def test_workspace_migrate_db(tmp_path):
+    dmf = DMF(path=tmp_path / "ws", create=True)
+    rsrc = make_resources(5)
+    for r in rsrc:
+        dmf.add(r)
+    assert commands.workspace_migrate_db(str(tmp_path / "ws")) == 5
+    dmf = DMF(path=tmp_path / "ws")
+    assert dmf.db_file == "resourcedb.sqlite"
+    assert isinstance(dmf._db, resourcedb.SQLiteResourceDB)
+    assert [r.id for r in dmf.find(name="r3")] == [rsrc[3].id]
+    related = [
+        m["aliases"][0] for _, _, m in dmf.find_related(rsrc[4], meta=["aliases"])
+    ]
+    assert related == ["r3", "r2", "r1", "r0", "r3"]
+    # remove also updates the relations of other resources
+    dmf.remove(identifier=rsrc[0].id)
+    assert dmf.fetch_one(rsrc[1].id).v["relations"] == [
+        rel for rel in rsrc[1].v["relations"] if rel["identifier"] != rsrc[0].id
+    ]
+    with pytest.raises(errors.CommandError):
+        commands.workspace_migrate_db(str(tmp_path / "ws"))
+
+
+@pytest.mark.performance
+class TestResourceDBPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return make_resources(10000)
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        resources = self.build_model()
+        with tempfile.TemporaryDirectory() as tmp:
+            tinydb = resourcedb.ResourceDB(str(Path(tmp) / "resourcedb.json"))
+            # (put() checks for duplicates, which is slow with TinyDB)
+            tinydb._db.insert_multiple([r.v for r in resources])
+            src = str(Path(tmp) / "resourcedb.json")
+            dest = str(Path(tmp) / "resourcedb.sqlite")
+            timer.tic(None)
+            resourcedb.migrate_tinydb(src, dest)
+            self.recordData("migrate 10000 resources", timer.toc(None))
+            sqlite = resourcedb.SQLiteResourceDB(dest)
+            r = resources[5000]
+            queries = {
+                "id": {resource.Resource.ID_FIELD: r.id},
+                "id prefix": {resource.Resource.ID_FIELD: "~" + r.id[:8] + "[a-z]*"},
+                "name": {"aliases": ["r5000"]},
+            }
+            for db, label in ((tinydb, "TinyDB"), (sqlite, "SQLite")):
+                for query, filter_dict in queries.items():
+                    timer.tic(None)
+                    assert len(list(db.find(filter_dict, flags=re.I))) == 1
+                    self.recordData(f"find by {query}, {label}", timer.toc(None))
+                timer.tic(None)
+                related = list(db.find_related(r.id, maxdepth=10, meta=["aliases"]))
+                assert len(related) == 10
+                self.recordData(f"find_related, {label}", timer.toc(None))
+            sqlite.close()
@@ -92,7 +92,8 @@ class Workspace(object):
         /path/to/dmf: Root DMF directory
          |
          +- config.yaml: Configuration file
-         +- resourcedb.json: Resource metadata "database" (uses TinyDB)
+         +- resourcedb.json: Resource metadata "database" (uses TinyDB),
+         |                   or an indexed SQLite database after `dmf migrate`
          +- files: Data files for all resources
 
     The configuration file is a `YAML`_ formatted file
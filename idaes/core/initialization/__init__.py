@@ -16,8 +16,10 @@
 from .block_triangularization import BlockTriangularizationInitializer
 from .general_hierarchical import SingleControlVolumeUnitInitializer
 from .initialize_from_data import FromDataInitializer
+from .initialization_cache import InitializationCache
 from .initializer_base import (
     ModularInitializerBase,
     InitializerBase,
     InitializationStatus,
 )
+from .sequential_modular import SequentialModularInitializer
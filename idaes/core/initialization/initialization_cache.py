@@ -0,0 +1,231 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Cache of initialized variable values, stored on disk and looked up by a hash of
+the model structure, configuration and fixed inputs.
+"""
+from enum import Enum
+import glob
+import hashlib
+import os
+
+from pyomo.environ import Block, Constraint, Var, value
+from pyomo.common.collections import ComponentSet
+from pyomo.common.config import ConfigDict
+from pyomo.core.base.component import Component, ComponentData
+from pyomo.core.expr.visitor import identify_mutable_parameters, identify_variables
+
+import idaes
+from idaes.core.util.model_serializer import StoreSpec, from_json, to_json
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+
+# Change this if the contents of the key or the cached files change
+_cache_version = 1
+
+
+def default_cache_directory():
+    """Return the default directory for the initialization cache, or None if
+    there is no IDAES data directory.
+    """
+    if idaes.data_directory is None:
+        return None
+    return os.path.join(idaes.data_directory, "initialization_cache")
+
+
+class InitializationCache:
+    """
+    Cache of initialized variable values, stored as (gzipped) json files in a
+    directory.
+
+    Values are stored and looked up by a key, which is a hash of:
+
+        - the type of the model and the names of its variables and
+          constraints (and whether the constraints are active),
+        - the model configuration, if it has one,
+        - the values of the fixed variables and mutable parameters which
+          appear in active constraints of the model, including those outside
+          the model, e.g. in property parameter blocks, and
+        - the version of IDAES.
+
+    The key should be computed once the initialization states of the model
+    are fixed, so it includes the inlet states. Names are relative to the
+    model, so models with the same structure in different places of a
+    flowsheet share cached values.
+
+    Cached values are only used after they have been checked by the
+    Initializer (see InitializerBase.initialize).
+
+    Args:
+        directory: directory to store the cache in, if None use
+            default_cache_directory()
+    """
+
+    def __init__(self, directory: str = None):
+        if directory is None:
+            directory = default_cache_directory()
+        if directory is None:
+            raise ValueError(
+                "No directory provided for the initialization cache and there "
+                "is no IDAES data directory."
+            )
+        self.directory = directory
+
+    def key(self, model: Block):
+        """
+        Get the cache key of a model.
+
+        Args:
+            model: model to get key of
+
+        Returns:
+            str key
+        """
+        digest = hashlib.sha1()
+
+        def add(*args):
+            digest.update(repr(args).encode("utf-8"))
+
+        add(_cache_version, idaes.__version__, _class_name(type(model)))
+        add(_stable_repr(getattr(model, "config", None)))
+
+        constraints = list(
+            model.component_data_objects(Constraint, descend_into=True, sort=False)
+        )
+        for v in model.component_data_objects(Var, descend_into=True, sort=False):
+            add(_name(v, model))
+        for c in constraints:
+            add(_name(c, model), c.active)
+
+        fixed = ComponentSet()
+        for c in constraints:
+            if not c.active:
+                continue
+            # Use the whole expression, as mutable parameters and fixed
+            # variables may be in the bounds (e.g. x == p)
+            for v in identify_variables(c.expr, include_fixed=True):
+                if v.fixed and v not in fixed:
+                    fixed.add(v)
+                    add(_name(v, model), v.value)
+            for p in identify_mutable_parameters(c.expr):
+                # (units are also returned)
+                if isinstance(p, ComponentData) and p not in fixed:
+                    fixed.add(p)
+                    add(_name(p, model), value(p, exception=False))
+
+        return digest.hexdigest()[:16]
+
+    def path(self, key: str):
+        """
+        Get the name of the file for a key.
+
+        Args:
+            key: key from self.key()
+
+        Returns:
+            str file name
+        """
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def load(self, model: Block, key: str):
+        """
+        Load cached values of the variables of a model, if there are any.
+        Values of fixed variables are not changed.
+
+        Args:
+            model: model to load values into
+            key: key from self.key(model)
+
+        Returns:
+            True if values were loaded, otherwise False
+        """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return False
+        try:
+            from_json(model, fname=path, wts=StoreSpec.value(only_not_fixed=True))
+        except (OSError, ValueError, KeyError, EOFError) as e:
+            _log.warning(f"Could not read initialization cache {path}: {e}")
+            return False
+        return True
+
+    def store(self, model: Block, key: str):
+        """
+        Store the values of the variables of a model.
+
+        Args:
+            model: model to store values of
+            key: key from self.key(model)
+
+        Returns:
+            None
+        """
+        path = self.path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            to_json(model, fname=tmp, wts=StoreSpec.value(), gz=True)
+            os.replace(tmp, path)
+        except OSError as e:
+            _log.warning(f"Could not write initialization cache {path}: {e}")
+
+    def clear(self):
+        """
+        Remove all cached values.
+
+        Returns:
+            None
+        """
+        for path in glob.glob(os.path.join(self.directory, "*.json.gz")):
+            os.remove(path)
+
+
+def _class_name(cls):
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _name(component, model):
+    """Name relative to the model, or the full name for components outside
+    the model"""
+    b = component.parent_block()
+    while b is not None and b is not model:
+        b = b.parent_block()
+    if b is None:
+        return component.getname(fully_qualified=True)
+    return component.getname(fully_qualified=True, relative_to=model)
+
+
+def _stable_repr(obj):
+    """
+    A representation of a configuration value which does not depend on where
+    objects are in memory, so it is the same when the model is built again.
+    """
+    if isinstance(obj, ConfigDict):
+        return {k: _stable_repr(v) for k, v in obj.items()}
+    if isinstance(obj, dict):
+        return {repr(k): _stable_repr(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_stable_repr(v) for v in obj]
+    if isinstance(obj, (Component, ComponentData)):
+        # e.g. property packages
+        return f"{_class_name(type(obj))}:{obj.name}"
+    if isinstance(obj, type):
+        return _class_name(obj)
+    if isinstance(obj, Enum) or obj is None:
+        return str(obj)
+    if isinstance(obj, (bool, int, float, str)):
+        return obj
+    if callable(obj):
+        return getattr(obj, "__qualname__", type(obj).__qualname__)
+    return _class_name(type(obj))
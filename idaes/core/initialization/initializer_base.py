@@ -23,8 +23,10 @@ from pyomo.environ import (
     Var,
 )
 from pyomo.core.base.var import _VarData
-from pyomo.common.config import ConfigDict, ConfigValue, String_ConfigFormatter
+from pyomo.common.config import Bool, ConfigDict, ConfigValue, String_ConfigFormatter
 
+from idaes.core.initialization.initialization_cache import InitializationCache
+from idaes.core.util.compiled_residuals import compiled_residuals
 from idaes.core.util.model_serializer import to_json, from_json, StoreSpec, _only_fixed
 from idaes.core.util.exceptions import InitializationError
 from idaes.core.util.model_statistics import (
@@ -75,6 +77,16 @@ StoreState = StoreSpec(
 )
 
 
+def _cache_domain(val):
+    if val is None or isinstance(val, InitializationCache):
+        return val
+    if isinstance(val, str):
+        return InitializationCache(val)
+    raise ValueError(
+        f"cache must be an InitializationCache or the name of a directory (received {val})."
+    )
+
+
 class InitializerBase:
     """
     Base class for Initializer objects.
@@ -100,6 +112,31 @@ class InitializerBase:
             description="Set output level for logging messages",
         ),
     )
+    CONFIG.declare(
+        "cache",
+        ConfigValue(
+            default=None,
+            domain=_cache_domain,
+            description="Cache of initialized values",
+            doc="InitializationCache (or name of a directory to use as an "
+            "InitializationCache) to load initialized values from and store them "
+            "in. Cached values are used if they pass the postcheck, otherwise "
+            "the model is initialized as usual. Default = None, no cache.",
+        ),
+    )
+    CONFIG.declare(
+        "fast_postcheck",
+        ConfigValue(
+            default=True,
+            domain=Bool,
+            description="Use compiled residuals in postcheck",
+            doc="If True, postcheck evaluates the residuals of all constraints "
+            "with CompiledResiduals, which are compiled once and cached on the "
+            "model for later checks. If False, each constraint is evaluated by "
+            "walking its expression (large_residuals_set). Both give the same "
+            "results. Default = True.",
+        ),
+    )
 
     def __init__(self, **kwargs):
         self.config = self.CONFIG(kwargs)
@@ -184,6 +221,15 @@ class InitializerBase:
         # 4. Prechecks
         self.precheck(model)
 
+        # 4a. Try to load initialized values from cache
+        cache_key = None
+        if self.config.cache is not None:
+            cache_key = self.config.cache.key(model)
+            if self.load_from_cache(model, cache_key, exclude_unused_vars):
+                self.restore_model_state(model)
+                self._local_logger_level = None
+                return self.summary[model]["status"]
+
         # 5. try: Call specified initialization routine
         try:
             # Base method does not have a return (NotImplementedError),
@@ -198,10 +244,17 @@ class InitializerBase:
             self._local_logger_level = None
 
         # 7. Check convergence
-        return self.postcheck(
+        status = self.postcheck(
             model, results_obj=results, exclude_unused_vars=exclude_unused_vars
         )
 
+        # 8. Store initialized values in cache
+        if cache_key is not None:
+            self.config.cache.store(model, cache_key)
+            self._update_summary(model, "cache", "stored")
+
+        return status
+
     def get_current_state(self, model: Block):
         """
         Get and store current state of variables (fixed/unfixed) and constraints/objectives
@@ -304,6 +357,43 @@ class InitializerBase:
                 f"initialization (DoF = {degrees_of_freedom(model)})."
             )
 
+    def load_from_cache(
+        self, model: Block, cache_key: str, exclude_unused_vars: bool = False
+    ):
+        """
+        Load initialized values from self.config.cache and check them with
+        postcheck.
+
+        Args:
+            model: Pyomo model to be initialized.
+            cache_key: key of model in cache
+            exclude_unused_vars: whether to ignore unused variables when doing post-initialization checks.
+
+        Returns:
+            True if cached values were loaded and passed the postcheck, otherwise False
+        """
+        # Values before loading, to restore if the cached values are rejected
+        values = to_json(
+            model, wts=StoreSpec.value(only_not_fixed=True), return_dict=True
+        )
+        if not self.config.cache.load(model, cache_key):
+            self._update_summary(model, "cache", "miss")
+            return False
+
+        try:
+            self.postcheck(model, exclude_unused_vars=exclude_unused_vars)
+        except InitializationError:
+            _log.warning(
+                f"Cached values for {model.name} failed postcheck - initializing model."
+            )
+            from_json(model, sd=values, wts=StoreSpec.value(only_not_fixed=True))
+            self._update_summary(model, "cache", "rejected")
+            self._update_summary(model, "status", InitializationStatus.none)
+            return False
+
+        self._update_summary(model, "cache", "hit")
+        return True
+
     def initialization_routine(self, model: Block):
         """
         Placeholder method to run initialization routine. Derived classes should overload
@@ -381,13 +471,20 @@ class InitializerBase:
                 )
         else:
             # Need to manually check initialization
-            # First, check that all Vars have values
-            if exclude_unused_vars:
-                # Need to get set of Vars in active constraints
-                active_vars = variables_in_activated_constraints_set(model)
+            if self.config.fast_postcheck:
+                residuals = compiled_residuals(model)
             else:
+                residuals = None
+
+            # First, check that all Vars have values
+            if not exclude_unused_vars:
                 # Placeholder, this should not get accessed unless exclude_unused_vars is True
                 active_vars = None
+            elif residuals is not None:
+                active_vars = residuals.variables
+            else:
+                # Need to get set of Vars in active constraints
+                active_vars = variables_in_activated_constraints_set(model)
 
             uninit_vars = []
 
@@ -404,9 +501,14 @@ class InitializerBase:
                 _append_uninit_vars(model)
 
             # Next check for unconverged equality constraints
-            uninit_const = large_residuals_set(
-                model, self.config.constraint_tolerance, return_residual_values=True
-            )
+            if residuals is not None:
+                uninit_const = residuals.large_residuals(
+                    self.config.constraint_tolerance
+                )
+            else:
+                uninit_const = large_residuals_set(
+                    model, self.config.constraint_tolerance, return_residual_values=True
+                )
 
             try:
                 max_res = max(i for i in uninit_const.values() if i is not None)
@@ -0,0 +1,460 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Initializer for flowsheets using the sequential modular approach
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+from time import perf_counter
+
+from pandas import DataFrame
+
+from pyomo.environ import Block, value
+from pyomo.common.config import ConfigValue, In, PositiveInt
+from pyomo.network import SequentialDecomposition
+
+from idaes.core.initialization.initializer_base import (
+    InitializationStatus,
+    ModularInitializerBase,
+)
+from idaes.core.util.exceptions import ConfigurationError, InitializationError
+from idaes.core.util.initialization import propagate_state
+from idaes.core.util.model_serializer import StoreSpec, from_json, to_json
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+
+# Values, fixed and active states of a unit, sent to and from worker processes
+_UnitState = StoreSpec.value_isfixed_isactive(only_fixed=False)
+
+
+class SequentialModularInitializer(ModularInitializerBase):
+    """
+    Initializer for flowsheets using the sequential modular approach.
+
+    The units of the flowsheet and the (expanded) Arcs connecting them are
+    converted to a graph, and tear streams are selected to break any recycle
+    loops. Each pass initializes the units in order using the Initializer
+    found by get_submodel_initializer (usually the default_initializer of the
+    unit), after propagating the states of the Arcs into the unit with
+    propagate_state. Passes are repeated, with direct substitution of the tear
+    streams, until the tear streams converge. Only the units downstream of the
+    tear streams are initialized again in later passes.
+
+    Units which do not depend on each other within a pass can be initialized
+    concurrently in a pool of worker processes. Each worker builds its own
+    copy of the flowsheet with model_builder, and the values, fixed and active
+    states of each unit are sent to and from the workers. The unit
+    Initializers are created again in the workers from their type and
+    configuration.
+
+    The time taken and status of each unit initialization and the residual of
+    the tear streams in each pass are recorded in unit_history and
+    tear_history.
+
+    """
+
+    CONFIG = ModularInitializerBase.CONFIG()
+    CONFIG.declare(
+        "tear_set",
+        ConfigValue(
+            default=None,
+            domain=list,
+            description="List of Arcs to use as tear streams",
+            doc="List of Arcs to use as tear streams. If not provided, tear "
+            "streams are selected using tear_method.",
+        ),
+    )
+    CONFIG.declare(
+        "tear_method",
+        ConfigValue(
+            default="heuristic",
+            domain=In(["heuristic", "mip"]),
+            description="Method used to select tear streams",
+            doc="Method used by Pyomo's SequentialDecomposition to select tear "
+            "streams, heuristic (default) or mip (requires an MIP solver).",
+        ),
+    )
+    CONFIG.declare(
+        "iteration_limit",
+        ConfigValue(
+            default=20,
+            domain=PositiveInt,
+            description="Maximum number of passes to converge tear streams",
+        ),
+    )
+    CONFIG.declare(
+        "tear_tolerance",
+        ConfigValue(
+            default=1e-5,
+            domain=float,
+            description="Tolerance for convergence of tear streams",
+        ),
+    )
+    CONFIG.declare(
+        "tear_tolerance_type",
+        ConfigValue(
+            default="abs",
+            domain=In(["abs", "rel"]),
+            description="Whether tear_tolerance is an absolute or relative "
+            "tolerance",
+        ),
+    )
+    CONFIG.declare(
+        "n_workers",
+        ConfigValue(
+            default=1,
+            domain=PositiveInt,
+            description="Number of worker processes",
+            doc="Number of worker processes used to initialize units which do "
+            "not depend on each other (default=1, initialize all units in this "
+            "process). model_builder must be provided if greater than 1.",
+        ),
+    )
+    CONFIG.declare(
+        "model_builder",
+        ConfigValue(
+            default=None,
+            description="Function which builds the model in worker processes",
+            doc="Function with no arguments which returns a model with the same "
+            "structure as the model being initialized, used to build the model "
+            "in each worker process. It must be defined at module level so it "
+            "can be pickled.",
+        ),
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.unit_history = []
+        self.tear_history = []
+
+    def unit_graph(self, model: Block):
+        """
+        Get the graph of the units in a flowsheet and the Arcs between them.
+
+        Args:
+            model: flowsheet to get graph of. Arcs must be expanded.
+
+        Returns:
+            networkx MultiDiGraph with a node for each unit and an edge for
+            each Arc (with the Arc stored as the arc attribute)
+        """
+        graph = SequentialDecomposition().create_graph(model)
+        # Add units which are not connected to anything
+        for unit in _units(model):
+            graph.add_node(unit)
+        return graph
+
+    def select_tear_set(self, graph):
+        """
+        Get the tear streams needed to break the recycle loops of a flowsheet,
+        either from the tear_set argument or selected using tear_method.
+
+        Args:
+            graph: graph of the flowsheet from unit_graph
+
+        Returns:
+            list of Arcs
+        """
+        if self.config.tear_set is not None:
+            return list(self.config.tear_set)
+        if _calculation_stages(graph, []) is not None:
+            # No recycle loops
+            return []
+        # Select tears in each strongly connected component separately, as
+        # the cost of the selection methods grows quickly with the number of
+        # loops in the graph
+        # (SequentialDecomposition caches data for one graph, so a new one is
+        # needed for each component)
+        tear_set = []
+        for nodes in SequentialDecomposition().scc_collect(graph)[0]:
+            if len(nodes) > 1:
+                subgraph = graph.subgraph(nodes).copy()
+                tear_set.extend(
+                    SequentialDecomposition().tear_set_arcs(
+                        subgraph, method=self.config.tear_method
+                    )
+                )
+            else:
+                # Units with an Arc from an outlet to their own inlet
+                tear_set.extend(
+                    a
+                    for _, v, a in graph.out_edges(nodes[0], data="arc")
+                    if v is nodes[0]
+                )
+        return tear_set
+
+    def calculation_stages(self, graph, tear_set):
+        """
+        Get the order in which to initialize the units of a flowsheet. Units
+        in the same stage do not depend on each other once the tear streams
+        are broken.
+
+        Args:
+            graph: graph of the flowsheet from unit_graph
+            tear_set: list of Arcs used as tear streams
+
+        Returns:
+            list of lists of units
+
+        Raises:
+            ConfigurationError if the tear streams do not break all the
+            recycle loops
+        """
+        stages = _calculation_stages(graph, tear_set)
+        if stages is None:
+            raise ConfigurationError(
+                "Tear set does not break all recycle loops in the flowsheet. "
+                "Please check the tear_set argument."
+            )
+        return stages
+
+    def initialization_routine(self, model: Block):
+        """
+        Sequential modular initialization routine for flowsheets.
+
+        Args:
+            model: flowsheet to be initialized
+
+        Returns:
+            None
+        """
+        _log = self.get_logger(model)
+        if self.config.n_workers > 1 and self.config.model_builder is None:
+            raise ConfigurationError(
+                "model_builder must be provided to initialize units in more "
+                "than one process, as models can not be sent to worker processes."
+            )
+
+        graph = self.unit_graph(model)
+        tear_set = self.select_tear_set(graph)
+        stages = self.calculation_stages(graph, tear_set)
+        _log.info_high(
+            f"Initializing {graph.number_of_nodes()} units in {len(stages)} "
+            f"stages with tear streams {[t.name for t in tear_set]}."
+        )
+
+        initializers = {u: self.get_submodel_initializer(u) for u in graph.nodes}
+        tears = set(tear_set)
+        in_arcs = {
+            u: [a for _, _, a in graph.in_edges(u, data="arc") if a not in tears]
+            for u in graph.nodes
+        }
+        # Units which are affected by the values of the tear streams
+        downstream = _downstream(graph, tears, [t.dest.parent_block() for t in tears])
+
+        self.unit_history = []
+        self.tear_history = []
+        executor = None
+        if self.config.n_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=self.config.n_workers,
+                initializer=_init_worker,
+                initargs=(self.config.model_builder,),
+            )
+
+        try:
+            converged = False
+            for n in range(self.config.iteration_limit):
+                for stage in stages:
+                    units = [u for u in stage if n == 0 or u in downstream]
+                    for u in units:
+                        for arc in in_arcs[u]:
+                            propagate_state(arc=arc)
+                    self._initialize_stage(units, initializers, n, executor)
+
+                if not tear_set:
+                    converged = True
+                    break
+                residual = self._tear_residual(tear_set)
+                self.tear_history.append(residual)
+                _log.info(f"Pass {n + 1}: tear stream residual {residual:.3e}.")
+                for arc in tear_set:
+                    propagate_state(arc=arc)
+                if residual <= self.config.tear_tolerance:
+                    converged = True
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if not converged:
+            _log.warning(
+                f"Tear streams did not converge in {self.config.iteration_limit} "
+                f"passes (residual {self.tear_history[-1]:.3e})."
+            )
+        self._update_summary(model, "tear_set", tear_set)
+        self._update_summary(model, "unit_history", self.unit_history)
+        self._update_summary(model, "tear_history", self.tear_history)
+
+        return None
+
+    def history_table(self):
+        """
+        Get the history of unit initializations from the last run.
+
+        Returns:
+            pandas DataFrame with a row for each unit initialization, with
+            columns unit, pass, time (s), status and process
+        """
+        return DataFrame(
+            self.unit_history, columns=["unit", "pass", "time", "status", "process"]
+        )
+
+    def _initialize_stage(self, units, initializers, n, executor):
+        if executor is None or len(units) < 2:
+            for u in units:
+                status, elapsed = _initialize_unit(
+                    u, initializers[u], self.get_output_level()
+                )
+                self._record(u, n, elapsed, status, "main")
+            return
+
+        futures = [
+            executor.submit(
+                _initialize_in_worker,
+                u.name,
+                to_json(u, wts=_UnitState, return_dict=True),
+                _initializer_spec(initializers[u]),
+                self.get_output_level(),
+            )
+            for u in units
+        ]
+        for u, future in zip(units, futures):
+            state, status, elapsed, pid = future.result()
+            from_json(u, sd=state, wts=_UnitState)
+            self._record(u, n, elapsed, status, f"worker {pid}")
+
+    def _record(self, unit, n, elapsed, status, process):
+        if status == InitializationStatus.Failed:
+            _log.warning(f"Initialization of {unit.name} failed in pass {n + 1}.")
+        self.unit_history.append(
+            {
+                "unit": unit.name,
+                "pass": n,
+                "time": elapsed,
+                "status": status.name,
+                "process": process,
+            }
+        )
+
+    def _tear_residual(self, tear_set):
+        residual = 0
+        rel = self.config.tear_tolerance_type == "rel"
+        for arc in tear_set:
+            for name, src in arc.src.vars.items():
+                dest = arc.dest.vars[name]
+                for k in src:
+                    s, d = value(src[k]), value(dest[k])
+                    r = abs(s - d)
+                    if rel and r > 0:
+                        r /= max(abs(s), abs(d))
+                    residual = max(residual, r)
+        return residual
+
+
+def _units(block):
+    """Units of a flowsheet, including those of sub-flowsheets"""
+    # Unit models use the Initializers, so import here to avoid a circular import
+    # pylint: disable-next=import-outside-toplevel
+    from idaes.core.base.unit_model import UnitModelBlockData
+
+    for b in block.component_data_objects(Block, descend_into=False):
+        if isinstance(b, UnitModelBlockData):
+            yield b
+        elif getattr(b, "is_flowsheet", lambda: False)():
+            yield from _units(b)
+
+
+def _calculation_stages(graph, tear_set):
+    """
+    Group the units of a graph into stages, where each unit depends only on
+    units in earlier stages when the tear streams are broken. Returns None if
+    there are recycle loops left.
+    """
+    tears = set(tear_set)
+    in_degree = {u: 0 for u in graph.nodes}
+    for _, v, arc in graph.edges(data="arc"):
+        if arc not in tears:
+            in_degree[v] += 1
+
+    stages = []
+    stage = [u for u in graph.nodes if in_degree[u] == 0]
+    while stage:
+        stages.append(stage)
+        next_stage = []
+        for u in stage:
+            for _, v, arc in graph.out_edges(u, data="arc"):
+                if arc not in tears:
+                    in_degree[v] -= 1
+                    if in_degree[v] == 0:
+                        next_stage.append(v)
+        stage = next_stage
+
+    if sum(len(s) for s in stages) < graph.number_of_nodes():
+        return None
+    return stages
+
+
+def _downstream(graph, tears, units):
+    """Set of units which depend on the given units when the tear streams are
+    broken, including the given units"""
+    found = set(units)
+    stack = list(units)
+    while stack:
+        u = stack.pop()
+        for _, v, arc in graph.out_edges(u, data="arc"):
+            if arc not in tears and v not in found:
+                found.add(v)
+                stack.append(v)
+    return found
+
+
+def _initializer_spec(initializer):
+    if initializer is None:
+        return None
+    return type(initializer), initializer.config.value()
+
+
+def _initialize_unit(unit, initializer, output_level):
+    start = perf_counter()
+    if initializer is None:
+        # get_submodel_initializer has already logged a warning
+        status = InitializationStatus.none
+    else:
+        try:
+            status = initializer.initialize(unit, output_level=output_level)
+        except InitializationError:
+            status = InitializationStatus.Failed
+    return status, perf_counter() - start
+
+
+# model of the current worker process, created by _init_worker
+_worker_model = None
+
+
+def _init_worker(model_builder):
+    global _worker_model  # pylint: disable=global-statement
+    _worker_model = model_builder()
+
+
+def _initialize_in_worker(name, state, initializer_spec, output_level):
+    unit = _worker_model.find_component(name)
+    from_json(unit, sd=state, wts=_UnitState)
+    initializer = None
+    if initializer_spec is not None:
+        initializer_class, config = initializer_spec
+        initializer = initializer_class(**config)
+    status, elapsed = _initialize_unit(unit, initializer, output_level)
+    return to_json(unit, wts=_UnitState, return_dict=True), status, elapsed, os.getpid()
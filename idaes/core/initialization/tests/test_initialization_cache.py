@@ -0,0 +1,230 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for the initialization cache
+"""
+import os
+
+import pytest
+
+from pyomo.environ import Block, ConcreteModel, Constraint, exp, Param, value, Var
+import pyomo.common.unittest as unittest
+from pyomo.common.tempfiles import TempfileManager
+from pyomo.common.timing import TicTocTimer
+
+from idaes.core import FlowsheetBlock
+from idaes.core.initialization import (
+    BlockTriangularizationInitializer,
+    InitializationCache,
+    InitializationStatus,
+)
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.properties.modular_properties.base.generic_property import (
+    GenericParameterBlock,
+)
+from idaes.models.properties.modular_properties.examples.BT_ideal import (
+    configuration,
+)
+from idaes.models.unit_models import Heater
+
+
+class CountingInitializer(BlockTriangularizationInitializer):
+    """BlockTriangularizationInitializer which counts calls of its routine"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+        self.start = None
+
+    def initialization_routine(self, model):
+        self.calls += 1
+        self.start = {i: value(v) for i, v in model.x.items()}
+        return super().initialization_routine(model)
+
+
+def build_chain(n=5, x0=1.0, name="b"):
+    m = ConcreteModel()
+    m.add_component(name, Block())
+    b = m.component(name)
+    b.x = Var(range(n), initialize=1)
+    b.x[0].fix(x0)
+    b.c = Constraint(range(1, n), rule=lambda b, i: exp(b.x[i]) == b.x[i - 1] + 2)
+    return m, b
+
+
+@pytest.mark.unit
+def test_key(tmp_path):
+    cache = InitializationCache(str(tmp_path))
+    key = cache.key(build_chain()[1])
+    assert len(key) == 16
+    # same structure and inputs
+    assert cache.key(build_chain()[1]) == key
+    assert cache.key(build_chain(name="other")[1]) == key
+    # different fixed inputs
+    assert cache.key(build_chain(x0=2)[1]) != key
+    # different structure
+    assert cache.key(build_chain(n=6)[1]) != key
+    _, b = build_chain()
+    b.c[2].deactivate()
+    assert cache.key(b) != key
+    # values of variables which are not fixed are not included
+    _, b = build_chain()
+    b.x[3].set_value(10)
+    assert cache.key(b) == key
+
+
+@pytest.mark.unit
+def test_key_bounds(tmp_path):
+    # mutable parameters and fixed variables which are not in the body of a
+    # constraint are included
+    cache = InitializationCache(str(tmp_path))
+    m = ConcreteModel()
+    m.b = Block()
+    m.b.x = Var()
+    m.b.y = Var()
+    m.b.p = Param(initialize=2, mutable=True)
+    m.b.c = Constraint(expr=m.b.x == m.b.p)
+    m.b.d = Constraint(expr=(m.b.y, m.b.x, None))
+    m.b.y.fix(0)
+    key = cache.key(m.b)
+    m.b.p = 5
+    assert cache.key(m.b) != key
+    m.b.p = 2
+    assert cache.key(m.b) == key
+    m.b.y.fix(1)
+    assert cache.key(m.b) != key
+
+
+def build_heater(**kwargs):
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.props = GenericParameterBlock(**configuration)
+    m.fs.H1 = Heater(property_package=m.fs.props, **kwargs)
+    return m
+
+
+@pytest.mark.unit
+def test_key_config(tmp_path):
+    cache = InitializationCache(str(tmp_path))
+    key = cache.key(build_heater().fs.H1)
+    assert cache.key(build_heater().fs.H1) == key
+    assert cache.key(build_heater(has_pressure_change=True).fs.H1) != key
+    # parameters outside the unit are included
+    m = build_heater()
+    m.fs.props.benzene.pressure_crit.fix(5e6)
+    assert cache.key(m.fs.H1) != key
+
+
+@pytest.mark.unit
+def test_cache(tmp_path):
+    initializer = CountingInitializer(cache=str(tmp_path))
+    assert isinstance(initializer.config.cache, InitializationCache)
+
+    m, b = build_chain()
+    assert initializer.initialize(b) == InitializationStatus.Ok
+    assert initializer.summary[b]["cache"] == "stored"
+    assert initializer.calls == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+    # A new model with the same structure and inputs uses the cached values
+    m2, b2 = build_chain(name="other")
+    assert initializer.initialize(b2) == InitializationStatus.Ok
+    assert initializer.summary[b2]["cache"] == "hit"
+    assert initializer.calls == 1
+    for i in b.x:
+        assert value(b2.x[i]) == pytest.approx(value(b.x[i]), rel=1e-12)
+    # model state is restored
+    assert b2.x[0].fixed and not b2.x[1].fixed
+
+    # Different inputs are initialized and stored
+    m3, b3 = build_chain(x0=2)
+    initializer.initialize(b3)
+    assert initializer.summary[b3]["cache"] == "stored"
+    assert initializer.calls == 2
+    assert len(os.listdir(tmp_path)) == 2
+
+    initializer.config.cache.clear()
+    assert len(os.listdir(tmp_path)) == 0
+    m4, b4 = build_chain()
+    initializer.initialize(b4)
+    assert initializer.calls == 3
+
+
+@pytest.mark.unit
+def test_cache_rejected(tmp_path, caplog):
+    cache = InitializationCache(str(tmp_path))
+    initializer = CountingInitializer(cache=cache)
+
+    # Store values which do not satisfy the constraints
+    m, b = build_chain()
+    for i in range(1, 5):
+        b.x[i].set_value(10)
+    cache.store(b, cache.key(b))
+
+    m, b = build_chain()
+    assert initializer.initialize(b) == InitializationStatus.Ok
+    assert "failed postcheck" in caplog.text
+    assert initializer.calls == 1
+    # Initialization starts from the values before the cache was loaded
+    assert initializer.start == {0: 1, 1: 1, 2: 1, 3: 1, 4: 1}
+    assert initializer.summary[b]["cache"] == "stored"
+
+    # The stored values are replaced
+    m2, b2 = build_chain()
+    initializer.initialize(b2)
+    assert initializer.summary[b2]["cache"] == "hit"
+    assert initializer.calls == 1
+
+
+@pytest.mark.unit
+def test_cache_unreadable(tmp_path, caplog):
+    cache = InitializationCache(str(tmp_path))
+    m, b = build_chain()
+    key = cache.key(b)
+    with open(cache.path(key), "w") as f:
+        f.write("not gzipped json")
+    assert not cache.load(b, key)
+    assert "Could not read initialization cache" in caplog.text
+
+
+@pytest.mark.unit
+def test_cache_domain():
+    assert CountingInitializer().config.cache is None
+    with pytest.raises(ValueError, match="cache must be an InitializationCache"):
+        CountingInitializer(cache=1)
+
+
+def build_long_chain():
+    return build_chain(n=2000)
+
+
+@pytest.mark.performance
+class TestInitializationCachePerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_long_chain()[0]
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        with TempfileManager.new_context() as tempfiles:
+            tmp = tempfiles.mkdtemp()
+            initializer = BlockTriangularizationInitializer(cache=tmp)
+            m, b = build_long_chain()
+            timer.tic(None)
+            initializer.initialize(b)
+            self.recordData("initialize and store", timer.toc(None))
+
+            m, b = build_long_chain()
+            timer.tic(None)
+            initializer.initialize(b)
+            self.recordData("initialize from cache", timer.toc(None))
+            assert initializer.summary[b]["cache"] == "hit"
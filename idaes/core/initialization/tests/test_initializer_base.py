@@ -549,6 +549,34 @@ class TestSubMethods:
         assert len(initializer.summary[m]["uninitialized_vars"]) == 0
         assert len(initializer.summary[m]["unconverged_constraints"]) == 0
 
+    @pytest.mark.unit
+    def test_postcheck_fast_postcheck(self, model):
+        model.v1.set_value(-10)
+        model.v3 = Var()  # unused
+
+        summaries = {}
+        for fast in (True, False):
+            initializer = InitializerBase(fast_postcheck=fast)
+            for exclude_unused_vars in (True, False):
+                with pytest.raises(InitializationError):
+                    initializer.postcheck(
+                        model, exclude_unused_vars=exclude_unused_vars
+                    )
+                summaries[fast, exclude_unused_vars] = dict(initializer.summary[model])
+
+        assert InitializerBase().config.fast_postcheck is True
+        for exclude_unused_vars in (True, False):
+            fast = summaries[True, exclude_unused_vars]
+            assert fast == summaries[False, exclude_unused_vars]
+            assert fast["status"] == InitializationStatus.Failed
+        assert summaries[True, True]["uninitialized_vars"] == [model.v2]
+        assert summaries[True, False]["uninitialized_vars"] == [model.v2, model.v3]
+        assert summaries[True, True]["unconverged_constraints"] == {
+            model.c1: 12,
+            model.c2: None,
+            model.c3: None,
+        }
+
     @pytest.mark.unit
     def test_update_summary(self):
         initializer = InitializerBase()
@@ -0,0 +1,311 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for the sequential modular flowsheet Initializer
+"""
+import pytest
+
+from pyomo.environ import (
+    ConcreteModel,
+    Constraint,
+    TransformationFactory,
+    value,
+    Var,
+)
+import pyomo.common.unittest as unittest
+from pyomo.common.config import ConfigValue
+from pyomo.common.timing import TicTocTimer
+from pyomo.network import Arc, Port
+
+from idaes.core import FlowsheetBlock, declare_process_block_class
+from idaes.core.base.unit_model import UnitModelBlockData
+from idaes.core.initialization import (
+    BlockTriangularizationInitializer,
+    InitializationStatus,
+    SequentialModularInitializer,
+    SingleControlVolumeUnitInitializer,
+)
+from idaes.core.util.exceptions import ConfigurationError, InitializationError
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.properties.modular_properties.base.generic_property import (
+    GenericParameterBlock,
+)
+from idaes.models.properties.modular_properties.examples.BT_ideal import (
+    configuration,
+)
+from idaes.models.unit_models import Heater
+
+
+@declare_process_block_class("ToyUnit")
+class ToyUnitData(UnitModelBlockData):
+    """
+    Unit with outlet = gain * (inlet + recycle), which can be initialized
+    without a solver.
+    """
+
+    default_initializer = BlockTriangularizationInitializer
+
+    CONFIG = UnitModelBlockData.CONFIG()
+    CONFIG.declare("gain", ConfigValue(default=1.0))
+
+    def build(self):
+        super().build()
+        self.x_in = Var(initialize=0)
+        self.x_rec = Var(initialize=0)
+        self.x_out = Var(initialize=0)
+        self.inlet = Port(initialize={"x": self.x_in})
+        self.recycle_inlet = Port(initialize={"x": self.x_rec})
+        self.outlet = Port(initialize={"x": self.x_out})
+        self.eq_out = Constraint(
+            expr=self.x_out == self.config.gain * (self.x_in + self.x_rec)
+        )
+
+
+def build_flowsheet():
+    """
+    A -> B -> C -> D -> B (recycle)
+              C -> E
+    A -> F
+    G (not connected)
+    """
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    for name, gain in [("A", 1), ("B", 1), ("C", 0.5), ("D", 0.5)]:
+        m.fs.add_component(name, ToyUnit(gain=gain))
+    for name, gain in [("E", 2), ("F", 3), ("G", 1)]:
+        m.fs.add_component(name, ToyUnit(gain=gain))
+
+    m.fs.a1 = Arc(source=m.fs.A.outlet, destination=m.fs.B.inlet)
+    m.fs.a2 = Arc(source=m.fs.B.outlet, destination=m.fs.C.inlet)
+    m.fs.a3 = Arc(source=m.fs.C.outlet, destination=m.fs.D.inlet)
+    m.fs.a4 = Arc(source=m.fs.D.outlet, destination=m.fs.B.recycle_inlet)
+    m.fs.a5 = Arc(source=m.fs.C.outlet, destination=m.fs.E.inlet)
+    m.fs.a6 = Arc(source=m.fs.A.outlet, destination=m.fs.F.inlet)
+    TransformationFactory("network.expand_arcs").apply_to(m.fs)
+
+    m.fs.A.x_in.fix(1)
+    m.fs.G.x_in.fix(2)
+    for u in ["A", "C", "D", "E", "F", "G"]:
+        m.fs.component(u).x_rec.fix(0)
+    return m
+
+
+def check_solution(m):
+    assert value(m.fs.B.x_out) == pytest.approx(4 / 3, abs=1e-5)
+    assert value(m.fs.E.x_out) == pytest.approx(4 / 3, abs=1e-5)
+    assert value(m.fs.F.x_out) == pytest.approx(3)
+    assert value(m.fs.G.x_out) == pytest.approx(2)
+
+
+@pytest.mark.unit
+def test_config():
+    initializer = SequentialModularInitializer()
+    assert initializer.config.tear_set is None
+    assert initializer.config.tear_method == "heuristic"
+    assert initializer.config.iteration_limit == 20
+    assert initializer.config.tear_tolerance == 1e-5
+    assert initializer.config.tear_tolerance_type == "abs"
+    assert initializer.config.n_workers == 1
+    assert initializer.config.model_builder is None
+
+
+@pytest.mark.unit
+def test_graph():
+    m = build_flowsheet()
+    initializer = SequentialModularInitializer()
+    graph = initializer.unit_graph(m.fs)
+    assert graph.number_of_nodes() == 7
+    assert graph.number_of_edges() == 6
+
+    tear_set = initializer.select_tear_set(graph)
+    assert len(tear_set) == 1
+    assert tear_set[0] in (m.fs.a2, m.fs.a3, m.fs.a4)
+
+    stages = initializer.calculation_stages(graph, [m.fs.a4])
+    fs = m.fs
+    assert [set(s) for s in stages] == [
+        {fs.A, fs.G},
+        {fs.B, fs.F},
+        {fs.C},
+        {fs.D, fs.E},
+    ]
+
+    with pytest.raises(ConfigurationError, match="does not break all recycle"):
+        initializer.calculation_stages(graph, [m.fs.a5])
+
+
+@pytest.mark.unit
+def test_tear_set_components():
+    m = build_trains(n_trains=3, n_units=4)
+    m.fs.G = ToyUnit(gain=0.5)
+    m.fs.g = Arc(source=m.fs.G.outlet, destination=m.fs.G.recycle_inlet)
+    TransformationFactory("network.expand_arcs").apply_to(m.fs)
+
+    initializer = SequentialModularInitializer()
+    tear_set = initializer.select_tear_set(initializer.unit_graph(m.fs))
+    # one tear in each train and the recycle of G to itself
+    assert len(tear_set) == 4
+    assert m.fs.g in tear_set
+
+
+@pytest.mark.unit
+def test_no_recycle():
+    m = build_flowsheet()
+    m.fs.a4.expanded_block.deactivate()
+    m.fs.del_component(m.fs.a4)
+    m.fs.B.x_rec.fix(0)
+
+    initializer = SequentialModularInitializer()
+    assert initializer.select_tear_set(initializer.unit_graph(m.fs)) == []
+    assert initializer.initialize(m.fs) == InitializationStatus.Ok
+    assert value(m.fs.E.x_out) == pytest.approx(1)
+    # one pass, each unit initialized once
+    assert len(initializer.unit_history) == 7
+    assert initializer.tear_history == []
+
+
+@pytest.mark.unit
+def test_initialize():
+    m = build_flowsheet()
+    initializer = SequentialModularInitializer(tear_set=[m.fs.a4])
+    assert initializer.initialize(m.fs) == InitializationStatus.Ok
+    check_solution(m)
+    # inlet states are not left fixed
+    assert not m.fs.B.x_in.fixed
+
+    history = initializer.history_table()
+    assert set(history["status"]) == {"Ok"}
+    assert set(history["process"]) == {"main"}
+    assert (history["time"] >= 0).all()
+    counts = history.groupby("unit")["pass"].count()
+    n_passes = len(initializer.tear_history)
+    # units which do not depend on the tear stream are initialized once
+    assert counts["fs.A"] == counts["fs.F"] == counts["fs.G"] == 1
+    assert counts["fs.B"] == counts["fs.E"] == n_passes
+    assert initializer.tear_history[-1] <= 1e-5
+    # residual is reduced by a factor of 4 in each pass
+    assert initializer.tear_history[1] == pytest.approx(initializer.tear_history[0] / 4)
+
+    summary = initializer.summary[m.fs]
+    assert summary["tear_set"] == [m.fs.a4]
+    assert summary["unit_history"] is initializer.unit_history
+
+
+@pytest.mark.unit
+def test_not_converged():
+    m = build_flowsheet()
+    initializer = SequentialModularInitializer(iteration_limit=2)
+    with pytest.raises(InitializationError):
+        initializer.initialize(m.fs)
+    assert len(initializer.tear_history) == 2
+
+
+@pytest.mark.unit
+def test_tolerance_type():
+    m = build_flowsheet()
+    initializer = SequentialModularInitializer(
+        tear_set=[m.fs.a4], tear_tolerance=1e-8, tear_tolerance_type="rel"
+    )
+    initializer.initialize(m.fs)
+    assert initializer.tear_history[-1] <= 1e-8
+    assert value(m.fs.B.x_out) == pytest.approx(4 / 3, rel=1e-7)
+
+
+@pytest.mark.unit
+def test_workers_need_builder():
+    m = build_flowsheet()
+    initializer = SequentialModularInitializer(n_workers=2)
+    with pytest.raises(ConfigurationError, match="model_builder must be provided"):
+        initializer.initialize(m.fs)
+
+
+@pytest.mark.component
+def test_initialize_workers():
+    m = build_flowsheet()
+    initializer = SequentialModularInitializer(
+        tear_set=[m.fs.a4], n_workers=2, model_builder=build_flowsheet
+    )
+    assert initializer.initialize(m.fs) == InitializationStatus.Ok
+    check_solution(m)
+
+    history = initializer.history_table()
+    first = history[history["pass"] == 0].set_index("unit")["process"]
+    # units in stages with more than one unit are initialized in the workers
+    assert first["fs.A"].startswith("worker")
+    assert first["fs.F"].startswith("worker")
+    assert first["fs.C"] == "main"
+
+
+@pytest.mark.unit
+def test_unit_initializers():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.props = GenericParameterBlock(**configuration)
+    m.fs.H1 = Heater(property_package=m.fs.props)
+    m.fs.H2 = Heater(property_package=m.fs.props)
+    m.fs.s = Arc(source=m.fs.H1.outlet, destination=m.fs.H2.inlet)
+    TransformationFactory("network.expand_arcs").apply_to(m.fs)
+
+    initializer = SequentialModularInitializer()
+    graph = initializer.unit_graph(m.fs)
+    assert initializer.calculation_stages(graph, []) == [[m.fs.H1], [m.fs.H2]]
+    assert isinstance(
+        initializer.get_submodel_initializer(m.fs.H1),
+        SingleControlVolumeUnitInitializer,
+    )
+
+
+def build_trains(n_trains=4, n_units=10):
+    """Parallel trains of units, each with a recycle from its last unit"""
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    for t in range(n_trains):
+        units = [ToyUnit(gain=0.9) for _ in range(n_units)]
+        for i, u in enumerate(units):
+            m.fs.add_component(f"U{t}_{i}", u)
+            if i > 0:
+                m.fs.add_component(
+                    f"s{t}_{i}", Arc(source=units[i - 1].outlet, destination=u.inlet)
+                )
+            else:
+                u.x_in.fix(1)
+            u.x_rec.fix(0)
+        units[0].x_rec.unfix()
+        m.fs.add_component(
+            f"r{t}", Arc(source=units[-1].outlet, destination=units[0].recycle_inlet)
+        )
+    TransformationFactory("network.expand_arcs").apply_to(m.fs)
+    return m
+
+
+@pytest.mark.performance
+class TestSequentialModularPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_trains()
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        for n_workers in (1, 4):
+            m = build_trains()
+            initializer = SequentialModularInitializer(
+                n_workers=n_workers, model_builder=build_trains
+            )
+            timer.tic(None)
+            initializer.initialize(m.fs)
+            self.recordData(
+                f"initialize 40 units ({n_workers} workers)", timer.toc(None)
+            )
+            self.recordData(
+                f"unit initializations ({n_workers} workers)",
+                len(initializer.unit_history),
+            )
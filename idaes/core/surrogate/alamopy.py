@@ -31,6 +31,7 @@ from pyomo.common.fileutils import Executable
 from pyomo.common.tempfiles import TempfileManager
 
 from idaes.core.surrogate.base.surrogate_base import SurrogateTrainer, SurrogateBase
+from idaes.core.surrogate.base.prediction_cache import cached_evaluation
 from idaes.core.util.exceptions import ConfigurationError
 import idaes.logger as idaeslog
 
@@ -1209,6 +1210,7 @@ class AlamoSurrogate(SurrogateBase):
         self._surrogate_expressions = surrogate_expressions
         self._fcn = None
 
+    @cached_evaluation
     def evaluate_surrogate(self, inputs):
         """
         Method to evaluate the ALAMO surrogate model at a set of user provided values.
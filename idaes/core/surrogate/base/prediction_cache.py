@@ -0,0 +1,159 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Bounded cache of surrogate predictions keyed on quantized input vectors.
+"""
+from collections import OrderedDict, namedtuple
+import functools
+
+import numpy as np
+import pandas as pd
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class PredictionCache(object):
+    """
+    Least-recently-used cache of surrogate outputs.
+
+    Input vectors are quantized to a grid with spacing ``tolerance`` (i.e.
+    rounded to the nearest multiple of the tolerance), so inputs that differ
+    by less than about half the tolerance share a cache entry. The cached
+    outputs are those computed for the first input vector seen for each entry.
+    """
+
+    def __init__(self, maxsize=100000, tolerance=1e-10):
+        """
+        Args:
+           maxsize: int
+              Maximum number of input vectors to keep in the cache. The least
+              recently used entries are discarded first.
+           tolerance: float
+              Spacing of the grid used to quantize the inputs
+        """
+        if maxsize is None or int(maxsize) < 1:
+            raise ValueError("PredictionCache maxsize must be a positive integer.")
+        if tolerance is None or not tolerance > 0:
+            raise ValueError("PredictionCache tolerance must be positive.")
+        self._maxsize = int(maxsize)
+        self._tolerance = float(tolerance)
+        self._data = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self):
+        """
+        Maximum number of entries in the cache
+        """
+        return self._maxsize
+
+    @property
+    def tolerance(self):
+        """
+        Spacing of the grid used to quantize the inputs
+        """
+        return self._tolerance
+
+    def cache_info(self):
+        """
+        Return the cache statistics
+
+        Returns: CacheInfo namedtuple (hits, misses, maxsize, currsize)
+        """
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._data))
+
+    def clear(self):
+        """
+        Remove all entries from the cache and reset the statistics
+        """
+        self._data.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def _keys(self, x):
+        # adding 0.0 maps -0.0 to 0.0 so both give the same key
+        q = np.round(x / self._tolerance) + 0.0
+        return [row.tobytes() for row in q]
+
+    def evaluate(self, inputs, evaluate, input_labels, output_labels):
+        """
+        Evaluate a surrogate for the rows of inputs, calling evaluate only for
+        the input vectors that are not in the cache.
+
+        Args:
+           inputs: pandas DataFrame
+              Input values (with a column for each input label)
+           evaluate: callable
+              Function taking a DataFrame of input values and returning a
+              DataFrame of output values (e.g. an uncached evaluate_surrogate)
+           input_labels: list
+              The ordered input labels of the surrogate
+           output_labels: list
+              The ordered output labels of the surrogate
+
+        Returns: pandas DataFrame of outputs with the same index as inputs
+        """
+        x = inputs[input_labels].to_numpy(dtype=float)
+        keys = self._keys(x)
+        outputs = np.empty((x.shape[0], len(output_labels)))
+
+        # rows which need to be evaluated, one per distinct missing key
+        missing = OrderedDict()
+        for i, k in enumerate(keys):
+            y = self._data.get(k)
+            if y is not None:
+                self._data.move_to_end(k)
+                outputs[i, :] = y
+                self._hits += 1
+            elif k in missing:
+                missing[k].append(i)
+                self._hits += 1
+            else:
+                missing[k] = [i]
+                self._misses += 1
+
+        if missing:
+            rows = [idx[0] for idx in missing.values()]
+            new = evaluate(pd.DataFrame(x[rows, :], columns=input_labels))
+            new = new[output_labels].to_numpy(dtype=float)
+            for (k, idx), y in zip(missing.items(), new):
+                outputs[idx, :] = y
+                self._data[k] = y.copy()
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+        return pd.DataFrame(data=outputs, index=inputs.index, columns=output_labels)
+
+
+def cached_evaluation(evaluate_surrogate):
+    """
+    Decorator for the evaluate_surrogate method of classes derived from
+    SurrogateBase. If a prediction cache has been enabled on the surrogate
+    (see :meth:`SurrogateBase.enable_prediction_cache`), the decorated method
+    is only called for input vectors that are not already cached.
+    """
+
+    @functools.wraps(evaluate_surrogate)
+    def wrapper(self, inputs):
+        cache = self._prediction_cache
+        if cache is None:
+            return evaluate_surrogate(self, inputs)
+        return cache.evaluate(
+            inputs,
+            lambda df: evaluate_surrogate(self, df),
+            self.input_labels(),
+            self.output_labels(),
+        )
+
+    return wrapper
@@ -13,7 +13,14 @@
 """
 Common Surrogate interface for IDAES.
 """
-from pyomo.common.config import ConfigBlock
+from pyomo.common.config import ConfigBlock, ConfigValue, PositiveInt
+
+from idaes.core.surrogate.base.prediction_cache import PredictionCache
+from idaes.core.surrogate.sampling.data_stream import (
+    DataStream,
+    RunningStatistics,
+    reservoir_sample,
+)
 
 
 class SurrogateTrainer(object):
@@ -22,6 +29,35 @@ class SurrogateTrainer(object):
     """
 
     CONFIG = ConfigBlock()
+    CONFIG.declare(
+        "max_training_samples",
+        ConfigValue(
+            default=None,
+            domain=PositiveInt,
+            description="Maximum number of rows to load from a training DataStream",
+            doc="""If the training data is provided as a DataStream, at most this
+many rows are loaded for training, drawn uniformly at random in a single pass
+over the stream (reservoir sampling). If None, all rows are loaded. Ignored for
+DataFrames.""",
+        ),
+    )
+    CONFIG.declare(
+        "max_validation_samples",
+        ConfigValue(
+            default=None,
+            domain=PositiveInt,
+            description="Maximum number of rows to load from a validation DataStream",
+            doc="""As max_training_samples, but for the validation data.""",
+        ),
+    )
+    CONFIG.declare(
+        "sampling_seed",
+        ConfigValue(
+            default=None,
+            domain=int,
+            description="Seed for sampling rows from DataStreams",
+        ),
+    )
 
     def __init__(
         self,
@@ -40,10 +76,13 @@ class SurrogateTrainer(object):
               list of labels corresponding to the inputs (in order)
            output_labels: list
               list of labels corresponding to the outputs (in order)
-           training_dataframe: pandas DataFrame
+           training_dataframe: pandas DataFrame or DataStream
               Pandas DataFrame corresponding to the training data. Columns must
-              include all the labels in input_labels and output_labels
-           validation_dataframe: pandas DataFrame or None
+              include all the labels in input_labels and output_labels. If a
+              DataStream is given, the input and output columns are loaded
+              (subject to the max_training_samples setting) after checking
+              the columns and computing the input bounds from the whole stream
+           validation_dataframe: pandas DataFrame, DataStream or None
              Pandas DateFrame corresponding to the validation data. Columns
              must include all the labels in input_labels and output_labels. If
              None is passed, then no validation data will be used. Some
@@ -89,30 +128,35 @@ class SurrogateTrainer(object):
         self._training_dataframe = training_dataframe
         self._validation_dataframe = validation_dataframe
 
+        training_columns = _data_columns(training_dataframe)
+        validation_columns = None
+        if validation_dataframe is not None:
+            validation_columns = _data_columns(validation_dataframe)
+
         # check that all input labels and output labels are in the dataframes
-        diff = set(self._input_labels) - set(self._training_dataframe.columns)
+        diff = set(self._input_labels) - set(training_columns)
         if diff:
             raise ValueError(
                 "The following input labels were not found in "
                 "the training data columns: {}.".format(diff)
             )
-        if self._validation_dataframe is not None:
-            diff = set(self._input_labels) - set(self._validation_dataframe.columns)
+        if validation_columns is not None:
+            diff = set(self._input_labels) - set(validation_columns)
             if diff:
                 raise ValueError(
                     "The following input labels were not found in "
                     "the validation data columns: {}.".format(diff)
                 )
 
-        diff = set(self._output_labels) - set(self._training_dataframe.columns)
+        diff = set(self._output_labels) - set(training_columns)
         if diff:
             raise ValueError(
                 "The following output labels were not found in "
                 "the training data columns: {}.".format(diff)
             )
 
-        if self._validation_dataframe is not None:
-            diff = set(self._output_labels) - set(self._validation_dataframe.columns)
+        if validation_columns is not None:
+            diff = set(self._output_labels) - set(validation_columns)
             if diff:
                 raise ValueError(
                     "The following output labels were not found in "
@@ -130,12 +174,42 @@ class SurrogateTrainer(object):
                         sorted(input_bounds.keys()), sorted(input_labels)
                     )
                 )
+        elif isinstance(training_dataframe, DataStream):
+            # get the bounds from a single pass over the whole stream
+            stats = RunningStatistics.from_stream(
+                training_dataframe, columns=self._input_labels
+            )
+            mx = stats.max().to_dict()
+            mn = stats.min().to_dict()
+            self._input_bounds = {k: (mn[k], mx[k]) for k in self._input_labels}
         else:
             # get the bounds from the data
             mx = self._training_dataframe.max().to_dict()
             mn = self._training_dataframe.min().to_dict()
             self._input_bounds = {k: (mn[k], mx[k]) for k in self._input_labels}
 
+        # load the training and validation data from streams
+        if isinstance(training_dataframe, DataStream):
+            self._training_dataframe = self._load_stream(
+                training_dataframe, self.config.max_training_samples
+            )
+        if isinstance(validation_dataframe, DataStream):
+            self._validation_dataframe = self._load_stream(
+                validation_dataframe, self.config.max_validation_samples
+            )
+
+    def _load_stream(self, stream, max_samples):
+        """
+        Load the input and output columns of a DataStream into a DataFrame,
+        sampling at most max_samples rows (all rows if max_samples is None).
+        """
+        columns = self._input_labels + self._output_labels
+        if max_samples is None:
+            return stream.to_dataframe(columns=columns)
+        return reservoir_sample(
+            stream, max_samples, columns=columns, seed=self.config.sampling_seed
+        )
+
     def n_inputs(self):
         """
         The number of inputs for the surrogate
@@ -199,11 +273,23 @@ class SurrogateTrainer(object):
         )
 
 
+def _data_columns(data):
+    """
+    Return the column labels of a DataFrame or DataStream
+    """
+    if isinstance(data, DataStream):
+        return data.columns()
+    return data.columns
+
+
 class SurrogateBase:
     """
     Base class for Surrogate object.
     """
 
+    # optional cache of evaluate_surrogate results (not saved with the model)
+    _prediction_cache = None
+
     def __init__(self, input_labels=None, output_labels=None, input_bounds=None):
         """
         Base class for standard IDAES Surrogate object. This class is
@@ -330,6 +416,43 @@ class SurrogateBase:
             "SurrogateModel class has not implemented an evaluate_surrogate " "method."
         )
 
+    def enable_prediction_cache(self, maxsize=100000, tolerance=1e-10):
+        """
+        Cache the results of evaluate_surrogate, so that repeated evaluations
+        at the same inputs (e.g. in parameter sweeps or Monte Carlo studies)
+        are not recomputed. Derived classes opt in by decorating their
+        evaluate_surrogate method with
+        :func:`idaes.core.surrogate.base.prediction_cache.cached_evaluation`.
+
+        The cache is held in memory only and is not saved with the surrogate.
+
+        Args:
+           maxsize: int
+              Maximum number of input vectors to keep in the cache. The least
+              recently used entries are discarded first.
+           tolerance: float
+              Input values are rounded to the nearest multiple of tolerance
+              before looking them up in the cache.
+        """
+        self._prediction_cache = PredictionCache(maxsize=maxsize, tolerance=tolerance)
+
+    def disable_prediction_cache(self):
+        """
+        Remove the prediction cache (if any) from this surrogate
+        """
+        self._prediction_cache = None
+
+    def prediction_cache_info(self):
+        """
+        Return the statistics of the prediction cache
+
+        Returns: CacheInfo namedtuple (hits, misses, maxsize, currsize), or
+           None if the cache is not enabled
+        """
+        if self._prediction_cache is None:
+            return None
+        return self._prediction_cache.cache_info()
+
     def save_to_file(self, filename, overwrite=False):
         """
         This method saves an instance of the surrogate to a file so the model
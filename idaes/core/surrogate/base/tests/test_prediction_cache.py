@@ -0,0 +1,130 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for the surrogate prediction cache
+"""
+from io import StringIO
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from idaes.core.surrogate.base.prediction_cache import PredictionCache, CacheInfo
+from idaes.core.surrogate import AlamoSurrogate
+
+
+class CountingEvaluator:
+    def __init__(self):
+        self.n_rows = 0
+
+    def __call__(self, df):
+        self.n_rows += len(df)
+        return pd.DataFrame({"z1": df["x1"] + 2 * df["x2"]}, index=df.index)
+
+
+class TestPredictionCache:
+    @pytest.mark.unit
+    def test_bad_args(self):
+        with pytest.raises(ValueError, match="maxsize must be a positive integer"):
+            PredictionCache(maxsize=0)
+        with pytest.raises(ValueError, match="tolerance must be positive"):
+            PredictionCache(tolerance=0)
+
+    @pytest.mark.unit
+    def test_evaluate(self):
+        cache = PredictionCache(maxsize=10, tolerance=1e-6)
+        f = CountingEvaluator()
+        df = pd.DataFrame(
+            {"x1": [1.0, 2.0, 1.0, 3.0], "x2": [0.0, 1.0, 0.0, -1.0]},
+            index=[10, 11, 12, 13],
+        )
+
+        out = cache.evaluate(df, f, ["x1", "x2"], ["z1"])
+        assert list(out.index) == [10, 11, 12, 13]
+        np.testing.assert_allclose(out["z1"], [1.0, 4.0, 1.0, 1.0])
+        # the duplicate row is only evaluated once
+        assert f.n_rows == 3
+        assert cache.cache_info() == CacheInfo(1, 3, 10, 3)
+
+        # values within the tolerance hit the cache
+        df2 = pd.DataFrame({"x1": [1.0 + 1e-8, 4.0], "x2": [-1e-8, 0.0]})
+        out = cache.evaluate(df2, f, ["x1", "x2"], ["z1"])
+        np.testing.assert_allclose(out["z1"], [1.0, 4.0])
+        assert f.n_rows == 4
+        assert cache.cache_info() == CacheInfo(2, 4, 10, 4)
+
+        cache.clear()
+        assert cache.cache_info() == CacheInfo(0, 0, 10, 0)
+
+    @pytest.mark.unit
+    def test_lru_eviction(self):
+        cache = PredictionCache(maxsize=2)
+        f = CountingEvaluator()
+
+        def point(x1):
+            return pd.DataFrame({"x1": [x1], "x2": [0.0]})
+
+        cache.evaluate(point(1.0), f, ["x1", "x2"], ["z1"])
+        cache.evaluate(point(2.0), f, ["x1", "x2"], ["z1"])
+        # touch 1.0 so 2.0 becomes the least recently used entry
+        cache.evaluate(point(1.0), f, ["x1", "x2"], ["z1"])
+        cache.evaluate(point(3.0), f, ["x1", "x2"], ["z1"])
+        assert cache.cache_info().currsize == 2
+        assert f.n_rows == 3
+
+        cache.evaluate(point(1.0), f, ["x1", "x2"], ["z1"])
+        assert f.n_rows == 3
+        cache.evaluate(point(2.0), f, ["x1", "x2"], ["z1"])
+        assert f.n_rows == 4
+
+
+class TestSurrogatePredictionCache:
+    @pytest.fixture
+    def surrogate(self):
+        return AlamoSurrogate(
+            surrogate_expressions={"z1": "z1 == 2*x1 + x2"},
+            input_labels=["x1", "x2"],
+            output_labels=["z1"],
+            input_bounds={"x1": (0, 5), "x2": (0, 10)},
+        )
+
+    @pytest.mark.unit
+    def test_enable_disable(self, surrogate):
+        assert surrogate.prediction_cache_info() is None
+
+        surrogate.enable_prediction_cache(maxsize=5)
+        df = pd.DataFrame({"x1": [1.0, 2.0, 1.0], "x2": [3.0, 4.0, 3.0]})
+        out = surrogate.evaluate_surrogate(df)
+        np.testing.assert_allclose(out["z1"], [5.0, 8.0, 5.0])
+        out = surrogate.evaluate_surrogate(df)
+        np.testing.assert_allclose(out["z1"], [5.0, 8.0, 5.0])
+        assert surrogate.prediction_cache_info() == CacheInfo(4, 2, 5, 2)
+
+        surrogate.disable_prediction_cache()
+        assert surrogate.prediction_cache_info() is None
+        out = surrogate.evaluate_surrogate(df)
+        np.testing.assert_allclose(out["z1"], [5.0, 8.0, 5.0])
+
+    @pytest.mark.unit
+    def test_cache_not_saved(self, surrogate):
+        stream = StringIO()
+        surrogate.save(stream)
+
+        surrogate.enable_prediction_cache()
+        surrogate.evaluate_surrogate(pd.DataFrame({"x1": [1.0], "x2": [3.0]}))
+        cached_stream = StringIO()
+        surrogate.save(cached_stream)
+        assert cached_stream.getvalue() == stream.getvalue()
+
+        loaded = AlamoSurrogate.load(StringIO(cached_stream.getvalue()))
+        assert loaded.prediction_cache_info() is None
@@ -18,6 +18,7 @@ import pytest
 import pandas as pd
 
 from idaes.core.surrogate.base.surrogate_base import SurrogateTrainer, SurrogateBase
+from idaes.core.surrogate.sampling.data_stream import DataFrameStream
 
 tdata = {"x1": [1, 2, 3, 4], "x2": [10, 20, 30, 40], "z1": [11, 22, 33, 44]}
 training_data = pd.DataFrame.from_dict(tdata)
@@ -196,6 +197,53 @@ class TestSurrogateTrainer:
 
         assert trainer._input_bounds == {"x1": (0, 5), "x2": (0, 50)}
 
+    @pytest.mark.unit
+    def test_surrogate_trainer_stream(self):
+        trainer = SurrogateTrainer(
+            input_labels=["x1", "x2"],
+            output_labels=["z1"],
+            training_dataframe=DataFrameStream(training_data, chunksize=3),
+            validation_dataframe=DataFrameStream(validation_data),
+        )
+
+        assert trainer._input_bounds == {"x1": (1, 4), "x2": (10, 40)}
+        pd.testing.assert_frame_equal(
+            trainer._training_dataframe, training_data, check_dtype=False
+        )
+        pd.testing.assert_frame_equal(
+            trainer._validation_dataframe, validation_data, check_dtype=False
+        )
+
+    @pytest.mark.unit
+    def test_surrogate_trainer_stream_max_samples(self):
+        trainer = SurrogateTrainer(
+            input_labels=["x1", "x2"],
+            output_labels=["z1"],
+            training_dataframe=DataFrameStream(training_data, chunksize=3),
+            max_training_samples=2,
+            sampling_seed=42,
+        )
+
+        # bounds are computed from the whole stream, not the sample
+        assert trainer._input_bounds == {"x1": (1, 4), "x2": (10, 40)}
+        assert len(trainer._training_dataframe) == 2
+        assert list(trainer._training_dataframe.columns) == ["x1", "x2", "z1"]
+        for _, row in trainer._training_dataframe.iterrows():
+            assert row["z1"] == row["x1"] + row["x2"]
+
+    @pytest.mark.unit
+    def test_surrogate_trainer_stream_label_mismatch(self):
+        with pytest.raises(
+            ValueError,
+            match=r"The following output labels were not found in the training "
+            r"data columns: {'z2'}.",
+        ):
+            SurrogateTrainer(
+                input_labels=["x1", "x2"],
+                output_labels=["z2"],
+                training_dataframe=DataFrameStream(training_data),
+            )
+
     @pytest.mark.unit
     def test_n_inputs(self, trainer):
         assert trainer.n_inputs() == 2
@@ -0,0 +1,379 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+NumPy-only evaluation of dense (fully connected) neural networks.
+
+A trained Keras Sequential model can be exported to a DenseNetworkSurrogate
+(see KerasSurrogate.to_dense_network_surrogate), which can be saved to JSON and
+evaluated in batches without importing TensorFlow.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+import numpy as np
+import pandas as pd
+
+from idaes.core.surrogate.base.surrogate_base import SurrogateBase
+from idaes.core.surrogate.base.prediction_cache import cached_evaluation
+from idaes.core.surrogate.sampling.scaling import OffsetScaler
+
+
+def _linear(x):
+    return x
+
+
+def _relu(x):
+    return np.maximum(x, 0.0)
+
+
+def _sigmoid(x):
+    # equivalent to 1/(1 + exp(-x)), but does not overflow for large |x|
+    return np.exp(-np.logaddexp(0.0, -x))
+
+
+def _softplus(x):
+    return np.logaddexp(0.0, x)
+
+
+_activations = {
+    "linear": _linear,
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "softplus": _softplus,
+}
+
+
+class DenseNetworkSurrogate(SurrogateBase):
+    def __init__(
+        self,
+        weights,
+        biases,
+        activations,
+        input_labels,
+        output_labels,
+        input_bounds,
+        input_scaler=None,
+        output_scaler=None,
+        batch_size=None,
+        n_threads=1,
+    ):
+        """
+        Surrogate object for a dense feed-forward neural network that is
+        evaluated with NumPy only. Each layer computes
+        ``activation(x @ weights + biases)``.
+
+        This object does not support populating a Pyomo Block. It is intended
+        for fast evaluation of a trained network (e.g. in post-processing or
+        parameter sweeps); use KerasSurrogate to embed the network in a model.
+
+        Args:
+           weights: list of 2-D arrays
+              The weight matrix of each layer, with shape (n_in, n_out)
+           biases: list of 1-D arrays
+              The bias vector of each layer, with length n_out
+           activations: list of str
+              The activation function of each layer. Supported activations
+              are linear, relu, sigmoid, tanh and softplus.
+           input_labels: list of str
+              The ordered list of labels corresponding to the network inputs
+           output_labels: list of str
+              The ordered list of labels corresponding to the network outputs
+           input_bounds: None of dict of tuples
+              Keys correspond to each of the input labels and values are the tuples of
+              bounds (lb, ub)
+           input_scaler: None or OffsetScaler
+              The scaler to be used for the inputs. If None, then no scaler is used
+           output_scaler: None of OffsetScaler
+              The scaler to be used for the outputs. If None, then no scaler is used
+           batch_size: None or int
+              Maximum number of rows passed through the network at once. If
+              None, all rows are evaluated in a single batch.
+           n_threads: int
+              Number of threads used to evaluate the batches
+        """
+        super().__init__(
+            input_labels=input_labels,
+            output_labels=output_labels,
+            input_bounds=input_bounds,
+        )
+
+        if not len(weights) == len(biases) == len(activations):
+            raise ValueError(
+                "DenseNetworkSurrogate requires the same number of weights, "
+                "biases and activations (one of each per layer)."
+            )
+        if len(weights) == 0:
+            raise ValueError("DenseNetworkSurrogate requires at least one layer.")
+
+        self._weights = [np.array(w, dtype=float, ndmin=2) for w in weights]
+        self._biases = [np.array(b, dtype=float).reshape(-1) for b in biases]
+        self._activations = list(activations)
+
+        n_in = len(self._input_labels)
+        for i, (w, b, a) in enumerate(
+            zip(self._weights, self._biases, self._activations)
+        ):
+            if a not in _activations:
+                raise ValueError(
+                    "Unsupported activation function '{}' in layer {}. Supported "
+                    "activations are: {}.".format(a, i, ", ".join(_activations))
+                )
+            if w.shape[0] != n_in or b.shape[0] != w.shape[1]:
+                raise ValueError(
+                    "The weights and biases of layer {} have shapes {} and {}, "
+                    "which do not match the {} inputs to the layer.".format(
+                        i, w.shape, b.shape, n_in
+                    )
+                )
+            n_in = w.shape[1]
+        if n_in != len(self._output_labels):
+            raise ValueError(
+                "The last layer of the network has {} outputs, but {} output "
+                "labels were provided.".format(n_in, len(self._output_labels))
+            )
+
+        for scaler, labels, kind in (
+            (input_scaler, self._input_labels, "input"),
+            (output_scaler, self._output_labels, "output"),
+        ):
+            if scaler is None:
+                continue
+            if not isinstance(scaler, OffsetScaler):
+                raise NotImplementedError(
+                    "DenseNetworkSurrogate only supports the OffsetScaler."
+                )
+            if scaler.expected_columns() != labels:
+                raise ValueError(
+                    "DenseNetworkSurrogate created with {0}_labels that do not "
+                    "match the expected columns in the {0}_scaler.\n"
+                    "{0}_labels={1}\n"
+                    "{0}_scaler.expected_columns()={2}".format(
+                        kind, labels, scaler.expected_columns()
+                    )
+                )
+        self._input_scaler = input_scaler
+        self._output_scaler = output_scaler
+
+        self.batch_size = batch_size
+        self.n_threads = n_threads
+
+    @property
+    def batch_size(self):
+        """
+        Maximum number of rows passed through the network at once (None for
+        no limit)
+        """
+        return self._batch_size
+
+    @batch_size.setter
+    def batch_size(self, value):
+        if value is not None and int(value) < 1:
+            raise ValueError("batch_size must be a positive integer or None.")
+        self._batch_size = None if value is None else int(value)
+
+    @property
+    def n_threads(self):
+        """
+        Number of threads used to evaluate the batches
+        """
+        return self._n_threads
+
+    @n_threads.setter
+    def n_threads(self, value):
+        if int(value) < 1:
+            raise ValueError("n_threads must be a positive integer.")
+        self._n_threads = int(value)
+
+    def n_layers(self):
+        """
+        Return the number of layers in the network
+        """
+        return len(self._weights)
+
+    def _forward(self, x):
+        for w, b, a in zip(self._weights, self._biases, self._activations):
+            x = _activations[a](x @ w + b)
+        return x
+
+    def predict(self, x):
+        """
+        Evaluate the network on an array of (scaled) inputs, splitting the rows
+        into batches of at most batch_size rows.
+
+        Args:
+           x: 2-D numpy array
+              Scaled input values, with one row per point
+
+        Returns: 2-D numpy array of scaled output values
+        """
+        x = np.asarray(x, dtype=float)
+        n = x.shape[0]
+        if self._batch_size is None or n <= self._batch_size:
+            return self._forward(x)
+
+        batches = [x[i : i + self._batch_size] for i in range(0, n, self._batch_size)]
+        if self._n_threads == 1:
+            results = [self._forward(b) for b in batches]
+        else:
+            # NumPy releases the GIL in the matrix products, so the batches
+            # are evaluated concurrently
+            with ThreadPoolExecutor(max_workers=self._n_threads) as executor:
+                results = list(executor.map(self._forward, batches))
+        return np.concatenate(results, axis=0)
+
+    @cached_evaluation
+    def evaluate_surrogate(self, inputs):
+        """
+        Method to evaluate the network at a set of input values.
+
+        Args:
+           inputs: pandas DataFrame
+              The dataframe of input values to be used in the evaluation. The
+              dataframe needs to contain a column corresponding to each of the
+              input labels.
+
+        Returns:
+            outputs: pandas DataFrame of values for all outputs evaluated at
+                the input points, with the same index as inputs.
+        """
+        x = inputs[self._input_labels]
+        if self._input_scaler is not None:
+            x = self._input_scaler.scale(x)
+        y = self.predict(x.to_numpy(dtype=float))
+
+        y = pd.DataFrame(
+            data=y, columns=self.output_labels(), index=inputs.index, dtype="float64"
+        )
+        if self._output_scaler is not None:
+            y = self._output_scaler.unscale(y)
+        return y
+
+    def to_dict(self):
+        """
+        Return a JSON-serializable dictionary describing the surrogate
+        """
+        return {
+            "layers": [
+                {"weights": w.tolist(), "biases": b.tolist(), "activation": a}
+                for w, b, a in zip(self._weights, self._biases, self._activations)
+            ],
+            "input_scaler": None
+            if self._input_scaler is None
+            else self._input_scaler.to_dict(),
+            "output_scaler": None
+            if self._output_scaler is None
+            else self._output_scaler.to_dict(),
+            "input_labels": self.input_labels(),
+            "output_labels": self.output_labels(),
+            "input_bounds": self.input_bounds(),
+            "batch_size": self._batch_size,
+            "n_threads": self._n_threads,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        """
+        Create a surrogate from a dictionary created by to_dict
+
+        Args:
+           d: dict
+              Dictionary describing the surrogate
+
+        Returns: an instance of DenseNetworkSurrogate
+        """
+        input_bounds = d["input_bounds"]
+        if input_bounds is not None:
+            input_bounds = {k: tuple(v) for k, v in input_bounds.items()}
+
+        input_scaler = None
+        if d["input_scaler"] is not None:
+            input_scaler = OffsetScaler.from_dict(d["input_scaler"])
+        output_scaler = None
+        if d["output_scaler"] is not None:
+            output_scaler = OffsetScaler.from_dict(d["output_scaler"])
+
+        return cls(
+            weights=[layer["weights"] for layer in d["layers"]],
+            biases=[layer["biases"] for layer in d["layers"]],
+            activations=[layer["activation"] for layer in d["layers"]],
+            input_labels=d["input_labels"],
+            output_labels=d["output_labels"],
+            input_bounds=input_bounds,
+            input_scaler=input_scaler,
+            output_scaler=output_scaler,
+            batch_size=d.get("batch_size"),
+            n_threads=d.get("n_threads", 1),
+        )
+
+    def save(self, strm):
+        """
+        Save an instance of this surrogate to the strm so the model can be used later.
+
+        Args:
+           strm: IO.TextIO
+              This is the python stream like a file object or StringIO that will be used
+              to serialize the surrogate object. This method writes a string
+              of json data to the stream.
+        """
+        json.dump(self.to_dict(), strm)
+
+    @classmethod
+    def load(cls, strm):
+        """
+        Create an instance of a surrogate from a stream.
+
+        Args:
+           strm: stream
+              This is the python stream containing the data required to load the surrogate.
+              This is often, but does not need to be a string of json data.
+
+        Returns: an instance of DenseNetworkSurrogate
+        """
+        return cls.from_dict(json.load(strm))
+
+
+def dense_layers_from_keras(keras_model):
+    """
+    Extract the weights, biases and activation functions of the layers of a
+    Keras Sequential model made up of Dense layers. Dropout layers are
+    ignored, as they are inactive during inference.
+
+    Args:
+       keras_model: Keras Sequential model
+
+    Returns: tuple of lists (weights, biases, activations)
+    """
+    weights = []
+    biases = []
+    activations = []
+    for layer in keras_model.layers:
+        kind = type(layer).__name__
+        if kind in ("InputLayer", "Dropout"):
+            continue
+        if kind != "Dense":
+            raise ValueError(
+                "Only Dense layers can be exported to a DenseNetworkSurrogate, "
+                "but the model contains a layer of type {}.".format(kind)
+            )
+        config = layer.get_config()
+        params = layer.get_weights()
+        w = np.asarray(params[0], dtype=float)
+        if config.get("use_bias", True):
+            b = np.asarray(params[1], dtype=float)
+        else:
+            b = np.zeros(w.shape[1])
+        weights.append(w)
+        biases.append(b)
+        activations.append(config["activation"])
+    return weights, biases, activations
@@ -27,7 +27,12 @@ import pandas as pd
 from pyomo.common.dependencies import attempt_import
 
 from idaes.core.surrogate.base.surrogate_base import SurrogateBase
+from idaes.core.surrogate.base.prediction_cache import cached_evaluation
 from idaes.core.surrogate.sampling.scaling import OffsetScaler
+from idaes.core.surrogate.dense_network_surrogate import (
+    DenseNetworkSurrogate,
+    dense_layers_from_keras,
+)
 
 keras, keras_available = attempt_import("tensorflow.keras")
 omlt, omlt_available = attempt_import("omlt")
@@ -228,6 +233,7 @@ class KerasSurrogate(SurrogateBase):
                 == block.nn.outputs[output_idx_by_label[output_label]]
             )
 
+    @cached_evaluation
     def evaluate_surrogate(self, inputs):
         """
         Method to evaluate Keras model at a set of input values.
@@ -253,6 +259,36 @@ class KerasSurrogate(SurrogateBase):
             y = self._output_scaler.unscale(y)
         return y
 
+    def to_dense_network_surrogate(self, batch_size=None, n_threads=1):
+        """
+        Export the weights, biases and scaling of the Keras model to a
+        DenseNetworkSurrogate, which is evaluated with NumPy only. The exported
+        surrogate can be saved with save_to_file and loaded without TensorFlow.
+        Only models made up of Dense (and Dropout) layers can be exported.
+
+        Args:
+           batch_size: None or int
+              Maximum number of rows passed through the network at once. If
+              None, all rows are evaluated in a single batch.
+           n_threads: int
+              Number of threads used to evaluate the batches
+
+        Returns: an instance of DenseNetworkSurrogate
+        """
+        weights, biases, activations = dense_layers_from_keras(self._keras_model)
+        return DenseNetworkSurrogate(
+            weights=weights,
+            biases=biases,
+            activations=activations,
+            input_labels=self.input_labels(),
+            output_labels=self.output_labels(),
+            input_bounds=self.input_bounds(),
+            input_scaler=self._input_scaler,
+            output_scaler=self._output_scaler,
+            batch_size=batch_size,
+            n_threads=n_threads,
+        )
+
     def save_to_folder(self, keras_folder_name):
         """
         Save the surrogate object to disk by providing the name of the
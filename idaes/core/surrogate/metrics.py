@@ -13,6 +13,10 @@
 # TODO: Missing doc strings
 # pylint: disable=missing-module-docstring
 
+import numpy as np
+
+from idaes.core.surrogate.sampling.data_stream import DataStream, RunningStatistics
+
 
 def compute_fit_metrics(surrogate, dataframe):
     """
@@ -25,14 +29,19 @@ def compute_fit_metrics(surrogate, dataframe):
     Args:
        surrogate : surrogate object (derived from SurrogateBase)
           This is the surrogate object we want to evaluate for the comparison
-       dataframe : pandas DataFrame
+       dataframe : pandas DataFrame or DataStream
           The dataframe that contains the inputs and outputs we want to use
-          in the evaluation.
+          in the evaluation. If a DataStream is given, the surrogate is
+          evaluated one chunk at a time and the metrics are accumulated in a
+          single pass.
 
     Returns:
         dict-of-dicts with outer keys representing output labels and inner keys
         representing metrics for that output.
     """
+    if isinstance(dataframe, DataStream):
+        return _compute_fit_metrics_stream(surrogate, dataframe)
+
     y = dataframe[surrogate.output_labels()]
     f = surrogate.evaluate_surrogate(dataframe)
     assert f.columns.to_list() == surrogate.output_labels()
@@ -60,3 +69,41 @@ def compute_fit_metrics(surrogate, dataframe):
         }
 
     return metrics
+
+
+def _compute_fit_metrics_stream(surrogate, stream):
+    """
+    Chunked version of compute_fit_metrics for DataStreams
+    """
+    outputs = surrogate.output_labels()
+    columns = surrogate.input_labels() + outputs
+    y_stats = RunningStatistics(outputs)
+    n = 0
+    SSE = np.zeros(len(outputs))
+    SAE = np.zeros(len(outputs))
+    maxAE = np.zeros(len(outputs))
+
+    for chunk in stream.iter_chunks(columns):
+        f = surrogate.evaluate_surrogate(chunk)
+        assert f.columns.to_list() == outputs
+        err = chunk[outputs].to_numpy(dtype=float) - f.to_numpy(dtype=float)
+        y_stats.update(chunk)
+        n += err.shape[0]
+        SSE += (err**2).sum(axis=0)
+        SAE += np.abs(err).sum(axis=0)
+        maxAE = np.maximum(maxAE, np.abs(err).max(axis=0))
+
+    SST = y_stats.sum_squared_deviations().to_numpy()
+    MSE = SSE / n
+    metrics = {}
+    for i, o in enumerate(outputs):
+        metrics[o] = {
+            "RMSE": MSE[i] ** 0.5,
+            "MSE": MSE[i],
+            "MAE": SAE[i] / n,
+            "maxAE": maxAE[i],
+            "SSE": SSE[i],
+            "R2": 1 - SSE[i] / SST[i],
+        }
+
+    return metrics
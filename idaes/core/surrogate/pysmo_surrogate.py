@@ -19,6 +19,7 @@
 # pylint: disable=protected-access
 
 # stdlib
+from enum import Enum
 import io
 import json
 from json import JSONEncoder, JSONDecodeError
@@ -28,12 +29,30 @@ from typing import Dict, Union
 # third-party
 import numpy as np
 import pandas as pd
+from scipy.sparse import coo_matrix
 
 # package
 import pyomo.core as pc
-from pyomo.environ import Constraint, sin, cos, log, exp, Set, Param
+from pyomo.environ import (
+    ConcreteModel,
+    Constraint,
+    sin,
+    cos,
+    log,
+    exp,
+    Set,
+    Param,
+    Var,
+    value,
+)
+from pyomo.core.expr.calculus.derivatives import differentiate
+from pyomo.contrib.pynumero.interfaces.external_grey_box import (
+    ExternalGreyBoxModel,
+    ExternalGreyBoxBlock,
+)
 from pyomo.common.config import ConfigValue, In, Bool, PositiveInt, PositiveFloat
 from idaes.core.surrogate.base.surrogate_base import SurrogateTrainer, SurrogateBase
+from idaes.core.surrogate.base.prediction_cache import cached_evaluation
 from idaes.core.surrogate.pysmo import (
     polynomial_regression as pr,
     radial_basis_function as rbf,
@@ -470,6 +489,198 @@ class PysmoKrigingTrainer(PysmoTrainer):
         return {"RMSE": model.training_rmse, "R2": model.training_R2}
 
 
+# Basis-function (reduced) representations of trained models
+# ------------------------------------------------------------
+
+
+class _PysmoBasisModel:
+    """
+    Dense NumPy representation of a trained RBF or Kriging model of the form
+
+        y = constant + scale * sum_i coefficients[i] * phi(xs - centres[i, :])
+
+    where xs = (x - x_min) / x_range are the scaled inputs. This is used to
+    evaluate values and analytic gradients of the model (grey-box formulation)
+    and to build the sparse formulation.
+    """
+
+    def __init__(self, model):
+        self.x_min = np.asarray(model.x_data_min, dtype=float).ravel()
+        x_range = np.asarray(model.x_data_max, dtype=float).ravel() - self.x_min
+        x_range[x_range == 0.0] = 1.0
+        self.x_range = x_range
+        if isinstance(model, krg.KrigingModel):
+            self.kind = "kriging"
+            self.centres = np.asarray(model.x_data_scaled, dtype=float)
+            self.weights = np.asarray(model.optimal_weights, dtype=float).ravel()
+            self.p = float(model.optimal_p)
+            self.coefficients = np.matmul(
+                np.asarray(model.covariance_matrix_inverse, dtype=float),
+                np.asarray(model.optimal_y_mu, dtype=float),
+            ).ravel()
+            self.constant = float(np.asarray(model.optimal_mean).ravel()[0])
+            self.scale = 1.0
+        else:
+            self.kind = model.basis_function
+            self.centres = np.asarray(model.centres, dtype=float)
+            self.sigma = float(model.sigma)
+            self.coefficients = np.asarray(model.weights, dtype=float).ravel()
+            y_min = float(np.asarray(model.y_data_min).ravel()[0])
+            y_max = float(np.asarray(model.y_data_max).ravel()[0])
+            self.constant = y_min
+            self.scale = y_max - y_min
+
+    @staticmethod
+    def supports(model):
+        return isinstance(model, (krg.KrigingModel, rbf.RadialBasisFunctions))
+
+    def basis_values(self, x):
+        """
+        Return the values of all basis functions and their derivatives with
+        respect to the scaled inputs at the (unscaled) point x.
+        """
+        d = (np.asarray(x, dtype=float) - self.x_min) / self.x_range - self.centres
+        if self.kind == "kriging":
+            phi = np.exp(-np.sum(self.weights * d**self.p, axis=1))
+            dphi_dxs = -(phi[:, None] * self.weights * self.p * d ** (self.p - 1))
+            return phi, dphi_dxs
+
+        r = np.sqrt(np.sum(d**2, axis=1))
+        s = self.sigma
+        # phi(r) and phi'(r)/r for each basis function
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if self.kind == "linear":
+                phi, dphi_r = r, 1 / r
+            elif self.kind == "cubic":
+                phi, dphi_r = r**3, 3 * r
+            elif self.kind == "gaussian":
+                phi = np.exp(-((s * r) ** 2))
+                dphi_r = -2 * s**2 * phi
+            elif self.kind == "mq":
+                phi = np.sqrt((r * s) ** 2 + 1)
+                dphi_r = s**2 / phi
+            elif self.kind == "imq":
+                phi = 1 / np.sqrt((r * s) ** 2 + 1)
+                dphi_r = -(s**2) * phi**3
+            elif self.kind == "spline":
+                phi = r**2 * np.log(r)
+                dphi_r = 2 * np.log(r) + 1
+            else:
+                raise ValueError(f"Unrecognized RBF basis function {self.kind}.")
+        # the limits r -> 0 are not defined for all basis functions
+        phi = np.where(r == 0, np.nan_to_num(phi, nan=0.0, neginf=0.0), phi)
+        dphi_r = np.where(r == 0, 0.0, dphi_r)
+        return phi, dphi_r[:, None] * d
+
+    def value_and_gradient(self, x):
+        """
+        Return the model value and its gradient with respect to the (unscaled)
+        inputs at the point x.
+        """
+        phi, dphi_dxs = self.basis_values(x)
+        y = self.constant + self.scale * np.dot(self.coefficients, phi)
+        grad = self.scale * np.dot(self.coefficients, dphi_dxs) / self.x_range
+        return y, grad
+
+    def basis_expression(self, scaled_vars, i):
+        """
+        Return a Pyomo expression for basis function i in terms of the
+        scaled input expressions scaled_vars.
+        """
+        c = self.centres[i, :]
+        if self.kind == "kriging":
+            return exp(
+                -sum(
+                    float(w) * (xs - float(cj)) ** self.p
+                    for w, xs, cj in zip(self.weights, scaled_vars, c)
+                )
+            )
+        r2 = sum((xs - float(cj)) ** 2 for xs, cj in zip(scaled_vars, c))
+        s = self.sigma
+        if self.kind == "linear":
+            return r2**0.5
+        elif self.kind == "cubic":
+            return r2**1.5
+        elif self.kind == "gaussian":
+            return exp(-(s**2) * r2)
+        elif self.kind == "mq":
+            return (s**2 * r2 + 1) ** 0.5
+        elif self.kind == "imq":
+            return 1 / (s**2 * r2 + 1) ** 0.5
+        elif self.kind == "spline":
+            return 0.5 * r2 * log(r2)
+        raise ValueError(f"Unrecognized RBF basis function {self.kind}.")
+
+
+class PysmoGreyBoxModel(ExternalGreyBoxModel):
+    """
+    ExternalGreyBoxModel evaluating a trained PySMO surrogate (all outputs)
+    directly from its NumPy representation.
+
+    RBF and Kriging models are evaluated with analytic first derivatives.
+    Polynomial models are evaluated from their Pyomo expression with reverse
+    mode automatic differentiation.
+    """
+
+    def __init__(self, surrogate):
+        self._input_labels = list(surrogate.input_labels())
+        self._output_labels = list(surrogate.output_labels())
+        self._x = np.zeros(len(self._input_labels))
+        self._evaluators = []
+        for o in self._output_labels:
+            model = surrogate._trained.get_result(o).model
+            if _PysmoBasisModel.supports(model):
+                self._evaluators.append(_PysmoBasisModel(model).value_and_gradient)
+            else:
+                self._evaluators.append(self._expression_evaluator(model))
+
+    def _expression_evaluator(self, model):
+        m = ConcreteModel()
+        m.x = Var(range(len(self._input_labels)), initialize=0)
+        x_vars = [m.x[j] for j in m.x]
+        expr = model.generate_expression(x_vars)
+
+        def evaluate(x):
+            for v, xj in zip(x_vars, x):
+                v.set_value(float(xj), skip_validation=True)
+            grad = differentiate(
+                expr, wrt_list=x_vars, mode=differentiate.Modes.reverse_numeric
+            )
+            return value(expr), np.asarray(grad, dtype=float)
+
+        return evaluate
+
+    def input_names(self):
+        return list(self._input_labels)
+
+    def output_names(self):
+        return list(self._output_labels)
+
+    def equality_constraint_names(self):
+        return []
+
+    def set_input_values(self, input_values):
+        self._x = np.asarray(input_values, dtype=float)
+
+    def evaluate_equality_constraints(self):
+        raise NotImplementedError(
+            "PysmoGreyBoxModel does not have any equality constraints."
+        )
+
+    def evaluate_jacobian_equality_constraints(self):
+        raise NotImplementedError(
+            "PysmoGreyBoxModel does not have any equality constraints."
+        )
+
+    def evaluate_outputs(self):
+        return np.asarray([f(self._x)[0] for f in self._evaluators], dtype=float)
+
+    def evaluate_jacobian_outputs(self):
+        jac = np.vstack([f(self._x)[1] for f in self._evaluators])
+        rows, cols = np.indices(jac.shape)
+        return coo_matrix((jac.ravel(), (rows.ravel(), cols.ravel())), shape=jac.shape)
+
+
 class PysmoSurrogate(SurrogateBase):
     """PySMO surrogate model API."""
 
@@ -494,6 +705,7 @@ class PysmoSurrogate(SurrogateBase):
             input_bounds,
         )
 
+    @cached_evaluation
     def evaluate_surrogate(self, inputs: pd.DataFrame) -> pd.DataFrame:
         """Evaluate the surrogate model at a set of user-provided values.
 
@@ -519,18 +731,48 @@ class PysmoSurrogate(SurrogateBase):
             data=outputs, index=inputs.index, columns=self._output_labels
         )
 
+    class Formulation(Enum):
+        FULL_SPACE = 1
+        SPARSE = 2
+        GREY_BOX = 3
+
     def populate_block(self, block, additional_options=None):
         """Populate a Pyomo Block with surrogate model constraints.
 
         Args:
             block: Pyomo Block component to be populated with constraints.
-            additional_options: None
-                No additional options are required for this surrogate object
+            additional_options: dict or None
+                If not None, then should be a dict with the following keys;
+                'formulation': PysmoSurrogate.Formulation
+                The formulation to use for the surrogate. Possible values are
+                FULL_SPACE (one explicit expression per output, default),
+                SPARSE (one variable and constraint per RBF/Kriging basis
+                function, with the outputs linear in the basis variables) or
+                GREY_BOX (a single ExternalGreyBoxBlock evaluating all outputs
+                with analytic derivatives; requires a solver supporting grey-box
+                models such as cyipopt).
 
         Returns:
             None
         """
+        formulation = PysmoSurrogate.Formulation.FULL_SPACE
+        if additional_options is not None:
+            formulation = additional_options.pop("formulation", formulation)
+
+        if formulation == PysmoSurrogate.Formulation.FULL_SPACE:
+            self._populate_full_space(block)
+        elif formulation == PysmoSurrogate.Formulation.SPARSE:
+            self._populate_sparse(block)
+        elif formulation == PysmoSurrogate.Formulation.GREY_BOX:
+            self._populate_grey_box(block)
+        else:
+            raise ValueError(
+                'An unrecognized formulation "{}" was passed to '
+                "PysmoSurrogate.populate_block. Please pass a valid "
+                "formulation.".format(formulation)
+            )
 
+    def _populate_full_space(self, block):
         output_set = Set(initialize=self._output_labels, ordered=True)
 
         def pysmo_rule(b, o):
@@ -542,6 +784,74 @@ class PysmoSurrogate(SurrogateBase):
 
         block.pysmo_constraint = Constraint(output_set, rule=pysmo_rule)
 
+    def _populate_sparse(self, block):
+        in_vars = block.input_vars_as_dict()
+        out_vars = block.output_vars_as_dict()
+        x0 = np.asarray(
+            [0 if v.value is None else v.value for v in in_vars.values()],
+            dtype=float,
+        )
+
+        basis_models = {}
+        for o in self._output_labels:
+            model = self._trained.get_result(o).model
+            if _PysmoBasisModel.supports(model):
+                basis_models[o] = _PysmoBasisModel(model)
+
+        block.pysmo_basis_set = Set(
+            dimen=2,
+            ordered=True,
+            initialize=[
+                (o, i)
+                for o, bm in basis_models.items()
+                for i in range(bm.centres.shape[0])
+            ],
+        )
+        block.pysmo_scaled_input_set = Set(
+            dimen=2,
+            ordered=True,
+            initialize=[(o, k) for o in basis_models for k in in_vars],
+        )
+
+        # scaled inputs are named expressions so they are only written once
+        @block.Expression(block.pysmo_scaled_input_set)
+        def pysmo_scaled_inputs(b, o, k):
+            j = self._input_labels.index(k)
+            bm = basis_models[o]
+            return (in_vars[k] - float(bm.x_min[j])) / float(bm.x_range[j])
+
+        # initialize the basis variables at the current input values
+        basis_init = {}
+        for o, bm in basis_models.items():
+            phi, _ = bm.basis_values(x0)
+            basis_init.update({(o, i): float(v) for i, v in enumerate(phi)})
+
+        block.pysmo_basis = Var(block.pysmo_basis_set, initialize=basis_init)
+
+        @block.Constraint(block.pysmo_basis_set)
+        def pysmo_basis_constraint(b, o, i):
+            scaled = [b.pysmo_scaled_inputs[o, k] for k in in_vars]
+            return b.pysmo_basis[o, i] == basis_models[o].basis_expression(scaled, i)
+
+        @block.Constraint(self._output_labels)
+        def pysmo_constraint(b, o):
+            if o not in basis_models:
+                return out_vars[o] == self._trained.get_result(
+                    o
+                ).model.generate_expression(list(in_vars.values()))
+            bm = basis_models[o]
+            return out_vars[o] == bm.constant + bm.scale * sum(
+                float(a) * b.pysmo_basis[o, i] for i, a in enumerate(bm.coefficients)
+            )
+
+    def _populate_grey_box(self, block):
+        block.pysmo_grey_box = ExternalGreyBoxBlock()
+        block.pysmo_grey_box.set_external_model(
+            PysmoGreyBoxModel(self),
+            inputs=list(block.input_vars_as_dict().values()),
+            outputs=list(block.output_vars_as_dict().values()),
+        )
+
     def save(self, stream: io.TextIOBase):
         """Save this surrogate to the provided output stream so the model can be used later.
 
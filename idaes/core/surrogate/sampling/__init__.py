@@ -18,3 +18,14 @@ from .data_utils import (
     split_training_validation_testing,
     split_dataframe,
 )
+from .data_stream import (
+    DataStream,
+    DataFrameStream,
+    CSVStream,
+    ParquetStream,
+    NumpyShardStream,
+    RunningStatistics,
+    reservoir_sample,
+    split_training_validation_stream,
+)
+from .flowsheet_sampling import generate_training_data
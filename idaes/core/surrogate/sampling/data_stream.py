@@ -0,0 +1,518 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Chunked (out-of-core) data sources for surrogate training and evaluation.
+
+A :class:`DataStream` yields a tabular data set as a sequence of pandas
+DataFrames so that data sets which do not fit in memory (e.g. collections of
+CSV or Parquet shards, or memory-mapped NumPy arrays) can be used to compute
+scaling statistics, input bounds, fit metrics and random subsamples in a
+single pass.
+"""
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from pyomo.common.dependencies import attempt_import
+
+pq, pyarrow_available = attempt_import("pyarrow.parquet")
+
+#: Default number of rows per chunk
+DEFAULT_CHUNKSIZE = 100000
+
+
+def _expand_filenames(filenames):
+    """
+    Expand a filename, a glob pattern or a list of these into a sorted list
+    of existing files.
+    """
+    if isinstance(filenames, (str, os.PathLike)):
+        filenames = [filenames]
+    expanded = []
+    for f in filenames:
+        f = os.fspath(f)
+        matches = sorted(glob.glob(f))
+        if not matches:
+            raise FileNotFoundError(f"No data files found matching {f}.")
+        expanded.extend(matches)
+    return expanded
+
+
+class DataStream(object):
+    """
+    Base class for data sources that provide tabular data in chunks.
+
+    Derived classes must implement :meth:`columns` and :meth:`_iter_chunks`.
+    """
+
+    def __init__(self, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Args:
+           chunksize: int
+              The (maximum) number of rows contained in each chunk
+        """
+        if chunksize is None or int(chunksize) < 1:
+            raise ValueError("DataStream chunksize must be a positive integer.")
+        self._chunksize = int(chunksize)
+
+    @property
+    def chunksize(self):
+        """
+        The maximum number of rows in each chunk
+        """
+        return self._chunksize
+
+    def columns(self):
+        """
+        The list of column labels available in the data stream
+
+        Returns: list
+        """
+        raise NotImplementedError(
+            "columns called, but not implemented on the derived class"
+        )
+
+    def _iter_chunks(self, columns):
+        raise NotImplementedError(
+            "_iter_chunks called, but not implemented on the derived class"
+        )
+
+    def iter_chunks(self, columns=None):
+        """
+        Iterate over the data as a sequence of pandas DataFrames.
+
+        Args:
+           columns: list or None
+              The column labels to include in each chunk. If None, all
+              columns are returned.
+
+        Returns:
+           iterator of pandas DataFrame
+        """
+        if columns is None:
+            columns = self.columns()
+        else:
+            columns = list(columns)
+            diff = set(columns) - set(self.columns())
+            if diff:
+                raise ValueError(
+                    "The following labels were not found in the "
+                    "data stream columns: {}.".format(diff)
+                )
+        for chunk in self._iter_chunks(columns):
+            if len(chunk) > 0:
+                yield chunk[columns]
+
+    def __iter__(self):
+        return self.iter_chunks()
+
+    def to_dataframe(self, columns=None):
+        """
+        Read the whole data stream into a single (in-memory) DataFrame.
+
+        Args:
+           columns: list or None
+              The column labels to include. If None, all columns are returned.
+
+        Returns: pandas DataFrame
+        """
+        chunks = list(self.iter_chunks(columns))
+        if not chunks:
+            return pd.DataFrame(
+                columns=self.columns() if columns is None else list(columns)
+            )
+        return pd.concat(chunks, ignore_index=True)
+
+
+class DataFrameStream(DataStream):
+    """
+    DataStream wrapping an in-memory pandas DataFrame.
+    """
+
+    def __init__(self, dataframe, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Args:
+           dataframe: pandas DataFrame
+              The data to provide in chunks
+           chunksize: int
+              The (maximum) number of rows contained in each chunk
+        """
+        super().__init__(chunksize)
+        self._dataframe = dataframe
+
+    def columns(self):
+        return list(self._dataframe.columns)
+
+    def _iter_chunks(self, columns):
+        df = self._dataframe[columns]
+        for start in range(0, len(df), self._chunksize):
+            yield df.iloc[start : start + self._chunksize]
+
+
+class CSVStream(DataStream):
+    """
+    DataStream reading one or more CSV files (shards) in chunks. All shards
+    must share the same header row.
+    """
+
+    def __init__(self, filenames, chunksize=DEFAULT_CHUNKSIZE, **read_csv_kwargs):
+        """
+        Args:
+           filenames: str, path or list
+              Name of a CSV file, a glob pattern (e.g. ``"runs/*.csv"``) or a
+              list of these
+           chunksize: int
+              The (maximum) number of rows contained in each chunk
+           read_csv_kwargs: additional keyword arguments
+              Passed through to :func:`pandas.read_csv`
+        """
+        super().__init__(chunksize)
+        self._filenames = _expand_filenames(filenames)
+        self._read_csv_kwargs = read_csv_kwargs
+        self._columns = None
+
+    def filenames(self):
+        """
+        The list of files read by this stream
+        """
+        return list(self._filenames)
+
+    def columns(self):
+        if self._columns is None:
+            header = pd.read_csv(self._filenames[0], nrows=0, **self._read_csv_kwargs)
+            self._columns = list(header.columns)
+        return list(self._columns)
+
+    def _iter_chunks(self, columns):
+        for fname in self._filenames:
+            with pd.read_csv(
+                fname,
+                usecols=columns,
+                chunksize=self._chunksize,
+                **self._read_csv_kwargs,
+            ) as reader:
+                for chunk in reader:
+                    yield chunk
+
+
+class ParquetStream(DataStream):
+    """
+    DataStream reading one or more Parquet files (shards) in record batches.
+    Requires pyarrow.
+    """
+
+    def __init__(self, filenames, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Args:
+           filenames: str, path or list
+              Name of a Parquet file, a glob pattern or a list of these
+           chunksize: int
+              The (maximum) number of rows contained in each chunk
+        """
+        if not pyarrow_available:
+            raise ImportError("ParquetStream requires the pyarrow package.")
+        super().__init__(chunksize)
+        self._filenames = _expand_filenames(filenames)
+        self._columns = None
+
+    def filenames(self):
+        """
+        The list of files read by this stream
+        """
+        return list(self._filenames)
+
+    def columns(self):
+        if self._columns is None:
+            self._columns = list(pq.ParquetFile(self._filenames[0]).schema_arrow.names)
+        return list(self._columns)
+
+    def _iter_chunks(self, columns):
+        for fname in self._filenames:
+            pfile = pq.ParquetFile(fname)
+            for batch in pfile.iter_batches(
+                batch_size=self._chunksize, columns=columns
+            ):
+                yield batch.to_pandas()
+
+
+class NumpyShardStream(DataStream):
+    """
+    DataStream over one or more 2-D NumPy ``.npy`` files (shards). The shards
+    are memory-mapped, so only the rows of the current chunk are read into
+    memory.
+    """
+
+    def __init__(self, filenames, columns, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Args:
+           filenames: str, path or list
+              Name of a ``.npy`` file, a glob pattern or a list of these. Each
+              file must contain a 2-D array with one column per label.
+           columns: list of str
+              The labels of the array columns (in order)
+           chunksize: int
+              The (maximum) number of rows contained in each chunk
+        """
+        super().__init__(chunksize)
+        self._filenames = _expand_filenames(filenames)
+        self._columns = list(columns)
+        for fname in self._filenames:
+            shard = np.load(fname, mmap_mode="r")
+            if shard.ndim != 2 or shard.shape[1] != len(self._columns):
+                raise ValueError(
+                    f"NumpyShardStream expected a 2-D array with "
+                    f"{len(self._columns)} columns in {fname}, but found an "
+                    f"array of shape {shard.shape}."
+                )
+
+    def filenames(self):
+        """
+        The list of files read by this stream
+        """
+        return list(self._filenames)
+
+    def columns(self):
+        return list(self._columns)
+
+    def _iter_chunks(self, columns):
+        idx = [self._columns.index(c) for c in columns]
+        for fname in self._filenames:
+            shard = np.load(fname, mmap_mode="r")
+            for start in range(0, shard.shape[0], self._chunksize):
+                block = np.asarray(shard[start : start + self._chunksize, idx])
+                yield pd.DataFrame(block, columns=columns)
+
+
+def as_data_stream(data, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Return data as a DataStream, wrapping pandas DataFrames in a
+    DataFrameStream. DataStreams are returned unchanged.
+    """
+    if isinstance(data, DataStream):
+        return data
+    return DataFrameStream(data, chunksize=chunksize)
+
+
+class RunningStatistics(object):
+    """
+    One-pass accumulation of count, mean, (sample) standard deviation,
+    minimum and maximum for each column of a chunked data set.
+
+    Chunks are merged with the pairwise update of Chan et al., so the results
+    match those of pandas on the concatenated data to within round-off.
+    """
+
+    def __init__(self, columns):
+        """
+        Args:
+           columns: list of str
+              The column labels to accumulate statistics for
+        """
+        self._columns = list(columns)
+        n = len(self._columns)
+        self._count = 0
+        self._mean = np.zeros(n)
+        self._m2 = np.zeros(n)
+        self._min = np.full(n, np.inf)
+        self._max = np.full(n, -np.inf)
+
+    @staticmethod
+    def from_stream(stream, columns=None):
+        """
+        Create a RunningStatistics object from a single pass over a DataStream
+        (or DataFrame).
+
+        Args:
+           stream: DataStream or pandas DataFrame
+              The data to compute statistics for
+           columns: list or None
+              The column labels to include. If None, all columns are used.
+
+        Returns: RunningStatistics
+        """
+        stream = as_data_stream(stream)
+        if columns is None:
+            columns = stream.columns()
+        stats = RunningStatistics(columns)
+        for chunk in stream.iter_chunks(columns):
+            stats.update(chunk)
+        return stats
+
+    def update(self, dataframe):
+        """
+        Add the rows of dataframe to the accumulated statistics
+
+        Args:
+           dataframe: pandas DataFrame
+              Chunk of data containing (at least) the accumulated columns
+        """
+        values = dataframe[self._columns].to_numpy(dtype=float)
+        n_b = values.shape[0]
+        if n_b == 0:
+            return
+        mean_b = values.mean(axis=0)
+        m2_b = ((values - mean_b) ** 2).sum(axis=0)
+        n_a = self._count
+        n = n_a + n_b
+        delta = mean_b - self._mean
+        self._mean = self._mean + delta * (n_b / n)
+        self._m2 = self._m2 + m2_b + delta**2 * (n_a * n_b / n)
+        self._count = n
+        self._min = np.minimum(self._min, values.min(axis=0))
+        self._max = np.maximum(self._max, values.max(axis=0))
+
+    def columns(self):
+        """
+        The list of column labels
+        """
+        return list(self._columns)
+
+    @property
+    def count(self):
+        """
+        The number of rows accumulated so far
+        """
+        return self._count
+
+    def mean(self):
+        """
+        Returns: pandas Series of column means
+        """
+        return pd.Series(self._mean, index=self._columns)
+
+    def sum_squared_deviations(self):
+        """
+        Returns: pandas Series of the sum of squared deviations from the mean
+        """
+        return pd.Series(self._m2, index=self._columns)
+
+    def std(self, ddof=1):
+        """
+        Args:
+           ddof: int
+              Delta degrees of freedom (1 gives the sample standard deviation,
+              consistent with pandas)
+
+        Returns: pandas Series of column standard deviations
+        """
+        if self._count - ddof <= 0:
+            return pd.Series(np.nan, index=self._columns)
+        return pd.Series(np.sqrt(self._m2 / (self._count - ddof)), index=self._columns)
+
+    def min(self):
+        """
+        Returns: pandas Series of column minima
+        """
+        return pd.Series(self._min, index=self._columns)
+
+    def max(self):
+        """
+        Returns: pandas Series of column maxima
+        """
+        return pd.Series(self._max, index=self._columns)
+
+
+def reservoir_sample(stream, n_samples, columns=None, seed=None):
+    """
+    Draw a uniform random sample of n_samples rows from a DataStream in a
+    single pass, holding at most n_samples rows in memory (reservoir sampling,
+    Algorithm R).
+
+    Args:
+       stream: DataStream or pandas DataFrame
+          The data to sample from
+       n_samples: int
+          The number of rows to sample. If the stream contains fewer rows,
+          all rows are returned.
+       columns: list or None
+          The column labels to include. If None, all columns are used.
+       seed : None or int
+          seed for the random number generator. If None, generator is not seeded.
+
+    Returns:
+       pandas DataFrame
+    """
+    stream = as_data_stream(stream)
+    if columns is None:
+        columns = stream.columns()
+    n_samples = int(n_samples)
+    if n_samples < 1:
+        raise ValueError("reservoir_sample requires n_samples >= 1.")
+
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    n_seen = 0
+    for chunk in stream.iter_chunks(columns):
+        values = chunk.to_numpy()
+        if reservoir is None:
+            reservoir = np.empty((n_samples, values.shape[1]), dtype=values.dtype)
+        elif reservoir.dtype != values.dtype:
+            reservoir = reservoir.astype(np.result_type(reservoir, values))
+
+        # fill the reservoir first
+        n_fill = min(max(n_samples - n_seen, 0), values.shape[0])
+        if n_fill:
+            reservoir[n_seen : n_seen + n_fill] = values[:n_fill]
+        rest = values[n_fill:]
+        if rest.shape[0]:
+            # row with global (0-based) position i replaces slot j ~ U[0, i]
+            positions = np.arange(n_seen + n_fill, n_seen + values.shape[0])
+            slots = rng.integers(0, positions + 1)
+            keep = slots < n_samples
+            slots = slots[keep]
+            rows = rest[keep]
+            # when several rows hit the same slot, the last one wins
+            _, last = np.unique(slots[::-1], return_index=True)
+            last = len(slots) - 1 - last
+            reservoir[slots[last]] = rows[last]
+        n_seen += values.shape[0]
+
+    if reservoir is None:
+        return pd.DataFrame(columns=columns)
+    return pd.DataFrame(reservoir[: min(n_seen, n_samples)], columns=columns)
+
+
+def split_training_validation_stream(
+    stream, training_fraction, n_samples, columns=None, seed=None
+):
+    """
+    Draw a uniform random sample of n_samples rows from a DataStream (see
+    :func:`reservoir_sample`) and split it into training and validation data
+
+    Args:
+       stream : DataStream or pandas DataFrame
+          The data to sample from
+       training_fraction : float between 0 < 1
+          The fraction of the sampled rows to include as training data. The
+          rest will be returned as validation data
+       n_samples : int
+          The total number of rows to sample from the stream
+       columns: list or None
+          The column labels to include. If None, all columns are used.
+       seed : None or int
+          seed for the random number generator. If None, generator is not seeded.
+
+    Returns:
+       tuple : (training_dataframe, validation_dataframe)
+    """
+    assert 0 < training_fraction < 1.0
+    sample = reservoir_sample(stream, n_samples, columns=columns, seed=seed)
+    # the reservoir is not in random order, so shuffle before splitting
+    rng = np.random.default_rng(None if seed is None else seed + 1)
+    sample = sample.iloc[rng.permutation(len(sample))].reset_index(drop=True)
+    n_train = int(np.floor(training_fraction * len(sample)))
+    training = sample.iloc[:n_train].reset_index(drop=True)
+    validation = sample.iloc[n_train:].reset_index(drop=True)
+    return training, validation
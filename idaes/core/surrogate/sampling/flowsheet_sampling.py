@@ -0,0 +1,446 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Generate surrogate training data by solving a flowsheet at a set of sample
+points (e.g. from the PySMO LatinHypercubeSampling or HaltonSampling classes).
+
+Each worker builds the model once and solves the sample points assigned to it
+one after the other, initializing each solve from the converged solution whose
+inputs are nearest to the new point. Converged points can be written to a CSV
+file as they are computed, and the file can be passed to the surrogate trainers
+through a CSVStream.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+
+import numpy as np
+import pandas as pd
+
+from pyomo.environ import Var, check_optimal_termination, value
+
+from idaes.core.solvers import get_solver
+from idaes.core.surrogate.sampling.data_stream import CSVStream
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+
+# label of the index column in the results, which holds the sample number
+SAMPLE_LABEL = "sample"
+# label of the column holding the solver status in the failures
+STATUS_LABEL = "termination_condition"
+
+
+class FlowsheetSampleSolver(object):
+    """
+    Solve a model at a sequence of input values, warm-starting each solve
+    from the nearest previously converged point.
+    """
+
+    def __init__(
+        self,
+        model,
+        input_vars,
+        output_vars,
+        solver=None,
+        solver_options=None,
+        warm_start=True,
+        input_scale=None,
+        max_warm_start_points=1000,
+    ):
+        """
+        Args:
+           model: Pyomo model
+              The model to be solved. It should be initialized, as its
+              variable values are used as the starting point when there is no
+              converged point to warm-start from.
+           input_vars: list of str
+              Names of the input variables (found with model.find_component).
+              These are fixed to the sample values before each solve.
+           output_vars: list of str
+              Names of the variables (or expressions) whose values are
+              returned after each solve
+           solver: None, str or solver object
+              Solver object with a solve method, or the name of a solver
+              passed to get_solver. If None, the default IDAES solver is used.
+           solver_options: None or dict
+              Solver options, used when the solver is given by name
+           warm_start: bool
+              If True, each solve starts from the converged point with the
+              nearest inputs. Otherwise each solve starts from the initial
+              state of the model.
+           input_scale: None or array
+              Scale of each input used when computing the distance between
+              points. If None, the inputs are not scaled.
+           max_warm_start_points: int
+              Maximum number of converged points kept to warm-start from.
+              Once this many points are stored, each new converged point
+              replaces the stored point nearest to it, so the stored points
+              stay spread over the sampled region.
+        """
+        self.model = model
+        self.input_vars = [self._find_component(n) for n in input_vars]
+        self.output_vars = [self._find_component(n) for n in output_vars]
+        if solver is None or isinstance(solver, str):
+            solver = get_solver(solver, solver_options)
+        self.solver = solver
+        self.warm_start = warm_start
+        if input_scale is None:
+            input_scale = np.ones(len(self.input_vars))
+        self.input_scale = np.asarray(input_scale, dtype=float)
+        if int(max_warm_start_points) < 1:
+            raise ValueError("max_warm_start_points must be a positive integer.")
+        self.max_warm_start_points = int(max_warm_start_points)
+
+        self._vars = list(model.component_data_objects(Var, descend_into=True))
+        self._initial_state = self._get_state()
+        # Converged points are stored in the first _n_converged rows of
+        # arrays which grow by doubling, up to max_warm_start_points rows.
+        # The inputs are stored divided by input_scale.
+        self._n_converged = 0
+        self._converged_inputs = np.empty((0, len(self.input_vars)))
+        self._converged_states = np.empty((0, len(self._vars)))
+
+    def _find_component(self, name):
+        comp = self.model.find_component(name)
+        if comp is None:
+            raise ValueError(f"Could not find component {name} in the model.")
+        return comp
+
+    def _get_state(self):
+        return np.array([v.value for v in self._vars], dtype=float)
+
+    def _set_state(self, state):
+        for v, val in zip(self._vars, state):
+            v.set_value(None if np.isnan(val) else val, skip_validation=True)
+
+    def _nearest_point(self, x_scaled):
+        """Return the row of the stored converged point nearest to x_scaled"""
+        n = self._n_converged
+        diff = self._converged_inputs[:n] - x_scaled
+        return int(np.argmin(np.einsum("ij,ij->i", diff, diff)))
+
+    def _store_point(self, x_scaled, state, nearest):
+        """Store a converged point, replacing the point in row nearest if the
+        maximum number of points is already stored"""
+        n = self._n_converged
+        if n == self.max_warm_start_points:
+            row = nearest
+        else:
+            if n == self._converged_inputs.shape[0]:
+                size = min(self.max_warm_start_points, max(16, 2 * n))
+                inputs = np.empty((size, self._converged_inputs.shape[1]))
+                states = np.empty((size, self._converged_states.shape[1]))
+                inputs[:n] = self._converged_inputs[:n]
+                states[:n] = self._converged_states[:n]
+                self._converged_inputs = inputs
+                self._converged_states = states
+            row = n
+            self._n_converged += 1
+        self._converged_inputs[row] = x_scaled
+        self._converged_states[row] = state
+
+    def solve(self, x):
+        """
+        Fix the inputs to x, solve the model and read the outputs.
+
+        Args:
+           x: array
+              Value of each input variable
+
+        Returns: tuple (converged, termination condition, array of output values)
+        """
+        x = np.asarray(x, dtype=float)
+        x_scaled = x / self.input_scale
+        nearest = None
+        if self.warm_start and self._n_converged > 0:
+            nearest = self._nearest_point(x_scaled)
+            self._set_state(self._converged_states[nearest])
+        else:
+            self._set_state(self._initial_state)
+        for v, val in zip(self.input_vars, x):
+            v.fix(val)
+
+        try:
+            results = self.solver.solve(self.model)
+            converged = check_optimal_termination(results)
+            status = str(results.solver.termination_condition)
+        except Exception as err:  # pylint: disable=broad-except
+            # a failed function evaluation should not stop the whole run
+            converged = False
+            status = f"error: {err}"
+
+        if not converged:
+            return False, status, np.full(len(self.output_vars), np.nan)
+
+        if self.warm_start:
+            self._store_point(x_scaled, self._get_state(), nearest)
+        y = np.array([value(v) for v in self.output_vars], dtype=float)
+        return True, status, y
+
+
+# solver for the current worker process, created by _init_worker
+_worker_solver = None
+
+
+def _init_worker(build_model, solver_args):
+    global _worker_solver  # pylint: disable=global-statement
+    _worker_solver = FlowsheetSampleSolver(build_model(), **solver_args)
+
+
+def _solve_points(sample_solver, index, x):
+    rows = []
+    for i, xi in zip(index, x):
+        converged, status, y = sample_solver.solve(xi)
+        rows.append((i, xi, converged, status, y))
+    return rows
+
+
+def _solve_points_in_worker(index, x):
+    return _solve_points(_worker_solver, index, x)
+
+
+def _sample_dataframe(samples, input_labels):
+    if hasattr(samples, "sample_points"):
+        samples = samples.sample_points()
+    if isinstance(samples, pd.DataFrame):
+        missing = set(input_labels) - set(samples.columns)
+        if missing:
+            raise ValueError(
+                f"The following input labels were not found in the samples: "
+                f"{missing}."
+            )
+        return samples[input_labels].reset_index(drop=True)
+    samples = np.asarray(samples, dtype=float)
+    if samples.ndim != 2 or samples.shape[1] < len(input_labels):
+        raise ValueError(
+            f"Expected a 2-D array of samples with a column for each of the "
+            f"{len(input_labels)} inputs."
+        )
+    # the PySMO samplers return the inputs in the first columns
+    return pd.DataFrame(samples[:, : len(input_labels)], columns=input_labels)
+
+
+def _labels_and_names(variables):
+    if isinstance(variables, dict):
+        return list(variables.keys()), list(variables.values())
+    return list(variables), list(variables)
+
+
+def generate_training_data(
+    build_model,
+    input_vars,
+    output_vars,
+    samples,
+    solver=None,
+    solver_options=None,
+    n_workers=1,
+    chunksize=None,
+    warm_start=True,
+    max_warm_start_points=1000,
+    filename=None,
+    failures_filename=None,
+):
+    """
+    Solve a flowsheet at each sample point to generate surrogate training
+    data.
+
+    The sample points are split into chunks of consecutive points, which are
+    solved in a pool of n_workers processes. Each process calls build_model once
+    and keeps the model for all the chunks it solves. Points for which the
+    solver does not converge are recorded as failures and left out of the
+    training data.
+
+    Args:
+       build_model: callable
+          Function with no arguments that returns an initialized Pyomo model.
+          When n_workers > 1, it must be importable by the worker processes
+          (e.g. a module level function).
+       input_vars: list of str or dict
+          Names of the input variables in the model. If a dict, the keys are
+          the labels of the inputs in the data and the values are the names of
+          the variables.
+       output_vars: list of str or dict
+          Names of the output variables in the model, given as for input_vars
+       samples: pandas DataFrame, 2-D array or sampler object
+          Input values at which to solve the model. Sampler objects (e.g.
+          LatinHypercubeSampling) are asked for their sample_points. If an
+          array is given, the first columns hold the inputs in the order of
+          input_vars.
+       solver: None, str or solver object
+          Solver object, or the name of the solver passed to get_solver. Use a
+          name when n_workers > 1. If None, the default IDAES solver is used.
+       solver_options: None or dict
+          Solver options, used when the solver is given by name
+       n_workers: int
+          Number of worker processes. If 1, the points are solved in the
+          current process.
+       chunksize: None or int
+          Number of points passed to a worker at a time. If None, the points
+          are split into about four chunks per worker.
+       warm_start: bool
+          If True, each solve starts from the converged point (solved by the
+          same worker) with the nearest inputs
+       max_warm_start_points: int
+          Maximum number of converged points each worker keeps to warm-start
+          from, see FlowsheetSampleSolver
+       filename: None or str
+          If given, converged points are appended to this CSV file as they are
+          computed, and a CSVStream of the file is returned instead of a
+          DataFrame
+       failures_filename: None or str
+          If given, failed points are also written to this CSV file
+
+    Returns:
+       tuple (data, failures). data holds the input and output values of the
+       converged points (a DataFrame or, if filename is given, a CSVStream), and
+       failures is a DataFrame with the inputs and termination condition of
+       the points that did not converge. Both are indexed by the sample number.
+    """
+    input_labels, input_names = _labels_and_names(input_vars)
+    output_labels, output_names = _labels_and_names(output_vars)
+    samples = _sample_dataframe(samples, input_labels)
+    x = samples.to_numpy(dtype=float)
+    n_points = x.shape[0]
+
+    n_workers = int(n_workers)
+    if n_workers < 1:
+        raise ValueError("n_workers must be a positive integer.")
+    if chunksize is None:
+        chunksize = max(1, int(np.ceil(n_points / (4 * n_workers))))
+    elif int(chunksize) < 1:
+        raise ValueError("chunksize must be a positive integer.")
+    chunksize = int(chunksize)
+
+    # scale the inputs by their ranges when looking for the nearest point
+    input_scale = np.ptp(x, axis=0) if n_points > 0 else np.ones(x.shape[1])
+    input_scale[input_scale == 0] = 1.0
+    solver_args = dict(
+        input_vars=input_names,
+        output_vars=output_names,
+        solver=solver,
+        solver_options=solver_options,
+        warm_start=warm_start,
+        input_scale=input_scale,
+        max_warm_start_points=max_warm_start_points,
+    )
+
+    writer = _ResultsWriter(input_labels, output_labels, filename, failures_filename)
+    chunks = [
+        (np.arange(i, min(i + chunksize, n_points)), x[i : i + chunksize])
+        for i in range(0, n_points, chunksize)
+    ]
+
+    if n_workers == 1:
+        sample_solver = FlowsheetSampleSolver(build_model(), **solver_args)
+        for index, xc in chunks:
+            writer.write(_solve_points(sample_solver, index, xc))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(build_model, solver_args),
+        ) as executor:
+            futures = [
+                executor.submit(_solve_points_in_worker, index, xc)
+                for index, xc in chunks
+            ]
+            for future in as_completed(futures):
+                writer.write(future.result())
+
+    _log.info(
+        f"Solved {n_points} sample points: {writer.n_converged} converged, "
+        f"{writer.n_failed} failed."
+    )
+    return writer.results()
+
+
+class _ResultsWriter(object):
+    """
+    Collect the results of the solves, appending them to CSV files if
+    file names are given.
+    """
+
+    def __init__(self, input_labels, output_labels, filename, failures_filename):
+        self.input_labels = input_labels
+        self.output_labels = output_labels
+        self.filename = filename
+        self.failures_filename = failures_filename
+        self.n_converged = 0
+        self.n_failed = 0
+        self._data = []
+        self._failures = []
+        # start from empty files, rather than appending to an earlier run
+        for fname in (filename, failures_filename):
+            if fname is not None and os.path.exists(fname):
+                os.remove(fname)
+
+    def _append(self, df, fname, count):
+        df.index.name = SAMPLE_LABEL
+        df.to_csv(fname, mode="a", header=(count == 0))
+
+    def write(self, rows):
+        """
+        Record the results of a chunk of solves
+
+        Args:
+           rows: list of tuples (sample number, inputs, converged,
+              termination condition, outputs)
+        """
+        data = [(i, np.concatenate([x, y])) for i, x, ok, _, y in rows if ok]
+        failures = [(i, x, status) for i, x, ok, status, _ in rows if not ok]
+
+        if data:
+            df = pd.DataFrame(
+                [r for _, r in data],
+                index=[i for i, _ in data],
+                columns=self.input_labels + self.output_labels,
+            )
+            if self.filename is not None:
+                self._append(df, self.filename, self.n_converged)
+            else:
+                self._data.append(df)
+            self.n_converged += len(data)
+
+        if failures:
+            df = pd.DataFrame(
+                [x for _, x, _ in failures],
+                index=[i for i, _, _ in failures],
+                columns=self.input_labels,
+            )
+            df[STATUS_LABEL] = [status for _, _, status in failures]
+            if self.failures_filename is not None:
+                self._append(df, self.failures_filename, self.n_failed)
+            self._failures.append(df)
+            self.n_failed += len(failures)
+
+    def results(self):
+        if self._failures:
+            failures = pd.concat(self._failures).sort_index()
+        else:
+            failures = pd.DataFrame(columns=self.input_labels + [STATUS_LABEL])
+        failures.index.name = SAMPLE_LABEL
+
+        if self.filename is not None:
+            if self.n_converged == 0:
+                # write the header so the file can still be read
+                pd.DataFrame(
+                    columns=[SAMPLE_LABEL] + self.input_labels + self.output_labels
+                ).to_csv(self.filename, index=False)
+            return CSVStream(self.filename), failures
+
+        if self._data:
+            data = pd.concat(self._data).sort_index()
+        else:
+            data = pd.DataFrame(columns=self.input_labels + self.output_labels)
+        data.index.name = SAMPLE_LABEL
+        return data, failures
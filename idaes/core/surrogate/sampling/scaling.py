@@ -16,6 +16,8 @@
 
 import pandas as pd
 
+from idaes.core.surrogate.sampling.data_stream import DataStream, RunningStatistics
+
 
 class OffsetScaler(object):
     @staticmethod
@@ -24,10 +26,15 @@ class OffsetScaler(object):
         Creates a scaling object that normalizes the data between 0 and 1
 
         Args:
-           dataframe: pandas DataFrame
+           dataframe: pandas DataFrame or DataStream
               The dataframe containing the data (usually the training data)
-              that will be used to compute the scaling factor and offset
+              that will be used to compute the scaling factor and offset. If a
+              DataStream is given, the minimum and maximum are computed in a
+              single pass over the chunks.
         """
+        if isinstance(dataframe, DataStream):
+            stats = RunningStatistics.from_stream(dataframe)
+            return OffsetScaler(stats.columns(), stats.min(), stats.max() - stats.min())
         expected_columns = list(dataframe.columns)
         offset = dataframe.min()
         factor = dataframe.max() - dataframe.min()
@@ -40,10 +47,15 @@ class OffsetScaler(object):
         standard deviation as the as the factor
 
         Args:
-           dataframe: pandas DataFrame
+           dataframe: pandas DataFrame or DataStream
               The dataframe containing the data (usually the training data) that will
-              be used to compute the mean and standard deviation for the scaler
+              be used to compute the mean and standard deviation for the scaler. If
+              a DataStream is given, the mean and standard deviation are computed
+              in a single pass over the chunks.
         """
+        if isinstance(dataframe, DataStream):
+            stats = RunningStatistics.from_stream(dataframe)
+            return OffsetScaler(stats.columns(), stats.mean(), stats.std())
         expected_columns = list(dataframe.columns)
         offset = dataframe.mean()
         factor = dataframe.std()
@@ -0,0 +1,165 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for surrogates/sampling/data_stream module
+"""
+import os
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from idaes.core.surrogate.sampling import (
+    DataFrameStream,
+    CSVStream,
+    NumpyShardStream,
+    RunningStatistics,
+    reservoir_sample,
+    split_training_validation_stream,
+)
+
+
+@pytest.fixture
+def dataframe():
+    x = np.linspace(0, 1, 23)
+    return pd.DataFrame({"a": x, "b": 2 * x + 1, "c": x**2})
+
+
+class TestDataStreams:
+    @pytest.mark.unit
+    def test_dataframe_stream(self, dataframe):
+        stream = DataFrameStream(dataframe, chunksize=5)
+        assert stream.columns() == ["a", "b", "c"]
+        chunks = list(stream.iter_chunks(["c", "a"]))
+        assert [len(c) for c in chunks] == [5, 5, 5, 5, 3]
+        assert list(chunks[0].columns) == ["c", "a"]
+        pd.testing.assert_frame_equal(stream.to_dataframe(), dataframe)
+
+    @pytest.mark.unit
+    def test_bad_chunksize(self, dataframe):
+        with pytest.raises(ValueError, match="chunksize must be a positive integer"):
+            DataFrameStream(dataframe, chunksize=0)
+
+    @pytest.mark.unit
+    def test_missing_columns(self, dataframe):
+        stream = DataFrameStream(dataframe)
+        with pytest.raises(
+            ValueError,
+            match=r"The following labels were not found in the data stream "
+            r"columns: {'d'}.",
+        ):
+            list(stream.iter_chunks(["a", "d"]))
+
+    @pytest.mark.unit
+    def test_csv_stream(self, dataframe, tmp_path):
+        dataframe.iloc[:10].to_csv(tmp_path / "shard_0.csv", index=False)
+        dataframe.iloc[10:].to_csv(tmp_path / "shard_1.csv", index=False)
+
+        stream = CSVStream(os.path.join(tmp_path, "shard_*.csv"), chunksize=4)
+        assert len(stream.filenames()) == 2
+        assert stream.columns() == ["a", "b", "c"]
+        assert [len(c) for c in stream] == [4, 4, 2, 4, 4, 4, 1]
+        pd.testing.assert_frame_equal(stream.to_dataframe(), dataframe)
+        pd.testing.assert_frame_equal(
+            stream.to_dataframe(["b"]), dataframe[["b"]], check_exact=False
+        )
+
+    @pytest.mark.unit
+    def test_csv_stream_no_files(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match="No data files found"):
+            CSVStream(os.path.join(tmp_path, "*.csv"))
+
+    @pytest.mark.unit
+    def test_numpy_shard_stream(self, dataframe, tmp_path):
+        np.save(tmp_path / "shard_0.npy", dataframe.to_numpy()[:12])
+        np.save(tmp_path / "shard_1.npy", dataframe.to_numpy()[12:])
+
+        stream = NumpyShardStream(
+            os.path.join(tmp_path, "shard_*.npy"), columns=["a", "b", "c"], chunksize=5
+        )
+        assert [len(c) for c in stream] == [5, 5, 2, 5, 5, 1]
+        pd.testing.assert_frame_equal(stream.to_dataframe(), dataframe)
+
+    @pytest.mark.unit
+    def test_numpy_shard_stream_wrong_shape(self, tmp_path):
+        np.save(tmp_path / "shard.npy", np.zeros((4, 2)))
+        with pytest.raises(ValueError, match="expected a 2-D array with 3 columns"):
+            NumpyShardStream(tmp_path / "shard.npy", columns=["a", "b", "c"])
+
+
+class TestRunningStatistics:
+    @pytest.mark.unit
+    def test_from_stream(self, dataframe):
+        stats = RunningStatistics.from_stream(DataFrameStream(dataframe, chunksize=4))
+        assert stats.count == 23
+        pd.testing.assert_series_equal(stats.mean(), dataframe.mean())
+        pd.testing.assert_series_equal(stats.std(), dataframe.std())
+        pd.testing.assert_series_equal(stats.min(), dataframe.min())
+        pd.testing.assert_series_equal(stats.max(), dataframe.max())
+
+    @pytest.mark.unit
+    def test_std_too_few_rows(self):
+        stats = RunningStatistics(["a"])
+        stats.update(pd.DataFrame({"a": [1.0]}))
+        assert np.isnan(stats.std()["a"])
+        assert stats.std(ddof=0)["a"] == 0
+
+
+class TestReservoirSample:
+    @pytest.mark.unit
+    def test_sample_size(self, dataframe):
+        sample = reservoir_sample(
+            DataFrameStream(dataframe, chunksize=4), n_samples=7, seed=1
+        )
+        assert len(sample) == 7
+        assert list(sample.columns) == ["a", "b", "c"]
+        # rows are kept intact and are drawn without replacement
+        np.testing.assert_allclose(sample["b"], 2 * sample["a"] + 1)
+        assert sample["a"].is_unique
+
+        # sampling is reproducible with a seed
+        pd.testing.assert_frame_equal(
+            sample,
+            reservoir_sample(
+                DataFrameStream(dataframe, chunksize=4), n_samples=7, seed=1
+            ),
+        )
+
+    @pytest.mark.unit
+    def test_sample_larger_than_stream(self, dataframe):
+        sample = reservoir_sample(dataframe, n_samples=100)
+        pd.testing.assert_frame_equal(sample, dataframe)
+
+    @pytest.mark.unit
+    def test_sample_uniform(self):
+        df = pd.DataFrame({"a": np.arange(10.0)})
+        counts = np.zeros(10)
+        for seed in range(2000):
+            sample = reservoir_sample(
+                DataFrameStream(df, chunksize=3), n_samples=3, seed=seed
+            )
+            counts[sample["a"].to_numpy(dtype=int)] += 1
+        # each row is selected with probability 3/10
+        np.testing.assert_allclose(counts / 2000, 0.3, atol=0.05)
+
+    @pytest.mark.unit
+    def test_split_training_validation_stream(self, dataframe):
+        training, validation = split_training_validation_stream(
+            DataFrameStream(dataframe, chunksize=4),
+            training_fraction=0.7,
+            n_samples=20,
+            seed=3,
+        )
+        assert len(training) == 14
+        assert len(validation) == 6
+        assert set(training["a"]).isdisjoint(validation["a"])
@@ -0,0 +1,224 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for surrogates/sampling/flowsheet_sampling module
+"""
+import pytest
+import numpy as np
+import pandas as pd
+
+from pyomo.environ import ConcreteModel, Constraint, Var
+from pyomo.opt import SolverResults, TerminationCondition
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+
+from idaes.core.solvers import get_solver
+from idaes.core.surrogate.pysmo.sampling import LatinHypercubeSampling
+from idaes.core.surrogate.sampling import generate_training_data, CSVStream
+from idaes.core.surrogate.sampling.flowsheet_sampling import FlowsheetSampleSolver
+
+
+def build_model():
+    m = ConcreteModel()
+    m.x1 = Var(initialize=1.0)
+    m.x2 = Var(initialize=1.0)
+    m.y = Var(initialize=0.0)
+    m.c = Constraint(expr=m.y == m.x1**2 + 2 * m.x2)
+    return m
+
+
+class SequentialSolver(object):
+    """
+    Solves the model above by calculating y from the constraint. Points with
+    x1 > 4 are reported as infeasible.
+    """
+
+    def __init__(self):
+        self.starting_points = []
+
+    def solve(self, model):
+        self.starting_points.append(model.y.value)
+        results = SolverResults()
+        if model.x1.value > 4:
+            results.solver.termination_condition = TerminationCondition.infeasible
+        else:
+            calculate_variable_from_constraint(model.y, model.c)
+            results.solver.termination_condition = TerminationCondition.optimal
+        return results
+
+
+@pytest.fixture
+def samples():
+    return pd.DataFrame(
+        {"x1": [0.0, 1.0, 5.0, 2.0, 3.0], "x2": [1.0, 0.5, 1.0, 0.0, -1.0]}
+    )
+
+
+class TestFlowsheetSampleSolver:
+    @pytest.mark.unit
+    def test_warm_start(self):
+        solver = SequentialSolver()
+        sample_solver = FlowsheetSampleSolver(
+            build_model(), ["x1", "x2"], ["y"], solver=solver
+        )
+        assert sample_solver.solve([1.0, 0.0]) == (True, "optimal", [1.0])
+        assert sample_solver.solve([3.0, 0.0])[2] == [9.0]
+        # the nearest converged point is (1, 0), with y = 1
+        sample_solver.solve([1.5, 0.0])
+        assert solver.starting_points == [0.0, 1.0, 1.0]
+
+    @pytest.mark.unit
+    def test_warm_start_points_limit(self):
+        solver = SequentialSolver()
+        sample_solver = FlowsheetSampleSolver(
+            build_model(),
+            ["x1", "x2"],
+            ["y"],
+            solver=solver,
+            max_warm_start_points=2,
+        )
+        sample_solver.solve([1.0, 0.0])
+        sample_solver.solve([3.0, 0.0])
+        # (3.5, 0) replaces the nearest stored point, (3, 0)
+        sample_solver.solve([3.5, 0.0])
+        assert sample_solver._n_converged == 2
+        n = sample_solver._n_converged
+        assert sorted(sample_solver._converged_inputs[:n, 0]) == [1.0, 3.5]
+        sample_solver.solve([3.2, 0.0])
+        assert solver.starting_points[-1] == pytest.approx(3.5**2)
+
+        with pytest.raises(ValueError, match="max_warm_start_points"):
+            FlowsheetSampleSolver(
+                build_model(), ["x1"], ["y"], solver, max_warm_start_points=0
+            )
+
+    @pytest.mark.unit
+    def test_stored_points_growth(self):
+        sample_solver = FlowsheetSampleSolver(
+            build_model(), ["x1", "x2"], ["y"], solver=SequentialSolver()
+        )
+        for i in range(40):
+            sample_solver.solve([i / 10, 0.0])
+        assert sample_solver._n_converged == 40
+        # the arrays grow by doubling
+        assert sample_solver._converged_inputs.shape == (64, 2)
+        assert sample_solver._converged_states.shape == (64, 3)
+        # the nearest point is found among the stored points only
+        assert sample_solver._nearest_point(np.array([10.0, 0.0])) == 39
+
+    @pytest.mark.unit
+    def test_cold_start(self):
+        solver = SequentialSolver()
+        sample_solver = FlowsheetSampleSolver(
+            build_model(), ["x1", "x2"], ["y"], solver=solver, warm_start=False
+        )
+        sample_solver.solve([1.0, 0.0])
+        sample_solver.solve([3.0, 0.0])
+        assert solver.starting_points == [0.0, 0.0]
+
+    @pytest.mark.unit
+    def test_failure(self):
+        sample_solver = FlowsheetSampleSolver(
+            build_model(), ["x1", "x2"], ["y"], solver=SequentialSolver()
+        )
+        converged, status, y = sample_solver.solve([5.0, 0.0])
+        assert not converged
+        assert status == "infeasible"
+        assert np.isnan(y).all()
+
+    @pytest.mark.unit
+    def test_bad_component(self):
+        with pytest.raises(ValueError, match="Could not find component x3"):
+            FlowsheetSampleSolver(build_model(), ["x3"], ["y"], SequentialSolver())
+
+
+class TestGenerateTrainingData:
+    @pytest.mark.unit
+    def test_serial(self, samples):
+        data, failures = generate_training_data(
+            build_model,
+            ["x1", "x2"],
+            {"z": "y"},
+            samples,
+            solver=SequentialSolver(),
+            chunksize=2,
+        )
+        assert list(data.columns) == ["x1", "x2", "z"]
+        assert list(data.index) == [0, 1, 3, 4]
+        np.testing.assert_allclose(data["z"], data["x1"] ** 2 + 2 * data["x2"])
+
+        assert list(failures.index) == [2]
+        assert list(failures.columns) == ["x1", "x2", "termination_condition"]
+        assert failures.loc[2, "termination_condition"] == "infeasible"
+
+    @pytest.mark.unit
+    def test_parallel_to_file(self, samples, tmp_path):
+        filename = str(tmp_path / "data.csv")
+        failures_filename = str(tmp_path / "failures.csv")
+        data, failures = generate_training_data(
+            build_model,
+            ["x1", "x2"],
+            ["y"],
+            samples.to_numpy(),
+            solver=SequentialSolver(),
+            n_workers=2,
+            chunksize=1,
+            filename=filename,
+            failures_filename=failures_filename,
+        )
+        assert isinstance(data, CSVStream)
+        df = data.to_dataframe().set_index("sample").sort_index()
+        assert list(df.index) == [0, 1, 3, 4]
+        np.testing.assert_allclose(df["y"], df["x1"] ** 2 + 2 * df["x2"])
+
+        assert list(failures.index) == [2]
+        written = pd.read_csv(failures_filename, index_col="sample")
+        assert list(written.index) == [2]
+
+    @pytest.mark.unit
+    def test_sampler(self):
+        sampler = LatinHypercubeSampling(
+            [[0.0, -1.0], [3.0, 1.0]], number_of_samples=10, sampling_type="creation"
+        )
+        data, failures = generate_training_data(
+            build_model,
+            ["x1", "x2"],
+            ["y"],
+            sampler,
+            solver=SequentialSolver(),
+        )
+        assert len(data) == 10
+        assert len(failures) == 0
+
+    @pytest.mark.unit
+    def test_bad_args(self, samples):
+        with pytest.raises(ValueError, match="labels were not found in the samples"):
+            generate_training_data(build_model, ["x1", "x3"], ["y"], samples)
+        with pytest.raises(ValueError, match="n_workers must be a positive integer"):
+            generate_training_data(build_model, ["x1"], ["y"], samples, n_workers=0)
+        with pytest.raises(ValueError, match="Expected a 2-D array of samples"):
+            generate_training_data(build_model, ["x1", "x2"], ["y"], [1.0, 2.0])
+
+    @pytest.mark.component
+    @pytest.mark.solver
+    @pytest.mark.skipif(
+        not get_solver().available(exception_flag=False), reason="solver unavailable"
+    )
+    def test_ipopt(self, samples):
+        data, failures = generate_training_data(
+            build_model, ["x1", "x2"], ["y"], samples
+        )
+        assert len(data) == 5
+        assert len(failures) == 0
+        np.testing.assert_allclose(
+            data["y"], data["x1"] ** 2 + 2 * data["x2"], rtol=1e-6
+        )
@@ -16,6 +16,7 @@ Tests for surrogates/sampling/scaling module
 import pytest
 import pandas as pd
 from idaes.core.surrogate.sampling.scaling import OffsetScaler
+from idaes.core.surrogate.sampling.data_stream import DataFrameStream
 
 
 class TestScaling:
@@ -115,6 +116,23 @@ class TestScaling:
         pd.testing.assert_series_equal(scaler._offset, pd.Series({"A": 14.0, "B": 7.0}))
         pd.testing.assert_series_equal(scaler._factor, pd.Series({"A": 8.0, "B": 4.0}))
 
+    @pytest.mark.unit
+    def test_OffsetScaler_stream(self):
+        df = pd.DataFrame(
+            {"A": [1.0, 2.0, 3.0, 4.0, 5.0], "B": [2.0, 5.0, 6.0, 10.0, 12.0]}
+        )
+        stream = DataFrameStream(df, chunksize=2)
+
+        scaler = OffsetScaler.create_from_mean_std(stream)
+        pd.testing.assert_series_equal(scaler._offset, pd.Series({"A": 3.0, "B": 7.0}))
+        pd.testing.assert_series_equal(
+            scaler._factor, pd.Series({"A": 1.58113, "B": 4.0})
+        )
+
+        scaler = OffsetScaler.create_normalizing_scaler(stream)
+        pd.testing.assert_series_equal(scaler._offset, pd.Series({"A": 1.0, "B": 2.0}))
+        pd.testing.assert_series_equal(scaler._factor, pd.Series({"A": 4.0, "B": 10.0}))
+
 
 if __name__ == "__main__":
     pass
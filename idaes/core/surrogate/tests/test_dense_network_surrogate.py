@@ -0,0 +1,174 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for DenseNetworkSurrogate
+"""
+from io import StringIO
+import subprocess
+import sys
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from idaes.core.surrogate.dense_network_surrogate import DenseNetworkSurrogate
+from idaes.core.surrogate.sampling.scaling import OffsetScaler
+
+
+def reference_network(x, weights, biases):
+    h = np.tanh(x @ weights[0] + biases[0])
+    h = 1.0 / (1.0 + np.exp(-(h @ weights[1] + biases[1])))
+    return h @ weights[2] + biases[2]
+
+
+@pytest.fixture
+def network():
+    rng = np.random.default_rng(7)
+    weights = [
+        rng.normal(size=(2, 6)),
+        rng.normal(size=(6, 4)),
+        rng.normal(size=(4, 2)),
+    ]
+    biases = [rng.normal(size=6), rng.normal(size=4), rng.normal(size=2)]
+    return weights, biases
+
+
+@pytest.fixture
+def surrogate(network):
+    weights, biases = network
+    return DenseNetworkSurrogate(
+        weights=weights,
+        biases=biases,
+        activations=["tanh", "sigmoid", "linear"],
+        input_labels=["x1", "x2"],
+        output_labels=["z1", "z2"],
+        input_bounds={"x1": (0, 10), "x2": (-1, 1)},
+        input_scaler=OffsetScaler(
+            expected_columns=["x1", "x2"],
+            offset_series=pd.Series({"x1": 5.0, "x2": 0.0}),
+            factor_series=pd.Series({"x1": 2.0, "x2": 0.5}),
+        ),
+        output_scaler=OffsetScaler(
+            expected_columns=["z1", "z2"],
+            offset_series=pd.Series({"z1": 100.0, "z2": -1.0}),
+            factor_series=pd.Series({"z1": 10.0, "z2": 3.0}),
+        ),
+    )
+
+
+@pytest.fixture
+def inputs():
+    rng = np.random.default_rng(11)
+    return pd.DataFrame(
+        {"x1": rng.uniform(0, 10, 50), "x2": rng.uniform(-1, 1, 50)},
+        index=np.arange(100, 150),
+    )
+
+
+def expected_outputs(inputs, network):
+    x = np.column_stack([(inputs["x1"] - 5.0) / 2.0, inputs["x2"] / 0.5])
+    y = reference_network(x, *network)
+    return pd.DataFrame(
+        {"z1": 10.0 * y[:, 0] + 100.0, "z2": 3.0 * y[:, 1] - 1.0}, index=inputs.index
+    )
+
+
+class TestDenseNetworkSurrogate:
+    @pytest.mark.unit
+    def test_evaluate(self, surrogate, network, inputs):
+        assert surrogate.n_layers() == 3
+        out = surrogate.evaluate_surrogate(inputs)
+        pd.testing.assert_frame_equal(out, expected_outputs(inputs, network))
+
+    @pytest.mark.unit
+    def test_batches_and_threads(self, surrogate, inputs):
+        expected = surrogate.evaluate_surrogate(inputs)
+        for batch_size, n_threads in [(7, 1), (7, 3), (50, 2), (1000, 4)]:
+            surrogate.batch_size = batch_size
+            surrogate.n_threads = n_threads
+            pd.testing.assert_frame_equal(
+                surrogate.evaluate_surrogate(inputs), expected
+            )
+
+    @pytest.mark.unit
+    def test_activations(self):
+        x = np.array([[-50.0], [0.0], [2.0], [800.0]])
+        for activation, expected in [
+            ("relu", [0.0, 0.0, 2.0, 800.0]),
+            ("sigmoid", [1.0 / (1 + np.exp(50.0)), 0.5, 1.0 / (1 + np.exp(-2)), 1.0]),
+            (
+                "softplus",
+                [np.log1p(np.exp(-50.0)), np.log(2.0), np.log1p(np.exp(2)), 800.0],
+            ),
+        ]:
+            surrogate = DenseNetworkSurrogate(
+                [[[1.0]]], [[0.0]], [activation], ["x"], ["z"], None
+            )
+            np.testing.assert_allclose(surrogate.predict(x)[:, 0], expected)
+
+    @pytest.mark.unit
+    def test_save_load(self, surrogate, inputs):
+        surrogate.batch_size = 16
+        stream = StringIO()
+        surrogate.save(stream)
+        loaded = DenseNetworkSurrogate.load(StringIO(stream.getvalue()))
+
+        assert loaded.input_labels() == ["x1", "x2"]
+        assert loaded.output_labels() == ["z1", "z2"]
+        assert loaded.input_bounds() == {"x1": (0, 10), "x2": (-1, 1)}
+        assert loaded.batch_size == 16
+        pd.testing.assert_frame_equal(
+            loaded.evaluate_surrogate(inputs), surrogate.evaluate_surrogate(inputs)
+        )
+
+    @pytest.mark.unit
+    def test_no_tensorflow(self):
+        # the exported surrogate can be loaded and evaluated without TensorFlow
+        code = (
+            "import sys\n"
+            "import idaes.core.surrogate.dense_network_surrogate\n"
+            "assert 'tensorflow' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    @pytest.mark.unit
+    def test_bad_layers(self, network):
+        weights, biases = network
+        with pytest.raises(ValueError, match="same number of weights, biases"):
+            DenseNetworkSurrogate(
+                weights, biases[:2], ["tanh"] * 3, ["x1", "x2"], ["z1", "z2"], None
+            )
+        with pytest.raises(ValueError, match="Unsupported activation function 'elu'"):
+            DenseNetworkSurrogate(
+                weights,
+                biases,
+                ["tanh", "elu", "linear"],
+                ["x1", "x2"],
+                ["z1", "z2"],
+                None,
+            )
+        with pytest.raises(ValueError, match="do not match the 3 inputs to the layer"):
+            DenseNetworkSurrogate(
+                weights, biases, ["tanh"] * 3, ["x1", "x2", "x3"], ["z1", "z2"], None
+            )
+        with pytest.raises(ValueError, match="last layer of the network has 2 outputs"):
+            DenseNetworkSurrogate(
+                weights, biases, ["tanh"] * 3, ["x1", "x2"], ["z1"], None
+            )
+
+    @pytest.mark.unit
+    def test_bad_options(self, surrogate):
+        with pytest.raises(ValueError, match="batch_size must be a positive integer"):
+            surrogate.batch_size = 0
+        with pytest.raises(ValueError, match="n_threads must be a positive integer"):
+            surrogate.n_threads = 0
@@ -731,3 +731,23 @@ def test_invalid_formulation():
         str(excinfo.value) == 'An unrecognized formulation "foo" was passed '
         "to KerasSurrogate.populate_block. Please pass a valid formulation."
     )
+
+
+@pytest.mark.unit
+def test_to_dense_network_surrogate():
+    x = pd.DataFrame(
+        {
+            "Temperature_K": [360, 370, 380],
+            "Pressure_Pa": [1.05 * 101325, 1.10 * 101325, 1.15 * 101325],
+        }
+    )
+    for name in ["PT_data_2_10_10_2_sigmoid", "PT_data_2_10_10_2_relu"]:
+        keras_surrogate = create_keras_model(name=name, return_keras_model_only=False)
+        dense_surrogate = keras_surrogate.to_dense_network_surrogate(batch_size=2)
+        assert dense_surrogate.n_layers() == 3
+        pd.testing.assert_frame_equal(
+            dense_surrogate.evaluate_surrogate(x),
+            keras_surrogate.evaluate_surrogate(x),
+            rtol=rtol,
+            atol=atol,
+        )
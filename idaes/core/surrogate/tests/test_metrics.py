@@ -18,6 +18,7 @@ import pandas as pd
 
 from idaes.core.surrogate.metrics import compute_fit_metrics
 from idaes.core.surrogate import AlamoSurrogate
+from idaes.core.surrogate.sampling.data_stream import DataFrameStream
 
 # For this test we will use a simple z = x function and calculate metrics
 # Measured (test) data will include a fixed offset (i.e. z = x + Err)
@@ -69,3 +70,22 @@ def test_compute_metrics(metrics):
         sst += 2 * (Np / 10 - 0.1 * i) ** 2
 
     assert metrics["z1"]["R2"] == pytest.approx(1 - ERR**2 * N / sst, rel=1e-12)
+
+
+@pytest.mark.unit
+def test_compute_metrics_stream(metrics):
+    x = [0.1 * i - Np / 10 for i in range(N)]
+    dataset = pd.DataFrame({"x1": x, "z1": [v + ERR for v in x]})
+
+    alm_obj = AlamoSurrogate(
+        surrogate_expressions={"z1": "z1 == x1"},
+        input_labels=["x1"],
+        output_labels=["z1"],
+    )
+
+    stream_metrics = compute_fit_metrics(
+        surrogate=alm_obj, dataframe=DataFrameStream(dataset, chunksize=7)
+    )
+
+    for k, v in metrics["z1"].items():
+        assert stream_metrics["z1"][k] == pytest.approx(v, rel=1e-10)
@@ -24,7 +24,12 @@ from io import StringIO
 import re
 
 import pyomo as pyo
-from pyomo.environ import ConcreteModel, Var, Constraint
+from pyomo.environ import ConcreteModel, Var, Constraint, Objective, value
+from pyomo.common.timing import TicTocTimer
+import pyomo.common.unittest as unittest
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+from pyomo.core.expr.calculus.derivatives import differentiate
+from pyomo.contrib.pynumero.interfaces.external_grey_box import ExternalGreyBoxBlock
 from pyomo.common.tempfiles import TempfileManager
 
 from idaes.core.surrogate.pysmo import (
@@ -40,10 +45,12 @@ from idaes.core.surrogate.pysmo_surrogate import (
     PysmoSurrogate,
     PysmoSurrogateTrainingResult,
     PysmoTrainedSurrogate,
+    PysmoGreyBoxModel,
 )
 
 from idaes.core.surrogate.surrogate_block import SurrogateBlock
 from idaes.core.surrogate.metrics import compute_fit_metrics
+from idaes.core.util.performance import PerformanceBaseClass
 
 
 dirpath = Path(__file__).parent.resolve()
@@ -2076,6 +2083,102 @@ class TestPysmoSurrogate:
         assert isinstance(blk.pysmo_constraint, Constraint)
         assert len(blk.pysmo_constraint) == 2
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("fixture", ["pysmo_surr2_rbf", "pysmo_surr2_krg"])
+    def test_populate_block_sparse(self, fixture, request):
+        # Test the sparse formulation reproduces evaluate_surrogate
+        _, trained = request.getfixturevalue(fixture)
+        blk = SurrogateBlock(concrete=True)
+        blk.build_model(trained, formulation=PysmoSurrogate.Formulation.SPARSE)
+
+        assert isinstance(blk.pysmo_constraint, Constraint)
+        assert len(blk.pysmo_constraint) == 2
+        # one basis function per training point and output
+        assert len(blk.pysmo_basis) == 10
+        assert len(blk.pysmo_basis_constraint) == 10
+        assert len(blk.pysmo_scaled_inputs) == 4
+
+        blk.inputs["x1"].fix(2.3)
+        blk.inputs["x2"].fix(7.7)
+        for k in blk.pysmo_basis:
+            calculate_variable_from_constraint(
+                blk.pysmo_basis[k], blk.pysmo_basis_constraint[k]
+            )
+        for o in blk.pysmo_constraint:
+            calculate_variable_from_constraint(blk.outputs[o], blk.pysmo_constraint[o])
+
+        expected = trained.evaluate_surrogate(pd.DataFrame({"x1": [2.3], "x2": [7.7]}))
+        for o in ["z1", "z2"]:
+            assert value(blk.outputs[o]) == pytest.approx(expected[o][0], rel=1e-8)
+
+    @pytest.mark.unit
+    def test_populate_block_sparse_poly(self, pysmo_surr2_poly):
+        # Polynomials have no basis functions, so the full expression is used
+        _, poly_trained = pysmo_surr2_poly
+        blk = SurrogateBlock(concrete=True)
+        blk.build_model(poly_trained, formulation=PysmoSurrogate.Formulation.SPARSE)
+
+        assert len(blk.pysmo_constraint) == 2
+        assert len(blk.pysmo_basis) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("fixture", ["pysmo_surr2_rbf", "pysmo_surr2_krg"])
+    def test_populate_block_grey_box(self, fixture, request):
+        _, trained = request.getfixturevalue(fixture)
+        blk = SurrogateBlock(concrete=True)
+        blk.build_model(trained, formulation=PysmoSurrogate.Formulation.GREY_BOX)
+
+        assert isinstance(blk.pysmo_grey_box, ExternalGreyBoxBlock)
+        assert not hasattr(blk, "pysmo_constraint")
+        assert blk.pysmo_grey_box.inputs[0] is blk.inputs["x1"]
+        assert blk.pysmo_grey_box.outputs[1] is blk.outputs["z2"]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("fixture", ["pysmo_surr2_rbf", "pysmo_surr2_krg"])
+    def test_grey_box_model(self, fixture, request):
+        _, trained = request.getfixturevalue(fixture)
+        gbm = PysmoGreyBoxModel(trained)
+        assert gbm.input_names() == ["x1", "x2"]
+        assert gbm.output_names() == ["z1", "z2"]
+        assert gbm.equality_constraint_names() == []
+
+        x = np.array([2.3, 7.7])
+        gbm.set_input_values(x)
+        out = gbm.evaluate_outputs()
+        expected = trained.evaluate_surrogate(pd.DataFrame({"x1": [2.3], "x2": [7.7]}))
+        np.testing.assert_allclose(out, expected.to_numpy().ravel(), rtol=1e-8)
+
+        # compare jacobian with the Pyomo expression derivatives
+        jac = gbm.evaluate_jacobian_outputs().toarray()
+        m = ConcreteModel()
+        m.x = Var([0, 1], initialize={0: 2.3, 1: 7.7})
+        for i, o in enumerate(["z1", "z2"]):
+            expr = trained._trained.get_result(o).model.generate_expression(
+                [m.x[0], m.x[1]]
+            )
+            grad = differentiate(expr, wrt_list=[m.x[0], m.x[1]])
+            np.testing.assert_allclose(jac[i], grad, rtol=1e-8, atol=1e-10)
+
+    @pytest.mark.unit
+    def test_grey_box_model_poly(self, pysmo_surr2_poly):
+        _, poly_trained = pysmo_surr2_poly
+        gbm = PysmoGreyBoxModel(poly_trained)
+        gbm.set_input_values(np.array([2.0, 6.0]))
+        expected = poly_trained.evaluate_surrogate(
+            pd.DataFrame({"x1": [2.0], "x2": [6.0]})
+        )
+        np.testing.assert_allclose(
+            gbm.evaluate_outputs(), expected.to_numpy().ravel(), rtol=1e-8
+        )
+        assert gbm.evaluate_jacobian_outputs().shape == (2, 2)
+
+    @pytest.mark.unit
+    def test_populate_block_bad_formulation(self, pysmo_surr2_rbf):
+        _, trained = pysmo_surr2_rbf
+        blk = SurrogateBlock(concrete=True)
+        with pytest.raises(ValueError, match="An unrecognized formulation"):
+            blk.build_model(trained, formulation="foo")
+
     @pytest.mark.unit
     def test_save_poly1(self, pysmo_surr1):
         # Test save for polynomial regression with single output with bounds supplied
@@ -3339,3 +3442,65 @@ class TestKrigingWorkflow:
         assert metrics["z1"]["RMSE"] == pytest.approx(
             pysmo_trainer_krg._data["z1"].metrics["RMSE"], rel=1e-8
         )
+
+
+@pytest.mark.performance
+class TestPysmoFormulationPerformance(PerformanceBaseClass, unittest.TestCase):
+    """
+    Compare the build time and NL file size of the PySMO surrogate formulations
+    for an RBF surrogate with many centres.
+    """
+
+    def build_model(self):
+        rng = np.random.default_rng(0)
+        x = rng.uniform(0, 1, (300, 2))
+        data = pd.DataFrame(
+            {
+                "x1": x[:, 0],
+                "x2": x[:, 1],
+                "z1": np.sin(3 * x[:, 0]) * x[:, 1],
+                "z2": x[:, 0] ** 2 + x[:, 1],
+            }
+        )
+        trainer = PysmoRBFTrainer(
+            input_labels=["x1", "x2"],
+            output_labels=["z1", "z2"],
+            training_dataframe=data,
+            basis_function="gaussian",
+            regularization=False,
+        )
+        return PysmoSurrogate(
+            trainer.train_surrogate(),
+            ["x1", "x2"],
+            ["z1", "z2"],
+            {"x1": (0, 1), "x2": (0, 1)},
+        )
+
+    def test_performance(self):
+        surrogate = self.build_model()
+        timer = TicTocTimer()
+        for formulation in [
+            PysmoSurrogate.Formulation.FULL_SPACE,
+            PysmoSurrogate.Formulation.SPARSE,
+        ]:
+            m = ConcreteModel()
+            timer.tic(None)
+            m.surrogate = SurrogateBlock()
+            m.surrogate.build_model(surrogate, formulation=formulation)
+            self.recordData(
+                f"build {formulation.name}", timer.toc(f"build {formulation.name}")
+            )
+            m.obj = Objective(expr=m.surrogate.outputs["z1"])
+
+            TempfileManager.push()
+            try:
+                fname = TempfileManager.create_tempfile(suffix=".nl")
+                timer.tic(None)
+                m.write(fname)
+                self.recordData(
+                    f"write nl {formulation.name}",
+                    timer.toc(f"write nl {formulation.name}"),
+                )
+                self.recordData(f"nl size {formulation.name}", os.path.getsize(fname))
+            finally:
+                TempfileManager.pop()
@@ -18,18 +18,20 @@ Flowsheet-related classes and functions used by the UI.
 # pylint: disable=missing-function-docstring
 
 # stdlib
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
 import copy
+import functools
 import json
 import logging
 import re
+import threading
 from typing import Dict, List, Tuple
 
 # third-party
 import pandas as pd
 import numpy as np
 import pint
-from pyomo.environ import Block, value
+from pyomo.environ import Block, Param, Var, value
 from pyomo.network import Arc
 from pyomo.network.port import Port
 
@@ -40,6 +42,12 @@ from idaes.core.ui.icons.positioning import UnitModelsPositioning
 
 _log = logger.getLogger(__name__)
 
+# Layouts (jointjs cells and routing config) of the most recently serialized
+# flowsheets, keyed by their structure (see FlowsheetSerializer._layout_key)
+_layout_cache = OrderedDict()
+_layout_cache_size = 16
+_layout_cache_lock = threading.Lock()
+
 
 class FileBaseNameExistsError(Exception):
     pass
@@ -150,13 +158,22 @@ class FlowsheetSerializer:
         re.IGNORECASE,
     )
 
-    def __init__(self, flowsheet, name: str, validate: bool = True):
+    def __init__(
+        self,
+        flowsheet,
+        name: str,
+        validate: bool = True,
+        cache: "SerializationCache" = None,
+    ):
         """Serialize input flowsheet with given name
 
         Args:
             flowsheet: The flowsheet to serialize
             name: The name of the flowsheet (also called its 'id' in some contexts)
             validate: If True, validate that the flowsheet is a reaonsable IDAES model, first
+            cache: If given, reuse the serialized unit models, streams and layout
+                that haven't changed since the flowsheet was last serialized with
+                this cache (see :class:`SerializationCache`)
         Raises:
             ValueError if validation is on and flowsheet is found to be invalid
         """
@@ -187,6 +204,8 @@ class FlowsheetSerializer:
         self.unit_models = {}  # {unit: {"name": unit.getname(), "type": str?}}
         self.streams = {}  # {Arc.getname(): Arc} or {Port.getname(): Port}
         self.ports = {}  # {Port: parent_unit}
+        self._arc_ports = {}  # {Arc.getname(): (source Port, dest Port)}
+        self._icons = {}  # {unit type: UnitModelIcon}
         self.edges = defaultdict(dict)  # {name: {"source": unit, "dest": unit}}
         self.adj_list = defaultdict(set)  # {name: (neighbor1, neighbor2, ...)}
         self.orphaned_ports = {}
@@ -194,7 +213,7 @@ class FlowsheetSerializer:
         self._stream_table_df = None
         self._ordered_stream_names = deque()
         self._out_json = {"model": {}, "routing_config": {}}
-        self._serialized_contents = defaultdict(dict)
+        self._serialized_contents = {}  # {unit name: unit}
         self._used_ports = set()
         self._known_endpoints = set()
         self._unit_name_used_count = defaultdict(lambda: 0)
@@ -205,6 +224,14 @@ class FlowsheetSerializer:
         self.name = name
         self.flowsheet = flowsheet
         self._positioning_model = None
+        self._stream_states = None
+        self._cache = cache
+        self._signatures = None
+        self._shared_signature = None
+        if cache is not None:
+            signature = cache.flowsheet_signature(flowsheet)
+            self._signatures = signature[1]
+            cache.signature = signature
         # serialize
         self._ingest_flowsheet()
         self._construct_output_json()
@@ -230,10 +257,13 @@ class FlowsheetSerializer:
     def _identify_arcs(self):
         # Identify the arcs and known endpoints and store them
         for component in self.flowsheet.component_objects(Arc, descend_into=False):
-            self.streams[component.getname()] = component
-            self._known_endpoints.add(component.source.parent_block())
-            self._known_endpoints.add(component.dest.parent_block())
-            self._ordered_stream_names.append(component.getname())
+            name = component.getname()
+            source, dest = component.source, component.dest
+            self.streams[name] = component
+            self._arc_ports[name] = (source, dest)
+            self._known_endpoints.add(source.parent_block())
+            self._known_endpoints.add(dest.parent_block())
+            self._ordered_stream_names.append(name)
 
     def _identify_unit_models(self) -> Dict:
         # pylint: disable=import-outside-toplevel
@@ -257,19 +287,12 @@ class FlowsheetSerializer:
                 # Find unit models nested within indexed blocks
                 type_ = self.get_unit_model_type(component)
                 for item in component.parent_component().values():
-                    if isinstance(item, UnitModelBlockData):
-                        # See if this unit is connected to an arc
-                        is_connected = False
-                        for stream in self.streams.values():
-                            if (
-                                item == stream.source.parent_block()
-                                or item == stream.dest.parent_block()
-                            ):
-                                is_connected = True
-                                break
-                        # Add to diagram if connected
-                        if is_connected:
-                            components[item] = type_
+                    # Add to diagram if this unit is connected to an arc
+                    if (
+                        isinstance(item, UnitModelBlockData)
+                        and item in self._known_endpoints
+                    ):
+                        components[item] = type_
 
         return components
 
@@ -283,7 +306,13 @@ class FlowsheetSerializer:
         # We might have this information from generating self.serialized_components
         # but I (Makayla) don't know how that connects to the stream names so this
         # will be left alone for now
-        for stream_name, stream_value in stream_states_dict(self.streams).items():
+        self._stream_states = stream_states_dict(self.streams)
+        for stream_name, stream_value in self._stream_states.items():
+            signature = self._stream_signature(stream_value)
+            cached = self._cache_get("labels", stream_name, signature)
+            if cached is not None:
+                self.labels[stream_name] = cached
+                continue
             label = ""
             for var, var_value in stream_value.define_display_vars().items():
                 var = var.capitalize()
@@ -294,25 +323,24 @@ class FlowsheetSerializer:
                     else:
                         label += f"{var} {k} {round(value(v), self._sig_figs)}\n"
             self.labels[stream_name] = label[:-2]
+            self._cache_set("labels", stream_name, signature, self.labels[stream_name])
 
     def _map_edges(self):
         # Map the arcs to the ports to construct the edges
         used_ports = set()
-        for name, stream in self.streams.items():
+        for name, (source, dest) in self._arc_ports.items():
             try:  # This is necessary because for internally-nested arcs we may not record ports
-                src = self.ports[stream.source]
-                dst = self.ports[stream.dest]
+                src = self.ports[source]
+                dst = self.ports[dest]
                 self.edges[name] = {
                     "source": src,
                     "dest": dst,
                 }
                 self.adj_list[src.getname()].add(dst.getname())
-                used_ports.add(stream.source)
-                used_ports.add(stream.dest)
+                used_ports.add(source)
+                used_ports.add(dest)
             except KeyError:
-                self._logger.error(
-                    f"Unable to find port. {name}, {stream.source}, {stream.dest}"
-                )
+                self._logger.error(f"Unable to find port. {name}, {source}, {dest}")
 
         # Note we're only using the keys from self.ports, {port: parentcomponent}
         untouched_ports = set(self.ports) - used_ports
@@ -337,25 +365,8 @@ class FlowsheetSerializer:
             The dataframe that now has valid JSON
         """
 
-        def get_valid_unit_format(pint_unit):
-            """Get different formats from the Units' pint object"""
-            if isinstance(pint_unit, pint.Unit):
-                return {
-                    "raw": str(pint_unit),
-                    "html": "{:~H}".format(pint_unit),
-                    "latex": "{:~L}".format(pint_unit),
-                }
-            else:
-                return {
-                    "raw": str(pint_unit),
-                    "html": "",
-                    "latex": "",
-                }
-
         if "Units" in df.columns:
-            df["Units"] = df["Units"].apply(
-                lambda pint_unit: get_valid_unit_format(pint_unit)
-            )
+            df["Units"] = df["Units"].apply(_unit_formats)
         return df
 
     def _make_valid_json(self, df):
@@ -370,6 +381,45 @@ class FlowsheetSerializer:
         df = self._clean_units(df)
         return df
 
+    def _valid_json_rows(self, df) -> Dict:
+        """
+        Get the rows of a dataframe as valid JSON, with the same values as
+        rounding the values of _make_valid_json(df). This is quicker than
+        changing the dataframe itself, which matters for large flowsheets.
+        Args:
+            df: The Pandas dataframe
+        Return:
+            Dict of the rows, keyed by the string of their index
+        """
+        # (tolist() gives Python values, like to_dict())
+        return self._json_rows(
+            df.index, [(column, series.tolist()) for column, series in df.items()]
+        )
+
+    def _json_rows(self, keys, columns) -> Dict:
+        """
+        Get rows of valid JSON from the values of their columns.
+        Args:
+            keys: The keys of the rows
+            columns: List of (column name, list of values) pairs
+        Return:
+            Dict of the rows, keyed by the string of their keys
+        """
+        for column, values in columns:
+            for i, x in enumerate(values):
+                if x is None or isinstance(x, float):
+                    x = _valid_json_number(x)
+                if column == "Units":
+                    x = _unit_formats(x)
+                elif isinstance(x, (int, float)):
+                    x = round(x, self._sig_figs)
+                values[i] = x
+        # ensure that keys are strings (so it's valid JSON)
+        return {
+            str(k): {column: values[i] for column, values in columns}
+            for i, k in enumerate(keys)
+        }
+
     def _add_unit_model_with_ports(self, unit, unit_type):
         unit_name = unit.getname()
         if unit.parent_block() == self.flowsheet:
@@ -383,28 +433,8 @@ class FlowsheetSerializer:
             for port in unit.component_objects(Port, descend_into=False):
                 self.ports[port] = unit
 
-            performance_contents, stream_df = unit.serialize_contents()
-            if stream_df is not None and not stream_df.empty:
-                # If there is a stream dataframe then we need to reset the index so we can get the variable names
-                # and then rename the "index"
-                stream_df = stream_df.reset_index().rename(
-                    columns={"index": "Variable"}
-                )
-                stream_df = self._make_valid_json(stream_df)
-            self._serialized_contents[unit_name]["stream_contents"] = stream_df
-
-            performance_df = pd.DataFrame()
-            if performance_contents:
-                # If performance contents is not empty or None then stick it into a dataframe and convert the
-                # GeneralVars to actual values
-                performance_df = pd.DataFrame(
-                    performance_contents["vars"].items(), columns=["Variable", "Value"]
-                )
-                performance_df["Value"] = performance_df["Value"].map(value)
-                performance_df = self._make_valid_json(performance_df)
-            self._serialized_contents[unit_name][
-                "performance_contents"
-            ] = performance_df
+            # Contents are serialized once all the unit models are known
+            self._serialized_contents[unit_name] = unit
         elif unit in self._known_endpoints:
             # Unit is a subcomponent AND it is connected to an Arc. Or maybe it's in
             # an indexed block. Find the top-level parent unit and assign the
@@ -427,6 +457,43 @@ class FlowsheetSerializer:
             # The unit is neither top-level nor connected; do not display this unit, since it is a subcomponent.
             pass
 
+    def _serialize_unit_contents(self, unit):
+        """Serialize the performance and stream contents of a unit model."""
+        performance_contents, stream_df = unit.serialize_contents()
+        stream_contents = {}
+        if stream_df is not None and not stream_df.empty:
+            index = stream_df.index
+            if index.nlevels > 1 or index.name is not None or "index" in stream_df:
+                # We need to reset the index so we can get the variable names
+                # and then rename the "index"
+                stream_df = stream_df.reset_index().rename(
+                    columns={"index": "Variable"}
+                )
+                stream_contents = self._valid_json_rows(stream_df)
+            else:
+                # The same rows, without making a new dataframe
+                columns = [("Variable", index.tolist())]
+                columns.extend((c, series.tolist()) for c, series in stream_df.items())
+                stream_contents = self._json_rows(range(len(index)), columns)
+
+        performance_contents_json = {}
+        if performance_contents:
+            # If performance contents is not empty or None then convert the
+            # GeneralVars to actual values. (A Series gives the values the
+            # same types as a dataframe column would, e.g. ints are made
+            # floats if there are also floats.)
+            variables = performance_contents["vars"]
+            values = pd.Series([value(v) for v in variables.values()], dtype=None)
+            performance_contents_json = self._json_rows(
+                range(len(variables)),
+                [("Variable", list(variables)), ("Value", values.tolist())],
+            )
+
+        return {
+            "performance_contents": performance_contents_json,
+            "stream_contents": stream_contents,
+        }
+
     @staticmethod
     def get_unit_model_type(unit) -> str:
         """Get the 'type' of the unit model."""
@@ -517,48 +584,62 @@ class FlowsheetSerializer:
         return f"{base_name}_{self._unit_name_used_count[base_name]}"
 
     def _construct_output_json(self):
-        self._positioning_model = UnitModelsPositioning(self.adj_list, self.unit_models)
         self._construct_model_json()
-        self._construct_jointjs_json()
-
-    def _construct_model_json(self):
-        # pylint: disable-next=import-outside-toplevel
-        from idaes.core.util.tables import (
-            create_stream_table_ui,
-        )  # deferred to avoid circular import
-
-        # Get the stream table and add it to the model json
-        # Change the index of the pandas dataframe to not be the variables
-        self._stream_table_df = (
-            create_stream_table_ui(self.streams)
-            # Change the index of the pandas dataframe to not be the variables
-            .reset_index()
-            .rename(columns={"index": "Variable"})
-            .reset_index()
-            .rename(columns={"index": ""})
-            .applymap(
-                lambda x: round(x, self._sig_figs) if isinstance(x, (int, float)) else x
+        # The layout only depends on the structure of the flowsheet, so it can be
+        # reused if that hasn't changed (with the current stream labels)
+        key = self._layout_key()
+        with _layout_cache_lock:
+            cached = _layout_cache.get(key, None)
+            if cached is not None:
+                _layout_cache.move_to_end(key)
+        if cached is None:
+            self._positioning_model = UnitModelsPositioning(
+                self.adj_list, self.unit_models
             )
+            self._construct_jointjs_json()
+            # (stored as JSON, which is quicker to copy than the objects)
+            cached = json.dumps(
+                [self._out_json["cells"], self._out_json["routing_config"]]
+            )
+            with _layout_cache_lock:
+                _layout_cache[key] = cached
+                while len(_layout_cache) > _layout_cache_size:
+                    _layout_cache.popitem(last=False)
+        else:
+            cells, routing_config = json.loads(cached)
+            for cell in cells:
+                if cell["type"] == "standard.Link":
+                    cell["labels"][0]["attrs"]["text"]["text"] = self.labels[cell["id"]]
+            self._out_json["cells"] = cells
+            self._out_json["routing_config"] = routing_config
+
+    def _layout_key(self):
+        """Structure of the flowsheet that its layout is computed from: the
+        names and types of the unit models and the ends of the edges."""
+        return (
+            tuple((u["name"], u["type"]) for u in self.unit_models.values()),
+            tuple(
+                (k, e["source"].getname(), e["dest"].getname())
+                for k, e in self.edges.items()
+            ),
         )
 
-        # Change NaNs to None for JSON
-        self._stream_table_df = self._stream_table_df.where(
-            (pd.notnull(self._stream_table_df)), None
-        )
-
-        self._stream_table_df = self._make_valid_json(self._stream_table_df)
+    def _unit_icon(self, unit_type) -> UnitModelIcon:
+        """Icon of a unit model type, for looking up its image and routing."""
+        if unit_type not in self._icons:
+            self._icons[unit_type] = UnitModelIcon(unit_type)
+        return self._icons[unit_type]
 
-        # Order the stream table based on the right order:
-        # feed streams -> middle streams -> product streams
-        self._ordered_stream_names.appendleft("Units")
-        self._ordered_stream_names.appendleft("Variable")
-        self._stream_table_df = self._stream_table_df[self._ordered_stream_names]
-
-        # Puts df in this format for easier parsing in the javascript table:
-        # {'index': ["('Liq', 'benzene')", "('Liq', 'toluene')", "('Liq', 'hydrogen')", "('Liq', 'methane')", "('Vap', 'benzene')", "('Vap', 'toluene')", "('Vap', 'hydrogen')", "('Vap', 'methane')", 'temperature', 'pressure'],
-        # 'columns': ['s03', 's04', 's05', 's06', 's08', 's09', 's10'],
-        # 'data': [[0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [298.15, 298.15, 298.15, 298.15, 298.15, 298.15, 298.15], [101325.0, 101325.0, 101325.0, 101325.0, 101325.0, 101325.0, 101325.0]]}
-        self._out_json["model"]["stream_table"] = self._stream_table_df.to_dict("split")
+    def _construct_model_json(self):
+        # Get the stream table and add it to the model json
+        signature = tuple(
+            (k, self._stream_signature(sb)) for k, sb in self._stream_states.items()
+        ) + (tuple(self._ordered_stream_names),)
+        stream_table = self._cache_get("stream_table", None, signature)
+        if stream_table is None:
+            stream_table = self._serialize_stream_table()
+            self._cache_set("stream_table", None, signature, stream_table)
+        self._out_json["model"]["stream_table"] = stream_table
 
         self._out_json["model"]["id"] = self.name
         self._out_json["model"]["unit_models"] = {}
@@ -567,26 +648,21 @@ class FlowsheetSerializer:
         for unit_model in self.unit_models.values():
             unit_name = unit_model["name"]
             unit_type = unit_model["type"]
-            unit_icon = UnitModelIcon(unit_type)
+            unit_icon = self._unit_icon(unit_type)
 
             unit_contents = {
                 "type": unit_type,
                 "image": "/images/icons/" + unit_icon.icon,
             }
             if unit_name in self._serialized_contents:
-                for pfx in "performance", "stream":
-                    content_type = pfx + "_contents"
-                    c = (
-                        self._serialized_contents[unit_name][content_type]
-                        .applymap(
-                            lambda x: round(x, self._sig_figs)
-                            if isinstance(x, (int, float))
-                            else x
-                        )
-                        .to_dict("index")
+                signature = self._unit_signature(unit_name)
+                contents = self._cache_get("units", unit_name, signature)
+                if contents is None:
+                    contents = self._serialize_unit_contents(
+                        self._serialized_contents[unit_name]
                     )
-                    # ensure that keys are strings (so it's valid JSON)
-                    unit_contents[content_type] = {str(k): v for k, v in c.items()}
+                    self._cache_set("units", unit_name, signature, contents)
+                unit_contents.update(contents)
 
             self._out_json["model"]["unit_models"][unit_name] = unit_contents
 
@@ -597,6 +673,96 @@ class FlowsheetSerializer:
                 "label": self.labels[edge],
             }
 
+    def _serialize_stream_table(self):
+        # pylint: disable-next=import-outside-toplevel
+        from idaes.core.util.tables import (
+            _stream_table_ui_dataframe,
+            _stream_table_ui_rows,
+        )  # deferred to avoid circular import
+
+        stream_rows = {}
+        for stream_name, sb in self._stream_states.items():
+            signature = self._stream_signature(sb)
+            rows = self._cache_get("stream_rows", stream_name, signature)
+            if rows is None:
+                rows = _stream_table_ui_rows(sb)
+                self._cache_set("stream_rows", stream_name, signature, rows)
+            stream_rows[stream_name] = rows
+
+        # Change the index of the pandas dataframe to not be the variables
+        stream_table_df = (
+            _stream_table_ui_dataframe(stream_rows)
+            # Change the index of the pandas dataframe to not be the variables
+            .reset_index()
+            .rename(columns={"index": "Variable"})
+            .reset_index()
+            .rename(columns={"index": ""})
+            .applymap(
+                lambda x: round(x, self._sig_figs) if isinstance(x, (int, float)) else x
+            )
+        )
+
+        # Change NaNs to None for JSON
+        stream_table_df = stream_table_df.where((pd.notnull(stream_table_df)), None)
+
+        stream_table_df = self._make_valid_json(stream_table_df)
+
+        # Order the stream table based on the right order:
+        # feed streams -> middle streams -> product streams
+        ordered_stream_names = ["Variable", "Units"] + list(self._ordered_stream_names)
+        self._stream_table_df = stream_table_df[ordered_stream_names]
+
+        # Puts df in this format for easier parsing in the javascript table:
+        # {'index': ["('Liq', 'benzene')", "('Liq', 'toluene')", "('Liq', 'hydrogen')", "('Liq', 'methane')", "('Vap', 'benzene')", "('Vap', 'toluene')", "('Vap', 'hydrogen')", "('Vap', 'methane')", 'temperature', 'pressure'],
+        # 'columns': ['s03', 's04', 's05', 's06', 's08', 's09', 's10'],
+        # 'data': [[0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [298.15, 298.15, 298.15, 298.15, 298.15, 298.15, 298.15], [101325.0, 101325.0, 101325.0, 101325.0, 101325.0, 101325.0, 101325.0]]}
+        return self._stream_table_df.to_dict("split")
+
+    # === Change tracking (see SerializationCache) ===
+
+    def _cache_get(self, section, key, signature):
+        """Get a cached value, or None if there is no cache or the cached value
+        was computed from a different signature."""
+        if self._cache is None or signature is None:
+            return None
+        try:
+            cached_signature, cached = getattr(self._cache, section)[key]
+        except KeyError:
+            return None
+        if cached_signature != signature:
+            return None
+        return cached
+
+    def _cache_set(self, section, key, signature, val):
+        if self._cache is not None and signature is not None:
+            getattr(self._cache, section)[key] = (signature, val)
+
+    def _unit_signature(self, unit_name):
+        """Signature of the values in a unit model (or other block in the
+        flowsheet), and the values in the flowsheet that are not in any unit
+        model, e.g. property parameters, which any part of the flowsheet may
+        depend on."""
+        if self._signatures is None or unit_name not in self._signatures:
+            return None
+        if self._shared_signature is None:
+            unit_names = {u["name"] for u in self.unit_models.values()}
+            self._shared_signature = tuple(
+                v for k, v in self._signatures.items() if k not in unit_names
+            )
+        return self._signatures[unit_name], self._shared_signature
+
+    def _stream_signature(self, sb):
+        """Signature of the unit model (or other block in the flowsheet) that a
+        stream's state block is in."""
+        if self._signatures is None:
+            return None
+        blk = sb
+        while blk is not None and blk.parent_block() is not self.flowsheet:
+            blk = blk.parent_block()
+        if blk is None:
+            return None
+        return self._unit_signature(blk.getname())
+
     def _add_port_item(self, cell_index, group, _id):
         """Add port item to jointjs element"""
         new_port_item = {"group": group, "id": _id}
@@ -649,23 +815,33 @@ class FlowsheetSerializer:
 
             src_unit_name = self.unit_models[src]["name"]
             src_unit_type = self.unit_models[src]["type"]
-            src_unit_icon = UnitModelIcon(src_unit_type)
+            src_unit_icon = self._unit_icon(src_unit_type)
 
             dest_unit_name = self.unit_models[dest]["name"]
             dest_unit_type = self.unit_models[dest]["type"]
-            dest_unit_icon = UnitModelIcon(dest_unit_type)
+            dest_unit_icon = self._unit_icon(dest_unit_type)
 
+            # Each element gets its own icon, since its port items are added to
+            # the icon's link positions
             if src_unit_name not in track_jointjs_elements:
                 x_pos, y_pos = self._positioning_model.get_position(src_unit_name)
                 cell_index = create_jointjs_image(
-                    src_unit_icon, src_unit_name, src_unit_type, x_pos, y_pos
+                    UnitModelIcon(src_unit_type),
+                    src_unit_name,
+                    src_unit_type,
+                    x_pos,
+                    y_pos,
                 )
                 track_jointjs_elements[src_unit_name] = cell_index
 
             if dest_unit_name not in track_jointjs_elements:
                 x_pos, y_pos = self._positioning_model.get_position(dest_unit_name)
                 cell_index = create_jointjs_image(
-                    dest_unit_icon, dest_unit_name, dest_unit_type, x_pos, y_pos
+                    UnitModelIcon(dest_unit_type),
+                    dest_unit_name,
+                    dest_unit_type,
+                    x_pos,
+                    y_pos,
                 )
                 track_jointjs_elements[dest_unit_name] = cell_index
 
@@ -832,6 +1008,161 @@ class FlowsheetSerializer:
             return self.id
 
 
+def _valid_json_number(x):
+    """Replace NaN (or None), Infinity, and Negative Infinity with strings, like
+    FlowsheetSerializer._clean_values()"""
+    if x is None or x != x:
+        return "NaN"
+    if x == np.inf:
+        return "Inf"
+    if x == np.NINF:
+        return "-Inf"
+    return x
+
+
+def _unit_formats(pint_unit):
+    """Get different formats from the Units' pint object"""
+    if isinstance(pint_unit, pint.Unit):
+        # formatting units is slow, and there are only a few different ones
+        raw, html, latex = _pint_unit_formats(pint_unit)
+        return {"raw": raw, "html": html, "latex": latex}
+    return {
+        "raw": str(pint_unit),
+        "html": "",
+        "latex": "",
+    }
+
+
+@functools.lru_cache(maxsize=1024)
+def _pint_unit_formats(pint_unit):
+    return str(pint_unit), "{:~H}".format(pint_unit), "{:~L}".format(pint_unit)
+
+
+class SerializationCache:
+    """Parts of a serialized flowsheet, with the signatures of the values they
+    were serialized from.
+
+    Pass the same instance to each :class:`FlowsheetSerializer` of a flowsheet,
+    so that only the unit models and streams whose values or structure changed
+    since the last serialization are serialized again. (The layout of the
+    diagram is cached by :class:`FlowsheetSerializer` for all flowsheets, keyed
+    by their unit models and arcs, so it does not need this cache.)
+
+    Changes are detected by comparing the values and fixed status of the
+    variables and the values of the mutable parameters in each block of the
+    flowsheet, so changes to components outside the flowsheet are not
+    detected.
+    """
+
+    def __init__(self):
+        #: Signature of the flowsheet when it was last serialized
+        self.signature = None
+        # Structure of the flowsheet (and its components, which are kept so
+        # that their ids stay unique), and the variables and mutable parameters
+        # in each of its blocks, which are only collected again if the
+        # structure changes
+        self._structure = None
+        self._structure_components = None
+        self._value_components = None
+        # {key: (signature, value)} for each part of the output
+        self.units = {}
+        self.labels = {}
+        self.stream_rows = {}
+        self.stream_table = {}
+
+    def is_current(self, flowsheet) -> bool:
+        """Whether the flowsheet has the same structure and values as when it
+        was last serialized with this cache.
+
+        Args:
+            flowsheet: The flowsheet
+
+        Returns:
+            True if the flowsheet has not changed
+        """
+        return (
+            self.signature is not None
+            and self.signature == self.flowsheet_signature(flowsheet)
+        )
+
+    def flowsheet_signature(self, flowsheet):
+        """Signature of the structure and values of a flowsheet, as a tuple of
+        the structure and a dict of the signatures of the values in each block
+        of the flowsheet (with key None for components of the flowsheet itself).
+
+        Args:
+            flowsheet: The flowsheet
+
+        Returns:
+            Tuple of the structure and the dict of value signatures
+        """
+        structure, components = _flowsheet_structure(flowsheet)
+        if structure != self._structure:
+            self._value_components = {
+                None: _value_components(flowsheet, descend_into=False)
+            }
+            for blk in flowsheet.component_data_objects(Block, descend_into=False):
+                self._value_components[blk.getname()] = _value_components(
+                    blk, descend_into=True
+                )
+            self._structure = structure
+            self._structure_components = components
+        values = {k: _values_signature(*c) for k, c in self._value_components.items()}
+        return structure, values
+
+    def clear(self):
+        """Remove all cached values."""
+        self.__init__()
+
+
+def _flowsheet_structure(flowsheet):
+    """Structure of a flowsheet: the ids and types of its blocks, arcs, ports,
+    variables and parameters, with the ports of the arcs and the sizes of the
+    variables and parameters. (Ids are much quicker than names, and can be
+    compared as long as the components are kept.)
+
+    Returns:
+        Tuple of the structure and the list of components
+    """
+    structure, components = [], []
+    for c in flowsheet.component_objects(
+        (Block, Arc, Port, Var, Param), descend_into=True
+    ):
+        components.append(c)
+        if isinstance(c, Arc):
+            structure.append(
+                tuple((k, tuple(id(p) for p in a.ports)) for k, a in c.items())
+            )
+            components.extend(p for a in c.values() for p in a.ports)
+        elif (c.ctype is Var or c.ctype is Param) and not c.is_reference():
+            # (references are left out, since their size is slow to compute)
+            structure.append((id(c), type(c), len(c)))
+        else:
+            structure.append((id(c), type(c)))
+    return tuple(structure), components
+
+
+def _value_components(blk, descend_into):
+    """Variables, and mutable parameters, in a block."""
+    variables = tuple(blk.component_data_objects(Var, descend_into=descend_into))
+    params = []
+    for p in blk.component_objects(Param, descend_into=descend_into):
+        if p.mutable:
+            params.extend(p.values())
+    return variables, tuple(params)
+
+
+def _values_signature(variables, params):
+    """Values and fixed status of the variables, and values of the mutable
+    parameters, from _value_components()."""
+    signature = []
+    for v in variables:
+        signature.append(v.value)
+        signature.append(v.fixed)
+    signature.extend(p.value for p in params)
+    return tuple(signature)
+
+
 class FlowsheetDiff:
     """Compute a flowsheet model 'diff' and use that to compute an updated layout.
 
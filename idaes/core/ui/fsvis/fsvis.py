@@ -56,6 +56,7 @@ def visualize(
     load_from_saved: bool = True,
     save_dir: Optional[Path] = None,
     save_time_interval=5000,  # 5 seconds
+    save_delay: float = 1.0,
     overwrite: bool = False,
     browser: bool = True,
     port: Optional[int] = None,
@@ -83,6 +84,9 @@ def visualize(
            the default. If ``save`` is given and an absolute path, this argument is ignored.
         save_time_interval: The time interval that the UI application checks if any changes has occurred
             in the graph for it to save the model. Default is 5 seconds
+        save_delay: Minimum time, in seconds, between writes of the save file. Saves in between
+            (e.g. while nodes are moved in the UI) are combined into one write. If 0, every save is
+            written to the file immediately. See :class:`idaes.core.ui.fsvis.persist.WriteBehindDataStore`.
         overwrite: If True, and the file given by ``save`` exists, overwrite instead of creating a new
           numbered file.
         browser: If true, open a browser
@@ -164,12 +168,20 @@ def visualize(
         else:
             if not quiet:
                 print(f"Saving flowsheet to {str(datastore)}")
+        if save_delay:
+            datastore = persist.WriteBehindDataStore(datastore, delay=save_delay)
 
     # Add our flowsheet to it
     try:
         new_name = web_server.add_flowsheet(name, flowsheet, datastore)
     except (errors.ProcessingError, errors.DatastoreError) as err:
         raise errors.VisualizerError(f"Cannot add flowsheet: {err}")
+    if isinstance(datastore, persist.WriteBehindDataStore):
+        # the save file is up to date when this function returns
+        try:
+            datastore.flush()
+        except errors.DatastoreError as err:
+            raise errors.VisualizerError(f"Cannot save flowsheet: {err}")
 
     if new_name != name:
         _log.warning(f"Flowsheet name changed: old='{name}' new='{new_name}'")
@@ -19,19 +19,23 @@ The main class is `FlowsheetServer`, which is instantiated from the `visualize()
 # pylint: disable=missing-function-docstring
 
 # stdlib
+import gzip
+import hashlib
 import http.server
 import json
+import os
 from pathlib import Path
 import re
 import socket
+import socketserver
 import threading
-from typing import Dict, Union
+from typing import Dict, Tuple, Union
 from urllib.parse import urlparse
 import time
 
 # package
 from idaes import logger
-from ..flowsheet import FlowsheetDiff, FlowsheetSerializer
+from ..flowsheet import FlowsheetDiff, FlowsheetSerializer, SerializationCache
 from . import persist, errors
 
 _log = logger.getLogger(__name__)
@@ -41,8 +45,13 @@ _this_dir = Path(__file__).parent.absolute()
 _static_dir = _this_dir / "static"
 _template_dir = _this_dir / "templates"
 
+# Responses smaller than this are not compressed
+_gzip_min_size = 1024
+# MIME types of static files which are worth compressing
+_gzip_types = ("text/", "application/javascript", "application/json", "image/svg")
 
-class FlowsheetServer(http.server.HTTPServer):
+
+class FlowsheetServer(http.server.ThreadingHTTPServer):
     """A simple HTTP server that runs in its own thread.
 
     This server is used for *all* models for a given process, so every request needs to contain
@@ -50,15 +59,36 @@ class FlowsheetServer(http.server.HTTPServer):
 
     The only methods that the visualization function needs to call are the constructor, `start()` to
      start running the server, and `add_flowsheet()`, to a add a new flowsheet.
+
+    By default, each connection is handled in its own thread and connections
+    are kept alive between requests (HTTP/1.1), so static files and other
+    flowsheets are served while a flowsheet is being serialized. Requests for
+    the same flowsheet are handled one at a time.
     """
 
-    def __init__(self, port=None):
-        """Create HTTP server"""
+    # don't wait for open (keep-alive) connections when the server is closed
+    daemon_threads = True
+
+    def __init__(self, port=None, threaded: bool = True):
+        """Create HTTP server
+
+        Args:
+            port: Port to listen on, if None find a free port
+            threaded: If True, handle each connection in a new thread, otherwise
+                handle one request at a time
+        """
         self._port = port or find_free_port()
+        self._threaded = threaded
         _log.info(f"Starting HTTP server on localhost, port {self._port}")
         super().__init__(("127.0.0.1", self._port), FlowsheetServerHandler)
         self._dsm = persist.DataStoreManager()
         self._flowsheets = {}
+        self._caches = {}  # {id: SerializationCache}
+        self._responses = {}  # {id: (JSON, entity tag)} of last flowsheet sent
+        self._compressed = {}  # {id: (gzipped JSON, entity tag)}
+        self._locks = {}  # {id: lock for the flowsheet}
+        self._lock = threading.Lock()  # protects self._locks
+        self._static = {}  # {(path, gzip): (file stat, (content, entity tag))}
         self._thr = None
         self._settings_block = {}
 
@@ -66,6 +96,16 @@ class FlowsheetServer(http.server.HTTPServer):
     def port(self):
         return self._port
 
+    @property
+    def threaded(self) -> bool:
+        return self._threaded
+
+    def process_request(self, request, client_address):
+        if self._threaded:
+            super().process_request(request, client_address)
+        else:
+            socketserver.TCPServer.process_request(self, request, client_address)
+
     def start(self):
         """Start the server, which will spawn a thread."""
         self._thr = threading.Thread(target=self._run)
@@ -118,19 +158,22 @@ class FlowsheetServer(http.server.HTTPServer):
         """
         # replace all but 'unreserved' (RFC 3896) chars with a dash; remove duplicate dashes
         id_ = self.canonical_flowsheet_name(id_)
-        self._flowsheets[id_] = flowsheet
-        _log.debug(f"Flowsheet '{id_}' storage is {store}")
-        self._dsm.add(id_, store)
-        # First try to update, so as not to overwrite saved value
-        try:
-            self.update_flowsheet(id_)
-        except errors.FlowsheetNotFoundInDatastore:
-            _log.debug(f"No existing flowsheet found in {store}: saving new value")
-            # If not found in datastore, save new value
-            fs_dict = FlowsheetSerializer(flowsheet, id_).as_dict()
-            store.save(fs_dict)
-        else:
-            _log.debug(f"Existing flowsheet found in {store}: saving merged value")
+        with self._flowsheet_lock(id_):
+            self._flowsheets[id_] = flowsheet
+            self._caches[id_] = SerializationCache()
+            self._clear_responses(id_)
+            _log.debug(f"Flowsheet '{id_}' storage is {store}")
+            self._dsm.add(id_, store)
+            # First try to update, so as not to overwrite saved value
+            try:
+                self.update_flowsheet(id_)
+            except errors.FlowsheetNotFoundInDatastore:
+                _log.debug(f"No existing flowsheet found in {store}: saving new value")
+                # If not found in datastore, save new value
+                fs_dict = self._serialize_flowsheet(id_, flowsheet)
+                store.save(fs_dict)
+            else:
+                _log.debug(f"Existing flowsheet found in {store}: saving merged value")
         return id_
 
     @staticmethod
@@ -156,12 +199,15 @@ class FlowsheetServer(http.server.HTTPServer):
         Raises:
             ProcessingError, if parsing of JSON failed (see :meth:`DataStoreManager.save()`)
         """
-        try:
-            self._dsm.save(id_, flowsheet)
-        except errors.DatastoreError as err:
-            raise errors.ProcessingError(f"While saving flowsheet: {err}")
-        except KeyError as err:
-            raise errors.ProcessingError(f"While saving flowsheet: {err}")
+        with self._flowsheet_lock(id_):
+            # the saved layout is part of the flowsheet sent to the UI
+            self._clear_responses(id_)
+            try:
+                self._dsm.save(id_, flowsheet)
+            except errors.DatastoreError as err:
+                raise errors.ProcessingError(f"While saving flowsheet: {err}")
+            except KeyError as err:
+                raise errors.ProcessingError(f"While saving flowsheet: {err}")
 
     def update_flowsheet(self, id_: str) -> Dict:
         """Update flowsheet.
@@ -179,6 +225,11 @@ class FlowsheetServer(http.server.HTTPServer):
             FlowsheetNotFound (subclass) if the flowsheet id is known, but it can't be retrieved
             ProcessingError for internal errors
         """
+        with self._flowsheet_lock(id_):
+            return self._update_flowsheet(id_)
+
+    def _update_flowsheet(self, id_: str) -> Dict:
+        self._clear_responses(id_)
         # Get saved flowsheet from datastore
         try:
             saved = self._load_flowsheet(id_)
@@ -209,8 +260,87 @@ class FlowsheetServer(http.server.HTTPServer):
         # Return [a copy of the] merged value
         return diff.merged(do_copy=True)
 
+    def get_flowsheet_json(self, id_: str, compress: bool = False) -> Tuple[bytes, str]:
+        """Get the updated flowsheet as JSON, with an entity tag for it.
+
+        If the flowsheet in memory and its saved layout haven't changed since
+        the last call, the same JSON is returned without serializing the
+        flowsheet again. Otherwise, this is the (encoded) result of
+        :meth:`update_flowsheet`.
+
+        Args:
+            id_: Identifier of flowsheet to update.
+            compress: If True, return the JSON compressed with gzip. The
+                compressed JSON has a different entity tag.
+
+        Returns:
+            Tuple of the UTF-8 encoded (and maybe compressed) JSON and its
+            entity tag
+
+        Raises:
+            See :meth:`update_flowsheet`
+        """
+        with self._flowsheet_lock(id_):
+            response = self._responses.get(id_, None)
+            if response is not None:
+                try:
+                    if not self._caches[id_].is_current(self._flowsheets[id_]):
+                        response = None
+                except (KeyError, AttributeError):
+                    # flowsheet was removed or is invalid, let update_flowsheet()
+                    # raise the appropriate error
+                    response = None
+            if response is None:
+                merged = self._update_flowsheet(id_)
+                value = utf8_encode(json.dumps(merged))
+                etag = f'"{hashlib.sha1(value).hexdigest()}"'
+                response = self._responses[id_] = (value, etag)
+            if not compress:
+                return response
+            if id_ not in self._compressed:
+                value, etag = response
+                self._compressed[id_] = (gzip_compress(value), f'{etag[:-1]}-gzip"')
+            return self._compressed[id_]
+
+    def get_static_file(self, path: str, compress: bool = False) -> Tuple[bytes, str]:
+        """Get the contents of a static file, with an entity tag for them.
+        They are cached in memory until the file changes.
+
+        Args:
+            path: Path of the file
+            compress: If True, compress the contents with gzip
+
+        Returns:
+            Tuple of the contents of the file and their entity tag
+
+        Raises:
+            OSError if the file can't be read
+        """
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (path, compress)
+        cached = self._static.get(key, None)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with open(path, "rb") as fp:
+            content = fp.read()
+        if compress:
+            content = gzip_compress(content)
+        response = (content, f'"{hashlib.sha1(content).hexdigest()}"')
+        self._static[key] = (stamp, response)
+        return response
+
     # === Internal methods ===
 
+    def _flowsheet_lock(self, id_) -> threading.RLock:
+        """Get the lock for requests which use or change a flowsheet."""
+        with self._lock:
+            return self._locks.setdefault(id_, threading.RLock())
+
+    def _clear_responses(self, id_):
+        self._responses.pop(id_, None)
+        self._compressed.pop(id_, None)
+
     def _load_flowsheet(self, id_) -> Union[Dict, str]:
         return self._dsm.load(id_)
 
@@ -218,10 +348,11 @@ class FlowsheetServer(http.server.HTTPServer):
         """Get a flowsheet with the given ID."""
         return self._flowsheets[id_]
 
-    @staticmethod
-    def _serialize_flowsheet(id_, flowsheet):
+    def _serialize_flowsheet(self, id_, flowsheet):
+        # reuse unchanged parts of the last serialization of the flowsheet
+        cache = self._caches.get(id_, None)
         try:
-            result = FlowsheetSerializer(flowsheet, id_).as_dict()
+            result = FlowsheetSerializer(flowsheet, id_, cache=cache).as_dict()
         except (AttributeError, KeyError) as err:
             raise ValueError(f"Error serializing flowsheet: {err}")
         return result
@@ -239,11 +370,19 @@ class FlowsheetServer(http.server.HTTPServer):
 class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
     """Handle requests from the IDAES flowsheet visualization (IFV) web page."""
 
-    def __init__(self, *args, **kwargs):
+    #: Seconds that browsers may use static files without checking for changes
+    static_max_age = 3600
+    #: Seconds after which an idle (keep-alive) connection is closed
+    timeout = 60
+
+    def __init__(self, request, client_address, server, **kwargs):
         self.directory = (
             None  # silence warning about initialization outside constructor
         )
-        super().__init__(*args, **kwargs)
+        # Keep connections alive only if they don't block other clients
+        if getattr(server, "threaded", False):
+            self.protocol_version = "HTTP/1.1"
+        super().__init__(request, client_address, server, **kwargs)
         # Server should return text/javascript MIME type for served JS files (issue 259)
         self.extensions_map[".js"] = "text/javascript"
 
@@ -284,7 +423,7 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
         else:
             # Try to serve a file
             self.directory = _static_dir  # keep here: overwritten if set earlier
-            super().do_GET()
+            self._get_static()
 
     def _get_app(self, id_):
         """Read index file, process to insert flowsheet identifier, and return it."""
@@ -303,8 +442,9 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
         Returns:
             None
         """
+        compress = self._accepts_gzip()
         try:
-            merged = self.server.update_flowsheet(id_)
+            value, etag = self.server.get_flowsheet_json(id_, compress=compress)
         except errors.FlowsheetUnknown as err:
             # User error: user asked for a flowsheet by an unknown ID
             self.send_error(404, message=str(err))
@@ -313,8 +453,41 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
             # Internal error: flowsheet ID is found, but other things are missing
             self.send_error(500, message=str(err))
             return
-        # Return merged flowsheet
-        self._write_json(200, merged)
+        # Return merged flowsheet, unless the client has the same version
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(self.headers.get("If-None-Match", None), etag):
+            self._write_not_modified(headers)
+            return
+        self._write_json_value(200, value, headers=headers, compressed=compress)
+
+    def _get_static(self):
+        """Get a file from the static directory, compressed if the client
+        accepts it, with headers that let the client cache it.
+        """
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            # let the base class deal with directories and missing files
+            super().do_GET()
+            return
+        content_type = self.guess_type(path)
+        try:
+            stat = os.stat(path)
+            compressed = self._accepts_gzip() and _should_compress(
+                content_type, stat.st_size
+            )
+            content, etag = self.server.get_static_file(path, compress=compressed)
+        except OSError:
+            self.send_error(404, "File not found")
+            return
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={self.static_max_age}",
+            "Last-Modified": self.date_time_string(stat.st_mtime),
+        }
+        if etag_matches(self.headers.get("If-None-Match", None), etag):
+            self._write_not_modified(headers)
+            return
+        self._write_value(200, content_type, content, headers, compressed)
 
     def _get_setting(self, setting_key_: str):
         """Get setting value.
@@ -335,6 +508,9 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
         u, queries = self._parse_flowsheet_url(self.path)
         id_ = queries.get("id", None) if queries else None
         _log.info(f"do_PUT: route={u} id={id_}")
+        if u.path != "/fs" or id_ is None:
+            # the request body is not read, so the connection can't be reused
+            self.close_connection = True
         if u.path in ("/fs",) and id_ is None:
             self._write_text(
                 400, message=f"Query parameter 'id' is required for '{u.path}'"
@@ -360,6 +536,10 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
 
     # === Internal methods ===
 
+    def _accepts_gzip(self) -> bool:
+        """Whether the client accepts responses compressed with gzip."""
+        return accepts_encoding(self.headers.get("Accept-Encoding", None), "gzip")
+
     def _write_text(self, code, message: str):
         value = utf8_encode(message)
         self.send_response(code)
@@ -369,14 +549,44 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
         self.wfile.write(value)
 
     def _write_json(self, code, data):
-        str_json = json.dumps(data)
-        value = utf8_encode(str_json)
+        value = utf8_encode(json.dumps(data))
+        compress = len(value) >= _gzip_min_size and self._accepts_gzip()
+        if compress:
+            value = gzip_compress(value)
+        self._write_json_value(code, value, compressed=compress)
+
+    def _write_json_value(
+        self, code, value: bytes, headers: Dict = None, compressed: bool = False
+    ):
+        self._write_value(code, "application/json", value, headers, compressed)
+
+    def _write_value(
+        self,
+        code,
+        content_type: str,
+        value: bytes,
+        headers: Dict = None,
+        compressed: bool = False,
+    ):
         self.send_response(code)
-        self.send_header("Content-type", "application/json")
+        self.send_header("Content-type", content_type)
         self.send_header("Content-length", str(len(value)))
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        # the response depends on whether the client accepts gzip
+        self.send_header("Vary", "Accept-Encoding")
+        for key, val in (headers or {}).items():
+            self.send_header(key, val)
         self.end_headers()
         self.wfile.write(value)
 
+    def _write_not_modified(self, headers: Dict):
+        self.send_response(304)
+        self.send_header("Vary", "Accept-Encoding")
+        for key, val in headers.items():
+            self.send_header(key, val)
+        self.end_headers()
+
     def _write_html(self, code, page):
         value = utf8_encode(page)
         self.send_response(code)
@@ -411,6 +621,71 @@ def utf8_decode(b: bytes):
     return b.decode(encoding="utf-8")
 
 
+def gzip_compress(b: bytes) -> bytes:
+    # mtime=0 so the same content always gives the same bytes (and entity tag)
+    return gzip.compress(b, compresslevel=6, mtime=0)
+
+
+def _should_compress(content_type: str, size: int) -> bool:
+    """Whether a static file is worth compressing."""
+    return size >= _gzip_min_size and content_type.startswith(_gzip_types)
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """Whether the value of an Accept-Encoding header allows an encoding
+    (see RFC 7231). Codings with a quality value of zero are not accepted.
+
+    Args:
+        accept_encoding: Value of the header, or None if there isn't one
+        encoding: Content coding, e.g. "gzip"
+
+    Returns:
+        True if the encoding is accepted
+    """
+    if not accept_encoding:
+        return False
+    wildcard = False
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, val = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(val)
+                except ValueError:
+                    quality = 0.0
+        if name == encoding:
+            return quality > 0
+        if name == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an entity tag matches the value of an If-None-Match header
+    (using weak comparison, see RFC 7232).
+
+    Args:
+        if_none_match: Value of the header, or None if there isn't one
+        etag: Entity tag
+
+    Returns:
+        True if the tag matches
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return _strip_weak(etag) in [_strip_weak(t) for t in tags]
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
 def find_free_port():
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     s.bind(("127.0.0.1", 0))
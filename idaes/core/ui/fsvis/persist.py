@@ -13,7 +13,9 @@
 """
 Storage of models for the IDAES Flowsheet Visualizer.
 
-Currently implemented methods are trivial storage in memory and storage to a file.
+Currently implemented methods are trivial storage in memory and storage to a file,
+and a store that combines saves made in quick succession before writing them to
+another store.
 """
 # TODO: Missing docstrings
 # pylint: disable=missing-class-docstring
@@ -21,9 +23,17 @@ Currently implemented methods are trivial storage in memory and storage to a fil
 
 # stdlib
 from abc import ABC, abstractmethod
+import atexit
+import copy
 import json
+import os
 from pathlib import Path
-from typing import Dict, Union
+import stat
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Union
+import weakref
 
 # package
 from idaes import logger
@@ -86,6 +96,16 @@ class DataStore(ABC):
         return ""
 
 
+def _file_mode(path):
+    """Mode of an existing file, or the mode a new file gets with the current umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
 class FileDataStore(DataStore):
     def __init__(self, path: Path):
         self._p = path
@@ -97,6 +117,9 @@ class FileDataStore(DataStore):
     def save(self, data):
         """Save data to a file.
 
+        The data is written to a temporary file, which then replaces the file,
+        so the file is never partially written.
+
         Args:
             data: If a dict, must be serializable by `json.dump()`, otherwise
                   treated as a string of JSON (e.g. '{"name": "value"}')
@@ -107,20 +130,43 @@ class FileDataStore(DataStore):
         Raises:
             DataStoreError, if serialization or I/O fails
         """
+        if isinstance(data, dict):
+            try:
+                text = json.dumps(data)
+            except (TypeError, ValueError) as err:
+                raise errors.DatastoreSerializeError(data, err, stream=self._p)
+        else:
+            text = str(data)
+            _parse_json(text)  # validation
+        self.write_text(text)
+
+    def write_text(self, text: str):
+        """Write a string of JSON to the file, without validating it.
+
+        Args:
+            text: JSON to write
+
+        Returns:
+            None
+
+        Raises:
+            DatastoreSaveError, if I/O fails
+        """
         _log.debug(f"Save to file: {self._p}")
+        tmp = None
         try:
-            with self._p.open("w") as fp:
-                if isinstance(data, dict):
-                    try:
-                        json.dump(data, fp)
-                    except TypeError as err:
-                        raise errors.DatastoreSerializeError(data, err, stream=fp)
-                else:
-                    _parse_json(data)  # validation
-                    fp.write(str(data))
-        except ValueError as err:
-            raise errors.DatastoreError(str(err))
-        except IOError as err:
+            fd, tmp = tempfile.mkstemp(
+                dir=self._p.parent, prefix=f".{self._p.name}.", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w") as fp:
+                fp.write(text)
+            # mkstemp creates the file with mode 0600, keep the mode of the
+            # existing file (or the default mode for a new file)
+            os.chmod(tmp, _file_mode(self._p))
+            os.replace(tmp, self._p)
+        except (IOError, OSError) as err:
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
             raise errors.DatastoreSaveError(f"IO error with datastore: {err}")
 
     def load(self):
@@ -181,6 +227,298 @@ class MemoryDataStore(DataStore):
         return "__MEMORY__"
 
 
+class WriteBehindDataStore(DataStore):
+    """Save data to another store, combining saves that come in quick succession
+    (e.g. while nodes are dragged in the UI) into one write.
+
+    The first save after a quiet period is written immediately. Saves made within
+    ``delay`` seconds of the last write are kept in memory and only the last of
+    them is written, in a background thread, ``delay`` seconds after the previous
+    write. Saves of the data that was last written are not written again. Loads
+    return the last saved data, whether or not it has been written yet.
+
+    Data that has not been written yet is written by :meth:`flush` and
+    :meth:`close`. Stores are closed when the Python interpreter exits.
+
+    Args:
+        store: Store to write the data to
+        delay: Minimum time between writes, in seconds
+        layout_delta: If True, and only the layout (the cells and the routing
+            configuration) changed since the last write, append the cells that
+            changed to a file next to the saved file (with the suffix ".delta")
+            instead of writing all the data. The deltas are combined with the
+            saved file by :meth:`close`, and after ``max_deltas`` of them.
+            Requires a FileDataStore.
+        max_deltas: Maximum number of deltas to append before writing all the data
+
+    Raises:
+        ValueError if ``layout_delta`` is True and ``store`` is not a FileDataStore
+    """
+
+    def __init__(
+        self,
+        store: DataStore,
+        delay: float = 1.0,
+        layout_delta: bool = False,
+        max_deltas: int = 100,
+    ):
+        if layout_delta and not isinstance(store, FileDataStore):
+            raise ValueError(
+                f"Layout deltas can only be saved to a file, not to {store}"
+            )
+        self._store = store
+        self._delay = delay
+        self._layout_delta = layout_delta
+        self._max_deltas = max_deltas
+        self._lock = threading.RLock()
+        self._data = None  # last saved data
+        self._pending = None  # (data, text) not written yet
+        self._written = None  # text of the data last written
+        self._written_data = None  # copy of the data last written (for deltas)
+        self._num_deltas = 0
+        self._last_write = None
+        self._timer = None
+        _write_behind_stores[id(self)] = self
+
+    @property
+    def store(self) -> DataStore:
+        """Store that the data is written to."""
+        return self._store
+
+    @property
+    def pending(self) -> bool:
+        """Whether there is saved data that has not been written yet."""
+        with self._lock:
+            return self._pending is not None
+
+    @property
+    def delta_path(self) -> Optional[Path]:
+        """File that layout deltas are appended to, if ``layout_delta`` is True."""
+        if not self._layout_delta:
+            return None
+        return Path(f"{self._store.filename}.delta")
+
+    def save(self, data: Union[Dict, str]):
+        """Save data, and write it if nothing was written in the last ``delay``
+        seconds.
+
+        Args:
+            data: If a dict, must be serializable by `json.dump()`, otherwise
+                  treated as a string of JSON (e.g. '{"name": "value"}')
+
+        Returns:
+            None
+
+        Raises:
+            DataStoreError, if serialization or I/O fails
+        """
+        if isinstance(data, dict):
+            try:
+                text = json.dumps(data)
+            except (TypeError, ValueError) as err:
+                raise errors.DatastoreSerializeError(data, err)
+        else:
+            text = str(data)
+            data = _parse_json(text)
+        with self._lock:
+            self._data = data
+            self._pending = (data, text)
+            if self._timer is not None:
+                return  # will be written by the timer
+            wait = 0
+            if self._last_write is not None:
+                wait = self._last_write + self._delay - time.monotonic()
+            if wait <= 0:
+                self._write()
+            else:
+                self._timer = threading.Timer(wait, self._write_later)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def load(self) -> Dict:
+        """Load the last saved data.
+
+        Returns:
+            data, as a dict (even if string of JSON was passed as input to `save()`)
+
+        Raises:
+            ValueError, if there is no saved data
+        """
+        with self._lock:
+            if self._data is None:
+                data = self._store.load()
+                if self._layout_delta:
+                    self._num_deltas = self._load_deltas(data)
+                    self._written_data = copy.deepcopy(data)
+                self._data = data
+            return self._data
+
+    def flush(self):
+        """Write the saved data, if it has not been written yet.
+
+        Returns:
+            None
+
+        Raises:
+            DataStoreError, if I/O fails
+        """
+        with self._lock:
+            self._cancel_timer()
+            self._write()
+
+    def close(self):
+        """Write the saved data, and combine the layout deltas (if any) with the
+        saved file.
+
+        Returns:
+            None
+
+        Raises:
+            DataStoreError, if I/O fails
+        """
+        with self._lock:
+            self._cancel_timer()
+            if self._num_deltas > 0 and self._pending is None:
+                self._pending = (self._data, json.dumps(self._data))
+            self._write(deltas=False)
+
+    def __str__(self):
+        return str(self._store)
+
+    @property
+    def filename(self):
+        return self._store.filename
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write_later(self):
+        with self._lock:
+            self._timer = None
+            try:
+                self._write()
+            except errors.DatastoreError as err:
+                # the data is kept, and written by the next save or flush
+                _log.error(f"Could not save to {self._store}: {err}")
+
+    def _write(self, deltas=True):
+        """Write the pending data (with the lock held)."""
+        if self._pending is None:
+            return
+        data, text = self._pending
+        if text != self._written or not deltas:
+            delta = None
+            if deltas and self._layout_delta and self._num_deltas < self._max_deltas:
+                delta = _layout_delta(self._written_data, data)
+            if delta is not None:
+                self._append_delta(delta)
+            else:
+                self._write_all(data, text)
+            if self._layout_delta:
+                self._written_data = json.loads(text)
+            self._written = text
+            self._last_write = time.monotonic()
+        self._pending = None
+
+    def _write_all(self, data, text):
+        if self._layout_delta:
+            # Remove the deltas first, so they are never applied to newer data
+            try:
+                self.delta_path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as err:
+                raise errors.DatastoreSaveError(f"IO error with datastore: {err}")
+            self._num_deltas = 0
+        if isinstance(self._store, FileDataStore):
+            self._store.write_text(text)
+        else:
+            self._store.save(data)
+
+    def _append_delta(self, delta):
+        _log.debug(f"Save layout delta to file: {self.delta_path}")
+        try:
+            with self.delta_path.open("a") as fp:
+                fp.write(json.dumps(delta) + "\n")
+        except (IOError, OSError) as err:
+            raise errors.DatastoreSaveError(f"IO error with datastore: {err}")
+        self._num_deltas += 1
+
+    def _load_deltas(self, data) -> int:
+        """Apply the saved layout deltas to data, and return how many there were."""
+        try:
+            with self.delta_path.open("r") as fp:
+                lines = fp.readlines()
+        except FileNotFoundError:
+            return 0
+        num = 0
+        for line in lines:
+            try:
+                delta = json.loads(line)
+            except json.JSONDecodeError:
+                # e.g. the last line, if writing it was interrupted
+                _log.warning(f"Ignoring invalid layout delta in {self.delta_path}")
+                continue
+            _apply_layout_delta(data, delta)
+            num += 1
+        return num
+
+
+# Stores which may have data to write when the interpreter exits (by their id,
+# since stores that compare equal may be different objects)
+_write_behind_stores = weakref.WeakValueDictionary()
+
+
+@atexit.register
+def _close_write_behind_stores():
+    for store in list(_write_behind_stores.values()):
+        try:
+            store.close()
+        except errors.DatastoreError as err:
+            _log.error(f"Could not save to {store}: {err}")
+
+
+def _layout_delta(old: Optional[Dict], new: Dict) -> Optional[Dict]:
+    """Changes of the layout from old to new flowsheet data: the cells that
+    changed (by their index) and the routing configuration, if it changed.
+
+    Returns:
+        The changes, or None if anything other than the positions or contents of
+        the cells and the routing configuration changed.
+    """
+    if old is None or old.keys() != new.keys():
+        return None
+    old_cells, new_cells = old.get("cells", None), new.get("cells", None)
+    if not isinstance(old_cells, list) or not isinstance(new_cells, list):
+        return None
+    if len(old_cells) != len(new_cells):
+        return None
+    for key in new:
+        if key not in ("cells", "routing_config") and new[key] != old[key]:
+            return None
+    delta = {"cells": {}}
+    for i, (old_cell, new_cell) in enumerate(zip(old_cells, new_cells)):
+        if not isinstance(new_cell, dict) or not isinstance(old_cell, dict):
+            return None
+        if new_cell.get("id", None) != old_cell.get("id", None):
+            return None
+        if new_cell != old_cell:
+            delta["cells"][str(i)] = new_cell
+    if "routing_config" in new and new["routing_config"] != old["routing_config"]:
+        delta["routing_config"] = new["routing_config"]
+    return delta
+
+
+def _apply_layout_delta(data: Dict, delta: Dict):
+    """Apply changes from _layout_delta() to flowsheet data."""
+    for i, cell in delta["cells"].items():
+        data["cells"][int(i)] = cell
+    if "routing_config" in delta:
+        data["routing_config"] = delta["routing_config"]
+
+
 def _parse_json(data) -> Dict:
     """Parse string of the data to JSON, with desired exceptions raised.
 
@@ -197,11 +535,18 @@ def _parse_json(data) -> Dict:
 
 
 class DataStoreManager:
-    """Manage operations on multiple id/data-store pairs."""
+    """Manage operations on multiple id/data-store pairs.
+
+    All methods are thread-safe. Saves and loads of the same identifier are
+    serialized, so a load never sees a partially written store, while
+    different identifiers can be saved and loaded concurrently.
+    """
 
     def __init__(self):
         self._id_store = {}
         self._id_path = {}  # maps identifiers to Path objects
+        self._id_lock = {}  # maps identifiers to locks for their store
+        self._lock = threading.Lock()  # protects the dicts above
 
     def add(self, id_: str, store: DataStore) -> bool:
         """Add an identifier and associated storage location.
@@ -214,12 +559,20 @@ class DataStoreManager:
         Returns:
             True if we added a new store, False if we did nothing
         """
-        if id_ in self._id_store and self._id_store[id_] == store:
-            _log.debug(f"Use existing store, {self._id_store[id_]}, for '{id_}'")
-            added = False
-        else:
-            self._id_store[id_] = store
-            added = True
+        with self._lock:
+            if id_ in self._id_store and self._id_store[id_] == store:
+                _log.debug(f"Use existing store, {self._id_store[id_]}, for '{id_}'")
+                added = False
+                existing = self._id_store[id_]
+                if existing is not store and isinstance(existing, WriteBehindDataStore):
+                    # The new store does not have the old one's (unwritten) data
+                    with self._id_lock[id_]:
+                        existing.close()
+                    self._id_store[id_] = store
+            else:
+                self._id_store[id_] = store
+                self._id_lock.setdefault(id_, threading.RLock())
+                added = True
         return added
 
     def save(self, id_: str, data: Union[Dict, str]):
@@ -236,7 +589,9 @@ class DataStoreManager:
             KeyError if the flowsheet is not found
             DatastoreSerializeError on JSON errors
         """
-        self._find(id_).save(data)
+        store, lock = self._find(id_)
+        with lock:
+            store.save(data)
         _log.debug(f"Flowsheet '{id_}' saved")
 
     def load(self, id_: str) -> Dict:
@@ -252,13 +607,15 @@ class DataStoreManager:
             KeyError if the flowsheet is not found
             ValueError on JSON errors
         """
-        value = self._find(id_).load()
+        store, lock = self._find(id_)
+        with lock:
+            value = store.load()
         _log.debug(f"Flowsheet '{id_}' loaded")
         return value
 
     def _find(self, id_: str):
-        try:
-            store = self._id_store[id_]
-        except KeyError:
-            raise KeyError(f"Unknown flowsheet '{id_}'")
-        return store
+        with self._lock:
+            try:
+                return self._id_store[id_], self._id_lock[id_]
+            except KeyError:
+                raise KeyError(f"Unknown flowsheet '{id_}'")
@@ -14,6 +14,10 @@
 Tests for model_server module
 """
 # stdlib
+import gzip
+import json
+import threading
+
 # ext
 import pytest
 from pyomo.environ import ConcreteModel
@@ -27,6 +31,7 @@ from idaes.models.properties.activity_coeff_models.BTX_activity_coeff_VLE import
     BTXParameterBlock,
 )
 from idaes.models.unit_models import Flash
+from idaes.core.ui.tests.shared import heater_flowsheet
 
 
 @pytest.mark.unit
@@ -127,3 +132,224 @@ def test_flowsheet_server_run(flash_model):
     )
     assert resp.ok
     assert resp.json()["setting_value"] == 5000
+
+
+@pytest.mark.unit
+def test_etag_matches():
+    assert not model_server.etag_matches(None, '"abc"')
+    assert model_server.etag_matches('"abc"', '"abc"')
+    assert model_server.etag_matches('"x", W/"abc"', '"abc"')
+    assert model_server.etag_matches("*", '"abc"')
+    assert not model_server.etag_matches('"x", "y"', '"abc"')
+
+
+@pytest.fixture
+def heater_model():
+    return heater_flowsheet(3)
+
+
+@pytest.mark.component
+def test_get_flowsheet_json(heater_model, monkeypatch):
+    srv = model_server.FlowsheetServer()
+    with pytest.raises(errors.FlowsheetUnknown):
+        srv.get_flowsheet_json("oscar")
+    m = heater_model
+    srv.add_flowsheet("oscar", m.fs, persist.MemoryDataStore())
+
+    value, etag = srv.get_flowsheet_json("oscar")
+    assert value == json.dumps(srv.update_flowsheet("oscar")).encode("utf-8")
+    assert srv.get_flowsheet_json("oscar") == (value, etag)
+
+    # Nothing is serialized if the flowsheet didn't change
+    def fail(*args, **kwargs):
+        raise AssertionError("flowsheet was serialized")
+
+    with monkeypatch.context() as mp:
+        mp.setattr(srv, "_update_flowsheet", fail)
+        assert srv.get_flowsheet_json("oscar") == (value, etag)
+
+    # Changed values
+    m.fs.heater1.heat_duty.fix(20)
+    value2, etag2 = srv.get_flowsheet_json("oscar")
+    assert etag2 != etag
+    fs_dict = json.loads(value2)
+    contents = fs_dict["model"]["unit_models"]["heater1"]["performance_contents"]
+    assert contents["0"]["Value"] == 20
+
+    # Changed layout
+    fs_dict["cells"][0]["position"] = {"x": 1234, "y": 5678}
+    srv.save_flowsheet("oscar", fs_dict)
+    value3, etag3 = srv.get_flowsheet_json("oscar")
+    assert etag3 != etag2
+    assert json.loads(value3)["cells"][0]["position"] == {"x": 1234, "y": 5678}
+
+    # Flowsheet which is no longer there
+    del srv._flowsheets["oscar"]
+    with pytest.raises(errors.FlowsheetNotFoundInMemory):
+        srv.get_flowsheet_json("oscar")
+
+
+@pytest.mark.component
+def test_flowsheet_server_etag(heater_model):
+    srv = model_server.FlowsheetServer()
+    srv.start()
+    m = heater_model
+    srv.add_flowsheet("oscar", m.fs, persist.MemoryDataStore())
+    url = f"http://localhost:{srv.port}/fs?id=oscar"
+    resp = requests.get(url)
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+    assert resp.headers["Cache-Control"] == "no-cache"
+
+    resp2 = requests.get(url, headers={"If-None-Match": etag})
+    assert resp2.status_code == 304
+    assert resp2.headers["ETag"] == etag
+    assert resp2.content == b""
+
+    m.fs.heater0.heat_duty.fix(5)
+    resp3 = requests.get(url, headers={"If-None-Match": etag})
+    assert resp3.status_code == 200
+    assert resp3.headers["ETag"] != etag
+    assert resp3.json()["model"]["unit_models"]["heater0"]["performance_contents"]
+
+
+@pytest.mark.unit
+def test_accepts_encoding():
+    assert not model_server.accepts_encoding(None, "gzip")
+    assert not model_server.accepts_encoding("", "gzip")
+    assert model_server.accepts_encoding("gzip, deflate", "gzip")
+    assert model_server.accepts_encoding("deflate, GZIP;q=0.5", "gzip")
+    assert not model_server.accepts_encoding("gzip;q=0", "gzip")
+    assert not model_server.accepts_encoding("identity", "gzip")
+    assert model_server.accepts_encoding("*", "gzip")
+    assert not model_server.accepts_encoding("*, gzip;q=0", "gzip")
+
+
+@pytest.mark.component
+def test_get_flowsheet_json_compressed(heater_model):
+    srv = model_server.FlowsheetServer()
+    m = heater_model
+    srv.add_flowsheet("oscar", m.fs, persist.MemoryDataStore())
+    value, etag = srv.get_flowsheet_json("oscar")
+    gz_value, gz_etag = srv.get_flowsheet_json("oscar", compress=True)
+    assert gzip.decompress(gz_value) == value
+    assert len(gz_value) < len(value)
+    assert gz_etag != etag
+    assert srv.get_flowsheet_json("oscar", compress=True) == (gz_value, gz_etag)
+
+    m.fs.heater1.heat_duty.fix(20)
+    gz_value2, gz_etag2 = srv.get_flowsheet_json("oscar", compress=True)
+    assert gz_etag2 != gz_etag
+    assert gzip.decompress(gz_value2) == srv.get_flowsheet_json("oscar")[0]
+
+
+@pytest.mark.component
+def test_flowsheet_server_gzip(heater_model):
+    srv = model_server.FlowsheetServer()
+    srv.start()
+    srv.add_flowsheet("oscar", heater_model.fs, persist.MemoryDataStore())
+    url = f"http://localhost:{srv.port}/fs?id=oscar"
+    resp = requests.get(url, headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    assert resp.json()["model"]["unit_models"]["heater0"]
+    resp2 = requests.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["ETag"]}
+    )
+    assert resp2.status_code == 304
+
+    resp3 = requests.get(url, headers={"Accept-Encoding": "identity"})
+    assert resp3.status_code == 200
+    assert "Content-Encoding" not in resp3.headers
+    assert resp3.headers["ETag"] != resp.headers["ETag"]
+    assert resp3.json() == resp.json()
+
+
+@pytest.mark.component
+def test_flowsheet_server_static():
+    srv = model_server.FlowsheetServer()
+    srv.start()
+    url = f"http://localhost:{srv.port}/css/main.css"
+    with open(model_server._static_dir / "css" / "main.css", "rb") as fp:
+        content = fp.read()
+
+    resp = requests.get(url, headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.content == content
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["Content-Type"] == "text/css"
+    assert resp.headers["Cache-Control"] == "public, max-age=3600"
+    assert "Last-Modified" in resp.headers
+    resp2 = requests.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["ETag"]}
+    )
+    assert resp2.status_code == 304
+    assert resp2.headers["Cache-Control"] == "public, max-age=3600"
+
+    resp3 = requests.get(url, headers={"Accept-Encoding": "identity"})
+    assert resp3.content == content
+    assert "Content-Encoding" not in resp3.headers
+
+    # binary files are not compressed
+    resp4 = requests.get(
+        f"http://localhost:{srv.port}/idaes-logo.ico",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert resp4.status_code == 200
+    assert "Content-Encoding" not in resp4.headers
+
+    resp5 = requests.get(f"http://localhost:{srv.port}/css/missing.css")
+    assert resp5.status_code == 404
+
+
+@pytest.mark.component
+def test_flowsheet_server_threaded(heater_model, monkeypatch):
+    srv = model_server.FlowsheetServer()
+    assert srv.threaded
+    srv.start()
+    srv.add_flowsheet("oscar", heater_model.fs, persist.MemoryDataStore())
+    base_url = f"http://localhost:{srv.port}"
+
+    # make serializing the flowsheet wait until the other requests are done
+    started, done = threading.Event(), threading.Event()
+    update_flowsheet = srv._update_flowsheet
+
+    def slow_update(id_):
+        started.set()
+        assert done.wait(timeout=30)
+        return update_flowsheet(id_)
+
+    monkeypatch.setattr(srv, "_update_flowsheet", slow_update)
+    heater_model.fs.heater0.heat_duty.fix(5)
+    responses = []
+    thr = threading.Thread(
+        target=lambda: responses.append(requests.get(f"{base_url}/fs?id=oscar"))
+    )
+    thr.start()
+    assert started.wait(timeout=30)
+    try:
+        # these are served while the flowsheet is being serialized
+        with requests.Session() as session:
+            resp = session.get(f"{base_url}/css/main.css", timeout=10)
+            assert resp.ok
+            assert resp.raw.version == 11  # keep-alive
+            resp = session.get(f"{base_url}/setting?setting_key=foo", timeout=10)
+            assert resp.ok
+    finally:
+        done.set()
+        thr.join(timeout=30)
+    assert responses[0].ok
+    assert responses[0].json()["model"]["unit_models"]["heater0"]
+
+
+@pytest.mark.component
+def test_flowsheet_server_not_threaded(heater_model):
+    srv = model_server.FlowsheetServer(threaded=False)
+    assert not srv.threaded
+    srv.start()
+    srv.add_flowsheet("oscar", heater_model.fs, persist.MemoryDataStore())
+    resp = requests.get(f"http://localhost:{srv.port}/fs?id=oscar")
+    assert resp.ok
+    assert resp.raw.version == 10
+    assert resp.json()["model"]["unit_models"]["heater0"]
@@ -15,6 +15,10 @@ Tests for the `idaes.core.ui.fsvis.persist` module
 """
 # stdlib
 import json
+import os
+import stat
+import threading
+import time
 
 # ext
 import pytest
@@ -102,3 +106,203 @@ def _save_and_load_data_dsm(id_, dsm):
     dsm.save(id_, data)
     result = dsm.load(id_)
     assert data == result
+
+
+@pytest.mark.unit
+def test_datastoremanager_threads(tmp_path):
+    dsm = persist.DataStoreManager()
+    ids = [f"fs{i}" for i in range(4)]
+    for id_ in ids:
+        dsm.add(id_, persist.FileDataStore(tmp_path / f"{id_}.json"))
+        dsm.save(id_, {"values": [id_]})
+    big = {"values": list(range(10000))}
+    failures = []
+
+    def run(id_):
+        try:
+            for _ in range(20):
+                dsm.save(id_, big)
+                # never sees a partially written file
+                assert dsm.load(id_) == big
+                dsm.add(f"{id_}-mem", persist.MemoryDataStore())
+        except Exception as err:  # pylint: disable=W0703
+            failures.append(err)
+
+    threads = [threading.Thread(target=run, args=(id_,)) for id_ in ids * 2]
+    for thr in threads:
+        thr.start()
+    for thr in threads:
+        thr.join()
+    assert failures == []
+
+
+@pytest.mark.unit
+def test_file_data_store_atomic(tmp_path, monkeypatch):
+    p = tmp_path / "test.json"
+    store = persist.FileDataStore(p)
+    store.save(data)
+    assert os.listdir(tmp_path) == ["test.json"]
+
+    def replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", replace)
+    with pytest.raises(errors.DatastoreSaveError):
+        store.save({"foo": "new"})
+    # the file is unchanged and the temporary file is removed
+    assert store.load() == data
+    assert os.listdir(tmp_path) == ["test.json"]
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(os.name == "nt", reason="POSIX file modes")
+def test_file_data_store_mode(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        # a new file gets the default mode
+        p = tmp_path / "test.json"
+        store = persist.FileDataStore(p)
+        store.save(data)
+        assert stat.S_IMODE(os.stat(p).st_mode) == 0o644
+        # the mode of an existing file is kept
+        os.chmod(p, 0o640)
+        store.save({"foo": "new"})
+        assert stat.S_IMODE(os.stat(p).st_mode) == 0o640
+    finally:
+        os.umask(umask)
+
+
+class CountingDataStore(persist.MemoryDataStore):
+    def __init__(self):
+        super().__init__()
+        self.saves = 0
+
+    def save(self, data):
+        super().save(data)
+        self.saves += 1
+
+
+def _wait_for_write(store, timeout=10):
+    end = time.time() + timeout
+    while store.pending and time.time() < end:
+        time.sleep(0.01)
+    assert not store.pending
+
+
+@pytest.mark.unit
+def test_write_behind_data_store(tmp_path):
+    _save_and_load_data(persist.WriteBehindDataStore(persist.MemoryDataStore()))
+    store = persist.WriteBehindDataStore(persist.FileDataStore(tmp_path / "test.json"))
+    _save_and_load_data(store)
+    store.close()
+    assert store.filename == str(tmp_path / "test.json")
+    assert store == persist.FileDataStore(tmp_path / "test.json")
+    with pytest.raises(ValueError):
+        persist.WriteBehindDataStore(persist.MemoryDataStore(), layout_delta=True)
+
+
+@pytest.mark.unit
+def test_write_behind_data_store_coalesce():
+    inner = CountingDataStore()
+    store = persist.WriteBehindDataStore(inner, delay=0.2)
+    # the first save is written immediately
+    store.save(data)
+    assert inner.saves == 1
+    assert not store.pending
+    # later saves are combined
+    for i in range(20):
+        store.save({"foo": i})
+        assert store.load() == {"foo": i}
+    assert inner.saves == 1
+    assert store.pending
+    _wait_for_write(store)
+    assert inner.saves == 2
+    assert inner.load() == {"foo": 19}
+    # data that was already written is not written again
+    time.sleep(0.2)
+    store.save({"foo": 19})
+    assert inner.saves == 2
+
+    store = persist.WriteBehindDataStore(inner, delay=60)
+    store.save({"foo": 1})
+    store.save({"foo": 2})
+    assert inner.saves == 3
+    store.flush()
+    assert inner.saves == 4
+    assert inner.load() == {"foo": 2}
+
+
+def _flowsheet_data(x):
+    return {
+        "model": {"id": "fs", "unit_models": {}, "arcs": {}},
+        "cells": [
+            {"id": "a", "position": {"x": x, "y": 0}},
+            {"id": "b", "position": {"x": 0, "y": 0}},
+        ],
+        "routing_config": {},
+    }
+
+
+@pytest.mark.unit
+def test_write_behind_data_store_layout_delta(tmp_path):
+    p = tmp_path / "test.json"
+    store = persist.WriteBehindDataStore(
+        persist.FileDataStore(p), delay=60, layout_delta=True, max_deltas=3
+    )
+    store.save(_flowsheet_data(0))
+    for x in range(1, 3):
+        store.save(_flowsheet_data(x))
+        store.flush()
+    # Only the changed cells are written
+    assert persist.FileDataStore(p).load() == _flowsheet_data(0)
+    lines = store.delta_path.read_text().splitlines()
+    assert json.loads(lines[-1]) == {"cells": {"0": _flowsheet_data(2)["cells"][0]}}
+    loaded = persist.WriteBehindDataStore(persist.FileDataStore(p), layout_delta=True)
+    assert loaded.load() == _flowsheet_data(2)
+    # An interrupted write of a delta is ignored
+    with store.delta_path.open("a") as fp:
+        fp.write('{"cells": {"0"')
+    loaded = persist.WriteBehindDataStore(persist.FileDataStore(p), layout_delta=True)
+    assert loaded.load() == _flowsheet_data(2)
+
+    # Other changes, and too many deltas, write all the data
+    changed = _flowsheet_data(2)
+    changed["model"]["id"] = "other"
+    store.save(changed)
+    store.flush()
+    assert persist.FileDataStore(p).load() == changed
+    assert not store.delta_path.exists()
+    for x in range(3, 7):
+        data_x = _flowsheet_data(x)
+        data_x["model"]["id"] = "other"
+        store.save(data_x)
+        store.flush()
+    assert persist.FileDataStore(p).load() == data_x
+    assert not store.delta_path.exists()
+
+    # Closing combines the deltas with the saved file
+    store.save(_flowsheet_data(0))
+    store.flush()
+    store.save(_flowsheet_data(1))
+    store.flush()
+    assert store.delta_path.exists()
+    store.close()
+    assert not store.delta_path.exists()
+    assert persist.FileDataStore(p).load() == _flowsheet_data(1)
+
+
+@pytest.mark.unit
+def test_datastoremanager_write_behind(tmp_path):
+    p = tmp_path / "test.json"
+    dsm = persist.DataStoreManager()
+    store = persist.WriteBehindDataStore(persist.FileDataStore(p), delay=60)
+    dsm.add("foo", store)
+    dsm.save("foo", data)
+    dsm.save("foo", {"foo": "pending"})
+    assert store.pending
+    # an equal store replaces the old one, after it is written
+    store2 = persist.WriteBehindDataStore(persist.FileDataStore(p), delay=60)
+    assert not dsm.add("foo", store2)
+    assert not store.pending
+    assert dsm.load("foo") == {"foo": "pending"}
+    assert dsm._find("foo")[0] is store2
@@ -13,6 +13,7 @@
 # TODO: Missing doc strings
 # pylint: disable=missing-module-docstring
 
+import copy
 import os
 import json
 from typing import Dict
@@ -39,13 +40,24 @@ class UnitModelIcon:
         self._model = unit_model
 
         # Loading the Unit Models mappings
-        dir_path = os.path.dirname(os.path.realpath(__file__))
-        mappings_file = os.path.join(dir_path, os.pardir, "mappings", "mappings.json")
-        with open(mappings_file, "r") as mappings_f:
-            self._mapping = json.load(mappings_f)
-        self._model_details = self._get_mapping(unit_model, default)
+        self._mapping = self._load_mappings()
+        # copy, since the link positions are changed by the user of the icon
+        self._model_details = copy.deepcopy(self._get_mapping(unit_model, default))
         self._pos = self._build_link_positions()
 
+    @classmethod
+    def _load_mappings(cls) -> Dict:
+        """Load the Unit Models mappings, which are read once and then kept in
+        the class."""
+        if cls._mapping_file_data is None:
+            dir_path = os.path.dirname(os.path.realpath(__file__))
+            mappings_file = os.path.join(
+                dir_path, os.pardir, "mappings", "mappings.json"
+            )
+            with open(mappings_file, "r") as mappings_f:
+                cls._mapping_file_data = json.load(mappings_f)
+        return cls._mapping_file_data
+
     def _get_mapping(self, unit_model, default):
         """Find the correct mapping for the given unit_model name."""
         if unit_model in self._mapping:
@@ -165,3 +177,5 @@ class UnitModelIcon:
     #  - Do not remove in/out entries in existing entries, or arcs won't connect
     # TODO: Move this mapping to its own directory/files.
     _mapping = {}
+    # Contents of the mappings file (shared, do not change)
+    _mapping_file_data = None
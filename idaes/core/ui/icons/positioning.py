@@ -15,6 +15,10 @@
 
 from collections import deque
 
+from idaes import logger
+
+_log = logger.getLogger(__name__)
+
 
 class Node:
     """A node represents a unit model or an element in JointJs terms"""
@@ -231,7 +235,7 @@ class UnitModelsPositioning:
             node_name = queue.popleft()
 
             if node_name not in visited_nodes:
-                print("_build_abstract_layout - node_name:", node_name)
+                _log.debug(f"_build_abstract_layout - node_name: {node_name}")
                 visited_nodes.add(node_name)
 
                 node = self._nodes[node_name]
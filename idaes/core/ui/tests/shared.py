@@ -16,6 +16,18 @@ Shared (utility) code for UI tests.
 # TODO: Missing docstrings
 # pylint: disable=missing-function-docstring
 
+from pyomo.environ import ConcreteModel, TransformationFactory, Var
+from pyomo.network import Arc
+
+from idaes.core import FlowsheetBlock
+from idaes.models.properties.modular_properties.base.generic_property import (
+    GenericParameterBlock,
+)
+from idaes.models.properties.modular_properties.examples.BT_ideal import (
+    configuration,
+)
+from idaes.models.unit_models import Heater
+
 
 def dict_diff(d1, d2, result=None, pfx=""):
     if result is None:
@@ -54,3 +66,25 @@ def dict_diff(d1, d2, result=None, pfx=""):
             if k in d2:
                 dict_diff(d1[k], d2[k], result=result, pfx=f"{pfx}.{k}")
     return result
+
+
+def heater_flowsheet(n_units):
+    """Flowsheet with a line of heaters"""
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.properties = GenericParameterBlock(**configuration)
+    for i in range(n_units):
+        m.fs.add_component(f"heater{i}", Heater(property_package=m.fs.properties))
+    for i in range(n_units - 1):
+        m.fs.add_component(
+            f"stream{i}",
+            Arc(
+                source=m.fs.component(f"heater{i}").outlet,
+                destination=m.fs.component(f"heater{i + 1}").inlet,
+            ),
+        )
+    TransformationFactory("network.expand_arcs").apply_to(m)
+    for v in m.fs.component_data_objects(Var):
+        if v.value is None:
+            v.set_value(1.0)
+    return m
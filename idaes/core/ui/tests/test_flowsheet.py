@@ -13,28 +13,34 @@
 import copy
 import json
 import numpy as np
+import pandas as pd
 from pathlib import Path
 
 import pytest
 
+import idaes.core.ui.flowsheet as flowsheet_module
 from idaes.core.ui.flowsheet import (
     FlowsheetSerializer,
     FlowsheetDiff,
+    SerializationCache,
     validate_flowsheet,
 )
 from idaes.models.properties.swco2 import SWCO2ParameterBlock
 from idaes.models.unit_models import Heater, PressureChanger, HeatExchanger
 from idaes.models.unit_models.pressure_changer import ThermodynamicAssumption
-from pyomo.environ import TransformationFactory, ConcreteModel
+from pyomo.environ import TransformationFactory, ConcreteModel, Var
 from pyomo.network import Arc
+import pyomo.common.unittest as unittest
+from pyomo.common.timing import TicTocTimer
 from idaes.core import FlowsheetBlock
 from idaes.models.properties.activity_coeff_models.BTX_activity_coeff_VLE import (
     BTXParameterBlock,
 )
 from idaes.models.properties.general_helmholtz import helmholtz_available
+from idaes.core.util.performance import PerformanceBaseClass
 
 from idaes.models.unit_models import Flash, Mixer
-from .shared import dict_diff
+from .shared import dict_diff, heater_flowsheet
 
 # === Sample data ===
 
@@ -413,3 +419,202 @@ def test_flowsheet_serializer_get_unit_model_type():
     )
     unit_type = FlowsheetSerializer.get_unit_model_type(m.fs.fwh)
     assert unit_type == "heat_exchanger"
+
+
+def _serialize(m, cache=None):
+    return json.dumps(FlowsheetSerializer(m.fs, "fs", cache=cache).as_dict())
+
+
+@pytest.mark.component
+def test_serialization_cache(monkeypatch):
+    m = heater_flowsheet(4)
+    serialized = []
+    serialize_unit_contents = FlowsheetSerializer._serialize_unit_contents
+
+    def _serialize_unit_contents(self, unit):
+        serialized.append(unit.getname())
+        return serialize_unit_contents(self, unit)
+
+    monkeypatch.setattr(
+        FlowsheetSerializer, "_serialize_unit_contents", _serialize_unit_contents
+    )
+
+    cache = SerializationCache()
+    assert not cache.is_current(m.fs)
+    assert _serialize(m, cache) == _serialize(m)
+    assert cache.is_current(m.fs)
+    serialized.clear()
+    assert _serialize(m, cache) == _serialize(m)
+    assert serialized == ["heater0", "heater1", "heater2", "heater3"]
+
+    # Only the unit model that changed is serialized again
+    m.fs.heater2.heat_duty.fix(50)
+    assert not cache.is_current(m.fs)
+    serialized.clear()
+    result = _serialize(m, cache)
+    assert serialized == ["heater2"]
+    assert result == _serialize(m)
+    d = json.loads(result)
+    contents = d["model"]["unit_models"]["heater2"]["performance_contents"]
+    assert contents["0"]["Value"] == 50
+
+    # Stream labels and the stream table are updated
+    m.fs.heater1.inlet.temperature[0].value = 400
+    assert _serialize(m, cache) == _serialize(m)
+    d = json.loads(_serialize(m, cache))
+    assert "Temperature 400" in d["model"]["arcs"]["stream0"]["label"]
+    for cell in d["cells"]:
+        if cell["id"] == "stream0":
+            assert "Temperature 400" in cell["labels"][0]["attrs"]["text"]["text"]
+
+    # Values outside the unit models, e.g. property parameters
+    serialized.clear()
+    m.fs.properties.pressure_ref.value = 2e5
+    assert _serialize(m, cache) == _serialize(m)
+    assert "heater0" in serialized
+
+    # Fixing variables and structural changes
+    m.fs.heater3.inlet.temperature.fix()
+    assert not cache.is_current(m.fs)
+    m.fs.extra = Heater(property_package=m.fs.properties)
+    assert not cache.is_current(m.fs)
+    assert _serialize(m, cache) == _serialize(m)
+    assert "extra" in json.loads(_serialize(m, cache))["model"]["unit_models"]
+
+    cache.clear()
+    assert not cache.is_current(m.fs)
+    assert cache.units == {}
+
+
+@pytest.mark.component
+def test_serialization_cache_structure():
+    m = heater_flowsheet(2)
+    cache = SerializationCache()
+    _serialize(m, cache)
+    assert cache.is_current(m.fs)
+    signature = cache.flowsheet_signature(m.fs)
+    assert cache.flowsheet_signature(m.fs) == signature
+
+    # New components inside unit models are structural changes
+    m.fs.heater1.extra = Var(initialize=1)
+    assert not cache.is_current(m.fs)
+    assert _serialize(m, cache) == _serialize(m)
+    assert cache.is_current(m.fs)
+    m.fs.heater0.control_volume.extra = Var([1, 2], initialize=1)
+    assert not cache.is_current(m.fs)
+
+
+@pytest.mark.component
+def test_layout_cache(monkeypatch):
+    positioned = []
+    positioning = flowsheet_module.UnitModelsPositioning
+
+    def _positioning(*args, **kwargs):
+        positioned.append(args)
+        return positioning(*args, **kwargs)
+
+    monkeypatch.setattr(flowsheet_module, "UnitModelsPositioning", _positioning)
+    monkeypatch.setattr(
+        flowsheet_module, "_layout_cache", type(flowsheet_module._layout_cache)()
+    )
+
+    m = heater_flowsheet(4)
+    first = _serialize(m)
+    assert len(positioned) == 1
+    # The layout is reused by other serializers, and for copies of the flowsheet
+    assert _serialize(m) == first
+    assert _serialize(heater_flowsheet(4)) == first
+    assert len(positioned) == 1
+
+    # Stream labels are updated with the values
+    m.fs.heater1.inlet.temperature[0].value = 400
+    d = json.loads(_serialize(m))
+    assert len(positioned) == 1
+    for cell in d["cells"]:
+        if cell["id"] == "stream0":
+            assert "Temperature 400" in cell["labels"][0]["attrs"]["text"]["text"]
+
+    # A different structure has a different layout
+    _serialize(heater_flowsheet(5))
+    assert len(positioned) == 2
+
+    # Least recently used layouts are removed
+    monkeypatch.setattr(flowsheet_module, "_layout_cache_size", 1)
+    _serialize(heater_flowsheet(3))
+    assert len(positioned) == 3
+    assert len(flowsheet_module._layout_cache) == 1
+
+
+@pytest.mark.unit
+def test_json_rows():
+    serializer = FlowsheetSerializer.__new__(FlowsheetSerializer)
+    serializer._sig_figs = 5
+    df = pd.DataFrame(
+        {
+            "a": [1, 2.123456789, np.nan],
+            "b": [np.inf, -np.inf, None],
+            "c": ["x", None, 3],
+            "d": [1, 2, 3],
+        },
+        index=["r1", "r2", 3],
+    )
+    # The same as rounding the values of the dataframe
+    expected = (
+        serializer._make_valid_json(df)
+        .applymap(lambda x: round(x, 5) if isinstance(x, (int, float)) else x)
+        .to_dict("index")
+    )
+    assert serializer._valid_json_rows(df) == {str(k): v for k, v in expected.items()}
+    assert serializer._valid_json_rows(df) == {
+        "r1": {"a": 1.0, "b": "Inf", "c": "x", "d": 1},
+        "r2": {"a": 2.12346, "b": "-Inf", "c": "NaN", "d": 2},
+        "3": {"a": "NaN", "b": "NaN", "c": 3, "d": 3},
+    }
+
+
+@pytest.mark.performance
+class TestSerializationCachePerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return heater_flowsheet(50)
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        m = heater_flowsheet(50)
+        cache = SerializationCache()
+        timer.tic(None)
+        FlowsheetSerializer(m.fs, "fs")
+        self.recordData("serialize, no cache", timer.toc(None))
+        for n in ("first", "second"):
+            timer.tic(None)
+            FlowsheetSerializer(m.fs, "fs", cache=cache)
+            self.recordData(f"serialize, cache ({n})", timer.toc(None))
+        m.fs.heater10.heat_duty.fix(10)
+        timer.tic(None)
+        FlowsheetSerializer(m.fs, "fs", cache=cache)
+        self.recordData("serialize, cache (one unit changed)", timer.toc(None))
+
+
+@pytest.mark.performance
+class TestLargeFlowsheetPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return heater_flowsheet(500)
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        m = heater_flowsheet(500)
+        flowsheet_module._layout_cache.clear()
+        timer.tic(None)
+        FlowsheetSerializer(m.fs, "fs")
+        self.recordData("serialize, 500 units (first)", timer.toc(None))
+        timer.tic(None)
+        FlowsheetSerializer(m.fs, "fs")
+        self.recordData("serialize, 500 units (layout cached)", timer.toc(None))
+        cache = SerializationCache()
+        FlowsheetSerializer(m.fs, "fs", cache=cache)
+        m.fs.heater10.heat_duty.fix(10)
+        timer.tic(None)
+        FlowsheetSerializer(m.fs, "fs", cache=cache)
+        self.recordData("serialize, 500 units (one unit changed)", timer.toc(None))
+        timer.tic(None)
+        FlowsheetSerializer(m.fs, "fs", cache=cache)
+        self.recordData("serialize, 500 units (unchanged)", timer.toc(None))
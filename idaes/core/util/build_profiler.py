@@ -0,0 +1,279 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Profiler for the construction of properties on demand.
+
+State and reaction blocks build most of their properties the first time they
+are used (see idaes.core.base.util.build_on_demand). While a BuildProfiler is
+active, each of these builds is timed and the number of components it adds to
+the block is counted. The results are collected by state block class and
+property name, and by the chain of properties which triggered each build.
+"""
+# Block declarations are counted using the private _decl dict of Pyomo blocks
+# pylint: disable=protected-access
+
+from time import perf_counter
+
+from pandas import DataFrame
+
+# Profiler which records builds, None if profiling is not active
+_active_profiler = None
+
+
+def active_profiler():
+    """
+    Return the BuildProfiler that is currently active, or None if no
+    profiler is active.
+
+    Returns:
+        BuildProfiler or None
+    """
+    return _active_profiler
+
+
+def _block_class(block):
+    # Scalar blocks are instances of a generated class, so report the data
+    # class instead, which is the same for scalar and indexed blocks
+    return getattr(type(block), "_ComponentDataClass", type(block)).__name__
+
+
+class _Frame(object):
+    __slots__ = ("key", "block", "child_time", "child_components")
+
+    def __init__(self, key, block):
+        self.key = key
+        self.block = block
+        self.child_time = 0.0
+        self.child_components = 0
+
+
+class _PropertyStats(object):
+    __slots__ = ("calls", "total_time", "self_time", "components", "triggers")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+        self.components = 0
+        self.triggers = {}
+
+
+class BuildProfiler(object):
+    """
+    Record the time spent building properties on demand, and the number of
+    components created, by state block class and property name.
+
+    The profiler can be used as a context manager, or with the start and stop
+    methods.
+
+    Example:
+
+    .. code-block:: python
+
+        with BuildProfiler() as prof:
+            m.fs.unit = Flash(property_package=m.fs.properties)
+        print(prof.table().head(10))
+        prof.write_folded_stacks("build.folded")
+
+    Times include the time spent building the properties which are triggered
+    by a property (total_time) and exclude it (self_time). The number of
+    components only counts components added to the block by the property
+    method itself.
+    """
+
+    def __init__(self):
+        self._stack = []
+        # (block class, property) -> _PropertyStats
+        self._stats = {}
+        # tuple of (block class, property) frames -> [self time, calls]
+        self._stacks = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        Start recording builds on demand.
+
+        Returns:
+            None
+        """
+        global _active_profiler  # pylint: disable=global-statement
+        if _active_profiler is not None and _active_profiler is not self:
+            raise RuntimeError("Another BuildProfiler is already active.")
+        _active_profiler = self
+
+    def stop(self):
+        """
+        Stop recording builds on demand.
+
+        Returns:
+            None
+        """
+        global _active_profiler  # pylint: disable=global-statement
+        if _active_profiler is self:
+            _active_profiler = None
+
+    def clear(self):
+        """
+        Remove all recorded data.
+
+        Returns:
+            None
+        """
+        self._stats = {}
+        self._stacks = {}
+
+    def profile(self, block, attr, build):
+        """
+        Call the method build which creates the property attr on block and
+        record the time it takes and the number of components it creates.
+        This is called by build_on_demand.
+
+        Args:
+            block: block the property is built on
+            attr: name of the property
+            build: method which builds the property
+
+        Returns:
+            None
+        """
+        key = (_block_class(block), attr)
+        frame = _Frame(key, block)
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(frame)
+        n_start = len(block._decl)
+        t_start = perf_counter()
+        try:
+            build()
+        finally:
+            elapsed = perf_counter() - t_start
+            created = len(block._decl) - n_start
+            self._stack.pop()
+
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _PropertyStats()
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.self_time += elapsed - frame.child_time
+            stats.components += created - frame.child_components
+
+            path = tuple(f.key for f in self._stack) + (key,)
+            record = self._stacks.setdefault(path, [0.0, 0])
+            record[0] += elapsed - frame.child_time
+            record[1] += 1
+
+            if parent is not None:
+                parent.child_time += elapsed
+                if parent.block is block:
+                    parent.child_components += created
+                triggers = self._stats.setdefault(parent.key, _PropertyStats()).triggers
+                triggers[key] = triggers.get(key, 0) + 1
+
+    def table(self, sort_by="total_time"):
+        """
+        Return a table of the recorded builds, with one row for each state
+        block class and property.
+
+        Columns are block_class, property, calls, total_time (s, including
+        properties triggered by the property), self_time (s), components
+        (number of components created) and triggers (properties built on
+        demand by the property).
+
+        Args:
+            sort_by: column to sort the rows by (descending), or None to keep
+                the order in which properties were first built
+
+        Returns:
+            pandas.DataFrame
+        """
+        rows = []
+        for (cls, attr), s in self._stats.items():
+            rows.append(
+                {
+                    "block_class": cls,
+                    "property": attr,
+                    "calls": s.calls,
+                    "total_time": s.total_time,
+                    "self_time": s.self_time,
+                    "components": s.components,
+                    "triggers": ", ".join(
+                        a if c == cls else f"{c}.{a}" for c, a in s.triggers
+                    ),
+                }
+            )
+        df = DataFrame(
+            rows,
+            columns=[
+                "block_class",
+                "property",
+                "calls",
+                "total_time",
+                "self_time",
+                "components",
+                "triggers",
+            ],
+        )
+        if sort_by is not None:
+            df = df.sort_values(sort_by, ascending=False, kind="stable")
+            df = df.reset_index(drop=True)
+        return df
+
+    def dependencies(self):
+        """
+        Return the properties triggered by each property, i.e. the properties
+        which were built on demand while building it.
+
+        Returns:
+            dict: {(block class, property): {(block class, property): calls}}
+        """
+        return {k: dict(s.triggers) for k, s in self._stats.items()}
+
+    def folded_stacks(self, unit=1e-6):
+        """
+        Return the recorded builds as folded stacks, the input format of
+        flame graph tools like flamegraph.pl and speedscope. Each line has
+        the chain of properties separated by semicolons and the time spent
+        in the last property of the chain.
+
+        Args:
+            unit: time unit of the values in seconds, default microseconds
+
+        Returns:
+            str
+        """
+        lines = []
+        for path, (self_time, _) in self._stacks.items():
+            chain = ";".join(f"{cls}.{attr}" for cls, attr in path)
+            lines.append(f"{chain} {int(round(self_time / unit))}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_folded_stacks(self, filename, unit=1e-6):
+        """
+        Write the recorded builds as folded stacks to a file, see
+        folded_stacks.
+
+        Args:
+            filename: name of the file to write
+            unit: time unit of the values in seconds, default microseconds
+
+        Returns:
+            None
+        """
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(self.folded_stacks(unit=unit))
@@ -0,0 +1,522 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Residuals of all active constraints of a model, evaluated at once by a Python
+function generated from the constraint expressions.
+
+Walking the expression trees of a large model to evaluate each constraint is
+slow. CompiledResiduals walks them once, translates them to Python source and
+compiles a single function which evaluates all of them from lists of variable
+and parameter values. The compiled residuals are cached on the model and
+reused as long as its active constraints are the same, so repeated checks of
+a model (e.g. in Initializer postchecks) only pay for the evaluation.
+"""
+from math import inf, nan
+
+import numpy as np
+
+from pyomo.environ import Block, Constraint, value
+from pyomo.common.collections import ComponentMap, ComponentSet
+from pyomo.core.base.units_container import _PyomoUnit
+from pyomo.core.expr.numvalue import native_types
+from pyomo.core.expr.visitor import StreamBasedExpressionVisitor, identify_variables
+from pyomo.core.expr.numeric_expr import (
+    AbsExpression,
+    DivisionExpression,
+    Expr_ifExpression,
+    MaxExpression,
+    MinExpression,
+    NegationExpression,
+    PowExpression,
+    ProductExpression,
+    SumExpression,
+    UnaryFunctionExpression,
+)
+from pyomo.core.expr.relational_expr import (
+    EqualityExpression,
+    InequalityExpression,
+    RangedExpression,
+)
+
+from idaes.core.util.model_statistics import _iter_indexed_block_data_objects
+
+# Name of the attribute the compiled residuals are cached in
+_CACHE_ATTR = "_idaes_compiled_residuals"
+
+# Errors which mark a constraint as not evaluable (same as large_residuals_set)
+_EVALUATION_ERRORS = (AttributeError, TypeError, ValueError)
+
+
+def _if_then_else(if_, then_, else_):
+    # All arguments are evaluated first, as in Pyomo
+    return then_ if if_ else else_
+
+
+def compiled_residuals(block: Block):
+    """
+    Get the CompiledResiduals of a model, reusing the ones cached on the model
+    if its active constraints have not changed since they were compiled.
+
+    Args:
+        block: model (Block or indexed Block) to get residuals of
+
+    Returns:
+        CompiledResiduals of block
+    """
+    residuals = getattr(block, _CACHE_ATTR, None)
+    if residuals is None or not residuals.is_current():
+        residuals = CompiledResiduals(block)
+        setattr(block, _CACHE_ATTR, residuals)
+    return residuals
+
+
+class CompiledResiduals:
+    """
+    Residuals of the active constraints of a model, compiled to Python.
+
+    Each expression is translated to a template, in which the variables,
+    parameters and constants are replaced by slots. Expressions with the same
+    structure (e.g. the same constraint at each point of a discretized
+    domain) share a template, which is evaluated for all of them in a single
+    loop of one compiled function.
+
+    The residual of a constraint is max(0, lower - body, body - upper), the
+    same as in large_residuals_set. Constraints whose body cannot be evaluated
+    (e.g. because of uninitialized variables or the log of a negative number)
+    have a residual of None.
+
+    Parts of expressions which cannot be compiled (e.g. external functions)
+    are evaluated by Pyomo. Changes to the active constraints (activating,
+    deactivating, adding or replacing constraints, or replacing named
+    Expressions) are detected by is_current(), any other changes to the
+    expressions require the residuals to be compiled again.
+
+    Args:
+        block: model (Block or indexed Block) to compile residuals of
+    """
+
+    def __init__(self, block: Block):
+        self._block = block
+        self._constraints = list(
+            _iter_indexed_block_data_objects(
+                block, ctype=Constraint, active=True, descend_into=True
+            )
+        )
+        self._exprs = [c.expr for c in self._constraints]
+        self._bodies = [c.body for c in self._constraints]
+        self._compile()
+
+    def __getstate__(self):
+        # The compiled function cannot be pickled (or deep copied with the
+        # model), so copies are compiled again when they are used
+        return {}
+
+    def __setstate__(self, state):
+        self._block = None
+
+    def is_current(self):
+        """
+        Check whether the active constraints of the model are the ones these
+        residuals were compiled from.
+
+        Returns:
+            bool
+        """
+        if self._block is None:
+            return False
+        n = 0
+        for c in _iter_indexed_block_data_objects(
+            self._block, ctype=Constraint, active=True, descend_into=True
+        ):
+            if (
+                n >= len(self._constraints)
+                or c is not self._constraints[n]
+                or c.expr is not self._exprs[n]
+            ):
+                return False
+            n += 1
+        if n != len(self._constraints):
+            return False
+        return all(e.expr is expr for e, expr in self._named)
+
+    @property
+    def constraints(self):
+        """List of the active constraints, in the order of residuals()"""
+        return self._constraints
+
+    @property
+    def variables(self):
+        """ComponentSet of the variables which appear in the bodies of active
+        constraints (the same as variables_in_activated_constraints_set)"""
+        return self._body_vars
+
+    @property
+    def number_of_templates(self):
+        """Number of distinct expression templates"""
+        return len(self._rows)
+
+    def residuals(self):
+        """
+        Evaluate the residuals of all active constraints.
+
+        Returns:
+            numpy array of residuals (NaN for constraints which could not be
+            evaluated) and list of the positions of those constraints
+        """
+        body = [nan] * len(self._constraints)
+        lower = self._lower.copy()
+        upper = self._upper.copy()
+        errors = []
+        self._function(
+            [v.value for v in self._vars],
+            [p.value for p in self._params],
+            self._constants,
+            self._opaque,
+            [None] * len(self._named),
+            body,
+            lower,
+            upper,
+            errors,
+            self._rows,
+        )
+        body = np.array(body, dtype=float)
+        with np.errstate(invalid="ignore"):
+            # NaN differences are ignored, as in large_residuals_set
+            residual = np.fmax(np.fmax(lower - body, body - upper), 0.0)
+        residual[errors] = nan
+        return residual, errors
+
+    def large_residuals(self, tol: float = 1e-5):
+        """
+        Get the active constraints with a residual greater than a threshold.
+        This gives the same result as large_residuals_set with
+        return_residual_values=True.
+
+        Args:
+            tol: residual threshold
+
+        Returns:
+            dict with constraints as keys and residuals (or None for
+            constraints which could not be evaluated) as values
+        """
+        residual, errors = self.residuals()
+        with np.errstate(invalid="ignore"):
+            large = set(np.flatnonzero(residual > tol).tolist())
+        large.update(errors)
+        return {
+            self._constraints[i]: None if np.isnan(residual[i]) else float(residual[i])
+            for i in sorted(large)
+        }
+
+    def _compile(self):
+        translator = _Translator()
+        # (order, kind, template): [(position, slots)]
+        groups = {}
+
+        def add(order, kind, i, expr):
+            template, slots, _ = translator.translate(expr)
+            groups.setdefault((order, kind, template), []).append((i, slots))
+
+        for i, body in enumerate(self._bodies):
+            add(inf, "b", i, body)
+        # Variables in bounds are not counted as variables of the constraints
+        self._body_vars = ComponentSet(translator.variables)
+        for node in translator.opaque:
+            self._body_vars.update(identify_variables(node, include_fixed=True))
+        n_opaque = len(translator.opaque)
+
+        n = len(self._constraints)
+        self._lower = np.full(n, -inf)
+        self._upper = np.full(n, inf)
+        for i, c in enumerate(self._constraints):
+            for kind, bound, const in (
+                ("l", c.lower, self._lower),
+                ("u", c.upper, self._upper),
+            ):
+                if bound is None:
+                    continue
+                if bound.__class__ in native_types or bound.is_constant():
+                    const[i] = value(bound)
+                else:
+                    add(inf, kind, i, bound)
+        for node in translator.opaque[n_opaque:]:
+            self._body_vars.update(identify_variables(node, include_fixed=True))
+
+        # Named Expressions are evaluated once, before the expressions which
+        # use them
+        for k, (_, _, template, slots, depth) in enumerate(translator.named):
+            groups.setdefault((depth, "e", template), []).append((k, slots))
+        groups = sorted(groups.items(), key=lambda g: g[0][0])
+
+        self._vars = translator.variables
+        self._params = translator.params
+        self._constants = translator.constants
+        self._opaque = translator.opaque
+        self._named = [(node, expr) for node, expr, *_ in translator.named]
+        self._kinds = [kind for (_, kind, _), _ in groups]
+        self._rows = [rows for _, rows in groups]
+        blocks = [
+            _loop(kind, template, k)
+            for k, ((_, kind, template), _) in enumerate(groups)
+        ]
+
+        namespace = {
+            "_errors": _EVALUATION_ERRORS,
+            "_float": float,
+            "_ite": _if_then_else,
+            "_value": value,
+        }
+        namespace.update((f"_f{k}", fcn) for k, fcn in enumerate(translator.functions))
+        try:
+            code = compile(_function_source(blocks), "<compiled residuals>", "exec")
+        except (SyntaxError, RecursionError, MemoryError):
+            # Some expressions are too deeply nested for the Python compiler,
+            # leave those to Pyomo
+            code = compile(
+                _function_source(self._compilable(blocks)),
+                "<compiled residuals>",
+                "exec",
+            )
+        exec(code, namespace)  # pylint: disable=exec-used
+        self._function = namespace["_residuals"]
+
+    def _compilable(self, blocks):
+        result = []
+        for k, block in enumerate(blocks):
+            try:
+                compile(block, "<compiled residuals>", "exec")
+            except (SyntaxError, RecursionError, MemoryError):
+                kind = self._kinds[k]
+                rows = []
+                for i, _ in self._rows[k]:
+                    if kind == "e":
+                        expr = self._named[i][0]
+                    elif kind == "b":
+                        expr = self._bodies[i]
+                    elif kind == "l":
+                        expr = self._constraints[i].lower
+                    else:
+                        expr = self._constraints[i].upper
+                    rows.append((i, (len(self._opaque),)))
+                    self._opaque.append(expr)
+                self._rows[k] = rows
+                block = _loop(kind, "_value(o[k[0]])", k)
+            result.append(block)
+        return result
+
+
+def _loop(kind, template, k):
+    if kind == "e":
+        # None makes anything that uses the expression fail
+        assign = f"e[i] = {template}"
+        error = "e[i] = None"
+    else:
+        assign = f"{kind}[i] = _float({template})"
+        error = "err.append(i)"
+    return (
+        f"for i, k in rows[{k}]:\n"
+        f"    try:\n"
+        f"        {assign}\n"
+        f"    except _errors:\n"
+        f"        {error}\n"
+    )
+
+
+def _function_source(blocks):
+    lines = ["def _residuals(x, p, c, o, e, b, l, u, err, rows):"]
+    for block in blocks:
+        lines.extend("    " + line for line in block.splitlines())
+    lines.append("    return b")
+    return "\n".join(lines) + "\n"
+
+
+class _Translator:
+    """
+    Translate Pyomo expressions to templates of Python source, which evaluate
+    them from the lists of values of variables (x), mutable parameters (p),
+    constants (c), expressions evaluated by Pyomo (o) and named Expressions
+    (e), at the positions in a tuple of slots (k).
+    """
+
+    def __init__(self):
+        self.variables = []
+        self.params = []
+        self.constants = []
+        self.opaque = []
+        self.functions = []
+        # (Expression, expr, template, slots, depth)
+        self.named = []
+        self._var_index = ComponentMap()
+        self._param_index = ComponentMap()
+        self._function_index = {}
+        self._named_index = {}
+        # walkers for each level of nested named Expressions (creating a
+        # walker for each expression is slow)
+        self._walkers = []
+        self._level = 0
+
+    def translate(self, expr):
+        """Returns template, tuple of slots and depth of nested named
+        Expressions"""
+        if self._level == len(self._walkers):
+            self._walkers.append(_TemplateWalker(self))
+        walker = self._walkers[self._level]
+        walker.slots = []
+        walker.depth = 0
+        self._level += 1
+        try:
+            template = walker.walk_expression(expr)
+        finally:
+            self._level -= 1
+        return template, tuple(walker.slots), walker.depth
+
+    def variable(self, var):
+        k = self._var_index.get(var)
+        if k is None:
+            k = self._var_index[var] = len(self.variables)
+            self.variables.append(var)
+        return k
+
+    def param(self, param):
+        k = self._param_index.get(param)
+        if k is None:
+            k = self._param_index[param] = len(self.params)
+            self.params.append(param)
+        return k
+
+    def constant(self, number):
+        self.constants.append(number)
+        return len(self.constants) - 1
+
+    def function(self, fcn):
+        k = self._function_index.get(id(fcn))
+        if k is None:
+            k = self._function_index[id(fcn)] = len(self.functions)
+            self.functions.append(fcn)
+        return k
+
+    def named_expression(self, node):
+        """Returns position and depth of a named Expression"""
+        k = self._named_index.get(id(node))
+        if k is None:
+            template, slots, depth = self.translate(node.expr)
+            k = self._named_index[id(node)] = len(self.named)
+            self.named.append((node, node.expr, template, slots, depth + 1))
+        return k, self.named[k][4]
+
+    def opaque_node(self, node):
+        self.opaque.append(node)
+        return len(self.opaque) - 1
+
+
+class _TemplateWalker(StreamBasedExpressionVisitor):
+    def __init__(self, translator):
+        super().__init__()
+        self.translator = translator
+        self.slots = []
+        self.depth = 0
+
+    def initializeWalker(self, expr):
+        descend, result = self.beforeChild(None, expr, 0)
+        if not descend:
+            return False, result
+        return True, None
+
+    def beforeChild(self, node, child, child_idx):
+        if child.__class__ in native_types:
+            return False, self._constant(child)
+        if not child.is_expression_type():
+            return False, self._leaf(child)
+        if child.is_named_expression_type():
+            if child.expr is None:
+                return False, self._opaque(child)
+            k, depth = self.translator.named_expression(child)
+            self.depth = max(self.depth, depth)
+            return False, self._slot("e", k)
+        if isinstance(child, _TRANSLATABLE):
+            return True, None
+        return False, self._opaque(child)
+
+    def exitNode(self, node, data):
+        args = [f"({a})" for a in data]
+        if isinstance(node, SumExpression):
+            return " + ".join(args) or "0"
+        if isinstance(node, ProductExpression):
+            return f"{args[0]} * {args[1]}"
+        if isinstance(node, DivisionExpression):
+            return f"{args[0]} / {args[1]}"
+        if isinstance(node, PowExpression):
+            return f"{args[0]} ** {args[1]}"
+        if isinstance(node, NegationExpression):
+            return f"-{args[0]}"
+        if isinstance(node, AbsExpression):
+            return f"abs{args[0]}"
+        if isinstance(node, UnaryFunctionExpression):
+            return f"_f{self.translator.function(node._fcn)}{args[0]}"
+        if isinstance(node, MaxExpression):
+            return f"max({', '.join(args)})"
+        if isinstance(node, MinExpression):
+            return f"min({', '.join(args)})"
+        if isinstance(node, Expr_ifExpression):
+            return f"_ite({', '.join(args)})"
+        if isinstance(node, EqualityExpression):
+            return f"{args[0]} == {args[1]}"
+        if isinstance(node, InequalityExpression):
+            op = "<" if node.strict else "<="
+            return f"{args[0]} {op} {args[1]}"
+        if isinstance(node, RangedExpression):
+            op1 = "<" if node.strict[0] else "<="
+            op2 = "<" if node.strict[1] else "<="
+            return f"{args[0]} {op1} {args[1]} {op2} {args[2]}"
+        raise TypeError(f"Unexpected expression type {type(node)}")
+
+    def _slot(self, kind, k):
+        self.slots.append(k)
+        return f"{kind}[k[{len(self.slots) - 1}]]"
+
+    def _constant(self, number):
+        # int is kept in the template, as its arithmetic (e.g. in powers)
+        # differs from float and it is often part of the structure
+        if number.__class__ is int:
+            return repr(number)
+        return self._slot("c", self.translator.constant(float(number)))
+
+    def _leaf(self, leaf):
+        if leaf.is_variable_type():
+            return self._slot("x", self.translator.variable(leaf))
+        if leaf.is_parameter_type():
+            return self._slot("p", self.translator.param(leaf))
+        if isinstance(leaf, _PyomoUnit):
+            return "1.0"
+        if leaf.is_constant():
+            return self._constant(value(leaf))
+        return self._opaque(leaf)
+
+    def _opaque(self, node):
+        return f"_value({self._slot('o', self.translator.opaque_node(node))})"
+
+
+_TRANSLATABLE = (
+    SumExpression,
+    ProductExpression,
+    DivisionExpression,
+    PowExpression,
+    NegationExpression,
+    UnaryFunctionExpression,
+    MaxExpression,
+    MinExpression,
+    Expr_ifExpression,
+    EqualityExpression,
+    InequalityExpression,
+    RangedExpression,
+)
@@ -14,9 +14,15 @@
 Author: Andrew Lee
 """
 import gc
+import os
+import re
+from io import StringIO
+
 import pytest
 
 from pyomo.util.check_units import assert_units_consistent
+from pyomo.common.tee import capture_output
+from pyomo.common.tempfiles import TempfileManager
 from pyomo.common.timing import TicTocTimer
 from pyomo.environ import assert_optimal_termination
 import pyomo.common.unittest as unittest
@@ -27,6 +33,27 @@ from idaes.core.util.model_statistics import degrees_of_freedom
 # Get default solver for testing
 solver = get_solver()
 
+# Data recorded by the current test, set by the performance suite runner
+# (see idaes.core.util.performance_suite) while a test is running
+_recorder = None
+
+
+def ipopt_iterations(log):
+    """
+    Return the number of iterations reported in an IPOPT log, or None if the
+    log does not contain the number of iterations.
+
+    Args:
+        log: IPOPT output
+
+    Returns:
+        int or None
+    """
+    match = re.search(r"Number of Iterations\.*:\s*(\d+)", log)
+    if match is None:
+        return None
+    return int(match.group(1))
+
 
 class PerformanceBaseClass:
     """
@@ -68,6 +95,10 @@ class PerformanceBaseClass:
     # TODO: Fix this once the Pyomo bug is resolved
     TEST_UNITS = True
 
+    # Flag for recording the size of the NL file written for the model, which
+    # can be turned off for models which can not be written to an NL file
+    RECORD_NL_SIZE = True
+
     def __init_subclass__(cls):
         if not issubclass(cls, unittest.TestCase):
             raise TypeError(
@@ -82,6 +113,8 @@ class PerformanceBaseClass:
         tmp = getattr(self, "testdata", None)
         if tmp is not None:
             tmp[name] = value
+        if _recorder is not None:
+            _recorder[name] = value
 
     def build_model(self):
         """
@@ -116,7 +149,8 @@ class PerformanceBaseClass:
     def solve_model(self, model):
         """
         Solve provided model. Developers should overload this if necessary to customize
-        solver and arguments.
+        solver and arguments. The number of IPOPT iterations is recorded if the
+        solver reports it.
 
         Args:
             model - constructed model object to be solved
@@ -124,7 +158,12 @@ class PerformanceBaseClass:
         Returns:
             None
         """
-        results = solver.solve(model)
+        log = StringIO()
+        with capture_output(log):
+            results = solver.solve(model, tee=True)
+        iterations = ipopt_iterations(log.getvalue())
+        if iterations is not None:
+            self.recordData("ipopt iterations", iterations)
 
         assert_optimal_termination(results)
 
@@ -138,8 +177,9 @@ class PerformanceBaseClass:
 
         1. Model construction time
         2. Time required to assert unit consistency
-        3. Model initialization time
-        4. Model solution time (post-initialization)
+        3. Size of the NL file written for the model
+        4. Model initialization time
+        5. Model solution time (post-initialization)
 
         Developers may overload this method to customize the information recorded.
         Note that dynamic models currently fail unit consistency checks, and thus
@@ -162,6 +202,15 @@ class PerformanceBaseClass:
             assert_units_consistent(model)
             self.recordData("unit consistency", timer.toc("unit consistency"))
 
+        # Write the model to an NL file and record its size
+        if self.RECORD_NL_SIZE:
+            with TempfileManager.new_context() as tempfiles:
+                fname = tempfiles.create_tempfile(suffix=".nl")
+                model.write(
+                    fname, format="nl", io_options={"symbolic_solver_labels": False}
+                )
+                self.recordData("nl file size", os.path.getsize(fname))
+
         # Initialize model and record execution time
         gc.collect()
         timer.tic(None)
@@ -0,0 +1,429 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Runner for the IDAES performance test suite.
+
+Performance tests are classes derived from PerformanceBaseClass (see
+idaes.core.util.performance). The runner finds these classes in test files,
+runs each class in a separate pytest process a number of times, and collects
+the data recorded by the tests (e.g. build, initialize and solve times, NL
+file size and IPOPT iterations) and the peak memory use of the process.
+Results can be appended to a local history file and compared with a baseline
+run to flag regressions.
+
+This module is also the pytest plugin used in the test processes to collect
+the recorded data.
+"""
+import ast
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+import pytest
+from pandas import DataFrame, to_numeric
+
+import idaes.logger as idaeslog
+from idaes.core.util import performance
+
+_log = idaeslog.getLogger(__name__)
+
+# Environment variable with the name of the file the plugin writes results to
+OUTPUT_VARIABLE = "IDAES_PERFORMANCE_OUTPUT"
+
+# Metric recorded for the peak resident set size of each test process
+PEAK_RSS = "peak rss"
+
+_SUMMARY_COLUMNS = ["test", "metric", "median", "min", "max", "n"]
+
+
+def find_performance_tests(paths, pattern=None):
+    """
+    Find the performance test classes, i.e. classes derived from
+    PerformanceBaseClass, in the test files (test_*.py) in a list of files and
+    directories. Files are parsed rather than imported.
+
+    Args:
+        paths: list of files and directories to search
+        pattern: if given, only return tests whose id contains this string
+
+    Returns:
+        list of pytest node ids ("file::Class") of the test classes
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, fnames in os.walk(path):
+                dirs.sort()
+                for fname in sorted(fnames):
+                    if fname.startswith("test_") and fname.endswith(".py"):
+                        files.append(os.path.join(root, fname))
+        else:
+            files.append(path)
+
+    tests = []
+    for fname in files:
+        with open(fname, "r", encoding="utf-8") as f:
+            source = f.read()
+        if "PerformanceBaseClass" not in source:
+            continue
+        for node in ast.parse(source, filename=fname).body:
+            if isinstance(node, ast.ClassDef) and any(
+                _base_name(b) == "PerformanceBaseClass" for b in node.bases
+            ):
+                test_id = f"{fname}::{node.name}"
+                if pattern is None or pattern in test_id:
+                    tests.append(test_id)
+    return tests
+
+
+def _base_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def run_performance_tests(tests, repeat=1, timeout=None, pytest_args=None):
+    """
+    Run performance test classes, each in a separate pytest process, and
+    collect the data they record.
+
+    Args:
+        tests: list of pytest node ids, e.g. from find_performance_tests
+        repeat: number of times to run each test class
+        timeout: time limit in seconds for each test process (default None)
+        pytest_args: list of additional arguments for pytest
+
+    Returns:
+        pandas.DataFrame with columns test (pytest node id of the test
+        method), repeat, metric, value and outcome (passed, failed, skipped
+        or error)
+    """
+    rows = []
+    for test in tests:
+        for rep in range(repeat):
+            _log.info(f"Running {test} ({rep + 1}/{repeat})")
+            for test_id, outcome, data in _run_test_process(test, timeout, pytest_args):
+                if not data:
+                    rows.append((test_id, rep, None, None, outcome))
+                for metric, val in data.items():
+                    rows.append((test_id, rep, metric, val, outcome))
+    return DataFrame(rows, columns=["test", "repeat", "metric", "value", "outcome"])
+
+
+def _run_test_process(test, timeout, pytest_args):
+    """Run one test class in a pytest process, return a list of
+    (test id, outcome, data) tuples"""
+    # Tests run in a temporary directory, so use the absolute path of the file
+    fname, _, cls = test.partition("::")
+    test = f"{os.path.abspath(fname)}::{cls}" if cls else os.path.abspath(fname)
+    fd, output = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    env = dict(os.environ)
+    env[OUTPUT_VARIABLE] = output
+    cmd = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        "-p",
+        __name__,
+        "-o",
+        "addopts=",
+        "--performance",
+        test,
+    ] + list(pytest_args or [])
+    try:
+        with tempfile.TemporaryDirectory() as cwd:
+            # Run in a temporary directory, as some tests write files
+            proc = subprocess.run(
+                cmd,
+                env=env,
+                cwd=cwd,
+                timeout=timeout,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                check=False,
+            )
+        with open(output, "r", encoding="utf-8") as f:
+            content = f.read()
+    except subprocess.TimeoutExpired:
+        _log.warning(f"{test} did not finish within {timeout} s.")
+        return [(test, "timeout", {})]
+    finally:
+        os.remove(output)
+
+    if not content:
+        _log.warning(f"{test} could not be run:\n{proc.stdout[-2000:]}")
+        return [(test, "error", {})]
+
+    result = json.loads(content)
+    if not result["tests"]:
+        # e.g. the test file could not be imported
+        _log.warning(f"{test} did not run any tests:\n{proc.stdout[-2000:]}")
+        return [(test, "error", {})]
+    tests = []
+    for test_id, rec in result["tests"].items():
+        data = dict(rec["data"])
+        if result.get(PEAK_RSS) is not None:
+            data[PEAK_RSS] = result[PEAK_RSS]
+        tests.append((test_id, rec["outcome"], data))
+        if rec["outcome"] not in ("passed", "skipped"):
+            _log.warning(f"{test_id} {rec['outcome']}:\n{rec.get('message', '')}")
+    return tests
+
+
+def summarize(results):
+    """
+    Summarize the results of repeated runs by the median, minimum and maximum
+    of each metric over the runs which passed.
+
+    Args:
+        results: results from run_performance_tests
+
+    Returns:
+        pandas.DataFrame with columns test, metric, median, min, max and n
+        (number of values)
+    """
+    df = results[(results["outcome"] == "passed") & results["metric"].notna()]
+    # Only numeric values are summarized
+    df = df.assign(value=to_numeric(df["value"], errors="coerce"))
+    df = df[df["value"].notna()]
+    if len(df) == 0:
+        return DataFrame(columns=_SUMMARY_COLUMNS)
+    summary = df.groupby(["test", "metric"], sort=False)["value"].agg(
+        ["median", "min", "max", "count"]
+    )
+    summary = summary.rename(columns={"count": "n"}).reset_index()
+    return summary[_SUMMARY_COLUMNS]
+
+
+def _git_commit():
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            check=True,
+        )
+        return proc.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def append_history(filename, summary, label=None):
+    """
+    Append a summary of a run to a history file. Each line of the file is a
+    JSON record of one run, with the time, git commit, host and Python
+    version.
+
+    Args:
+        filename: name of the history file
+        summary: summary of the run from summarize
+        label: optional name of the run
+
+    Returns:
+        dict: the record added to the file
+    """
+    record = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "label": label,
+        "commit": _git_commit(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "results": summary.to_dict(orient="records"),
+    }
+    with open(filename, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+
+def load_history(filename):
+    """
+    Read a history file written by append_history.
+
+    Args:
+        filename: name of the history file
+
+    Returns:
+        pandas.DataFrame with one row for each run, test and metric, with
+        columns run (number of the run in the file), timestamp, label, commit,
+        host, python and the summary columns
+    """
+    rows = []
+    if os.path.exists(filename):
+        with open(filename, "r", encoding="utf-8") as f:
+            for run, line in enumerate(ln for ln in f if ln.strip()):
+                record = json.loads(line)
+                info = {k: v for k, v in record.items() if k != "results"}
+                for res in record["results"]:
+                    rows.append({"run": run, **info, **res})
+    columns = ["run", "timestamp", "label", "commit", "host", "python"]
+    return DataFrame(rows, columns=columns + _SUMMARY_COLUMNS)
+
+
+def baseline_from_history(history, run=-1):
+    """
+    Return the summary of one run from a history, to use as a baseline.
+
+    Args:
+        history: history from load_history
+        run: number of the run, negative numbers count from the last run, or
+            the label or (a prefix of) the git commit of the run. If several
+            runs match a label or commit, the last one is used.
+
+    Returns:
+        pandas.DataFrame in the format of summarize, or None if there is no
+        such run
+    """
+    if len(history) == 0:
+        return None
+    runs = sorted(history["run"].unique())
+    if isinstance(run, int):
+        if run >= len(runs) or run < -len(runs):
+            return None
+        selected = runs[run]
+    else:
+        match = history[
+            (history["label"] == run)
+            | history["commit"].fillna("").str.startswith(str(run))
+        ]
+        if len(match) == 0:
+            return None
+        selected = match["run"].max()
+    baseline = history[history["run"] == selected]
+    return baseline[_SUMMARY_COLUMNS].reset_index(drop=True)
+
+
+def find_regressions(summary, baseline, rel_tol=0.2, abs_tol=0.05):
+    """
+    Compare a summary with a baseline and return the metrics which got worse.
+    All metrics are assumed to be better when lower (times, memory, file size
+    and iterations). A metric has regressed if its median is greater than the
+    baseline median by more than rel_tol times the baseline median and by
+    more than abs_tol, which avoids flagging noise in short times.
+
+    Args:
+        summary: summary from summarize
+        baseline: summary of the baseline run
+        rel_tol: relative tolerance (default 0.2)
+        abs_tol: absolute tolerance (default 0.05)
+
+    Returns:
+        pandas.DataFrame with columns test, metric, baseline, current and
+        ratio (current / baseline) for each regression
+    """
+    columns = ["test", "metric", "baseline", "current", "ratio"]
+    if baseline is None or len(baseline) == 0 or len(summary) == 0:
+        return DataFrame(columns=columns)
+    df = summary[["test", "metric", "median"]].merge(
+        baseline[["test", "metric", "median"]],
+        on=["test", "metric"],
+        suffixes=("_current", "_baseline"),
+    )
+    current = df["median_current"]
+    base = df["median_baseline"]
+    worse = (current - base > rel_tol * base.abs()) & (current - base > abs_tol)
+    df = df[worse]
+    regressions = DataFrame(
+        {
+            "test": df["test"],
+            "metric": df["metric"],
+            "baseline": df["median_baseline"],
+            "current": df["median_current"],
+            "ratio": df["median_current"] / df["median_baseline"],
+        },
+        columns=columns,
+    )
+    return regressions.reset_index(drop=True)
+
+
+def _peak_rss():
+    """Peak resident set size of this process in bytes, or None"""
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        # Not available on Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kB, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _json_value(val):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return str(val)
+
+
+# Results of the test process, collected by the plugin hooks below
+_plugin_results = {}
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Collect the data recorded by a performance test"""
+    if os.environ.get(OUTPUT_VARIABLE) is None:
+        yield
+        return
+    performance._recorder = {}  # pylint: disable=protected-access
+    try:
+        yield
+    finally:
+        data = performance._recorder  # pylint: disable=protected-access
+        performance._recorder = None  # pylint: disable=protected-access
+        rec = _plugin_results.setdefault(item.nodeid, {"outcome": None})
+        rec["data"] = {k: _json_value(v) for k, v in data.items()}
+
+
+def pytest_runtest_logreport(report):
+    """Record the outcome of each test"""
+    if os.environ.get(OUTPUT_VARIABLE) is None:
+        return
+    rec = _plugin_results.setdefault(report.nodeid, {"outcome": None, "data": {}})
+    if report.when == "call" or report.outcome != "passed":
+        if rec["outcome"] in (None, "passed"):
+            rec["outcome"] = report.outcome
+            if report.outcome != "passed":
+                rec["message"] = str(report.longrepr)[-2000:]
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write the results of the test process"""
+    output = os.environ.get(OUTPUT_VARIABLE)
+    if output is None:
+        return
+    for rec in _plugin_results.values():
+        rec.setdefault("data", {})
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "tests": _plugin_results,
+                PEAK_RSS: _peak_rss(),
+                "exitstatus": int(exitstatus),
+            },
+            f,
+        )
@@ -14,6 +14,8 @@
 This module contains utility functions to generate phase equilibrium data and
 plots.
 """
+from concurrent.futures import ProcessPoolExecutor
+
 # Import plotting functions
 import matplotlib.pyplot as plt
 import numpy as np
@@ -22,6 +24,7 @@ import numpy as np
 from pyomo.environ import (
     check_optimal_termination,
     value,
+    Var,
     units as pyunits,
 )
 
@@ -100,6 +103,8 @@ def Txy_data(
     print_level=idaeslog.NOTSET,
     solver=None,
     solver_op=None,
+    continuation=False,
+    n_workers=1,
 ):
     """
     Function to generate T-x-y data. The function builds a state block and extracts
@@ -114,64 +119,259 @@ def Txy_data(
         temperature: Temperature at which to initialize state block
         num_points: Number of data point to be calculated
         model: Model wit initialized Property package which contains data to calculate
-        bubble and dew temperatures for  component 1 and component 2
+        bubble and dew temperatures for  component 1 and component 2, or a
+        function with no arguments which returns such a model
         print_level: printing level from initialization
         solver: solver to use (default=None, use IDAES default solver)
         solver_op: solver options
+        continuation: if True, start each solve from a prediction extrapolated
+            from the solutions at the two previous compositions, and restart
+            from the last converged solution after a failed solve
+            (default=False)
+        n_workers: number of processes to split the compositions between
+            (default=1). Each process builds its own model and calculates a
+            contiguous part of the compositions, so model must be a function
+            which can be pickled, e.g. defined at module level, if n_workers
+            is greater than 1.
 
     Returns:
         (Class): A class containing the T-x-y data
 
     """
+    if n_workers > 1:
+        return Txy_data_pairs(
+            model,
+            [(component_1, component_2)],
+            pressure,
+            num_points=num_points,
+            temperature=temperature,
+            print_level=print_level,
+            solver=solver,
+            solver_op=solver_op,
+            continuation=continuation,
+            n_workers=n_workers,
+        )[component_1, component_2]
+
+    if callable(model):
+        model = model()
+    x_d, xs = _txy_compositions(model, component_1, component_2, num_points)
+    X, Tbubb, Tdew, Punit, Tunit = _txy_points(
+        model,
+        component_1,
+        component_2,
+        pressure,
+        x_d,
+        xs,
+        temperature,
+        print_level,
+        solver,
+        solver_op,
+        continuation,
+    )
+
+    # Call TXYData function and store the data in TD class
+    TD = TXYDataClass(component_1, component_2, Punit, Tunit, pressure)
+    TD.TBubb = Tbubb
+    TD.TDew = Tdew
+    TD.x = X
 
-    components = list(model.params.component_list)
-    components_used = [component_1, component_2]
-    components_not_used = list(set(components) - set(components_used))
+    # Return the data class with all the information of the calculations
+    return TD
 
-    # Add properties parameter blocks to the flowsheet with specifications
 
-    model.props = model.params.build_state_block([1], defined_state=True)
+def Txy_data_pairs(
+    model,
+    pairs,
+    pressure,
+    num_points=20,
+    temperature=298.15,
+    print_level=idaeslog.NOTSET,
+    solver=None,
+    solver_op=None,
+    continuation=False,
+    n_workers=1,
+):
+    """
+    Function to generate T-x-y data for several pairs of components, e.g. to
+    screen the binary pairs of a property package. The compositions of each
+    pair are split into contiguous parts, which are calculated in a pool of
+    n_workers processes. Each process builds the model once and calculates
+    each part as in Txy_data().
+
+    Args:
+        model: function with no arguments which returns a model with a
+            property package params, see Txy_data(). The function must be
+            defined at module level if n_workers is greater than 1, so it can
+            be pickled.
+        pairs: list of (component_1, component_2) tuples
+        pressure: Pressure at which the bubble and dew temperatures will be calculated
+        num_points: Number of data point to be calculated for each pair
+        temperature: Temperature at which to initialize state block
+        print_level: printing level from initialization
+        solver: solver to use (default=None, use IDAES default solver)
+        solver_op: solver options
+        continuation: if True, start each solve from a prediction extrapolated
+            from the previous compositions (default=False, the same as
+            Txy_data())
+        n_workers: number of processes (default=1, calculate all points in
+            this process)
+
+    Returns:
+        (dict): TXYDataClass with the T-x-y data for each pair
+    """
+    args = (pressure, temperature, print_level, solver, solver_op, continuation)
+    if n_workers > 1 and not callable(model):
+        raise ValueError(
+            "model must be a function which returns a model to calculate T-x-y "
+            "data in more than one process, as models can not be sent to "
+            "other processes."
+        )
+
+    # Split the compositions of each pair into n_workers contiguous parts
+    tasks = []
+    for c1, c2 in pairs:
+        for chunk in _split_points(num_points, n_workers):
+            tasks.append((c1, c2, num_points, chunk))
+
+    if n_workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(model,)
+        ) as executor:
+            results = list(
+                executor.map(_txy_task_in_worker, tasks, [args] * len(tasks))
+            )
+    else:
+        base = model() if callable(model) else model
+        results = [_txy_task(base, task, args) for task in tasks]
+
+    data = {}
+    for (c1, c2, _, _), (X, Tbubb, Tdew, Punit, Tunit) in zip(tasks, results):
+        TD = data.get((c1, c2))
+        if TD is None:
+            TD = data[c1, c2] = TXYDataClass(c1, c2, Punit, Tunit, pressure)
+        TD.TBubb += Tbubb
+        TD.TDew += Tdew
+        TD.x += X
+    return data
+
+
+def _split_points(num_points, n_parts):
+    """Split range(num_points) into at most n_parts contiguous slices"""
+    bounds = np.linspace(0, num_points, min(n_parts, num_points) + 1)
+    bounds = [int(round(b)) for b in bounds]
+    return [slice(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
 
+# model of the current worker process, created by _init_worker
+_worker_model = None
+
+
+def _init_worker(build_model):
+    global _worker_model  # pylint: disable=global-statement
+    _worker_model = build_model()
+
+
+def _txy_task_in_worker(task, args):
+    return _txy_task(_worker_model, task, args)
+
+
+def _txy_task(base, task, args):
+    """Calculate the bubble and dew temperatures for part of the compositions
+    of a pair, using a copy of the base model"""
+    c1, c2, num_points, chunk = task
+    pressure, temperature, print_level, solver, solver_op, continuation = args
+    model = base.clone()
+    x_d, xs = _txy_compositions(model, c1, c2, num_points)
+    return _txy_points(
+        model,
+        c1,
+        c2,
+        pressure,
+        x_d[chunk],
+        xs,
+        temperature,
+        print_level,
+        solver,
+        solver_op,
+        continuation,
+    )
+
+
+def _txy_compositions(model, component_1, component_2, num_points):
+    """Return the compositions of component_1 to calculate and the total
+    mole fraction of the other components"""
+    components_not_used = [
+        j for j in model.params.component_list if j not in (component_1, component_2)
+    ]
     # Set initial concentration of component 1 close to 1
     x = 0.99
+    xs = 1e-5 * len(components_not_used)
 
-    # Set conditions for flash unit model
-    model.props[1].mole_frac_comp[component_1].fix(x)
+    # Create an array of compositions with N number of points
+    return np.linspace(x, 1 - x - xs, num_points), xs
 
-    for i in components_not_used:
-        model.props[1].mole_frac_comp[i].fix(1e-5)
 
-    xs = sum(value(model.props[1].mole_frac_comp[i]) for i in components_not_used)
+def _txy_points(
+    model,
+    component_1,
+    component_2,
+    pressure,
+    x_d,
+    xs,
+    temperature,
+    print_level,
+    solver,
+    solver_op,
+    continuation,
+):
+    """Build and initialize a state block on model and calculate the bubble
+    and dew temperatures at each composition in x_d"""
+    components_not_used = [
+        j for j in model.params.component_list if j not in (component_1, component_2)
+    ]
 
-    model.props[1].mole_frac_comp[component_2].fix(1 - x - xs)
+    # Add properties parameter blocks to the flowsheet with specifications
+
+    model.props = model.params.build_state_block([1], defined_state=True)
+    sb = model.props[1]
+
+    # Set conditions for flash unit model, starting from the first composition
+    sb.mole_frac_comp[component_1].fix(x_d[0] if len(x_d) else 0.99)
+
+    for i in components_not_used:
+        sb.mole_frac_comp[i].fix(1e-5)
 
-    model.props[1].flow_mol.fix(1)
-    model.props[1].temperature.fix(temperature)
-    model.props[1].pressure.fix(pressure)
+    sb.mole_frac_comp[component_2].fix(1 - value(sb.mole_frac_comp[component_1]) - xs)
+
+    sb.flow_mol.fix(1)
+    sb.temperature.fix(temperature)
+    sb.pressure.fix(pressure)
 
     # Initialize flash unit model
-    model.props[1].calculate_scaling_factors()
+    sb.calculate_scaling_factors()
     model.props.initialize(solver=solver, optarg=solver_op, outlvl=print_level)
 
     solver = get_solver(solver, solver_op)
 
-    # Create an array of compositions with N number of points
-    x_d = np.linspace(x, 1 - x - xs, num_points)
-
     # Create emprty arrays for concentration, bubble temperature and dew temperature
     X = []
     Tbubb = []
     Tdew = []
 
     # Obtain pressure and temperature units from the unit model
-    Punit = pyunits.get_units(model.props[1].pressure)
-    Tunit = pyunits.get_units(model.props[1].temperature)
+    Punit = pyunits.get_units(sb.pressure)
+    Tunit = pyunits.get_units(sb.temperature)
+
+    if continuation:
+        path = _ContinuationPath(model)
 
     count = 1
     # Create and run loop to calculate temperatures at every composition
     for i, v in enumerate(x_d):
-        model.props[1].mole_frac_comp[component_1].fix(v)
-        model.props[1].mole_frac_comp[component_2].fix(1 - v - xs)
+        if continuation:
+            path.predict(v)
+        sb.mole_frac_comp[component_1].fix(v)
+        sb.mole_frac_comp[component_2].fix(1 - v - xs)
         # solve the model
         status = solver.solve(model, tee=False)
         # If solution is optimal store the concentration, and calculated temperatures in the created arrays
@@ -179,35 +379,84 @@ def Txy_data(
 
             print(f"Case: {count} Optimal. {component_1} x = {v:.2f}")
 
-            if hasattr(model.props[1], "_mole_frac_tdew") and hasattr(
-                model.props[1], "_mole_frac_tbub"
-            ):
-                Tbubb.append(value(model.props[1].temperature_bubble["Vap", "Liq"]))
-                Tdew.append(value(model.props[1].temperature_dew["Vap", "Liq"]))
+            if hasattr(sb, "_mole_frac_tdew") and hasattr(sb, "_mole_frac_tbub"):
+                Tbubb.append(value(sb.temperature_bubble["Vap", "Liq"]))
+                Tdew.append(value(sb.temperature_dew["Vap", "Liq"]))
 
-            elif hasattr(model.props[1], "_mole_frac_tdew"):
+            elif hasattr(sb, "_mole_frac_tdew"):
                 print("One of the components only exists in vapor phase.")
-                Tdew.append(value(model.props[1].temperature_dew["Vap", "Liq"]))
+                Tdew.append(value(sb.temperature_dew["Vap", "Liq"]))
 
-            elif hasattr(model.props[1], "_mole_frac_tbub"):
+            elif hasattr(sb, "_mole_frac_tbub"):
                 print("One of the components only exists in liquid phase.")
-                Tbubb.append(value(model.props[1].temperature_bubble["Vap", "Liq"]))
+                Tbubb.append(value(sb.temperature_bubble["Vap", "Liq"]))
 
             X.append(v)
+            if continuation:
+                path.converged(v)
 
         # If the solver did not solve to an optimal solution, do not store the data point
         else:
             print(f"Case: {count} No Result {component_1} x = {x_d[i]:.2f}")
+            if continuation:
+                path.restore()
         count += 1
 
-    # Call TXYData function and store the data in TD class
-    TD = TXYDataClass(component_1, component_2, Punit, Tunit, pressure)
-    TD.TBubb = Tbubb
-    TD.TDew = Tdew
-    TD.x = X
+    return X, Tbubb, Tdew, Punit, Tunit
 
-    # Return the data class with all the information of the calculations
-    return TD
+
+class _ContinuationPath:
+    """
+    Starting points for a sequence of solves along the composition of
+    component 1. Each solve starts from the linear extrapolation of the
+    solutions at the two previous converged compositions (or from the previous
+    solution for the second point), rather than from the last point the solver
+    reached, which may be far from a solution if that solve failed.
+    """
+
+    def __init__(self, model):
+        self._vars = [
+            v
+            for v in model.props.component_data_objects(Var, descend_into=True)
+            if not v.fixed
+        ]
+        self._x = []
+        self._states = []
+
+    def _get_state(self):
+        return np.array(
+            [np.nan if v.value is None else v.value for v in self._vars], dtype=float
+        )
+
+    def _set_state(self, state):
+        for v, val in zip(self._vars, state):
+            if not np.isnan(val):
+                v.set_value(val, skip_validation=True)
+
+    def converged(self, x):
+        """Record the solution at composition x"""
+        self._x = self._x[-1:] + [x]
+        self._states = self._states[-1:] + [self._get_state()]
+
+    def restore(self):
+        """Return to the last converged solution"""
+        if self._states:
+            self._set_state(self._states[-1])
+
+    def predict(self, x):
+        """Set the variables to the predicted solution at composition x"""
+        if len(self._states) < 2 or self._x[1] == self._x[0]:
+            self.restore()
+            return
+        s0, s1 = self._states
+        state = s1 + (s1 - s0) * (x - self._x[1]) / (self._x[1] - self._x[0])
+        # keep the prediction within the bounds of the variables
+        for j, v in enumerate(self._vars):
+            if v.lb is not None and state[j] < v.lb:
+                state[j] = v.lb
+            if v.ub is not None and state[j] > v.ub:
+                state[j] = v.ub
+        self._set_state(state)
 
 
 # Author: Alejandro Garciadiego
@@ -15,17 +15,26 @@
 # pylint: disable=missing-class-docstring
 
 from collections import OrderedDict
+import os
 
-from pandas import DataFrame
+import numpy as np
+from pandas import DataFrame, MultiIndex, Index
 
-from pyomo.environ import value
+from pyomo.environ import value, units as pyunits
 from pyomo.network import Arc, Port
 from pyomo.core.base.var import _GeneralVarData, Var
 from pyomo.core.base.param import Param
 from pyomo.core.base.expression import Expression
+from pyomo.common.dependencies import attempt_import
 
 import idaes.logger as idaeslog
-from idaes.core.util.units_of_measurement import report_quantity
+from idaes.core.util.units_of_measurement import (
+    convert_quantity_to_reporting_units,
+    report_quantity,
+)
+
+pa, pyarrow_available = attempt_import("pyarrow")
+pq, _ = attempt_import("pyarrow.parquet")
 
 _log = idaeslog.getLogger(__name__)
 
@@ -190,6 +199,254 @@ def create_stream_table_dataframe(
     return DataFrame.from_dict(stream_attributes, orient=orient)
 
 
+def create_stream_table_time_series(
+    streams, true_state=False, time_points=None, layout="long"
+):
+    """
+    Method to create a stream table for a number of time points (e.g. for the
+    results of a dynamic flowsheet) in the form of a pandas dataframe. This
+    gives the same values as calling create_stream_table_dataframe for each
+    time point, but the display variables and their units are only looked up
+    once for each stream.
+
+    Args:
+        streams : dict with name keys and stream values. Names will be used as
+            display names for stream table, and streams may be Arcs, Ports or
+            StateBlocks.
+        true_state : indicated whether the stream table should contain the
+            display variables define in the StateBlock (False, default) or the
+            state variables (True).
+        time_points : points in the time domain at which to generate the
+            stream table (default = all points in the time domain of the
+            flowsheet of the first stream)
+        layout : layout of the stream table. Accepted values are 'long'
+            (default), with one row for each time point, stream and variable
+            and columns 'time', 'stream', 'variable', 'value' and 'units', or
+            'wide', with one row for each time point and a column for each
+            stream and variable (a MultiIndex with levels 'stream' and
+            'variable'). In the 'wide' layout the units of the variables are
+            stored in the attrs['units'] of the dataframe.
+
+    Returns:
+        A pandas DataFrame containing the stream table data.
+    """
+    if layout not in ("long", "wide"):
+        raise ValueError(
+            f"Unrecognized layout {layout} for stream table, expected 'long' "
+            "or 'wide'."
+        )
+    table = _StreamTableSeries(streams, true_state, time_points)
+    times, values = table.values(table.time_points)
+    if layout == "long":
+        return table.long_dataframe(times, values)
+
+    df = DataFrame(
+        values.T,
+        index=Index(times, name="time"),
+        columns=MultiIndex.from_arrays(
+            [table.stream_keys, table.labels], names=["stream", "variable"]
+        ),
+    )
+    df.attrs["units"] = dict(zip(table.labels, table.units))
+    return df
+
+
+def write_stream_table_time_series(
+    streams,
+    fname,
+    true_state=False,
+    time_points=None,
+    chunk_size=100,
+    file_format=None,
+):
+    """
+    Method to write a stream table for a number of time points to a CSV or
+    Parquet file, in the 'long' layout of create_stream_table_time_series.
+    The table is built and written in chunks of time points, so the whole
+    table is never held in memory. Writing Parquet files requires pyarrow.
+
+    Args:
+        streams : dict with name keys and stream values. Names will be used as
+            display names for stream table, and streams may be Arcs, Ports or
+            StateBlocks.
+        fname : name of the file to write
+        true_state : indicated whether the stream table should contain the
+            display variables define in the StateBlock (False, default) or the
+            state variables (True).
+        time_points : points in the time domain at which to generate the
+            stream table (default = all points in the time domain of the
+            flowsheet of the first stream)
+        chunk_size : number of time points in each chunk (default = 100)
+        file_format : 'csv' or 'parquet' (default = from the extension of
+            fname, '.parquet' or '.pq' for Parquet, otherwise CSV)
+
+    Returns:
+        None
+    """
+    if file_format is None:
+        ext = os.path.splitext(fname)[1].lower()
+        file_format = "parquet" if ext in (".parquet", ".pq") else "csv"
+    if file_format not in ("csv", "parquet"):
+        raise ValueError(
+            f"Unrecognized file format {file_format} for stream table, expected "
+            "'csv' or 'parquet'."
+        )
+    if file_format == "parquet" and not pyarrow_available:
+        raise ImportError("Writing stream tables to Parquet requires pyarrow.")
+
+    table = _StreamTableSeries(streams, true_state, time_points)
+    time_points = table.time_points
+    writer = None
+    try:
+        for start in range(0, max(len(time_points), 1), chunk_size):
+            df = table.long_dataframe(
+                *table.values(time_points[start : start + chunk_size])
+            )
+            if file_format == "csv":
+                df.to_csv(
+                    fname,
+                    mode="w" if start == 0 else "a",
+                    header=start == 0,
+                    index=False,
+                )
+            else:
+                chunk = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(fname, chunk.schema)
+                writer.write_table(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+class _StreamTableSeries:
+    """
+    Display (or state) variables of streams, with their units and where to
+    find them in the StateBlock of each time point, looked up once at the
+    first time point.
+    """
+
+    def __init__(self, streams, true_state, time_points):
+        if time_points is None:
+            t0 = None
+        else:
+            time_points = list(time_points)
+            t0 = time_points[0] if time_points else 0
+        if t0 is None:
+            # Get the time domain from the first stream
+            sb = next(iter(stream_states_dict(streams, time_point=0).values()))
+            time_points = list(sb.flowsheet().time)
+            t0 = time_points[0]
+        self.time_points = time_points
+
+        # Per stream: (StateBlock, index of StateBlock data without time,
+        # locators of variables)
+        self._streams = []
+        # Per variable
+        self.stream_keys = []
+        self.labels = []
+        self.units = []
+        factors = []
+        for key, sb in stream_states_dict(streams, time_point=t0).items():
+            if true_state:
+                disp_dict = sb.define_state_vars()
+            else:
+                disp_dict = sb.define_display_vars()
+            locators = []
+            labels = {}
+            for k in disp_dict:
+                for i in disp_dict[k]:
+                    stream_key = k if i is None else f"{k} {i}"
+                    if stream_key in labels:
+                        continue
+                    labels[stream_key] = None
+                    c = disp_dict[k][i]
+                    locators.append(_locator(c, sb))
+                    self.stream_keys.append(key)
+                    self.labels.append(stream_key)
+                    u = pyunits.get_units(c)
+                    if u is None:
+                        self.units.append(str(pyunits.dimensionless._get_pint_unit()))
+                        factors.append(1.0)
+                        continue
+                    q = convert_quantity_to_reporting_units(1 * u._get_pint_unit())
+                    self.units.append(str(q.u))
+                    factors.append(q.m)
+            index = sb.index()
+            if sb.parent_component().is_indexed() and isinstance(index, tuple):
+                # time is always the first index
+                rest = index[1:]
+            else:
+                rest = None
+            self._streams.append((sb, rest, locators))
+        self._factors = np.array(factors, dtype=float)
+
+    def values(self, time_points):
+        """Values of all variables at time_points, in reporting units, as an
+        array with one row per variable and one column per time point"""
+        values = np.full((len(self.labels), len(time_points)), np.nan)
+        row = 0
+        for sb, rest, locators in self._streams:
+            block = sb.parent_component()
+            for j, t in enumerate(time_points):
+                if not block.is_indexed():
+                    sb_t = sb
+                elif rest is None:
+                    sb_t = block[t]
+                else:
+                    sb_t = block[(t,) + rest]
+                for k, locator in enumerate(locators):
+                    v = value(_locate(sb_t, locator), exception=False)
+                    if v is not None:
+                        values[row + k, j] = v
+            row += len(locators)
+        values *= self._factors[:, None]
+        return list(time_points), values
+
+    def long_dataframe(self, times, values):
+        """Stream table in the long layout"""
+        n = len(self.labels)
+        return DataFrame(
+            {
+                "time": np.repeat(np.array(times), n),
+                "stream": np.tile(np.array(self.stream_keys, dtype=object), len(times)),
+                "variable": np.tile(np.array(self.labels, dtype=object), len(times)),
+                "value": values.T.ravel(),
+                "units": np.tile(np.array(self.units, dtype=object), len(times)),
+            }
+        )
+
+
+def _locator(c, sb):
+    """
+    Path of (component name, index) pairs from StateBlock data sb to component
+    data c, so the same component can be found in the StateBlock data of other
+    time points. Components which are not part of sb (e.g. parameters) are
+    returned as they are.
+    """
+    path = []
+    obj = c
+    while obj is not sb:
+        parent = obj.parent_block()
+        if parent is None:
+            return c
+        path.append((obj.parent_component().local_name, obj.index()))
+        obj = parent
+    return tuple(reversed(path))
+
+
+def _locate(sb, locator):
+    if not isinstance(locator, tuple):
+        return locator
+    obj = sb
+    for name, index in locator:
+        # getattr, so components which are built on demand are constructed
+        obj = getattr(obj, name)
+        if obj.is_indexed():
+            obj = obj[index]
+    return obj
+
+
 def create_stream_table_ui(
     streams, true_state=False, time_point=0, orient="columns", precision=5
 ):
@@ -220,51 +477,79 @@ def create_stream_table_ui(
         A pandas DataFrame containing the stream table data.
     """
 
-    # Variable Types:
-    class VariableTypes:
-        UNFIXED = "unfixed"
-        FIXED = "fixed"
-        PARAMETER = "parameter"
-        EXPRESSION = "expression"
-
-    stream_attributes = OrderedDict()
     stream_states = stream_states_dict(streams=streams, time_point=time_point)
-    full_keys = []  # List of all rows in dataframe to fill in missing data
+    return _stream_table_ui_dataframe(
+        {
+            key: _stream_table_ui_rows(sb, true_state=true_state, precision=precision)
+            for key, sb in stream_states.items()
+        },
+        orient=orient,
+    )
 
-    stream_attributes["Units"] = {}
 
-    for key, sb in stream_states.items():
-        stream_attributes[key] = {}
-        if true_state:
-            disp_dict = sb.define_state_vars()
-        else:
-            disp_dict = sb.define_display_vars()
-        for k in disp_dict:
-            for row, i in enumerate(disp_dict[k]):
-                stream_key = k if i is None else f"{k} {i}"
+class _VariableTypes:
+    UNFIXED = "unfixed"
+    FIXED = "fixed"
+    PARAMETER = "parameter"
+    EXPRESSION = "expression"
 
-                # Identifying value's variable type
-                var_type = None
-                if isinstance(disp_dict[k][i], (_GeneralVarData, Var)):
-                    if disp_dict[k][i].fixed:
-                        var_type = VariableTypes.FIXED
-                    else:
-                        var_type = VariableTypes.UNFIXED
-                elif isinstance(disp_dict[k][i], Param):
-                    var_type = VariableTypes.PARAMETER
-                elif isinstance(disp_dict[k][i], Expression):
-                    var_type = VariableTypes.EXPRESSION
 
-                quant = report_quantity(disp_dict[k][i])
-                stream_attributes[key][stream_key] = (
-                    round(quant.m, precision),
-                    var_type,
-                )
-                if row == 0 or stream_key not in stream_attributes["Units"]:
-                    stream_attributes["Units"][stream_key] = quant.u
+def _stream_table_ui_rows(sb, true_state=False, precision=5):
+    """
+    PRIVATE function to get the rows of the UI stream table for a StateBlock.
+    This is separate from _stream_table_ui_dataframe so that the rows of
+    streams which haven't changed can be reused (see the UI flowsheet
+    serializer).
 
-                if stream_key not in full_keys:
-                    full_keys.append(stream_key)
+    Returns:
+        list of (row key, (value, variable type), units, first element of the
+        display variable) tuples
+    """
+    rows = []
+    if true_state:
+        disp_dict = sb.define_state_vars()
+    else:
+        disp_dict = sb.define_display_vars()
+    for k in disp_dict:
+        for row, i in enumerate(disp_dict[k]):
+            stream_key = k if i is None else f"{k} {i}"
+
+            # Identifying value's variable type
+            var_type = None
+            if isinstance(disp_dict[k][i], (_GeneralVarData, Var)):
+                if disp_dict[k][i].fixed:
+                    var_type = _VariableTypes.FIXED
+                else:
+                    var_type = _VariableTypes.UNFIXED
+            elif isinstance(disp_dict[k][i], Param):
+                var_type = _VariableTypes.PARAMETER
+            elif isinstance(disp_dict[k][i], Expression):
+                var_type = _VariableTypes.EXPRESSION
+
+            quant = report_quantity(disp_dict[k][i])
+            rows.append(
+                (stream_key, (round(quant.m, precision), var_type), quant.u, row == 0)
+            )
+    return rows
+
+
+def _stream_table_ui_dataframe(stream_rows, orient="columns"):
+    """
+    PRIVATE function to create the UI stream table from the rows of each
+    stream (see _stream_table_ui_rows).
+    """
+    stream_attributes = OrderedDict()
+    full_keys = {}  # All rows in dataframe (in order) to fill in missing data
+
+    stream_attributes["Units"] = {}
+
+    for key, rows in stream_rows.items():
+        stream_attributes[key] = {}
+        for stream_key, val, units, first in rows:
+            stream_attributes[key][stream_key] = val
+            if first or stream_key not in stream_attributes["Units"]:
+                stream_attributes["Units"][stream_key] = units
+            full_keys[stream_key] = None
 
     # Check for missing rows in any stream, and fill with "-" if needed
     for k, v in stream_attributes.items():
@@ -16,10 +16,12 @@ and group them, for easy display, formatting, and input.
 import xml.dom.minidom
 import collections
 
+import numpy as np
 import pyomo.environ as pyo
 from pyomo.core.base.indexed_component_slice import IndexedComponent_slice
 
 import idaes.logger as idaeslog
+from idaes.core.util.units_of_measurement import conversion_factor
 
 _log = idaeslog.getLogger(__name__)
 
@@ -37,8 +39,8 @@ class ModelTag:
         "_expression",
         "_doc",
         "_display_units",
-        "_cache_validation_value",
-        "_cache_display_value",
+        "_cache_conversion_factor",
+        "_cache_unit_str",
         "_name",
         "_root",
         "_index",
@@ -68,8 +70,8 @@ class ModelTag:
             self._expression = expr
         self._doc = doc  # documentation for a tag
         self._display_units = display_units  # unit to display value in
-        self._cache_validation_value = {}  # value when converted value stored
-        self._cache_display_value = {}  # value to display after unit conversions
+        self._cache_conversion_factor = {}  # factor to convert to display units
+        self._cache_unit_str = {}  # string representation of units
         self._name = None  # tag name (just used to clarify error messages)
         self._root = None  # use this to cache scalar tags in indexed parent
         self._index = None  # index to get cached converted value from parent
@@ -232,9 +234,8 @@ class ModelTag:
 
     def get_display_value(self, index=None, convert=True):
         """Get the value of the expression to display.  Do unit conversion if
-        needed.  This caches the unit conversion, to save time if this is called
-        repeatedly.  The unconverted value is used to ensure the cached
-        converted value is still valid.
+        needed.  This caches the unit conversion factor, to save time if this is
+        called repeatedly.
 
         Args:
             index: index of value to display if expression is indexed
@@ -248,58 +249,83 @@ class ModelTag:
                 index = self._index
             return self._root.get_display_value(index=index, convert=convert)
 
+        expr = self._expression_data(index)
         try:
-            expr = self.expression[index]
+            val = pyo.value(expr, exception=False)
+        except ZeroDivisionError:
+            return "ZeroDivisionError"
+        except ValueError:  # no value
+            return None
+
+        if val is None or not convert:
+            return val
+        return val * self._conversion_factor(index, expr)
+
+    def _value_and_factor(self, index=None, convert=True):
+        """PRIVATE method to get the value of an element of the tagged expression
+        in native units and the factor to convert it to the display units, used
+        to evaluate many tags at once.  The value is None if it can't be
+        evaluated.
+        """
+        if self._root is not None:
+            if not self.is_indexed:
+                index = self._index
+            return self._root._value_and_factor(index=index, convert=convert)
+
+        expr = self._expression_data(index)
+        try:
+            val = pyo.value(expr, exception=False)
+        except (ZeroDivisionError, ValueError):
+            val = None
+        if not convert:
+            return val, 1
+        return val, self._conversion_factor(index, expr)
+
+    def _expression_data(self, index):
+        """PRIVATE method to get the element of the tagged expression for an
+        index.
+        """
+        try:
+            return self.expression[index]
         except KeyError as key_err:
             if self._name is None:
                 raise KeyError(f"{index} not a valid key for tag") from key_err
             raise KeyError(f"{index} not a valid key for tag {self._name}") from key_err
         except TypeError:
-            expr = self.expression
-
-        if (
-            self._display_units is None
-            or isinstance(self._display_units, str)
-            or not convert
-        ):
-            # no display units, so display in original units, no convert opt
-            try:
-                return pyo.value(expr, exception=False)
-            except ZeroDivisionError:
-                return "ZeroDivisionError"
-            except ValueError:  # no value
-                return None
+            return self.expression
 
+    def _conversion_factor(self, index, expr):
+        """PRIVATE method to get the factor converting the value of an element of
+        the tagged expression to the display units.  Factors are cached by index.
+        """
+        if self._display_units is None or isinstance(self._display_units, str):
+            # no display units, so display in original units
+            return 1
         try:
-            val = pyo.value(expr, exception=False)
-        except ZeroDivisionError:
-            return "ZeroDivisionError"
-        except ValueError:  # no value
-            return None
-
-        cache_validate = self._cache_validation_value
-        cache_value = self._cache_display_value
-        if index in cache_validate and val == cache_validate[index]:
-            return cache_value[index]
-        cache_validate[index] = val
-        if self._display_units is None:
-            cache_value[index] = pyo.value(expr, exception=False)
-        else:
-            try:
-                cache_value[index] = pyo.value(
-                    pyo.units.convert(expr, self._display_units), exception=False
-                )
-            except ValueError:
-                return None
-        return cache_value[index]
+            return self._cache_conversion_factor[index]
+        except KeyError:
+            pass
+        factor = conversion_factor(expr, self._display_units)
+        self._cache_conversion_factor[index] = factor
+        return factor
 
     def get_unit_str(self, index=None):
         """String representation of the tagged quantity's units of measure"""
+        if self._root is not None and not self.is_indexed:
+            return self._root.get_unit_str(index=self._index)
+        try:
+            return self._cache_unit_str[index]
+        except KeyError:
+            pass
         if self._display_units is None:
             if self.is_indexed:
-                return str(pyo.units.get_units(self.expression[index]))
-            return str(pyo.units.get_units(self.expression))
-        return str(self._display_units)
+                unit_str = str(pyo.units.get_units(self.expression[index]))
+            else:
+                unit_str = str(pyo.units.get_units(self.expression))
+        else:
+            unit_str = str(self._display_units)
+        self._cache_unit_str[index] = unit_str
+        return unit_str
 
     @property
     def is_var(self):
@@ -662,6 +688,36 @@ class ModelTagGroup(dict):
                 row[i] = self[tag][indexes[i]].display(units=units)
         return row
 
+    def values_array(self, tags=None, convert=True):
+        """Get the numeric values of a given set of tags as a NumPy array.  This
+        is much faster than getting the values of the tags one at a time, since
+        the unit conversion factors are cached and applied to all the values at
+        once.  Values which can't be evaluated (e.g. variables without a value)
+        are NaN.
+
+        Args:
+            tags: List (not tuple, since a tuple can be a key) of tag keys or
+                2-element list of tags key and an index. If a key is for an
+                indexed value and no index is given with the key, it will be
+                flattened to include each index.  If None, use all tags.
+            convert: If True convert the values to the display units of the tags,
+                otherwise use the native units.
+
+        Returns:
+            numpy array of values, in the same order as table_row()
+        """
+        tag_list, indexes = self._table_tagkey_index_lists(tags)
+
+        values = np.full(len(tag_list), np.nan)
+        factors = np.ones(len(tag_list))
+        for i, tag in enumerate(tag_list):
+            val, factors[i] = self[tag]._value_and_factor(
+                index=indexes[i], convert=convert
+            )
+            if val is not None:
+                values[i] = val
+        return values * factors
+
     @property
     def str_include_units(self):
         """When converting a tag in this group directly to a string, include units
@@ -0,0 +1,137 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for the profiler of properties built on demand
+"""
+import time
+
+import pytest
+
+from pyomo.environ import Block, ConcreteModel, Var
+
+from idaes.core import FlowsheetBlock
+from idaes.core.util.build_profiler import BuildProfiler, active_profiler
+from idaes.models.properties.modular_properties.base.generic_property import (
+    GenericParameterBlock,
+)
+from idaes.models.properties.modular_properties.examples.BT_ideal import (
+    configuration,
+)
+
+
+@pytest.mark.unit
+def test_start_stop():
+    prof = BuildProfiler()
+    assert active_profiler() is None
+    with prof:
+        assert active_profiler() is prof
+        with pytest.raises(RuntimeError, match="Another BuildProfiler"):
+            BuildProfiler().start()
+    assert active_profiler() is None
+    prof.stop()
+    assert active_profiler() is None
+
+
+@pytest.mark.unit
+def test_profile():
+    m = ConcreteModel()
+    m.b = Block()
+    m.c = Block()
+    prof = BuildProfiler()
+
+    def build_y():
+        m.b.y = Var()
+        time.sleep(0.01)
+
+    def build_z():
+        m.c.z = Var()
+
+    def build_x():
+        prof.profile(m.b, "y", build_y)
+        prof.profile(m.c, "z", build_z)
+        m.b.x1 = Var()
+        m.b.x2 = Var()
+
+    prof.profile(m.b, "x", build_x)
+
+    df = prof.table()
+    assert list(df["property"]) == ["x", "y", "z"]
+    x, y, z = (df.iloc[i] for i in range(3))
+    assert x.block_class == "_BlockData"
+    assert list(df["calls"]) == [1, 1, 1]
+    # components created by y are not counted for x
+    assert list(df["components"]) == [2, 1, 1]
+    assert x.total_time >= y.total_time + z.total_time
+    assert x.self_time == pytest.approx(x.total_time - y.total_time - z.total_time)
+    assert x.triggers == "y, z"
+    assert y.triggers == ""
+
+    deps = prof.dependencies()
+    assert deps[("_BlockData", "x")] == {("_BlockData", "y"): 1, ("_BlockData", "z"): 1}
+
+    folded = prof.folded_stacks().splitlines()
+    assert len(folded) == 3
+    assert folded[0].startswith("_BlockData.x;_BlockData.y ")
+    assert int(folded[0].split()[-1]) >= 10000
+    assert folded[1].startswith("_BlockData.x;_BlockData.z ")
+    assert folded[2].startswith("_BlockData.x ")
+
+    prof.clear()
+    assert len(prof.table()) == 0
+    assert prof.folded_stacks() == ""
+
+
+@pytest.mark.unit
+def test_profile_error():
+    m = ConcreteModel()
+    prof = BuildProfiler()
+
+    def fail():
+        m.x = Var()
+        raise ValueError("build failed")
+
+    with pytest.raises(ValueError, match="build failed"):
+        prof.profile(m, "x", fail)
+    # the failed call is recorded and the profiler can continue
+    assert prof.table()["calls"][0] == 1
+    assert not prof._stack
+
+
+@pytest.mark.unit
+def test_state_block(tmp_path):
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.params = GenericParameterBlock(**configuration)
+    m.fs.props = m.fs.params.build_state_block([1, 2], defined_state=True)
+
+    with BuildProfiler() as prof:
+        for k in m.fs.props.values():
+            k.enth_mol_phase
+        m.fs.props[1].enth_mol_phase_comp
+    assert active_profiler() is None
+
+    df = prof.table().set_index("property")
+    assert set(df["block_class"]) == {"GenericStateBlockData"}
+    assert df.loc["enth_mol_phase", "calls"] == 2
+    assert df.loc["enth_mol_phase", "components"] == 2
+    assert "enth_mol_phase_comp" in df.loc["enth_mol_phase", "triggers"]
+    # enth_mol_phase_comp already exists for the last call
+    assert df.loc["enth_mol_phase_comp", "calls"] == 2
+
+    fname = tmp_path / "build.folded"
+    prof.write_folded_stacks(str(fname))
+    lines = fname.read_text().splitlines()
+    assert (
+        "GenericStateBlockData.enth_mol_phase;"
+        "GenericStateBlockData.enth_mol_phase_comp" in [ln.split()[0] for ln in lines]
+    )
@@ -0,0 +1,240 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for compiled residuals
+"""
+import pytest
+
+from pyomo.environ import (
+    Block,
+    ConcreteModel,
+    Constraint,
+    exp,
+    Expr_if,
+    Expression,
+    ExternalFunction,
+    inequality,
+    log,
+    Param,
+    sqrt,
+    units as pyunits,
+    Var,
+)
+import pyomo.common.unittest as unittest
+from pyomo.common.timing import TicTocTimer
+
+from idaes.core import FlowsheetBlock
+from idaes.core.initialization import BlockTriangularizationInitializer
+from idaes.core.util.compiled_residuals import CompiledResiduals, compiled_residuals
+from idaes.core.util.exceptions import InitializationError
+from idaes.core.util.model_statistics import (
+    large_residuals_set,
+    variables_in_activated_constraints_set,
+)
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.properties.modular_properties.base.generic_property import (
+    GenericParameterBlock,
+)
+from idaes.models.properties.modular_properties.examples.BT_ideal import (
+    configuration,
+)
+from idaes.models.unit_models import HeatExchanger1D
+
+
+def _square(x):
+    return x**2
+
+
+def build_model():
+    m = ConcreteModel()
+    m.x = Var(range(5), initialize=lambda m, i: i + 0.5)
+    m.y = Var()  # uninitialized
+    m.z = Var()  # not in any constraint
+    m.p = Param(mutable=True, initialize=2)
+    m.q = Param(initialize=3)
+    m.f = ExternalFunction(_square)
+    m.e = Expression(expr=exp(m.x[1]) * m.p)
+    m.e2 = Expression(expr=m.e / m.x[2])
+
+    m.c1 = Constraint(expr=m.e + log(m.x[2]) == 3)
+    m.c2 = Constraint(expr=inequality(0, m.x[1] ** 2 - m.x[3], 1))
+    m.c3 = Constraint(
+        expr=Expr_if(m.x[1] >= 1, m.x[2], -m.x[3]) * pyunits.m == 0.1 * pyunits.m
+    )
+    # log of a negative number
+    m.c4 = Constraint(expr=log(m.x[0] - 1) == 0)
+    m.c5 = Constraint(expr=m.y + m.x[1] == 0)
+    m.c6 = Constraint(expr=m.x[4] <= m.p)
+    # complex result
+    m.c7 = Constraint(expr=abs(m.x[1] - m.q) + (m.x[4] - 5) ** 0.5 >= 0)
+    m.c8 = Constraint(expr=m.e2 - m.e == m.q)
+    m.c9 = Constraint(expr=inequality(m.p, m.x[1] * m.x[2], m.p + 5))
+    m.c10 = Constraint(expr=m.f(m.x[3]) + sqrt(m.x[4]) == 1)
+    m.c11 = Constraint(expr=m.x[0] - m.x[1] == -1)
+
+    m.b = Block([1, 2])
+    for i, b in m.b.items():
+        b.v = Var(range(4), initialize=i)
+        b.c = Constraint(range(3), rule=lambda b, j: b.v[j + 1] == 2 * b.v[j] + 1)
+    return m
+
+
+def assert_same_residuals(block, tol=1e-5):
+    expected = large_residuals_set(block, tol, return_residual_values=True)
+    result = compiled_residuals(block).large_residuals(tol)
+    assert list(result) == list(expected)
+    for c, r in expected.items():
+        if r is None:
+            assert result[c] is None
+        else:
+            assert result[c] == pytest.approx(r, rel=1e-12)
+    return result
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("tol", [1e-5, 2])
+def test_large_residuals(tol):
+    m = build_model()
+    result = assert_same_residuals(m, tol)
+    for c in (m.c4, m.c5, m.c7):
+        assert result[c] is None
+    assert m.c11 not in result
+    assert m.b[2].c[0] in result
+
+    residuals, errors = compiled_residuals(m).residuals()
+    assert len(residuals) == len(compiled_residuals(m).constraints) == 17
+    assert len(errors) == 3
+
+
+@pytest.mark.unit
+def test_variables():
+    m = build_model()
+    assert compiled_residuals(m).variables == variables_in_activated_constraints_set(m)
+    assert m.z not in compiled_residuals(m).variables
+
+
+@pytest.mark.unit
+def test_indexed_block():
+    m = build_model()
+    assert_same_residuals(m.b)
+    assert len(compiled_residuals(m.b).constraints) == 6
+    # the constraints of both blocks share a template
+    assert compiled_residuals(m.b).number_of_templates == 1
+
+
+@pytest.mark.unit
+def test_cache():
+    m = build_model()
+    residuals = compiled_residuals(m)
+    assert isinstance(residuals, CompiledResiduals)
+    assert residuals.is_current()
+    assert compiled_residuals(m) is residuals
+
+    # Values of variables and parameters do not need a new compilation
+    m.p = 10
+    m.x[2].set_value(5)
+    m.y.set_value(1)
+    assert compiled_residuals(m) is residuals
+    assert_same_residuals(m)
+
+    # Structural changes do
+    m.c5.deactivate()
+    assert not residuals.is_current()
+    residuals = compiled_residuals(m)
+    assert m.c5 not in residuals.constraints
+    m.c12 = Constraint(expr=m.x[1] == 4)
+    assert compiled_residuals(m) is not residuals
+    assert_same_residuals(m)
+
+    residuals = compiled_residuals(m)
+    m.c12.set_value(m.x[1] == 5)
+    assert compiled_residuals(m) is not residuals
+    residuals = compiled_residuals(m)
+    m.e.set_value(m.x[1])
+    assert compiled_residuals(m) is not residuals
+    assert_same_residuals(m)
+
+
+@pytest.mark.unit
+def test_clone():
+    m = build_model()
+    compiled_residuals(m)
+    m2 = m.clone()
+    residuals = compiled_residuals(m2)
+    assert residuals.constraints[0] is m2.c1
+    assert_same_residuals(m2)
+
+
+@pytest.mark.unit
+def test_deeply_nested():
+    m = ConcreteModel()
+    m.x = Var(range(3), initialize=1.001)
+    # too deeply nested for the Python compiler
+    expr = m.x[0]
+    for _ in range(500):
+        expr = expr * m.x[0] + 1
+    m.c1 = Constraint(expr=expr == 1)
+    m.c2 = Constraint(expr=m.x[1] + m.x[2] == 1)
+    assert len(assert_same_residuals(m)) == 2
+
+
+def build_heat_exchanger(finite_elements):
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.properties = GenericParameterBlock(**configuration)
+    side = {
+        "property_package": m.fs.properties,
+        "transformation_method": "dae.finite_difference",
+        "transformation_scheme": "BACKWARD",
+    }
+    m.fs.unit = HeatExchanger1D(
+        hot_side=side,
+        cold_side=side,
+        finite_elements=finite_elements,
+    )
+    for v in m.fs.unit.component_data_objects(Var, descend_into=True):
+        if v.value is None:
+            lb, ub = v.bounds
+            v.set_value(
+                1.3 if lb is None or ub is None else (lb + ub) / 2,
+                skip_validation=True,
+            )
+    return m
+
+
+@pytest.mark.component
+def test_heat_exchanger():
+    m = build_heat_exchanger(5)
+    assert_same_residuals(m.fs.unit)
+    assert compiled_residuals(
+        m.fs.unit
+    ).variables == variables_in_activated_constraints_set(m.fs.unit)
+
+
+@pytest.mark.performance
+class TestCompiledResidualsPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_heat_exchanger(50)
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        m = build_heat_exchanger(50)
+        unit = m.fs.unit
+        for fast in (False, True):
+            label = "compiled" if fast else "expression walk"
+            initializer = BlockTriangularizationInitializer(fast_postcheck=fast)
+            for n in ("first", "second"):
+                timer.tic(None)
+                with pytest.raises(InitializationError):
+                    initializer.postcheck(unit, exclude_unused_vars=True)
+                self.recordData(f"postcheck, {label} ({n})", timer.toc(None))
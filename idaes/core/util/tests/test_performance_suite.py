@@ -0,0 +1,204 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for the performance test suite runner
+"""
+import os
+import textwrap
+
+import pytest
+from pandas import DataFrame
+
+from idaes.core.util.performance import ipopt_iterations
+from idaes.core.util.performance_suite import (
+    PEAK_RSS,
+    append_history,
+    baseline_from_history,
+    find_performance_tests,
+    find_regressions,
+    load_history,
+    run_performance_tests,
+    summarize,
+)
+
+TEST_FILE = """
+import time
+import pytest
+import pyomo.common.unittest as unittest
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.core.util import performance
+
+
+@pytest.mark.performance
+class TestFast(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return None
+
+    def test_performance(self):
+        self.recordData("build model", 0.5)
+        self.recordData("ipopt iterations", 7)
+        self.recordData("note", "not a number")
+
+
+@pytest.mark.performance
+class TestFails(performance.PerformanceBaseClass, unittest.TestCase):
+    def test_performance(self):
+        self.recordData("build model", 0.1)
+        raise AssertionError("did not converge")
+
+
+class NotPerformance(unittest.TestCase):
+    def test_something(self):
+        pass
+"""
+
+# The option is defined by the idaes conftest for tests in the idaes package
+CONFTEST = """
+def pytest_addoption(parser):
+    parser.addoption("--performance", action="store_true")
+"""
+
+
+@pytest.fixture
+def test_dir(tmp_path):
+    (tmp_path / "test_perf.py").write_text(TEST_FILE)
+    (tmp_path / "conftest.py").write_text(CONFTEST)
+    (tmp_path / "helper.py").write_text("class PerformanceBaseClass: pass\n")
+    return tmp_path
+
+
+@pytest.mark.unit
+def test_find_performance_tests(test_dir):
+    fname = os.path.join(str(test_dir), "test_perf.py")
+    tests = find_performance_tests([str(test_dir)])
+    assert tests == [f"{fname}::TestFast", f"{fname}::TestFails"]
+    assert find_performance_tests(str(test_dir), pattern="Fails") == [
+        f"{fname}::TestFails"
+    ]
+
+
+@pytest.mark.unit
+def test_ipopt_iterations():
+    log = textwrap.dedent(
+        """
+        Number of Iterations....: 12
+
+                                           (scaled)                 (unscaled)
+        Objective...............:   0.0000000000000000e+00    0.0000000000000000e+00
+        """
+    )
+    assert ipopt_iterations(log) == 12
+    assert ipopt_iterations("no log") is None
+
+
+def results_frame(rows):
+    return DataFrame(rows, columns=["test", "repeat", "metric", "value", "outcome"])
+
+
+@pytest.mark.unit
+def test_summarize():
+    results = results_frame(
+        [
+            ("a", 0, "build", 1.0, "passed"),
+            ("a", 1, "build", 3.0, "passed"),
+            ("a", 2, "build", 2.5, "passed"),
+            ("a", 0, "note", "text", "passed"),
+            ("b", 0, "build", 1.0, "failed"),
+            ("c", 0, None, None, "skipped"),
+        ]
+    )
+    summary = summarize(results)
+    assert len(summary) == 1
+    row = summary.iloc[0]
+    assert (row.test, row.metric) == ("a", "build")
+    assert (row["median"], row["min"], row["max"], row.n) == (2.5, 1.0, 3.0, 3)
+
+
+def summary_frame(values):
+    return DataFrame(
+        [(t, m, v, v, v, 1) for (t, m), v in values.items()],
+        columns=["test", "metric", "median", "min", "max", "n"],
+    )
+
+
+@pytest.mark.unit
+def test_find_regressions():
+    baseline = summary_frame(
+        {("a", "build"): 1.0, ("a", "solve"): 0.01, ("a", "size"): 1000}
+    )
+    current = summary_frame(
+        {
+            ("a", "build"): 1.5,
+            # more than 20 % slower, but by less than abs_tol
+            ("a", "solve"): 0.02,
+            ("a", "size"): 1100,
+            ("b", "build"): 100,
+        }
+    )
+    regressions = find_regressions(current, baseline)
+    assert list(regressions["metric"]) == ["build"]
+    assert regressions["ratio"][0] == pytest.approx(1.5)
+
+    regressions = find_regressions(current, baseline, rel_tol=0.05, abs_tol=0)
+    assert list(regressions["metric"]) == ["build", "solve", "size"]
+    assert len(find_regressions(current, None)) == 0
+
+
+@pytest.mark.unit
+def test_history(tmp_path):
+    fname = str(tmp_path / "history.jsonl")
+    assert len(load_history(fname)) == 0
+    assert baseline_from_history(load_history(fname)) is None
+
+    append_history(fname, summary_frame({("a", "build"): 1.0}), label="first")
+    append_history(fname, summary_frame({("a", "build"): 2.0}))
+    history = load_history(fname)
+    assert list(history["run"]) == [0, 1]
+    assert list(history["label"]) == ["first", None]
+
+    assert baseline_from_history(history)["median"][0] == 2.0
+    assert baseline_from_history(history, -2)["median"][0] == 1.0
+    assert baseline_from_history(history, "first")["median"][0] == 1.0
+    assert baseline_from_history(history, 5) is None
+    assert baseline_from_history(history, "unknown") is None
+
+
+@pytest.mark.component
+def test_run_performance_tests(test_dir):
+    tests = find_performance_tests(str(test_dir))
+    results = run_performance_tests(tests, repeat=2)
+
+    fast = results[results["test"].str.endswith("TestFast::test_performance")]
+    assert set(fast["outcome"]) == {"passed"}
+    assert list(fast["repeat"].unique()) == [0, 1]
+    assert set(fast["metric"]) == {"build model", "ipopt iterations", "note", PEAK_RSS}
+    assert (fast[fast["metric"] == PEAK_RSS]["value"] > 0).all()
+
+    fails = results[results["test"].str.endswith("TestFails::test_performance")]
+    assert set(fails["outcome"]) == {"failed"}
+
+    summary = summarize(results)
+    assert set(summary["metric"]) == {"build model", "ipopt iterations", PEAK_RSS}
+    assert list(summary["n"]) == [2, 2, 2]
+
+
+@pytest.mark.component
+def test_run_error(tmp_path):
+    (tmp_path / "test_perf.py").write_text("import not_a_module\n")
+    # pytest fails to start without the performance option
+    results = run_performance_tests([str(tmp_path / "test_perf.py")])
+    assert list(results["outcome"]) == ["error"]
+    # the test file can not be collected
+    (tmp_path / "conftest.py").write_text(CONFTEST)
+    results = run_performance_tests([str(tmp_path / "test_perf.py")])
+    assert list(results["outcome"]) == ["error"]
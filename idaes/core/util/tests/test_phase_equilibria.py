@@ -16,13 +16,14 @@ This module contains phase equilibria utility functions for use in IDAES models.
 
 __author__ = "Alejandro Garciadiego"
 
+
 import pytest
 
 import numpy as np
 
 import idaes.logger as idaeslog
 
-from pyomo.environ import ConcreteModel
+from pyomo.environ import Block, ConcreteModel, Var
 
 # Import Pyomo units
 from pyomo.environ import units as pyunits
@@ -50,7 +51,14 @@ from idaes.models.properties.modular_properties.base.generic_property import (
     GenericParameterBlock,
 )
 
-from idaes.core.util.phase_equilibria import TXYDataClass, Txy_data
+from idaes.core.util import phase_equilibria
+from idaes.core.util.phase_equilibria import (
+    TXYDataClass,
+    Txy_data,
+    Txy_data_pairs,
+    _ContinuationPath,
+    _split_points,
+)
 from idaes.models.properties.modular_properties.eos.ceos import cubic_roots_available
 
 
@@ -426,3 +434,157 @@ def test_Txy_data_no_bub():
     assert TD.TDew == pytest.approx(TDew_ref, abs=1e-2)
     x_ref = np.array([0.99, 0.8675, 0.745, 0.6225, 0.5, 0.3775, 0.255, 0.1325, 0.01])
     assert TD.x == pytest.approx(x_ref, abs=1e-4)
+
+
+def build_BT_model():
+    from idaes.models.properties.modular_properties.examples.BT_ideal import (
+        configuration,
+    )
+
+    model = ConcreteModel()
+    model.params = GenericParameterBlock(**configuration)
+    return model
+
+
+@pytest.mark.unit
+def test_split_points():
+    assert _split_points(10, 1) == [slice(0, 10)]
+    assert _split_points(10, 3) == [slice(0, 3), slice(3, 7), slice(7, 10)]
+    # no empty parts
+    assert _split_points(2, 4) == [slice(0, 1), slice(1, 2)]
+    x = np.arange(7)
+    assert sum((list(x[s]) for s in _split_points(7, 3)), []) == list(x)
+
+
+@pytest.mark.unit
+def test_continuation_path():
+    model = ConcreteModel()
+    model.props = Block()
+    model.props.T = Var(initialize=300, bounds=(250, 400))
+    model.props.y = Var(initialize=0.5)
+    model.props.x = Var(initialize=1)
+    model.props.x.fix()
+    path = _ContinuationPath(model)
+    assert len(path._vars) == 2
+
+    # nothing to predict from
+    path.predict(0.9)
+    assert model.props.T.value == 300
+
+    path.converged(0.9)
+    model.props.T.set_value(320)
+    model.props.y.set_value(0.2)
+    # start from the previous solution
+    path.predict(0.8)
+    assert model.props.T.value == 300
+
+    model.props.T.set_value(310)
+    model.props.y.set_value(0.4)
+    path.converged(0.8)
+    path.predict(0.7)
+    assert model.props.T.value == pytest.approx(320)
+    assert model.props.y.value == pytest.approx(0.3)
+    # predictions are kept within bounds
+    path.predict(-20)
+    assert model.props.T.value == 400
+
+    # a failed solve returns to the last solution
+    model.props.T.set_value(1000)
+    path.restore()
+    assert model.props.T.value == 310
+    assert model.props.y.value == pytest.approx(0.4)
+
+
+@pytest.mark.unit
+def test_Txy_data_pairs_model_not_callable():
+    with pytest.raises(ValueError, match="model must be a function"):
+        Txy_data_pairs(build_BT_model(), [("benzene", "toluene")], 101325, n_workers=2)
+
+
+@pytest.mark.component
+def test_Txy_data_continuation():
+    TD_ref = Txy_data(
+        build_BT_model(),
+        "benzene",
+        "toluene",
+        101325,
+        num_points=6,
+        print_level=idaeslog.CRITICAL,
+        solver_op={"tol": 1e-6},
+    )
+    TD = Txy_data(
+        build_BT_model,
+        "benzene",
+        "toluene",
+        101325,
+        num_points=6,
+        print_level=idaeslog.CRITICAL,
+        solver_op={"tol": 1e-6},
+        continuation=True,
+    )
+    assert TD.x == pytest.approx(TD_ref.x)
+    assert TD.TBubb == pytest.approx(TD_ref.TBubb, abs=1e-4)
+    assert TD.TDew == pytest.approx(TD_ref.TDew, abs=1e-4)
+
+    # split between two processes
+    TD_par = Txy_data(
+        build_BT_model,
+        "benzene",
+        "toluene",
+        101325,
+        num_points=6,
+        print_level=idaeslog.CRITICAL,
+        solver_op={"tol": 1e-6},
+        continuation=True,
+        n_workers=2,
+    )
+    assert TD_par.x == pytest.approx(TD_ref.x)
+    assert TD_par.TBubb == pytest.approx(TD_ref.TBubb, abs=1e-4)
+    assert TD_par.TDew == pytest.approx(TD_ref.TDew, abs=1e-4)
+
+
+@pytest.mark.unit
+def test_Txy_data_defaults(monkeypatch):
+    # Both entry points calculate the points in the same way by default
+    calls = []
+
+    def txy_points(model, c1, c2, pressure, x_d, xs, *args):
+        calls.append(args)
+        X = list(x_d)
+        return X, [300 + 50 * x for x in X], [310 + 50 * x for x in X], "Pa", "K"
+
+    monkeypatch.setattr(phase_equilibria, "_txy_points", txy_points)
+
+    TD = Txy_data(build_BT_model, "benzene", "toluene", 101325, num_points=5)
+    TD_pairs = Txy_data_pairs(
+        build_BT_model, [("benzene", "toluene")], 101325, num_points=5
+    )["benzene", "toluene"]
+
+    assert len(calls) == 2
+    assert calls[0] == calls[1]
+    # continuation is the last argument
+    assert calls[0][-1] is False
+    assert TD_pairs.x == pytest.approx(TD.x)
+    assert TD_pairs.TBubb == pytest.approx(TD.TBubb)
+    assert TD_pairs.TDew == pytest.approx(TD.TDew)
+
+
+@pytest.mark.component
+def test_Txy_data_pairs():
+    data = Txy_data_pairs(
+        build_BT_model,
+        [("benzene", "toluene"), ("toluene", "benzene")],
+        101325,
+        num_points=4,
+        print_level=idaeslog.CRITICAL,
+        n_workers=2,
+    )
+    assert list(data) == [("benzene", "toluene"), ("toluene", "benzene")]
+    TD = data["benzene", "toluene"]
+    TD_rev = data["toluene", "benzene"]
+    assert TD.Component_1 == "benzene"
+    assert TD_rev.Component_1 == "toluene"
+    assert len(TD.x) == 4
+    # the bubble temperature of pure benzene is the boiling point
+    assert TD.TBubb[0] < TD.TBubb[-1]
+    assert TD.TBubb[0] == pytest.approx(TD_rev.TBubb[-1], abs=1)
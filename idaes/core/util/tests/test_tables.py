@@ -11,7 +11,7 @@
 # for full copyright and license information.
 #################################################################################
 
-from pandas import isna
+from pandas import isna, read_csv, read_parquet
 import pytest
 
 from pyomo.environ import (
@@ -23,6 +23,9 @@ from pyomo.environ import (
     units as pyunits,
 )
 from pyomo.network import Arc, Port
+import pyomo.common.unittest as unittest
+from pyomo.common.timing import TicTocTimer
+
 from idaes.core import (
     FlowsheetBlock,
     StateBlock,
@@ -32,16 +35,20 @@ from idaes.core import (
 from idaes.core.util.tables import (
     arcs_to_stream_dict,
     create_stream_table_dataframe,
+    create_stream_table_time_series,
     create_stream_table_ui,
     stream_table_dataframe_to_string,
     generate_table,
     stream_states_dict,
+    write_stream_table_time_series,
+    pyarrow_available,
 )
 import idaes.models.properties.examples.saponification_thermo as thermo_props
 import idaes.models.properties.examples.saponification_reactions as rxn_props
-from idaes.models.unit_models import CSTR, Flash
+from idaes.models.unit_models import CSTR, Flash, Heater
 from idaes.models.unit_models.heat_exchanger_1D import HeatExchanger1D as HX1D
 from idaes.core.util.testing import PhysicalParameterTestBlock
+from idaes.core.util.performance import PerformanceBaseClass
 from idaes.models_extra.column_models import TrayColumn
 from idaes.models_extra.column_models.condenser import CondenserType, TemperatureSpec
 from idaes.models.properties.activity_coeff_models.BTX_activity_coeff_VLE import (
@@ -537,6 +544,133 @@ def test_create_stream_table_dataframe_from_Arc_HX1D(HX1D_array_model):
     assert df.loc["Molar Concentration Ethanol"][stg] == pytest.approx(100.0)
 
 
+def time_series_streams(m):
+    return {
+        "inlet": m.fs.unit_array[0].tube_side_inlet,
+        "tube": m.fs.tube_stream_array,
+        "shell": m.fs.shell_stream_array,
+    }
+
+
+def set_time_series_values(m):
+    for t in m.fs.time:
+        m.fs.unit_array[0].tube_side.properties[t, 0].temperature.set_value(300 + t)
+
+
+@pytest.mark.unit
+def test_create_stream_table_time_series(HX1D_array_model):
+    m = HX1D_array_model
+    set_time_series_values(m)
+    streams = time_series_streams(m)
+    df = create_stream_table_time_series(streams)
+
+    assert list(df.columns) == ["time", "stream", "variable", "value", "units"]
+    assert list(df["time"].unique()) == [0, 5]
+    assert list(df["stream"].unique()) == [
+        "inlet",
+        "tube[0]",
+        "tube[1]",
+        "shell[1]",
+        "shell[0]",
+    ]
+    # same values and units as the stream table of each time point
+    for t in m.fs.time:
+        st = create_stream_table_dataframe(streams, time_point=t)
+        rows = df[df["time"] == t]
+        assert len(rows) == st.shape[0] * (st.shape[1] - 1)
+        for _, r in rows.iterrows():
+            assert r["value"] == pytest.approx(st.loc[r["variable"], r["stream"]])
+            assert r["units"] == str(st.loc[r["variable"], "Units"])
+
+    temperature = df[(df["stream"] == "inlet") & (df["variable"] == "Temperature")]
+    assert list(temperature["value"]) == [300, 305]
+
+
+@pytest.mark.unit
+def test_create_stream_table_time_series_wide(HX1D_array_model):
+    m = HX1D_array_model
+    set_time_series_values(m)
+    df = create_stream_table_time_series(
+        time_series_streams(m), time_points=[5], layout="wide"
+    )
+
+    assert list(df.index) == [5]
+    assert df.columns.names == ["stream", "variable"]
+    assert df.loc[5, ("inlet", "Temperature")] == 305
+    st = create_stream_table_dataframe(time_series_streams(m), time_point=5)
+    assert df.loc[5, ("shell[0]", "Pressure")] == st.loc["Pressure", "shell[0]"]
+    assert df.attrs["units"]["Pressure"] == "pascal"
+
+    with pytest.raises(ValueError, match="Unrecognized layout foo"):
+        create_stream_table_time_series(time_series_streams(m), layout="foo")
+
+
+@pytest.mark.unit
+def test_create_stream_table_time_series_true_state(m):
+    df = create_stream_table_time_series({"state": m.fs.stream}, true_state=True)
+    st = create_stream_table_dataframe({"state": m.fs.stream}, true_state=True)
+    assert list(df["variable"]) == list(st.index)
+    assert list(df["value"]) == pytest.approx(list(st["state"]))
+
+
+@pytest.mark.unit
+def test_write_stream_table_time_series(HX1D_array_model, tmp_path):
+    m = HX1D_array_model
+    set_time_series_values(m)
+    streams = time_series_streams(m)
+    df = create_stream_table_time_series(streams)
+
+    fname = str(tmp_path / "streams.csv")
+    write_stream_table_time_series(streams, fname, chunk_size=1)
+    written = read_csv(fname)
+    assert written.shape == df.shape
+    assert list(written["value"]) == pytest.approx(list(df["value"]))
+    assert list(written["stream"]) == list(df["stream"])
+
+    with pytest.raises(ValueError, match="Unrecognized file format xls"):
+        write_stream_table_time_series(streams, fname, file_format="xls")
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not pyarrow_available, reason="pyarrow not available")
+def test_write_stream_table_time_series_parquet(HX1D_array_model, tmp_path):
+    m = HX1D_array_model
+    streams = time_series_streams(m)
+    fname = str(tmp_path / "streams.parquet")
+    write_stream_table_time_series(streams, fname, chunk_size=1)
+    df = create_stream_table_time_series(streams)
+    written = read_parquet(fname)
+    assert list(written["value"]) == pytest.approx(list(df["value"]))
+
+
+def build_time_series_model(n_time=200):
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False, time_set=list(range(n_time)))
+    m.fs.properties = thermo_props.SaponificationParameterBlock()
+    m.fs.H1 = Heater(property_package=m.fs.properties)
+    m.fs.H2 = Heater(property_package=m.fs.properties)
+    m.fs.stream = Arc(source=m.fs.H1.outlet, destination=m.fs.H2.inlet)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+    return m, {"feed": m.fs.H1.inlet, "stream": m.fs.stream, "product": m.fs.H2.outlet}
+
+
+@pytest.mark.performance
+class TestStreamTableTimeSeriesPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_time_series_model()[0]
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        m, streams = build_time_series_model()
+        timer.tic(None)
+        for t in m.fs.time:
+            create_stream_table_dataframe(streams, time_point=t)
+        self.recordData("stream table for each time point", timer.toc(None))
+        timer.tic(None)
+        create_stream_table_time_series(streams)
+        self.recordData("time series stream table", timer.toc(None))
+
+
 @pytest.fixture()
 def flash_model():
     m = ConcreteModel()
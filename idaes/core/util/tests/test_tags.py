@@ -14,12 +14,17 @@
 __Author__ = "John Eslick"
 
 
+import numpy as np
 import pytest
 import pyomo.environ as pyo
 from pyomo.environ import ConcreteModel, Set, Block, Var
 from pyomo.network import Port
+from pyomo.core.base.units_container import InconsistentUnitsError
+import pyomo.common.unittest as unittest
+from pyomo.common.timing import TicTocTimer
 from idaes.core.util import ModelTag, ModelTagGroup
 from idaes.core.util.tags import svg_tag
+from idaes.core.util.performance import PerformanceBaseClass
 
 
 @pytest.fixture()
@@ -179,16 +184,15 @@ def test_tag_display_convert(model):
     assert str(tx[1]) == "3000.000 " + str(pyo.units.g)
     assert str(tw[1, "a"]) == "4000.000 " + str(pyo.units.g)
     assert tw[1, "a"]._index == (1, "a")
-    assert tw._cache_display_value[1, "a"] == pytest.approx(4000.0)
-    assert tw._cache_validation_value[1, "a"] == 4
+    assert tw._cache_conversion_factor[1, "a"] == pytest.approx(1000.0)
     m.w[1, "a"].value = 1
     m.w[2, "a"].value = 2
     m.w[3, "a"].value = 3
     assert str(tw[1, "a"]) == "1000.000 " + str(pyo.units.g)
     assert str(tw[2, "a"]) == "2000.000 " + str(pyo.units.g)
     assert str(tw[3, "a"]) == "3000.000 " + str(pyo.units.g)
-    assert tw._cache_display_value[1, "a"] == pytest.approx(1000.0)
-    assert tw._cache_validation_value[1, "a"] == 1
+    assert tw._cache_conversion_factor[1, "a"] == pytest.approx(1000.0)
+    assert (2, "a") in tw._cache_conversion_factor
 
 
 @pytest.mark.unit
@@ -435,6 +439,92 @@ def test_tabulate_runs(model):
     assert row[6] == "1.000 s"
 
 
+@pytest.mark.unit
+def test_values_array(model):
+    m = model
+    g = ModelTagGroup()
+    g.add("w", expr=m.w, format_string="{:.3f}", display_units=pyo.units.g)
+    g.add("x", expr=m.x, format_string="{:.3f}")
+    g.add("y", expr=m.y, format_string="{:.3f}", display_units=pyo.units.hr)
+    g.add("f", expr=m.f, display_units=pyo.units.g / pyo.units.hr)
+    g.add("g", expr=m.g, format_string="{:.1f}", display_units="%")
+    g.add("w1", g["w"][1, "b"])
+    m.v = pyo.Var(units=pyo.units.kg)  # no value
+    g.add("v", expr=m.v, display_units=pyo.units.g)
+
+    values = g.values_array()
+    assert isinstance(values, np.ndarray)
+    assert len(values) == len(g.table_heading())
+    assert list(values[:-1]) == g.table_row(numeric=True)[:-1]
+    assert np.isnan(values[-1])
+    assert values[0] == 4000
+    assert values[-2] == 4000
+
+    columns = (["w", (2, "a")], ["y", None], "f")
+    values = g.values_array(tags=columns)
+    assert list(values) == pytest.approx([4000, 6 / 3600, 5000 * 3600 / 6])
+    values = g.values_array(tags=columns, convert=False)
+    assert list(values) == pytest.approx([4, 6, 5 / 6])
+
+    # values are updated
+    m.w[2, "a"] = 2
+    m.y = 1800
+    m.v = 1
+    assert list(g.values_array(tags=columns)) == pytest.approx(
+        [2000, 0.5, 5000 * 3600 / 1800]
+    )
+    assert g.values_array(tags=["v"])[0] == 1000
+
+
+@pytest.mark.unit
+def test_values_array_errors(model):
+    m = model
+    g = ModelTagGroup()
+    g.add("x", expr=m.x, display_units=pyo.units.m)
+    m.zero = pyo.Var(initialize=0)
+    g.add("e", expr=1 / m.zero)
+
+    with pytest.raises(KeyError, match="4 not a valid key for tag x"):
+        g.values_array(tags=[["x", 4]])
+    with pytest.raises(InconsistentUnitsError):
+        g.values_array(tags=["x"])
+    assert np.isnan(g.values_array(tags=["e"])[0])
+
+
+def build_tag_group(n):
+    m = pyo.ConcreteModel()
+    m.x = pyo.Var(range(n), initialize=2, units=pyo.units.kPa)
+    m.y = pyo.Var(range(n), initialize=3, units=pyo.units.kJ / pyo.units.kmol)
+    m.z = pyo.Expression(range(n), rule=lambda m, i: m.x[i] * m.y[i])
+    g = ModelTagGroup()
+    for i in range(n):
+        g.add(f"x{i}", expr=m.x[i], display_units=pyo.units.psi)
+        g.add(f"y{i}", expr=m.y[i], display_units=pyo.units.BTU / pyo.units.mol)
+        g.add(
+            f"z{i}",
+            expr=m.z[i],
+            display_units=pyo.units.J * pyo.units.Pa / pyo.units.mol,
+        )
+    return m, g
+
+
+@pytest.mark.performance
+class TestTagGroupPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_tag_group(1000)[0]
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        m, g = build_tag_group(1000)
+        for n in ("first", "second"):
+            timer.tic(None)
+            g.table_row(numeric=True)
+            self.recordData(f"table_row, 3000 tags ({n})", timer.toc(None))
+            timer.tic(None)
+            g.values_array()
+            self.recordData(f"values_array, 3000 tags ({n})", timer.toc(None))
+
+
 @pytest.mark.unit
 def test_doc_example_and_bound(model):
     m = model
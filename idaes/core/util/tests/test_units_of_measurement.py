@@ -16,9 +16,16 @@ Tests for units of measurement utility functions
 """
 import pytest
 
-from pyomo.environ import as_quantity, units
+from pyomo.environ import ConcreteModel, Param, Var, as_quantity, units, value
+from pyomo.core.base.units_container import InconsistentUnitsError, UnitsError
 
-from idaes.core.util.units_of_measurement import convert_quantity_to_reporting_units
+import idaes
+from idaes.core.util.units_of_measurement import (
+    conversion_factor,
+    convert_quantity_to_reporting_units,
+    report_quantity,
+    reporting_units_conversion,
+)
 
 
 @pytest.mark.unit
@@ -129,3 +136,72 @@ def test_convert_quantity_dimensionless():
     assert q2.m == 1
     assert str(q2.u) == "dimensionless"
     assert q is q2
+
+
+@pytest.mark.unit
+def test_convert_quantity_offset_units():
+    q = as_quantity(units.pint_registry.Quantity(25, units.pint_registry.degC))
+
+    q2 = convert_quantity_to_reporting_units(q)
+
+    assert q2.m == pytest.approx(298.15)
+    assert str(q2.u) == "kelvin"
+
+
+@pytest.mark.unit
+def test_report_quantity():
+    m = ConcreteModel()
+    m.x = Var(initialize=2, units=units.atm)
+    m.y = Var(initialize=3)
+    m.p = Param(initialize=4, units=units.BTU / units.pound, mutable=True)
+    for c in (m.x, m.y, m.p, 2 * m.x):
+        q = report_quantity(c)
+        expected = convert_quantity_to_reporting_units(as_quantity(c))
+        assert q.m == pytest.approx(expected.m, rel=1e-12)
+        assert q.u == expected.u
+    assert str(report_quantity(m.x).u) == "pascal"
+    assert str(report_quantity(m.y).u) == "dimensionless"
+
+
+@pytest.mark.unit
+def test_reporting_units_conversion():
+    u = as_quantity(1 * units.BTU / units.pound).units
+
+    u2, factor = reporting_units_conversion(u)
+    assert str(u2) == "joule / kilogram"
+    assert factor == pytest.approx(1055.056 / 0.453592, rel=1e-6)
+    assert reporting_units_conversion(u) == (u2, factor)
+
+    u2, factor = reporting_units_conversion(units.pint_registry.degC)
+    assert str(u2) == "kelvin"
+    assert factor is None
+
+
+@pytest.mark.unit
+def test_reporting_units_conversion_config_change():
+    u = as_quantity(1 * units.atm).units
+    assert str(reporting_units_conversion(u)[0]) == "pascal"
+
+    old = idaes.cfg.reporting_units
+    idaes.cfg.reporting_units = dict(old, pressure="bar")
+    try:
+        u2, factor = reporting_units_conversion(u)
+        assert str(u2) == "bar"
+        assert factor == pytest.approx(1.01325)
+    finally:
+        idaes.cfg.reporting_units = old
+    assert str(reporting_units_conversion(u)[0]) == "pascal"
+
+
+@pytest.mark.unit
+def test_conversion_factor():
+    assert conversion_factor(units.kg, units.g) == 1000
+    assert conversion_factor(units.kg / units.s, units.g / units.hr) == value(
+        units.convert(units.kg / units.s, to_units=units.g / units.hr)
+    )
+    assert conversion_factor(1, units.dimensionless) == 1
+
+    with pytest.raises(InconsistentUnitsError):
+        conversion_factor(units.kg, units.m)
+    with pytest.raises(UnitsError):
+        conversion_factor(units.degC, units.K)
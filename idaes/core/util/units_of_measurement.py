@@ -17,16 +17,36 @@ reporting model outputs.
 # TODO: Missing docstrings
 # pylint: disable=missing-function-docstring
 
-from pyomo.environ import as_quantity, units
+from pyomo.environ import as_quantity, units, value
 import idaes
 
 
 def report_quantity(c):
-    q = as_quantity(c)
+    if _is_numeric_leaf(c):
+        # Same as as_quantity(c), without walking an expression
+        u = c.get_units()
+        pint_unit = units.pint_registry.dimensionless if u is None else u._pint_unit
+        q = units.pint_registry.Quantity(value(c), pint_unit)
+    else:
+        q = as_quantity(c)
 
     return convert_quantity_to_reporting_units(q)
 
 
+def _is_numeric_leaf(c):
+    """Whether c is a Var, Param or other numeric component with units (rather
+    than an expression)"""
+    try:
+        return (
+            c.is_numeric_type()
+            and not c.is_expression_type()
+            and hasattr(c, "get_units")
+        )
+    except AttributeError:
+        # e.g. native numbers or pint quantities
+        return False
+
+
 def convert_quantity_to_reporting_units(q):
     """
     Converts a pint quantity to the units defined in the IDAES config block.
@@ -37,27 +57,94 @@ def convert_quantity_to_reporting_units(q):
     Returns:
         A new pint quantity in the units defined by the IDAES config block.
     """
-    # First, check if quantity is dimensionless
-    if q.dimensionless:
+    # First, check if quantity is dimensionless (checking the units is quicker)
+    if q.units.dimensionless:
         # No need to do anything here
         return q
 
+    u_obj, factor = reporting_units_conversion(q.units)
+    if factor is None:
+        # Offset units (e.g. degC) can't be converted with a factor
+        return q.to(u_obj)
+    return units.pint_registry.Quantity(q.magnitude * factor, u_obj)
+
+
+# Cache of reporting units and conversion factors, keyed on the source pint
+# unit and the reporting units in the IDAES config block
+_reporting_units_cache = {}
+
+
+def reporting_units_conversion(u):
+    """
+    Get the units defined in the IDAES config block that a pint unit is reported
+    in, and the factor to convert to them. The result is cached, so this is
+    cheap to call repeatedly.
+
+    Args:
+        u: pint unit to be converted
+
+    Returns:
+        tuple of the pint unit to report in and the conversion factor, the
+        factor is None for offset units (e.g. degC)
+    """
     # Get definition of desired units from config block
-    def_units = idaes.cfg.reporting_units
+    def_units = tuple(idaes.cfg.reporting_units.values())
+    key = (u, def_units)
+    try:
+        return _reporting_units_cache[key]
+    except KeyError:
+        pass
 
-    # Get dimensionality of q
-    dim = q.dimensionality
+    # Get dimensionality of u
+    dim = str(u.dimensionality)
 
     # Iterate through unit definition to try to find matching dimensionality
-    for u in def_units.values():
+    for ustr in def_units:
         # Get pint unit object from string
-        u_obj = getattr(units.pint_registry, u)
-        if str(u_obj.dimensionality) == str(dim):
+        u_obj = getattr(units.pint_registry, ustr)
+        if str(u_obj.dimensionality) == dim:
             # Found matching dimensionality
-            q2 = q.to(u_obj)
+            q = units.pint_registry.Quantity(1, u).to(u_obj)
             break
     else:
         # No matching dimensionality found, fall back to default system of units
-        q2 = q.to_base_units()
+        q = units.pint_registry.Quantity(1, u).to_base_units()
+
+    if units.pint_registry.Quantity(1, u)._is_multiplicative:
+        result = (q.units, q.magnitude)
+    else:
+        result = (q.units, None)
+    _reporting_units_cache[key] = result
+    return result
+
+
+# Cache of conversion factors between Pyomo units, keyed on the source and
+# target pint units
+_conversion_factor_cache = {}
+
 
-    return q2
+def conversion_factor(from_units, to_units):
+    """
+    Get the factor to convert a quantity from one set of Pyomo units to
+    another, so that the converted value is from_value * factor. The factor is
+    the same as the one used by pyomo.environ.units.convert(), and it is cached
+    on the (source, target) pint units, so this is cheap to call repeatedly.
+
+    Args:
+        from_units: Pyomo units (or units expression) to convert from
+        to_units: Pyomo units (or units expression) to convert to
+
+    Returns:
+        float conversion factor
+    """
+    from_units = units.get_units(from_units)
+    to_units = units.get_units(to_units)
+    key = (from_units._get_pint_unit(), to_units._get_pint_unit())
+    try:
+        return _conversion_factor_cache[key]
+    except KeyError:
+        pass
+    # The values of the units in the expression are 1, so this is the factor
+    factor = value(units.convert(from_units, to_units=to_units))
+    _conversion_factor_cache[key] = factor
+    return factor
@@ -60,7 +60,7 @@ from pyomo.environ import (
     sqrt,
     units as pyunits,
 )
-from pyomo.common.config import ConfigDict, ConfigValue, In
+from pyomo.common.config import Bool, ConfigDict, ConfigValue, In
 
 # Import IDAES cores
 from idaes.core import (
@@ -157,6 +157,20 @@ conditions, and thus corresponding constraints  should be included,
         ),
     )
 
+    CONFIG.declare(
+        "shared_pairwise_sums",
+        ConfigValue(
+            default=False,
+            domain=Bool,
+            description="Flag indicating whether to share pairwise sums",
+            doc="""Flag indicating whether the sums over components used by the
+NRTL and Wilson activity coefficients (e.g. sum(x_k*G_kj) for each component j)
+should be built once for each state block as named Expressions and used in all
+the constraints which need them, rather than being written out in each term,
+**default** - False.""",
+        ),
+    )
+
     def build(self):
         """Callable method for Block construction."""
         super(ActivityCoeffParameterData, self).build()
@@ -1096,18 +1110,12 @@ class ActivityCoeffStateBlockData(StateBlockData):
             self.params.component_list, self.params.component_list, rule=rule_Gij_coeff
         )
 
+        sum_xG, sum_xtauG = self._make_pairwise_sums(tau=True)
+
         # First sum part in the NRTL equation
         def rule_A(self, i):
-            value_1 = sum(
-                self.mole_frac_phase_comp["Liq", j]
-                * self.params.tau[j, i]
-                * self.Gij_coeff[j, i]
-                for j in self.params.component_list
-            )
-            value_2 = sum(
-                self.mole_frac_phase_comp["Liq", k] * self.Gij_coeff[k, i]
-                for k in self.params.component_list
-            )
+            value_1 = sum_xtauG(i)
+            value_2 = sum_xG(i)
             return self.A[i] == value_1 / value_2
 
         self.eq_A = Constraint(self.params.component_list, rule=rule_A)
@@ -1115,27 +1123,8 @@ class ActivityCoeffStateBlockData(StateBlockData):
         # Second sum part in the NRTL equation
         def rule_B(self, i):
             value = sum(
-                (
-                    self.mole_frac_phase_comp["Liq", j]
-                    * self.Gij_coeff[i, j]
-                    / sum(
-                        self.mole_frac_phase_comp["Liq", k] * self.Gij_coeff[k, j]
-                        for k in self.params.component_list
-                    )
-                )
-                * (
-                    self.params.tau[i, j]
-                    - sum(
-                        self.mole_frac_phase_comp["Liq", m]
-                        * self.params.tau[m, j]
-                        * self.Gij_coeff[m, j]
-                        for m in self.params.component_list
-                    )
-                    / sum(
-                        self.mole_frac_phase_comp["Liq", k] * self.Gij_coeff[k, j]
-                        for k in self.params.component_list
-                    )
-                )
+                (self.mole_frac_phase_comp["Liq", j] * self.Gij_coeff[i, j] / sum_xG(j))
+                * (self.params.tau[i, j] - sum_xtauG(j) / sum_xG(j))
                 for j in self.params.component_list
             )
             return self.B[i] == value
@@ -1192,14 +1181,11 @@ class ActivityCoeffStateBlockData(StateBlockData):
             self.params.component_list, self.params.component_list, rule=rule_Gij_coeff
         )
 
+        sum_xG, _ = self._make_pairwise_sums(tau=False)
+
         # First sum part in Wilson equation
         def rule_A(self, i):
-            value_1 = log(
-                sum(
-                    self.mole_frac_phase_comp["Liq", j] * self.Gij_coeff[j, i]
-                    for j in self.params.component_list
-                )
-            )
+            value_1 = log(sum_xG(i))
             return self.A[i] == value_1
 
         self.eq_A = Constraint(self.params.component_list, rule=rule_A)
@@ -1207,14 +1193,7 @@ class ActivityCoeffStateBlockData(StateBlockData):
         # Second sum part in Wilson equation
         def rule_B(self, i):
             value = sum(
-                (
-                    self.mole_frac_phase_comp["Liq", j]
-                    * self.Gij_coeff[i, j]
-                    / sum(
-                        self.mole_frac_phase_comp["Liq", k] * self.Gij_coeff[k, j]
-                        for k in self.params.component_list
-                    )
-                )
+                (self.mole_frac_phase_comp["Liq", j] * self.Gij_coeff[i, j] / sum_xG(j))
                 for j in self.params.component_list
             )
             return self.B[i] == value
@@ -1229,6 +1208,51 @@ class ActivityCoeffStateBlockData(StateBlockData):
             self.params.component_list, rule=rule_activity_coeff
         )
 
+    def _make_pairwise_sums(self, tau):
+        """
+        Return functions of component j giving the sums over components used
+        by the activity coefficient models, sum_k(x_k*G_kj) and, if tau is
+        True, sum_k(x_k*tau_kj*G_kj). If the shared_pairwise_sums option is
+        set, these sums are built once as named Expressions and the functions
+        return their elements, otherwise the sums are written out each time.
+        """
+        comps = self.params.component_list
+        x = self.mole_frac_phase_comp
+
+        def rule_sum_xG(b, j):
+            return sum(x["Liq", k] * b.Gij_coeff[k, j] for k in comps)
+
+        def rule_sum_xtauG(b, j):
+            return sum(
+                x["Liq", k] * b.params.tau[k, j] * b.Gij_coeff[k, j] for k in comps
+            )
+
+        if not self.params.config.shared_pairwise_sums:
+            return (
+                lambda j: rule_sum_xG(self, j),
+                lambda j: rule_sum_xtauG(self, j),
+            )
+
+        self.sum_mole_frac_Gij = Expression(
+            comps,
+            rule=rule_sum_xG,
+            doc="Sum of liquid mole fraction times Gij coefficient over the "
+            "first index of Gij",
+        )
+        if not tau:
+            return self.sum_mole_frac_Gij.__getitem__, None
+
+        self.sum_mole_frac_tau_Gij = Expression(
+            comps,
+            rule=rule_sum_xtauG,
+            doc="Sum of liquid mole fraction times tau times Gij coefficient "
+            "over the first index of Gij",
+        )
+        return (
+            self.sum_mole_frac_Gij.__getitem__,
+            self.sum_mole_frac_tau_Gij.__getitem__,
+        )
+
     def _pressure_sat_comp(self):
         self.pressure_sat_comp = Var(
             self.params.component_list,
@@ -18,6 +18,8 @@ from VLE data to compute the activity coefficients.
 Author: Jaffer Ghouse
 """
 import pytest
+
+import pyomo.common.unittest as unittest
 from pyomo.environ import ConcreteModel
 from pyomo.util.check_units import assert_units_consistent
 
@@ -26,6 +28,8 @@ from idaes.models.properties.activity_coeff_models.BTX_activity_coeff_VLE import
     BTXParameterBlock,
 )
 from idaes.core.util.model_statistics import degrees_of_freedom
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.unit_models import Heater
 
 
 # -----------------------------------------------------------------------------
@@ -64,7 +68,7 @@ def m():
 
 @pytest.mark.unit
 def test_build_inlet_state_block(m):
-    assert len(m.fs.properties_NRTL_vl.config) == 4
+    assert len(m.fs.properties_NRTL_vl.config) == 5
 
     # vapor-liquid (NRTL)
     assert m.fs.properties_NRTL_vl.config.valid_phase == (
@@ -79,7 +83,7 @@ def test_build_inlet_state_block(m):
     assert not hasattr(m.fs.state_block_NRTL_vl, "eq_mol_frac_out")
 
     # liquid only (NRTL)
-    assert len(m.fs.properties_NRTL_l.config) == 4
+    assert len(m.fs.properties_NRTL_l.config) == 5
 
     assert m.fs.properties_NRTL_l.config.valid_phase == "Liq"
     assert len(m.fs.properties_NRTL_l.phase_list) == 1
@@ -90,7 +94,7 @@ def test_build_inlet_state_block(m):
     assert not hasattr(m.fs.state_block_NRTL_l, "eq_mol_frac_out")
 
     # vapor only (NRTL)
-    assert len(m.fs.properties_NRTL_v.config) == 4
+    assert len(m.fs.properties_NRTL_v.config) == 5
 
     assert m.fs.properties_NRTL_v.config.valid_phase == "Vap"
     assert len(m.fs.properties_NRTL_v.phase_list) == 1
@@ -200,7 +204,7 @@ def m2():
 @pytest.mark.unit
 def test_build_outlet_state_block(m2):
     m = m2
-    assert len(m.fs.properties_NRTL_vl.config) == 4
+    assert len(m.fs.properties_NRTL_vl.config) == 5
 
     # vapor-liquid (NRTL)
     assert m.fs1.properties_NRTL_vl.config.valid_phase == (
@@ -215,7 +219,7 @@ def test_build_outlet_state_block(m2):
     assert hasattr(m.fs1.state_block_NRTL_vl, "eq_mol_frac_out")
 
     # liquid only (NRTL)
-    assert len(m.fs1.properties_NRTL_l.config) == 4
+    assert len(m.fs1.properties_NRTL_l.config) == 5
 
     assert m.fs1.properties_NRTL_l.config.valid_phase == "Liq"
     assert len(m.fs1.properties_NRTL_l.phase_list) == 1
@@ -226,7 +230,7 @@ def test_build_outlet_state_block(m2):
     assert hasattr(m.fs1.state_block_NRTL_l, "eq_mol_frac_out")
 
     # vapour only (NRTL)
-    assert len(m.fs1.properties_NRTL_v.config) == 4
+    assert len(m.fs1.properties_NRTL_v.config) == 5
 
     assert m.fs1.properties_NRTL_v.config.valid_phase == "Vap"
     assert len(m.fs1.properties_NRTL_v.phase_list) == 1
@@ -271,3 +275,37 @@ def test_units_consistent(m2):
     m = m2
     assert_units_consistent(m.fs)
     assert_units_consistent(m.fs1)
+
+
+def build_heater():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.properties = BTXParameterBlock(
+        valid_phase=("Liq", "Vap"), activity_coeff_model="NRTL"
+    )
+    m.fs.heater = Heater(property_package=m.fs.properties, has_phase_equilibrium=True)
+    m.fs.heater.inlet.flow_mol.fix(1)
+    m.fs.heater.inlet.temperature.fix(368)
+    m.fs.heater.inlet.pressure.fix(101325)
+    m.fs.heater.inlet.mole_frac_comp[0, "benzene"].fix(0.5)
+    m.fs.heater.inlet.mole_frac_comp[0, "toluene"].fix(0.5)
+    m.fs.heater.heat_duty.fix(1000)
+
+    m.fs.properties.alpha["benzene", "benzene"].fix(0)
+    m.fs.properties.alpha["benzene", "toluene"].fix(0.3)
+    m.fs.properties.alpha["toluene", "toluene"].fix(0)
+    m.fs.properties.alpha["toluene", "benzene"].fix(0.3)
+    m.fs.properties.tau["benzene", "benzene"].fix(0)
+    m.fs.properties.tau["benzene", "toluene"].fix(0.1690)
+    m.fs.properties.tau["toluene", "toluene"].fix(0)
+    m.fs.properties.tau["toluene", "benzene"].fix(-0.1559)
+    return m
+
+
+@pytest.mark.performance
+class TestNRTLPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_heater()
+
+    def initialize_model(self, model):
+        model.fs.heater.initialize()
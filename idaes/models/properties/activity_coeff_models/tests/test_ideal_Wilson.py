@@ -63,7 +63,7 @@ def m():
 
 @pytest.mark.unit
 def test_build_inlet_state_block(m):
-    assert len(m.fs.properties_Wilson_vl.config) == 4
+    assert len(m.fs.properties_Wilson_vl.config) == 5
 
     # vapor-liquid (Wilson)
     assert m.fs.properties_Wilson_vl.config.valid_phase == (
@@ -78,7 +78,7 @@ def test_build_inlet_state_block(m):
     assert not hasattr(m.fs.state_block_Wilson_vl, "eq_mol_frac_out")
 
     # liquid only (Wilson)
-    assert len(m.fs.properties_Wilson_l.config) == 4
+    assert len(m.fs.properties_Wilson_l.config) == 5
 
     assert m.fs.properties_Wilson_l.config.valid_phase == "Liq"
     assert len(m.fs.properties_Wilson_l.phase_list) == 1
@@ -89,7 +89,7 @@ def test_build_inlet_state_block(m):
     assert not hasattr(m.fs.state_block_Wilson_l, "eq_mol_frac_out")
 
     # vapor only (Wilson)
-    assert len(m.fs.properties_Wilson_v.config) == 4
+    assert len(m.fs.properties_Wilson_v.config) == 5
 
     assert m.fs.properties_Wilson_v.config.valid_phase == "Vap"
     assert len(m.fs.properties_Wilson_v.phase_list) == 1
@@ -199,7 +199,7 @@ def m2():
 @pytest.mark.unit
 def test_build_outlet_state_block(m2):
     m = m2
-    assert len(m.fs.properties_Wilson_vl.config) == 4
+    assert len(m.fs.properties_Wilson_vl.config) == 5
 
     # vapor-liquid (Wilson)
     assert m.fs1.properties_Wilson_vl.config.valid_phase == (
@@ -214,7 +214,7 @@ def test_build_outlet_state_block(m2):
     assert hasattr(m.fs1.state_block_Wilson_vl, "eq_mol_frac_out")
 
     # liquid only (Wilson)
-    assert len(m.fs1.properties_Wilson_l.config) == 4
+    assert len(m.fs1.properties_Wilson_l.config) == 5
 
     assert m.fs1.properties_Wilson_l.config.valid_phase == "Liq"
     assert len(m.fs1.properties_Wilson_l.phase_list) == 1
@@ -225,7 +225,7 @@ def test_build_outlet_state_block(m2):
     assert hasattr(m.fs1.state_block_Wilson_l, "eq_mol_frac_out")
 
     # vapour only (Wilson)
-    assert len(m.fs1.properties_Wilson_v.config) == 4
+    assert len(m.fs1.properties_Wilson_v.config) == 5
 
     assert m.fs1.properties_Wilson_v.config.valid_phase == "Vap"
     assert len(m.fs1.properties_Wilson_v.phase_list) == 1
@@ -64,7 +64,7 @@ class TestFTPz_LV_inlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_vl.config) == 4
+        assert len(model.fs.properties_ideal_vl.config) == 5
 
         assert model.fs.properties_ideal_vl.config.valid_phase == ("Liq", "Vap")
         assert len(model.fs.properties_ideal_vl.phase_list) == 2
@@ -147,7 +147,7 @@ class TestFTPz_L_inlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_l.config) == 4
+        assert len(model.fs.properties_ideal_l.config) == 5
 
         assert model.fs.properties_ideal_l.config.valid_phase == "Liq"
         assert len(model.fs.properties_ideal_l.phase_list) == 1
@@ -230,7 +230,7 @@ class TestFTPz_V_inlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_v.config) == 4
+        assert len(model.fs.properties_ideal_v.config) == 5
 
         assert model.fs.properties_ideal_v.config.valid_phase == "Vap"
         assert len(model.fs.properties_ideal_v.phase_list) == 1
@@ -312,7 +312,7 @@ class TestFTPz_LV_outlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_vl.config) == 4
+        assert len(model.fs.properties_ideal_vl.config) == 5
 
         assert model.fs.properties_ideal_vl.config.valid_phase == ("Liq", "Vap")
         assert len(model.fs.properties_ideal_vl.phase_list) == 2
@@ -394,7 +394,7 @@ class TestFTPz_L_outlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_l.config) == 4
+        assert len(model.fs.properties_ideal_l.config) == 5
 
         assert model.fs.properties_ideal_l.config.valid_phase == "Liq"
         assert len(model.fs.properties_ideal_l.phase_list) == 1
@@ -476,7 +476,7 @@ class TestFTPz_V_outlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_v.config) == 4
+        assert len(model.fs.properties_ideal_v.config) == 5
 
         assert model.fs.properties_ideal_v.config.valid_phase == "Vap"
         assert len(model.fs.properties_ideal_v.phase_list) == 1
@@ -66,7 +66,7 @@ class TestFcTP_LV_inlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_vl.config) == 4
+        assert len(model.fs.properties_ideal_vl.config) == 5
 
         assert model.fs.properties_ideal_vl.config.valid_phase == ("Liq", "Vap")
         assert len(model.fs.properties_ideal_vl.phase_list) == 2
@@ -148,7 +148,7 @@ class TestFcTP_L_inlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_l.config) == 4
+        assert len(model.fs.properties_ideal_l.config) == 5
 
         assert model.fs.properties_ideal_l.config.valid_phase == "Liq"
         assert len(model.fs.properties_ideal_l.phase_list) == 1
@@ -230,7 +230,7 @@ class TestFcTP_V_inlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_v.config) == 4
+        assert len(model.fs.properties_ideal_v.config) == 5
 
         assert model.fs.properties_ideal_v.config.valid_phase == "Vap"
         assert len(model.fs.properties_ideal_v.phase_list) == 1
@@ -314,7 +314,7 @@ class TestFcTP_LV_outlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_vl.config) == 4
+        assert len(model.fs.properties_ideal_vl.config) == 5
 
         assert model.fs.properties_ideal_vl.config.valid_phase == ("Liq", "Vap")
         assert len(model.fs.properties_ideal_vl.phase_list) == 2
@@ -396,7 +396,7 @@ class TestFcTP_L_outlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_l.config) == 4
+        assert len(model.fs.properties_ideal_l.config) == 5
 
         assert model.fs.properties_ideal_l.config.valid_phase == "Liq"
         assert len(model.fs.properties_ideal_l.phase_list) == 1
@@ -478,7 +478,7 @@ class TestFcTP_V_outlet:
 
     @pytest.mark.unit
     def test_build(self, model):
-        assert len(model.fs.properties_ideal_v.config) == 4
+        assert len(model.fs.properties_ideal_v.config) == 5
 
         assert model.fs.properties_ideal_v.config.valid_phase == "Vap"
         assert len(model.fs.properties_ideal_v.phase_list) == 1
@@ -0,0 +1,221 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for the shared pairwise sums option of the activity coefficient property
+package, using a mixture with many components.
+"""
+import os
+
+import pytest
+
+from pyomo.environ import (
+    ConcreteModel,
+    Expression,
+    Param,
+    value,
+)
+import pyomo.common.unittest as unittest
+from pyomo.common.tempfiles import TempfileManager
+from pyomo.common.timing import TicTocTimer
+from pyomo.core.expr.calculus.derivatives import differentiate, Modes
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+
+from idaes.core import Component, FlowsheetBlock, declare_process_block_class
+from idaes.core.solvers import get_solver
+from idaes.core.util.model_statistics import degrees_of_freedom
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.properties.activity_coeff_models.activity_coeff_prop_pack import (
+    ActivityCoeffParameterData,
+)
+from idaes.models.properties.activity_coeff_models.BTX_activity_coeff_VLE import (
+    BTXParameterBlock,
+)
+
+solver = get_solver()
+
+NUM_COMPONENTS = 12
+
+
+@declare_process_block_class("MulticomponentParameterBlock")
+class MulticomponentParameterData(ActivityCoeffParameterData):
+    """
+    Property package for a mixture of NUM_COMPONENTS components, alternately
+    with the parameters of benzene and toluene from the BTX package.
+    """
+
+    def build(self):
+        ref_model = ConcreteModel()
+        ref_model.params = BTXParameterBlock()
+        ref = ref_model.params
+        names = {f"c{i}": ("benzene", "toluene")[i % 2] for i in range(NUM_COMPONENTS)}
+        for c in names:
+            self.add_component(c, Component())
+
+        super().build()
+
+        # Copy the parameters of the BTX package
+        def ref_index(idx):
+            idx = tuple(names.get(k, k) for k in idx)
+            return idx[0] if len(idx) == 1 else idx
+
+        for p in ref.component_objects(Param, descend_into=False):
+            if not p.is_indexed():
+                self.add_component(
+                    p.local_name,
+                    Param(mutable=True, initialize=value(p), units=p.get_units()),
+                )
+                continue
+            sets = [
+                self.component_list
+                if s is ref.component_list
+                else self.phase_list
+                if s is ref.phase_list
+                else list(s)
+                for s in p.index_set().subsets()
+            ]
+            self.add_component(
+                p.local_name,
+                Param(
+                    *sets,
+                    mutable=p.mutable,
+                    units=p.get_units(),
+                    initialize=lambda b, *idx, p=p: value(p[ref_index(idx)]),
+                ),
+            )
+
+
+def build_model(model, shared, states=1):
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.properties = MulticomponentParameterBlock(
+        valid_phase=("Liq", "Vap"),
+        activity_coeff_model=model,
+        shared_pairwise_sums=shared,
+    )
+    params = m.fs.properties
+    comps = list(params.component_list)
+    for i, ci in enumerate(comps):
+        for j, cj in enumerate(comps):
+            # benzene-toluene parameters for pairs of different species
+            if model == "NRTL":
+                params.alpha[ci, cj].fix(0 if i % 2 == j % 2 else 0.3)
+            tau = 0 if i % 2 == j % 2 else (0.1690 if i % 2 == 0 else -0.1559)
+            params.tau[ci, cj].fix(tau)
+    if model == "Wilson":
+        params.vol_mol_comp.fix(1e-4)
+
+    m.fs.state = params.build_state_block(range(states), defined_state=True)
+    for k, sb in m.fs.state.items():
+        sb.flow_mol.fix(1)
+        sb.temperature.fix(368 + k)
+        sb.pressure.fix(101325)
+        for i, c in enumerate(comps):
+            # vary the composition so that the sums are not all equal
+            sb.mole_frac_comp[c].fix(
+                (1 + 0.1 * i) / sum(1 + 0.1 * j for j in range(len(comps)))
+            )
+    return m
+
+
+def activity_terms(m):
+    """Calculate the Gij coefficients and the A and B terms of the activity
+    coefficients at the liquid composition of the state"""
+    sb = m.fs.state[0]
+    comps = list(m.fs.properties.component_list)
+    for c in comps:
+        sb.mole_frac_phase_comp["Liq", c].set_value(value(sb.mole_frac_comp[c]))
+    for i in comps:
+        for j in comps:
+            if i != j:
+                calculate_variable_from_constraint(
+                    sb.Gij_coeff[i, j], sb.eq_Gij_coeff[i, j]
+                )
+    for i in comps:
+        calculate_variable_from_constraint(sb.A[i], sb.eq_A[i])
+        calculate_variable_from_constraint(sb.B[i], sb.eq_B[i])
+    return [value(sb.A[i]) for i in comps] + [value(sb.B[i]) for i in comps]
+
+
+def nl_size(m):
+    with TempfileManager.new_context() as tempfiles:
+        fname = tempfiles.create_tempfile(suffix=".nl")
+        m.write(fname, format="nl", io_options={"symbolic_solver_labels": False})
+        return os.path.getsize(fname)
+
+
+def jacobian_time(m):
+    """Time to differentiate the bodies of the activity coefficient constraints
+    with respect to their variables, using Pyomo's reverse mode automatic
+    differentiation"""
+    timer = TicTocTimer()
+    timer.tic(None)
+    for sb in m.fs.state.values():
+        for c in (sb.eq_A, sb.eq_B):
+            for cd in c.values():
+                wrt = list(identify_variables(cd.body))
+                differentiate(cd.body, wrt_list=wrt, mode=Modes.reverse_numeric)
+    return timer.toc(None)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("model", ["NRTL", "Wilson"])
+def test_shared_sums(model):
+    m = build_model(model, shared=True)
+    m_ref = build_model(model, shared=False)
+    sb = m.fs.state[0]
+
+    assert isinstance(sb.sum_mole_frac_Gij, Expression)
+    assert len(sb.sum_mole_frac_Gij) == NUM_COMPONENTS
+    if model == "NRTL":
+        assert isinstance(sb.sum_mole_frac_tau_Gij, Expression)
+    else:
+        assert sb.find_component("sum_mole_frac_tau_Gij") is None
+    assert m_ref.fs.state[0].find_component("sum_mole_frac_Gij") is None
+
+    # same activity coefficient terms for both formulations
+    terms = activity_terms(m)
+    assert terms == pytest.approx(activity_terms(m_ref), rel=1e-12)
+    assert max(abs(t) for t in terms) > 1e-3
+
+    assert degrees_of_freedom(m) == degrees_of_freedom(m_ref) == 0
+    assert nl_size(m) < nl_size(m_ref)
+
+
+@pytest.mark.unit
+def test_default():
+    m = ConcreteModel()
+    m.params = BTXParameterBlock(activity_coeff_model="NRTL")
+    assert m.params.config.shared_pairwise_sums is False
+
+
+@pytest.mark.performance
+class TestPairwiseSumsPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_model("NRTL", shared=True, states=10)
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        for model in ("NRTL", "Wilson"):
+            for shared in (False, True):
+                label = f"{model}, {'shared' if shared else 'not shared'}"
+                timer.tic(None)
+                m = build_model(model, shared=shared, states=10)
+                self.recordData(f"build ({label})", timer.toc(None))
+                self.recordData(f"nl file size ({label})", nl_size(m))
+                self.recordData(f"jacobian AD ({label})", jacobian_time(m))
+                if solver.available(exception_flag=False):
+                    m.fs.state.initialize()
+                    timer.tic(None)
+                    solver.solve(m)
+                    self.recordData(f"solve ({label})", timer.toc(None))
@@ -1738,6 +1738,35 @@ class CubicStateBlockData(StateBlockData):
     def _entr_mol_liq_ig(b):
         return b._entr_mol_ig("Liq")
 
+    def _shared_compress_fact(b, name, phase, A, B):
+        """
+        Return the compressibility factor of phase for A and B as an
+        Expression on the state block. The bubble and dew point equations of
+        all components refer to this Expression, and the NL writer writes
+        Expressions which are used more than once a single time, so the cubic
+        root external function is only called once for all components.
+
+        Args:
+            name: name of the Expression
+            phase: "Liq" or "Vap"
+            A: dimensionless attraction parameter
+            B: dimensionless covolume parameter
+
+        Returns:
+            Expression
+        """
+        z = b.component(name)
+        if z is None:
+            if phase == "Vap":
+                expr = b.expr_write.z_vap(eos=b.params.cubic_type, A=A, B=B)
+            else:
+                expr = b.expr_write.z_liq(eos=b.params.cubic_type, A=A, B=B)
+            z = Expression(
+                expr=expr, doc="Compressibility factor shared by all components"
+            )
+            b.add_component(name, z)
+        return z
+
     def bubble_temp_liq(b, j):
         def a(k):
             return (
@@ -1784,7 +1813,7 @@ class CubicStateBlockData(StateBlockData):
             )
         )
 
-        Z = b.expr_write.z_liq(eos=b.params.cubic_type, A=A, B=B)
+        Z = b._shared_compress_fact("_compress_fact_tbub_liq", "Liq", A, B)
 
         return exp(
             (
@@ -1844,7 +1873,7 @@ class CubicStateBlockData(StateBlockData):
             )
         )
 
-        Z = b.expr_write.z_liq(eos=b.params.cubic_type, A=A, B=B)
+        Z = b._shared_compress_fact("_compress_fact_tdew_liq", "Liq", A, B)
 
         return exp(
             (
@@ -1887,7 +1916,7 @@ class CubicStateBlockData(StateBlockData):
             )
         )
 
-        Z = b.expr_write.z_liq(eos=b.params.cubic_type, A=A, B=B)
+        Z = b._shared_compress_fact("_compress_fact_pbub_liq", "Liq", A, B)
 
         return exp(
             (
@@ -1930,7 +1959,7 @@ class CubicStateBlockData(StateBlockData):
             )
         )
 
-        Z = b.expr_write.z_liq(eos=b.params.cubic_type, A=A, B=B)
+        Z = b._shared_compress_fact("_compress_fact_pdew_liq", "Liq", A, B)
 
         return exp(
             (
@@ -2025,7 +2054,7 @@ class CubicStateBlockData(StateBlockData):
             )
         )
 
-        Z = b.expr_write.z_vap(eos=b.params.cubic_type, A=A, B=B)
+        Z = b._shared_compress_fact("_compress_fact_tbub_vap", "Vap", A, B)
 
         return exp(
             (
@@ -2085,7 +2114,7 @@ class CubicStateBlockData(StateBlockData):
             )
         )
 
-        Z = b.expr_write.z_vap(eos=b.params.cubic_type, A=A, B=B)
+        Z = b._shared_compress_fact("_compress_fact_tdew_vap", "Vap", A, B)
 
         return exp(
             (
@@ -2128,7 +2157,7 @@ class CubicStateBlockData(StateBlockData):
             )
         )
 
-        Z = b.expr_write.z_vap(eos=b.params.cubic_type, A=A, B=B)
+        Z = b._shared_compress_fact("_compress_fact_pbub_vap", "Vap", A, B)
 
         return exp(
             (
@@ -2171,7 +2200,7 @@ class CubicStateBlockData(StateBlockData):
             )
         )
 
-        Z = b.expr_write.z_vap(eos=b.params.cubic_type, A=A, B=B)
+        Z = b._shared_compress_fact("_compress_fact_pdew_vap", "Vap", A, B)
 
         return exp(
             (
@@ -12,6 +12,8 @@
 #################################################################################
 import pytest
 
+import pyomo.common.unittest as unittest
+
 from idaes.core import FlowsheetBlock
 from idaes.models.properties.cubic_eos.cubic_prop_pack import cubic_roots_available
 from idaes.models.properties.cubic_eos import BT_PR
@@ -28,6 +30,8 @@ from pyomo.util.check_units import assert_units_consistent
 
 from idaes.models.properties.tests.test_harness import PropertyTestHarness
 from idaes.core.solvers import get_solver
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.unit_models import Heater
 
 
 # Set module level pyest marker
@@ -738,3 +742,27 @@ class TestBTExample(object):
         assert (
             pytest.approx(value(m.fs.state[0].entr_mol_phase["Vap"]), 1e-5) == -278.766
         )
+
+
+def build_heater():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.props = BT_PR.BTParameterBlock(valid_phase=("Vap", "Liq"))
+    m.fs.heater = Heater(property_package=m.fs.props, has_phase_equilibrium=True)
+    m.fs.heater.inlet.flow_mol.fix(1)
+    m.fs.heater.inlet.temperature.fix(360)
+    m.fs.heater.inlet.pressure.fix(101325)
+    m.fs.heater.inlet.mole_frac_comp[0, "benzene"].fix(0.5)
+    m.fs.heater.inlet.mole_frac_comp[0, "toluene"].fix(0.5)
+    m.fs.heater.heat_duty.fix(1000)
+    return m
+
+
+@pytest.mark.skipif(not cubic_roots_available(), reason="Cubic functions not available")
+@pytest.mark.performance
+class TestBTPRPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_heater()
+
+    def initialize_model(self, model):
+        model.fs.heater.initialize()
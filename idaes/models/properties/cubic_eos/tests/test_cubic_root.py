@@ -13,11 +13,17 @@
 """Test the basic 0 = z^3 + bz^2 + cz + d calculator."""
 
 import os
+import numpy as np
 import pytest
 import pyomo.environ as pyo
 import idaes
 from idaes.models.properties.modular_properties.eos.ceos import cubic_roots_available
-from idaes.models.properties.modular_properties.eos.ceos_common import cubic_so_path
+from idaes.models.properties.modular_properties.eos.ceos_common import (
+    cubic_so_path,
+    cubic_roots,
+    CubicType,
+    EoS_param,
+)
 
 
 def cubic_function(z, b, c, d):
@@ -89,3 +95,80 @@ def test_general_cubic_root_finder():
             assert pytest.approx(ge, abs=1e-5) == gh[i]
         for i, he in enumerate(h):
             assert pytest.approx(he, abs=1e-5) == hh[i]
+
+
+def cubic_coefficients(A, B, eos):
+    u = EoS_param[eos]["u"]
+    w = EoS_param[eos]["w"]
+    b = -(1.0 + B - u * B)
+    c = A + w * B**2 - u * B - u * B**2
+    d = -A * B - w * B**2 - w * B**3
+    return b, c, d
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("eos", [CubicType.PR, CubicType.SRK])
+def test_cubic_roots_batch(eos):
+    rng = np.random.default_rng(1)
+    A = rng.uniform(1e-3, 2, 500)
+    B = rng.uniform(5e-4, 0.3, 500)
+    liq, vap = cubic_roots(A, B, eos)
+    assert liq.z.shape == (500,)
+    b, c, d = cubic_coefficients(A, B, eos)
+    for i in range(500):
+        roots = np.roots([1, b[i], c[i], d[i]])
+        real = np.real(roots[np.abs(np.imag(roots)) < 1e-9])
+        assert liq.z[i] == pytest.approx(real.min(), abs=1e-12)
+        assert vap.z[i] == pytest.approx(real.max(), abs=1e-12)
+
+    # scalars are supported, and one real root is returned for both phases
+    liq, vap = cubic_roots(0.01, 0.001, u=2, w=-1)
+    assert float(liq.z) == pytest.approx(0.001354, abs=1e-6)
+    assert float(vap.z) == pytest.approx(0.990939, abs=1e-6)
+    liq, vap = cubic_roots(0.2, 0.05, u=2, w=-1)
+    assert liq.z == vap.z
+    assert float(liq.z) == pytest.approx(0.851544, abs=1e-6)
+
+    with pytest.raises(RuntimeError, match="Please supply args"):
+        cubic_roots(A, B)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("eos", [CubicType.PR, CubicType.SRK])
+def test_cubic_roots_batch_derivatives(eos):
+    # states with three real roots and states with one real root
+    A = np.array([0.05, 0.3, 1.0, 0.02])
+    B = np.array([0.01, 0.05, 0.1, 0.002])
+    h = 1e-6
+    roots = cubic_roots(A, B, eos)
+    # central differences
+    roots_A = zip(cubic_roots(A + h, B, eos), cubic_roots(A - h, B, eos))
+    roots_B = zip(cubic_roots(A, B + h, eos), cubic_roots(A, B - h, eos))
+    for r, (rAp, rAm), (rBp, rBm) in zip(roots, roots_A, roots_B):
+        np.testing.assert_allclose(r.dz_dA, (rAp.z - rAm.z) / 2 / h, rtol=1e-6)
+        np.testing.assert_allclose(r.dz_dB, (rBp.z - rBm.z) / 2 / h, rtol=1e-6)
+        np.testing.assert_allclose(
+            r.d2z_dA2, (rAp.dz_dA - rAm.dz_dA) / 2 / h, rtol=1e-5
+        )
+        np.testing.assert_allclose(
+            r.d2z_dAdB, (rBp.dz_dA - rBm.dz_dA) / 2 / h, rtol=1e-5
+        )
+        np.testing.assert_allclose(
+            r.d2z_dB2, (rBp.dz_dB - rBm.dz_dB) / 2 / h, rtol=1e-5
+        )
+
+
+@pytest.mark.skipif(not cubic_roots_available(), reason="Cubic functions not available")
+@pytest.mark.unit
+def test_cubic_roots_batch_matches_external():
+    m = pyo.ConcreteModel()
+    m.croot_l = pyo.ExternalFunction(library=cubic_so_path, function="cubic_root_l")
+    m.croot_h = pyo.ExternalFunction(library=cubic_so_path, function="cubic_root_h")
+    A = np.array([0.05, 0.3, 1.0, 0.02])
+    B = np.array([0.01, 0.05, 0.1, 0.002])
+    liq, vap = cubic_roots(A, B, CubicType.PR)
+    b, c, d = cubic_coefficients(A, B, CubicType.PR)
+    for i in range(len(A)):
+        args = (b[i], c[i], d[i])
+        assert liq.z[i] == pytest.approx(m.croot_l.evaluate(args), abs=1e-8)
+        assert vap.z[i] == pytest.approx(m.croot_h.evaluate(args), abs=1e-8)
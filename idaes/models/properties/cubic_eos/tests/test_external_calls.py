@@ -0,0 +1,111 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Check that each cubic root is calculated by one external function call in the
+NL file, however many expressions use it.
+"""
+import os
+
+import pytest
+
+import pyomo.environ as pyo
+import pyomo.common.unittest as unittest
+from pyomo.common.timing import TicTocTimer
+
+from idaes.core import FlowsheetBlock
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.properties.cubic_eos.BT_PR import BTParameterBlock
+from idaes.models.properties.modular_properties.base.generic_property import (
+    GenericParameterBlock,
+)
+from idaes.models.properties.modular_properties.examples.HC_PR import configuration
+from idaes.models.properties.modular_properties.eos.ceos import cubic_roots_available
+
+
+def external_calls(m, fname):
+    """Write an NL file and return the number of external function calls in
+    it, i.e. the calls made for each evaluation of the model functions."""
+    m.write(fname, format="nl", io_options={"symbolic_solver_labels": False})
+    with open(fname, "r", encoding="utf-8") as f:
+        return sum(1 for ln in f if ln[:1] == "f" and ln[1:2].isdigit())
+
+
+def build_BT_PR(n):
+    m = pyo.ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.props = BTParameterBlock(valid_phase=("Vap", "Liq"))
+    m.fs.sb = m.fs.props.build_state_block(range(n), defined_state=True)
+    for sb in m.fs.sb.values():
+        sb.temperature_bubble
+        sb.temperature_dew
+        sb.pressure_bubble
+        sb.pressure_dew
+        sb.enth_mol
+    return m
+
+
+def shared_roots(m):
+    """Number of compressibility factor Expressions, each of which should
+    make one external function call."""
+    return sum(
+        len(c)
+        for c in m.component_objects(pyo.Expression, descend_into=True)
+        if "compress_fact" in c.local_name
+    )
+
+
+def build_HC_PR(n):
+    m = pyo.ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.props = GenericParameterBlock(**configuration)
+    m.fs.sb = m.fs.props.build_state_block(range(n), defined_state=True)
+    # use the enthalpy, as an energy balance would
+    m.fs.enth = pyo.Constraint(range(n), rule=lambda b, i: b.sb[i].enth_mol == 0)
+    return m
+
+
+@pytest.mark.skipif(not cubic_roots_available(), reason="Cubic functions not available")
+@pytest.mark.unit
+def test_BT_PR(tmp_path):
+    m = build_BT_PR(2)
+    # phase, phase equilibrium and 8 bubble and dew point roots per state
+    assert shared_roots(m) == 2 * 12
+    assert external_calls(m, os.path.join(tmp_path, "bt.nl")) == shared_roots(m)
+
+
+@pytest.mark.skipif(not cubic_roots_available(), reason="Cubic functions not available")
+@pytest.mark.unit
+def test_HC_PR(tmp_path):
+    m = build_HC_PR(2)
+    # phase, phase equilibrium and dew temperature roots per state
+    assert shared_roots(m) == 2 * 6
+    assert external_calls(m, os.path.join(tmp_path, "hc.nl")) == shared_roots(m)
+
+
+@pytest.mark.skipif(not cubic_roots_available(), reason="Cubic functions not available")
+@pytest.mark.performance
+class TestExternalCallsPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_BT_PR(10)
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        for name, build in (("BT_PR", build_BT_PR), ("HC_PR", build_HC_PR)):
+            timer.tic(None)
+            m = build(10)
+            self.recordData(f"{name} build", timer.toc(f"{name} build"))
+            timer.tic(None)
+            n = external_calls(m, f"{name}.nl")
+            self.recordData(f"{name} write nl", timer.toc(f"{name} write nl"))
+            self.recordData(f"{name} external calls per evaluation", n)
+            os.remove(f"{name}.nl")
@@ -21,6 +21,8 @@ from .helmholtz_functions import (
     helmholtz_available,
     helmholtz_data_dir,
 )
+from .helmholtz_batch import HelmholtzBatchEvaluator
+from .helmholtz_tables import HelmholtzTableSpec, HelmholtzPropertyTables
 from .helmholtz_state import (
     HelmholtzStateBlock,
     HelmholtzStateBlockData,
@@ -0,0 +1,305 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""Evaluate Helmholtz EoS properties for arrays of states without building a
+Pyomo model.
+"""
+
+import ctypes
+import functools
+
+import numpy as np
+
+import pyomo.environ as pyo
+from pyomo.core.base.external import _ARGLIST
+
+from idaes.core.util.exceptions import ConfigurationError
+from idaes.models.properties.general_helmholtz.helmholtz_functions import (
+    AmountBasis,
+    helmholtz_available,
+    helmholtz_data_dir,
+    _flib,
+)
+from idaes.models.properties.general_helmholtz.helmholtz_functions_map import (
+    external_function_map as _external_function_map,
+)
+from idaes.models.properties.general_helmholtz.components import (
+    component_registered,
+    viscosity_available,
+    thermal_conductivity_available,
+    surface_tension_available,
+)
+
+# Map property names (the HelmholtzThermoExpressions method names) to the
+# prefix of the external functions that calculate them.
+_property_functions = {
+    "p": "p",
+    "T": "t",
+    "tau": "tau",
+    "x": "vf",
+    "h": "h",
+    "s": "s",
+    "u": "u",
+    "g": "g",
+    "f": "f",
+    "cp": "cp",
+    "cv": "cv",
+    "w": "w",
+    "v": "v",
+    "viscosity": "mu",
+    "thermal_conductivity": "lambda",
+    "surface_tension": "sigma",
+}
+
+# Units of results, amount basis dependent units are for the mass basis and
+# are multiplied by the molecular weight for the mole basis.
+_mass_units = {
+    "h": pyo.units.J / pyo.units.kg,
+    "s": pyo.units.J / pyo.units.kg / pyo.units.K,
+    "u": pyo.units.J / pyo.units.kg,
+    "g": pyo.units.J / pyo.units.kg,
+    "f": pyo.units.J / pyo.units.kg,
+    "cp": pyo.units.J / pyo.units.kg / pyo.units.K,
+    "cv": pyo.units.J / pyo.units.kg / pyo.units.K,
+    "v": pyo.units.m**3 / pyo.units.kg,
+}
+_other_units = {
+    "p": pyo.units.Pa,
+    "T": pyo.units.K,
+    "tau": pyo.units.dimensionless,
+    "x": pyo.units.dimensionless,
+    "w": pyo.units.m / pyo.units.s,
+    "viscosity": pyo.units.Pa * pyo.units.s,
+    "thermal_conductivity": pyo.units.W / pyo.units.m / pyo.units.K,
+    "surface_tension": pyo.units.N / pyo.units.m,
+}
+
+_availability_checks = {
+    "viscosity": viscosity_available,
+    "thermal_conductivity": thermal_conductivity_available,
+    "surface_tension": surface_tension_available,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _library_functions():
+    """Load the Helmholtz external function library once and return a dict of
+    the function pointers it registers, keyed by external function name."""
+    if not helmholtz_available():
+        raise RuntimeError("Helmholtz EoS external functions not available")
+    loader = pyo.ExternalFunction(library=_flib, function="p")
+    loader.load_library()
+    # pylint: disable-next=protected-access
+    return {k: v[0] for k, v in loader._known_functions.items()}
+
+
+def _conversion_factor(from_units, to_units):
+    return pyo.units.convert_value(1.0, from_units=from_units, to_units=to_units)
+
+
+class HelmholtzBatchEvaluator(object):
+    """Evaluate Helmholtz EoS properties of a pure component for arrays of
+    states in one call. This calls the Helmholtz external function library
+    directly through ctypes, so no Pyomo model, expressions or external
+    function components are created. The library is loaded once, and the
+    parameters of each component are read by the library on first use and kept
+    for later calls.
+
+    The state is given by one of the sets (h, p), (s, p), (u, p), (T, p, x),
+    or for saturated states (T, x) or (p, x), in SI units on the amount basis of the evaluator, as NumPy arrays (or
+    scalars, which are broadcast). Points where the external function reports
+    an error are returned as NaN.
+
+    Args:
+        pure_component (str): registered component name, e.g. "h2o"
+        amount_basis (AmountBasis): amount basis of extensive state variables
+            and results
+
+    Returns:
+        HelmholtzBatchEvaluator
+    """
+
+    def __init__(self, pure_component, amount_basis=AmountBasis.MOLE):
+        if not component_registered(pure_component):
+            raise ConfigurationError(f"Component {pure_component} not supported.")
+        self.pure_component = pure_component
+        self.amount_basis = amount_basis
+        self._functions = _library_functions()
+        self._component_arg = pure_component.encode("ascii")
+        self._data_dir_arg = helmholtz_data_dir.encode("ascii")
+        # molecular weight in kg/mol and the temperature used to compute tau
+        self.mw = self._constant("mw_func") * _conversion_factor(
+            pyo.units.g / pyo.units.mol, pyo.units.kg / pyo.units.mol
+        )
+        self.temperature_star = self._constant("t_star_func")
+        # result conversion factors keyed by external function name
+        self._factors = {}
+
+    def _constant(self, name):
+        fname = _external_function_map[name]["fname"]
+        arglist = _ARGLIST([self._component_arg, self._data_dir_arg])
+        return self._functions[fname](ctypes.byref(arglist))
+
+    def call_function(self, name, *args):
+        """Call an external function, e.g. "t_hp_func", at each point of the
+        argument arrays. The component and data directory arguments are added,
+        so args are the real arguments only, in the units expected by the
+        external function (see helmholtz_functions_map).
+
+        Args:
+            name (str): name of the function in the external function map
+            args (array): real arguments, arrays are broadcast together
+
+        Returns:
+            array: function values in the external function units
+        """
+        fname = _external_function_map[name]["fname"]
+        if fname not in self._functions:
+            raise RuntimeError(
+                f"External function {fname} is not in the Helmholtz library."
+            )
+        fcn = self._functions[fname]
+        args = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in args])
+        shape = args[0].shape
+        result = np.empty(args[0].size)
+        # The argument list is allocated once and only the real arguments are
+        # updated for each point, so there is no per-point allocation.
+        arglist = _ARGLIST(
+            [self._component_arg] + [0.0] * len(args) + [self._data_dir_arg]
+        )
+        ra = arglist.ra
+        n = len(args)
+        for i, point in enumerate(zip(*[a.ravel().tolist() for a in args])):
+            for j in range(n):
+                ra[j] = point[j]
+            result[i] = fcn(ctypes.byref(arglist))
+            if arglist.Errmsg:
+                result[i] = np.nan
+                arglist.Errmsg = None
+        return result.reshape(shape)
+
+    def _state(self, h, s, u, p, T, x):
+        """Return the state variable set, the (broadcast) state variables in
+        SI units, and the first state variable and pressure in external
+        function units.
+        """
+        given = {
+            k: v
+            for k, v in {"h": h, "s": s, "u": u, "p": p, "T": T, "x": x}.items()
+            if v is not None
+        }
+        if set(given) not in (
+            {"h", "p"},
+            {"s", "p"},
+            {"u", "p"},
+            {"T", "p", "x"},
+            {"T", "x"},
+            {"p", "x"},
+        ):
+            raise RuntimeError(
+                f"Helmholtz batch evaluator: state variable set {set(given)} is "
+                "not supported."
+            )
+        keys = list(given)
+        arrays = np.broadcast_arrays(*[np.asarray(given[k], dtype=float) for k in keys])
+        given = dict(zip(keys, arrays))
+        if "p" not in given:
+            # saturated state given by temperature and vapor fraction
+            given["p"] = self.call_function("p_sat_t_func", given["T"])
+            given["p"] *= _conversion_factor(pyo.units.kPa, pyo.units.Pa)
+        elif "T" not in given and "x" in given:
+            # saturated state given by pressure and vapor fraction
+            given["T"] = self.call_function(
+                "t_sat_func",
+                given["p"] * _conversion_factor(pyo.units.Pa, pyo.units.kPa),
+            )
+        p_kpa = given["p"] * _conversion_factor(pyo.units.Pa, pyo.units.kPa)
+        if "T" in given:
+            return "tp", given, given["T"], p_kpa
+        sv = {"h", "s", "u"}.intersection(given).pop()
+        ext_units = _external_function_map[f"{sv}_func"]["units"]
+        state1 = given[sv] * _conversion_factor(_mass_units[sv], ext_units)
+        if self.amount_basis == AmountBasis.MOLE:
+            state1 = state1 / self.mw
+        return f"{sv}p", given, state1, p_kpa
+
+    def properties(
+        self, props, h=None, s=None, u=None, p=None, T=None, x=None, phase=None
+    ):
+        """Evaluate properties at an array of states.
+
+        Args:
+            props (list of str): properties to calculate, any of p, T, tau, x, h, s,
+                u, g, f, cp, cv, w, v, viscosity, thermal_conductivity or
+                surface_tension
+            h (array): enthalpy (J/mol or J/kg)
+            s (array): entropy (J/mol/K or J/kg/K)
+            u (array): internal energy (J/mol or J/kg)
+            p (array): pressure (Pa)
+            T (array): temperature (K)
+            x (array): vapor fraction
+            phase (str|None): None for mixed phase properties, or "liq" or "vap"
+                for the properties of one phase
+
+        Returns:
+            dict: arrays of property values in SI units keyed by property name
+        """
+        if isinstance(props, str):
+            props = [props]
+        if phase not in (None, "liq", "vap"):
+            raise ValueError(f"phase must be None, 'liq' or 'vap', not {phase}")
+        for prop in props:
+            if prop not in _property_functions:
+                raise ValueError(f"Property {prop} is not supported.")
+            check = _availability_checks.get(prop)
+            if check is not None and not check(self.pure_component):
+                raise RuntimeError(f"{prop} not available for {self.pure_component}")
+
+        sv, given, state1, p_kpa = self._state(h=h, s=s, u=u, p=p, T=T, x=x)
+        results = {}
+        for prop in props:
+            prefix = _property_functions[prop]
+            if prop in given and (phase is None or prop in ("T", "p", "x")):
+                # the property is one of the state variables
+                results[prop] = given[prop].copy()
+            elif sv == "tp":
+                if prop == "tau":
+                    results[prop] = self.temperature_star / given["T"]
+                elif phase is not None:
+                    results[prop] = self._call(
+                        prop, f"{prefix}_{phase}_tp_func", state1, p_kpa
+                    )
+                else:
+                    liq = self._call(prop, f"{prefix}_liq_tp_func", state1, p_kpa)
+                    vap = self._call(prop, f"{prefix}_vap_tp_func", state1, p_kpa)
+                    results[prop] = liq * (1 - given["x"]) + vap * given["x"]
+            elif phase is None or prop in ("T", "tau", "x"):
+                results[prop] = self._call(prop, f"{prefix}_{sv}_func", state1, p_kpa)
+            else:
+                results[prop] = self._call(
+                    prop, f"{prefix}_{phase}_{sv}_func", state1, p_kpa
+                )
+        return results
+
+    def _call(self, prop, name, arg1, arg2):
+        """Call an external function and convert the result to SI units"""
+        factor = self._factors.get(name)
+        if factor is None:
+            ext_units = _external_function_map[name]["units"]
+            if prop in _mass_units:
+                factor = _conversion_factor(ext_units, _mass_units[prop])
+                if self.amount_basis == AmountBasis.MOLE:
+                    factor *= self.mw
+            else:
+                factor = _conversion_factor(ext_units, _other_units[prop])
+            self._factors[name] = factor
+        return self.call_function(name, arg1, arg2) * factor
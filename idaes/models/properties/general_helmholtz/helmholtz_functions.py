@@ -45,6 +45,10 @@ from idaes.models.properties.general_helmholtz.components.parameters import (
     auto_register,
 )
 import idaes.logger as idaeslog
+from idaes.models.properties.general_helmholtz.helmholtz_tables import (
+    HelmholtzPropertyTables,
+    tabulation_spec,
+)
 from idaes.models.properties.general_helmholtz.helmholtz_functions_map import (
     external_function_map as _external_function_map,
 )
@@ -1138,6 +1142,27 @@ change.
         ),
     )
 
+    CONFIG.declare(
+        "tabulation",
+        ConfigValue(
+            default=None,
+            domain=tabulation_spec,
+            description="Options for tabulated properties",
+            doc="""If not None, properties that are functions of pressure and
+enthalpy are calculated from polynomial tables fitted over the given region
+instead of the external functions. The region is split at the saturation
+curves, and the external functions are used within saturation_band of the
+saturation curves and wherever a table is not accurate to the requested
+tolerance. The pressure and enthalpy state variables are bounded to the
+region. This option is only supported with StateVars.PH.
+**default** - None
+**Valid values:** {
+**None** - use the external functions,
+**HelmholtzTableSpec** - table region and options,
+**dict** - arguments for HelmholtzTableSpec}""",
+        ),
+    )
+
     def available(self):
         """Returns True if the shared library is installed and loads properly
         otherwise returns False
@@ -1755,6 +1780,11 @@ change.
             self.energy_internal_mol_max,
         )
 
+        # Property tables, these replace external functions in state blocks
+        self.property_tables = None
+        if self.config.tabulation is not None:
+            self._build_property_tables()
+
         # Smoothing parameters for TPX complimentarity form
         if self.config.state_vars == StateVars.TPX:
             self.smoothing_pressure_over = pyo.Param(
@@ -1771,6 +1801,58 @@ change.
                 units=pyo.units.Pa,
             )
 
+    def _build_property_tables(self):
+        """Load or fit the property tables for the tabulation option"""
+        if self.config.state_vars != StateVars.PH:
+            raise ConfigurationError(
+                "Tabulated properties are only supported with StateVars.PH"
+            )
+        spec = self.config.tabulation
+        pressure_range = tuple(
+            pyo.value(p * self.uc["Pa to kPa"]) for p in spec.pressure_range
+        )
+        if self.config.amount_basis == AmountBasis.MOLE:
+            uc = self.uc["J/mol to kJ/kg"]
+        else:
+            uc = self.uc["J/kg to kJ/kg"]
+        enthalpy_range = tuple(pyo.value(h * uc) for h in spec.enthalpy_range)
+        self.property_tables = HelmholtzPropertyTables.build(
+            self.pure_component,
+            spec,
+            pressure_range,
+            enthalpy_range,
+            band=pyo.value(spec.saturation_band * uc),
+            pressure_crit=pyo.value(self.pressure_crit * self.uc["Pa to kPa"]),
+        )
+        self.property_tables.log_error_bounds(_log)
+
+        # The tables are polynomials, which must not be extrapolated, so the
+        # state variables are bounded to the table region.
+        self.default_pressure_bounds = (
+            max(pyo.value(self.pressure_min), spec.pressure_range[0]),
+            min(pyo.value(self.pressure_max), spec.pressure_range[1]),
+        )
+        self.default_enthalpy_mol_bounds = (
+            max(
+                pyo.value(self.enthalpy_mol_min),
+                pyo.value(enthalpy_range[0] * self.uc["kJ/kg to J/mol"]),
+            ),
+            min(
+                pyo.value(self.enthalpy_mol_max),
+                pyo.value(enthalpy_range[1] * self.uc["kJ/kg to J/mol"]),
+            ),
+        )
+        self.default_enthalpy_mass_bounds = (
+            max(
+                pyo.value(self.enthalpy_mass_min),
+                pyo.value(enthalpy_range[0] * self.uc["kJ/kg to J/kg"]),
+            ),
+            min(
+                pyo.value(self.enthalpy_mass_max),
+                pyo.value(enthalpy_range[1] * self.uc["kJ/kg to J/kg"]),
+            ),
+        )
+
     def add_param(self, name, expr):
         """Add a parameter to the block.
 
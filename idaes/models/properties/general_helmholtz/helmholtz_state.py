@@ -122,125 +122,43 @@ class _StateBlock(StateBlock):
         # Fix state variables
         fix_state_vars(self)
 
+    @staticmethod
+    def _state_var_names(blk):
+        """Return the names of the state variables of a StateBlockData, which
+        are the same for all elements of an indexed state block. These are
+        also the keys of the state_args dict.
+        """
+        pp = blk.config.parameters.config.phase_presentation
+        sv = blk.state_vars
+        if blk.amount_basis == AmountBasis.MOLE:
+            basis = "mol"
+        else:
+            basis = "mass"
+        if sv == StateVars.PH:
+            return (f"flow_{basis}", f"enth_{basis}", "pressure")
+        if sv == StateVars.PS:
+            return (f"flow_{basis}", f"entr_{basis}", "pressure")
+        if sv == StateVars.PU:
+            return (f"flow_{basis}", f"energy_internal_{basis}", "pressure")
+        if pp in (PhaseType.MIX, PhaseType.LG):
+            return (f"flow_{basis}", "temperature", "pressure", "vapor_frac")
+        return (f"flow_{basis}", "temperature", "pressure")
+
     def initialize(self, *args, **kwargs):
         flags = {}
         hold_state = kwargs.pop("hold_state", False)
         state_args = kwargs.pop("state_args", None)
+        if len(self) == 0:
+            return flags
+        # The state variable set, amount basis and phase presentation come
+        # from the parameter block, so look up the variable names once rather
+        # than for every element.
+        names = self._state_var_names(next(iter(self.values())))
         for i, v in self.items():
-            pp = self[i].config.parameters.config.phase_presentation
-            sv = self[i].state_vars
-            ab = self[i].amount_basis
-            if sv == StateVars.PH and ab == AmountBasis.MOLE:
-                flags[i] = (v.flow_mol.fixed, v.enth_mol.fixed, v.pressure.fixed)
-                self._set_not_fixed(v.flow_mol, state_args, "flow_mol", hold_state)
-                self._set_not_fixed(v.enth_mol, state_args, "enth_mol", hold_state)
-                self._set_not_fixed(v.pressure, state_args, "pressure", hold_state)
-            elif sv == StateVars.PH and ab == AmountBasis.MASS:
-                flags[i] = (v.flow_mass.fixed, v.enth_mass.fixed, v.pressure.fixed)
-                self._set_not_fixed(v.flow_mass, state_args, "flow_mass", hold_state)
-                self._set_not_fixed(v.enth_mass, state_args, "enth_mass", hold_state)
-                self._set_not_fixed(v.pressure, state_args, "pressure", hold_state)
-            elif sv == StateVars.PS and ab == AmountBasis.MOLE:
-                flags[i] = (v.flow_mol.fixed, v.entr_mol.fixed, v.pressure.fixed)
-                self._set_not_fixed(v.flow_mol, state_args, "flow_mol", hold_state)
-                self._set_not_fixed(v.entr_mol, state_args, "enth_mol", hold_state)
-                self._set_not_fixed(v.pressure, state_args, "pressure", hold_state)
-            elif sv == StateVars.PS and ab == AmountBasis.MASS:
-                flags[i] = (v.flow_mass.fixed, v.entr_mass.fixed, v.pressure.fixed)
-                self._set_not_fixed(v.flow_mass, state_args, "flow_mass", hold_state)
-                self._set_not_fixed(v.entr_mass, state_args, "enth_mass", hold_state)
-                self._set_not_fixed(v.pressure, state_args, "pressure", hold_state)
-            elif sv == StateVars.PU and ab == AmountBasis.MOLE:
-                flags[i] = (
-                    v.flow_mol.fixed,
-                    v.energy_internal_mol.fixed,
-                    v.pressure.fixed,
-                )
-                self._set_not_fixed(
-                    v.energy_internal_mol, state_args, "energy_internal_mol", hold_state
-                )
-                self._set_not_fixed(
-                    v.energy_internal_mol, state_args, "energy_internal_mol", hold_state
-                )
-                self._set_not_fixed(
-                    v.energy_internal_mol, state_args, "energy_internal_mol", hold_state
-                )
-            elif sv == StateVars.PU and ab == AmountBasis.MASS:
-                flags[i] = (
-                    v.flow_mass.fixed,
-                    v.energy_internal_mass.fixed,
-                    v.pressure.fixed,
-                )
-                self._set_not_fixed(
-                    v.energy_internal_mass,
-                    state_args,
-                    "energy_internal_mass",
-                    hold_state,
-                )
-                self._set_not_fixed(
-                    v.energy_internal_mass,
-                    state_args,
-                    "energy_internal_mass",
-                    hold_state,
-                )
-                self._set_not_fixed(v.pressure, state_args, "pressure", hold_state)
-            elif sv == StateVars.TPX and ab == AmountBasis.MOLE:
-                # Hold the T-P-x vars
-                if pp in (PhaseType.MIX, PhaseType.LG):
-                    flags[i] = (
-                        v.flow_mol.fixed,
-                        v.temperature.fixed,
-                        v.pressure.fixed,
-                        v.vapor_frac.fixed,
-                    )
-                    self._set_not_fixed(v.flow_mol, state_args, "flow_mol", hold_state)
-                    self._set_not_fixed(
-                        v.temperature, state_args, "temperature", hold_state
-                    )
-                    self._set_not_fixed(v.pressure, state_args, "pressure", hold_state)
-                    self._set_not_fixed(
-                        v.vapor_frac, state_args, "vapor_frac", hold_state
-                    )
-                else:
-                    flags[i] = (v.flow_mol.fixed, v.temperature.fixed, v.pressure.fixed)
-                    self._set_not_fixed(v.flow_mol, state_args, "flow_mol", hold_state)
-                    self._set_not_fixed(
-                        v.temperature, state_args, "temperature", hold_state
-                    )
-                    self._set_not_fixed(v.pressure, state_args, "pressure", hold_state)
-            elif sv == StateVars.TPX and ab == AmountBasis.MASS:
-                # Hold the T-P-x vars
-                if pp in (PhaseType.MIX, PhaseType.LG):
-                    flags[i] = (
-                        v.flow_mass.fixed,
-                        v.temperature.fixed,
-                        v.pressure.fixed,
-                        v.vapor_frac.fixed,
-                    )
-                    self._set_not_fixed(
-                        v.flow_mass, state_args, "flow_mass", hold_state
-                    )
-                    self._set_not_fixed(
-                        v.temperature, state_args, "temperature", hold_state
-                    )
-                    self._set_not_fixed(v.pressure, state_args, "pressure", hold_state)
-                    self._set_not_fixed(
-                        v.vapor_frac, state_args, "vapor_frac", hold_state
-                    )
-                else:
-                    flags[i] = (
-                        v.flow_mass.fixed,
-                        v.temperature.fixed,
-                        v.pressure.fixed,
-                    )
-                    self._set_not_fixed(
-                        v.flow_mass, state_args, "flow_mass", hold_state
-                    )
-                    self._set_not_fixed(
-                        v.temperature, state_args, "temperature", hold_state
-                    )
-                    self._set_not_fixed(v.pressure, state_args, "pressure", hold_state)
-
+            state_vars = [getattr(v, name) for name in names]
+            flags[i] = tuple(sv.fixed for sv in state_vars)
+            for name, sv in zip(names, state_vars):
+                self._set_not_fixed(sv, state_args, name, hold_state)
         return flags
 
     def release_state(self, flags, **kwargs):
@@ -250,46 +168,13 @@ class _StateBlock(StateBlock):
         Args:
             flags (dict): Original variable states
         """
+        if len(flags) == 0:
+            return
+        names = self._state_var_names(self[next(iter(flags))])
         for i, f in flags.items():
-            pp = self[i].config.parameters.config.phase_presentation
-            sv = self[i].state_vars
-            ab = self[i].amount_basis
-            if sv == StateVars.PH and ab == AmountBasis.MOLE:
-                self._set_fixed(self[i].flow_mol, f[0])
-                self._set_fixed(self[i].enth_mol, f[1])
-                self._set_fixed(self[i].pressure, f[2])
-            elif sv == StateVars.PH and ab == AmountBasis.MASS:
-                self._set_fixed(self[i].flow_mass, f[0])
-                self._set_fixed(self[i].enth_mass, f[1])
-                self._set_fixed(self[i].pressure, f[2])
-            elif sv == StateVars.PS and ab == AmountBasis.MOLE:
-                self._set_fixed(self[i].flow_mol, f[0])
-                self._set_fixed(self[i].entr_mol, f[1])
-                self._set_fixed(self[i].pressure, f[2])
-            elif sv == StateVars.PS and ab == AmountBasis.MASS:
-                self._set_fixed(self[i].flow_mass, f[0])
-                self._set_fixed(self[i].entr_mass, f[1])
-                self._set_fixed(self[i].pressure, f[2])
-            elif sv == StateVars.PU and ab == AmountBasis.MOLE:
-                self._set_fixed(self[i].flow_mol, f[0])
-                self._set_fixed(self[i].energy_internal_mol, f[1])
-                self._set_fixed(self[i].pressure, f[2])
-            elif sv == StateVars.PU and ab == AmountBasis.MASS:
-                self._set_fixed(self[i].flow_mass, f[0])
-                self._set_fixed(self[i].energy_internal_mass, f[1])
-                self._set_fixed(self[i].pressure, f[2])
-            elif sv == StateVars.TPX and ab == AmountBasis.MOLE:
-                self._set_fixed(self[i].flow_mol, f[0])
-                self._set_fixed(self[i].temperature, f[1])
-                self._set_fixed(self[i].pressure, f[2])
-                if pp in (PhaseType.MIX, PhaseType.LG):
-                    self._set_fixed(self[i].vapor_frac, f[3])
-            elif sv == StateVars.TPX and ab == AmountBasis.MASS:
-                self._set_fixed(self[i].flow_mass, f[0])
-                self._set_fixed(self[i].temperature, f[1])
-                self._set_fixed(self[i].pressure, f[2])
-                if pp in (PhaseType.MIX, PhaseType.LG):
-                    self._set_fixed(self[i].vapor_frac, f[3])
+            v = self[i]
+            for name, fixed in zip(names, f):
+                self._set_fixed(getattr(v, name), fixed)
 
 
 @declare_process_block_class("HelmholtzStateBlock", block_class=_StateBlock)
@@ -596,6 +481,10 @@ class HelmholtzStateBlockData(StateBlockData):
         super().build(*args)
         # Short path to the parameter block
         params = self.config.parameters
+        # Add property tables first, so external functions are only added for
+        # the properties that are not tabulated.
+        if params.property_tables is not None:
+            params.property_tables.add_functions(self)
         # Check if the library is available, and add external functions.
         add_helmholtz_external_functions(self)
         cmp = params.pure_component
@@ -646,6 +535,13 @@ class HelmholtzStateBlockData(StateBlockData):
         # basis if using TPx as state variables it also adds the complementarity
         # constraints. Beyond this everything else is common.
         self._state_vars()
+        if params.property_tables is not None:
+            # The state variables are bounded to the table region, so start
+            # inside it.
+            for v in self.intensive_set:
+                if v.value is not None:
+                    lb, ub = v.bounds
+                    v.set_value(min(max(v.value, lb), ub))
 
         # P is pressure in kPa for external function calls
         T = self.temperature
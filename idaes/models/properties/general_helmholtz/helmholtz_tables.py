@@ -0,0 +1,1224 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""Tabulated (p, h) property mode for Helmholtz EoS state blocks.
+
+Property functions of pressure and enthalpy are approximated by tensor product
+Chebyshev polynomials over a user specified region. The polynomials are
+written as Pyomo expressions, so the solver evaluates them and their exact
+derivatives directly instead of calling the external functions, which solve
+for density at every evaluation. Fitted tables are cached on disk.
+
+Properties change slope at the saturation curves, so a region that reaches
+the saturation dome is split into liquid, two-phase and vapor parts, bounded
+by tabulated saturation enthalpies, with separate tables for each part. The
+full EoS is used in a band of configurable width around the saturation
+curves, and in any part where a table is not accurate enough.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+import pyomo.environ as pyo
+
+import idaes
+import idaes.logger as idaeslog
+from idaes.models.properties.general_helmholtz.helmholtz_functions_map import (
+    external_function_map as _external_function_map,
+)
+from idaes.models.properties.general_helmholtz.components import (
+    viscosity_available,
+    thermal_conductivity_available,
+    surface_tension_available,
+)
+
+_log = idaeslog.getLogger(__name__)
+
+# Increment if the format of the cache files changes
+_cache_version = 2
+
+# Functions that can be tabulated, all functions with (h, p) arguments
+_hp_functions = tuple(k for k in _external_function_map if k.endswith("_hp_func"))
+
+# Functions that are only available if the component has transport models
+_availability_checks = {
+    "mu": viscosity_available,
+    "lambda": thermal_conductivity_available,
+    "sigma": surface_tension_available,
+}
+
+# Units of the enthalpy and pressure arguments of the (h, p) functions
+_h_units, _p_units = _external_function_map["t_hp_func"]["arg_units"][1:]
+
+# Points used to check where the saturation curves cross the table region
+_n_check_points = 201
+
+# Tolerance on the scaled state for points on the boundary of a table
+_boundary_tolerance = 1e-9
+
+
+def default_cache_directory():
+    """Return the default directory for cached property tables, or None if
+    there is no IDAES data directory.
+    """
+    if idaes.data_directory is None:
+        return None
+    return os.path.join(idaes.data_directory, "helmholtz_tables")
+
+
+class HelmholtzTableSpec(object):
+    """Options for the tabulated property mode of a Helmholtz parameter block.
+
+    Args:
+        pressure_range (tuple): (min, max) pressure of the table region in Pa
+        enthalpy_range (tuple): (min, max) enthalpy of the table region in
+            J/mol or J/kg, depending on the amount basis of the parameter block
+        degree (int|tuple): degree of the Chebyshev polynomials in pressure and
+            enthalpy, an int is used for both
+        max_rel_error (float): largest acceptable error of a table, relative to
+            the largest absolute value of the function in the region. Functions
+            with larger errors use the full EoS external function.
+        functions (list|None): names of the (h, p) external functions to
+            tabulate, e.g. "t_hp_func". If None, tabulate all available
+            functions.
+        nodes_per_degree (int): number of fitting nodes in each direction per
+            polynomial coefficient
+        cache_dir (str|None): directory for cached tables, if None use
+            default_cache_directory()
+        use_cache (bool): if False, always fit the tables and don't write them
+            to the cache
+        saturation_band (float): width of the band on each side of the
+            saturation curves where the full EoS is used instead of the
+            tables, in the units of enthalpy_range
+        saturation_pressure_limit (float): fraction of the critical pressure
+            up to which the region is split at the saturation curves. Above
+            it, one table of each function covers the whole enthalpy range.
+
+    Returns:
+        HelmholtzTableSpec
+    """
+
+    def __init__(
+        self,
+        pressure_range,
+        enthalpy_range,
+        degree=16,
+        max_rel_error=1e-4,
+        functions=None,
+        nodes_per_degree=2,
+        cache_dir=None,
+        use_cache=True,
+        saturation_band=0.0,
+        saturation_pressure_limit=0.95,
+    ):
+        self.pressure_range = _check_range(pressure_range, "pressure_range")
+        if self.pressure_range[0] <= 0:
+            raise ValueError("pressure_range must be positive")
+        self.enthalpy_range = _check_range(enthalpy_range, "enthalpy_range")
+        if isinstance(degree, int):
+            degree = (degree, degree)
+        degree = tuple(degree)
+        if len(degree) != 2 or any(not isinstance(d, int) or d < 1 for d in degree):
+            raise ValueError("degree must be a positive int or a pair of them")
+        self.degree = degree
+        if max_rel_error <= 0:
+            raise ValueError("max_rel_error must be positive")
+        self.max_rel_error = max_rel_error
+        if functions is not None:
+            for name in functions:
+                if name not in _hp_functions:
+                    raise ValueError(
+                        f"{name} is not a function of enthalpy and pressure"
+                    )
+            functions = tuple(functions)
+        self.functions = functions
+        if not isinstance(nodes_per_degree, int) or nodes_per_degree < 1:
+            raise ValueError("nodes_per_degree must be a positive int")
+        self.nodes_per_degree = nodes_per_degree
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+        if saturation_band < 0:
+            raise ValueError("saturation_band must not be negative")
+        self.saturation_band = float(saturation_band)
+        if not 0 < saturation_pressure_limit <= 1:
+            raise ValueError("saturation_pressure_limit must be in (0, 1]")
+        self.saturation_pressure_limit = float(saturation_pressure_limit)
+
+
+def _check_range(value, name):
+    lo, hi = (float(v) for v in value)
+    if not lo < hi:
+        raise ValueError(f"{name} must be (min, max) with min < max")
+    return (lo, hi)
+
+
+def tabulation_spec(value):
+    """ConfigValue domain for the tabulation option. Accepts None, a
+    HelmholtzTableSpec, or a dict of HelmholtzTableSpec arguments.
+    """
+    if value is None or isinstance(value, HelmholtzTableSpec):
+        return value
+    if isinstance(value, dict):
+        return HelmholtzTableSpec(**value)
+    raise ValueError(
+        "tabulation must be None, a HelmholtzTableSpec, or a dict of its arguments"
+    )
+
+
+def _chebyshev_nodes(n):
+    """Chebyshev-Gauss-Lobatto nodes on [-1, 1] in increasing order"""
+    return np.cos(np.pi * np.arange(n - 1, -1, -1) / (n - 1))
+
+
+def _midpoint_nodes(n):
+    """Points between the n Chebyshev-Gauss-Lobatto nodes, for validation"""
+    return np.cos(np.pi * (np.arange(n - 2, -1, -1) + 0.5) / (n - 1))
+
+
+def _scale_log(p, pressure_range):
+    """Map pressure to [-1, 1] on a log scale, works on arrays and Pyomo
+    expressions"""
+    lo, hi = np.log(pressure_range)
+    log = pyo.log if _is_expression(p) else np.log
+    return (2 * log(p) - (lo + hi)) / (hi - lo)
+
+
+def _unscale_log(xp, pressure_range):
+    lo, hi = np.log(pressure_range)
+    return np.exp(lo + (xp + 1) * (hi - lo) / 2)
+
+
+def _check_scaled(x, what):
+    if np.any(np.abs(x) > 1 + _boundary_tolerance):
+        raise ValueError(f"The {what} of a point is outside the region of the table")
+
+
+class ChebyshevCurve(object):
+    """Chebyshev series in log(p) approximating a function of pressure, used
+    for the saturation enthalpies that bound the table regions next to the
+    saturation dome.
+
+    Args:
+        name (str): curve name, e.g. "liq" or "vap"
+        coef (array): coefficients, coef[i] multiplies T_i(x_p)
+        pressure_range (tuple): (min, max) pressure
+        max_abs_error (float): largest absolute error on the validation points
+
+    Returns:
+        ChebyshevCurve
+    """
+
+    def __init__(self, name, coef, pressure_range, max_abs_error=np.inf):
+        self.name = name
+        self.coef = np.asarray(coef, dtype=float)
+        self.pressure_range = tuple(float(x) for x in pressure_range)
+        self.max_abs_error = float(max_abs_error)
+
+    @classmethod
+    def fit(cls, name, fcn, pressure_range, degree, nodes_per_degree=2):
+        """Fit a curve to a function by least squares on Chebyshev nodes, and
+        calculate the error on the points between the nodes. If the function
+        returns NaN at any point, the curve is returned with an infinite
+        error bound.
+
+        Args:
+            name (str): curve name
+            fcn (callable): f(p), evaluated on arrays
+            pressure_range (tuple): (min, max) pressure
+            degree (int): polynomial degree
+            nodes_per_degree (int): fitting nodes per coefficient
+
+        Returns:
+            ChebyshevCurve
+        """
+        curve = cls(name, np.zeros(degree + 1), pressure_range)
+        n = nodes_per_degree * (degree + 1)
+        xp = _chebyshev_nodes(n)
+        y = np.asarray(fcn(_unscale_log(xp, curve.pressure_range)), dtype=float)
+        if not np.all(np.isfinite(y)):
+            return curve
+        curve.coef = chebyshev.chebfit(xp, y, degree)
+        xp = _midpoint_nodes(n)
+        y = np.asarray(fcn(_unscale_log(xp, curve.pressure_range)), dtype=float)
+        if np.all(np.isfinite(y)):
+            curve.max_abs_error = np.max(np.abs(chebyshev.chebval(xp, curve.coef) - y))
+        return curve
+
+    def __call__(self, p):
+        """Evaluate the curve for an array of p"""
+        xp = _scale_log(np.asarray(p, dtype=float), self.pressure_range)
+        return chebyshev.chebval(xp, self.coef)
+
+    def expression(self, xp):
+        """Return a Pyomo expression for the curve given the scaled pressure.
+        The series is converted to a polynomial in x_p and written in Horner
+        form, which references x_p only once per degree."""
+        return _horner(_cheb2poly_matrix(len(self.coef)) @ self.coef, xp)
+
+    def to_dict(self):
+        """Return a dict of the curve data that can be written to JSON"""
+        return {
+            "name": self.name,
+            "coef": self.coef.tolist(),
+            "pressure_range": list(self.pressure_range),
+            "max_abs_error": _json_float(self.max_abs_error),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a curve from the dict returned by to_dict()"""
+        return cls(
+            data["name"],
+            data["coef"],
+            data["pressure_range"],
+            max_abs_error=float(data["max_abs_error"]),
+        )
+
+
+class TableRegion(object):
+    """Part of the (p, h) plane covered by one table of each function.
+
+    Pressure is scaled to [-1, 1] on a log scale. Enthalpy is scaled linearly
+    between a lower and an upper bound. A bound is either a number, or a
+    (ChebyshevCurve, offset) pair for a bound at a fixed enthalpy offset from
+    a saturation curve, so the regions next to the saturation dome are mapped
+    to [-1, 1] x [-1, 1] as well.
+
+    Args:
+        name (str): region name
+        pressure_range (tuple): (min, max) pressure
+        lower: lower enthalpy bound
+        upper: upper enthalpy bound
+
+    Returns:
+        TableRegion
+    """
+
+    def __init__(self, name, pressure_range, lower, upper):
+        self.name = name
+        self.pressure_range = tuple(float(x) for x in pressure_range)
+        self.lower = self._check_bound(lower)
+        self.upper = self._check_bound(upper)
+
+    def _check_bound(self, bound):
+        if isinstance(bound, tuple):
+            curve, offset = bound
+            if curve.pressure_range != self.pressure_range:
+                raise ValueError(
+                    "Saturation curves must have the pressure range of the region"
+                )
+            return (curve, float(offset))
+        return float(bound)
+
+    def curves(self):
+        """Return the curves used by the enthalpy bounds"""
+        return [b[0] for b in (self.lower, self.upper) if isinstance(b, tuple)]
+
+    def curve_values(self, p):
+        """Return the values of the curves of the bounds for an array of p,
+        keyed by curve name"""
+        return {c.name: c(p) for c in self.curves()}
+
+    def scaled_pressure(self, p):
+        """Map pressure to [-1, 1], works on arrays and Pyomo expressions"""
+        return _scale_log(p, self.pressure_range)
+
+    def enthalpy_bounds(self, curve_values):
+        """Return the lower and upper enthalpy bounds.
+
+        Args:
+            curve_values (dict): values of the curves keyed by curve name,
+                numbers, arrays or Pyomo expressions
+
+        Returns:
+            tuple: lower and upper bound
+        """
+        return tuple(
+            curve_values[b[0].name] + b[1] if isinstance(b, tuple) else b
+            for b in (self.lower, self.upper)
+        )
+
+    def scaled_enthalpy(self, h, curve_values):
+        """Map enthalpy to [-1, 1], works on arrays and Pyomo expressions"""
+        lo, hi = self.enthalpy_bounds(curve_values)
+        return (2 * h - (lo + hi)) / (hi - lo)
+
+    def state(self, xp, xh):
+        """Return the enthalpy and pressure for arrays of scaled states"""
+        p = _unscale_log(xp, self.pressure_range)
+        lo, hi = self.enthalpy_bounds(self.curve_values(p))
+        return lo + (xh + 1) * (hi - lo) / 2, p
+
+    def to_dict(self):
+        """Return a dict of the region data that can be written to JSON,
+        curves are given by name"""
+        return {
+            "name": self.name,
+            "pressure_range": list(self.pressure_range),
+            "lower": _bound_to_json(self.lower),
+            "upper": _bound_to_json(self.upper),
+        }
+
+    @classmethod
+    def from_dict(cls, data, curves):
+        """Create a region from the dict returned by to_dict() and the
+        curves keyed by name"""
+
+        def bound(b):
+            if isinstance(b, dict):
+                return (curves[b["curve"]], b["offset"])
+            return b
+
+        return cls(
+            data["name"],
+            data["pressure_range"],
+            bound(data["lower"]),
+            bound(data["upper"]),
+        )
+
+
+def _bound_to_json(bound):
+    if isinstance(bound, tuple):
+        return {"curve": bound[0].name, "offset": bound[1]}
+    return bound
+
+
+class ChebyshevTable(object):
+    """Tensor product Chebyshev polynomial approximation of a function f(h, p)
+    over a region of the (p, h) plane, in the scaled pressure and enthalpy of
+    the region.
+
+    Args:
+        coef (array): coefficients, coef[i, j] multiplies T_i(x_p) * T_j(x_h)
+        region (TableRegion): region of the table
+        max_abs_error (float): largest absolute error on the validation points
+        max_rel_error (float): max_abs_error divided by the largest absolute
+            function value on the validation points
+
+    Returns:
+        ChebyshevTable
+    """
+
+    def __init__(
+        self,
+        coef,
+        region,
+        max_abs_error=np.inf,
+        max_rel_error=np.inf,
+    ):
+        self.coef = np.asarray(coef, dtype=float)
+        self.region = region
+        self.max_abs_error = float(max_abs_error)
+        self.max_rel_error = float(max_rel_error)
+
+    @property
+    def degree(self):
+        """Polynomial degree in pressure and enthalpy"""
+        return (self.coef.shape[0] - 1, self.coef.shape[1] - 1)
+
+    @classmethod
+    def fit(cls, fcn, region, degree, nodes_per_degree=2):
+        """Fit a table to a function by least squares on a grid of Chebyshev
+        nodes, and calculate the error on the points between the nodes. If the
+        function returns NaN at any point, the table is returned with infinite
+        error bounds.
+
+        Args:
+            fcn (callable): f(h, p), evaluated on arrays
+            region (TableRegion): region of the table
+            degree (tuple): polynomial degree in pressure and enthalpy
+            nodes_per_degree (int): fitting nodes per coefficient
+
+        Returns:
+            ChebyshevTable
+        """
+        table = cls(np.zeros((degree[0] + 1, degree[1] + 1)), region)
+        n_p = nodes_per_degree * (degree[0] + 1)
+        n_h = nodes_per_degree * (degree[1] + 1)
+        xp, xh = np.meshgrid(_chebyshev_nodes(n_p), _chebyshev_nodes(n_h))
+        y = np.asarray(fcn(*region.state(xp, xh)), dtype=float)
+        if not np.all(np.isfinite(y)):
+            return table
+        a = chebyshev.chebvander2d(xp.ravel(), xh.ravel(), degree)
+        coef = np.linalg.lstsq(a, y.ravel(), rcond=None)[0]
+        table.coef = coef.reshape(degree[0] + 1, degree[1] + 1)
+
+        xp, xh = np.meshgrid(_midpoint_nodes(n_p), _midpoint_nodes(n_h))
+        y = np.asarray(fcn(*region.state(xp, xh)), dtype=float)
+        if not np.all(np.isfinite(y)):
+            return table
+        err = np.max(np.abs(chebyshev.chebval2d(xp, xh, table.coef) - y))
+        scale = np.max(np.abs(y))
+        table.max_abs_error = err
+        table.max_rel_error = err / scale if scale > 0 else err
+        return table
+
+    def __call__(self, h, p):
+        """Evaluate the table for arrays of h and p. Raises ValueError if a
+        point is outside the region of the table, where the polynomials would
+        be extrapolated."""
+        h = np.asarray(h, dtype=float)
+        p = np.asarray(p, dtype=float)
+        xp = self.region.scaled_pressure(p)
+        _check_scaled(xp, "pressure")
+        xh = self.region.scaled_enthalpy(h, self.region.curve_values(p))
+        _check_scaled(xh, "enthalpy")
+        return chebyshev.chebval2d(xp, xh, self.coef)
+
+    def power_coef(self):
+        """Return the coefficients of the table as a polynomial in x_p and
+        x_h, a[i, j] multiplies x_p**i * x_h**j"""
+        n_p, n_h = self.coef.shape
+        return _cheb2poly_matrix(n_p) @ self.coef @ _cheb2poly_matrix(n_h).T
+
+    def expression(self, xp, xh):
+        """Return a Pyomo expression for the table given the scaled pressure
+        and enthalpy. The table is written as a polynomial in Horner form, so
+        each scaled variable is referenced once per degree. Pyomo does not
+        cache the value of named Expressions, so the Chebyshev recurrence
+        would evaluate the scaled state a number of times that grows
+        exponentially with the degree.
+
+        Args:
+            xp: scaled pressure, number or expression
+            xh: scaled enthalpy, number or expression
+
+        Returns:
+            expression
+        """
+        return _horner([_horner(row, xh) for row in self.power_coef()], xp)
+
+    def to_dict(self):
+        """Return a dict of the table data that can be written to JSON, the
+        region is given by name"""
+        return {
+            "coef": self.coef.tolist(),
+            "region": self.region.name,
+            "max_abs_error": _json_float(self.max_abs_error),
+            "max_rel_error": _json_float(self.max_rel_error),
+        }
+
+    @classmethod
+    def from_dict(cls, data, region):
+        """Create a table from the dict returned by to_dict() and its region"""
+        return cls(
+            coef=data["coef"],
+            region=region,
+            max_abs_error=float(data["max_abs_error"]),
+            max_rel_error=float(data["max_rel_error"]),
+        )
+
+
+def _is_expression(x):
+    return not isinstance(x, (float, int, np.ndarray, np.number))
+
+
+def _json_float(x):
+    return x if np.isfinite(x) else "inf"
+
+
+def _cheb2poly_matrix(n):
+    """Matrix converting n Chebyshev series coefficients to polynomial
+    coefficients"""
+    m = np.zeros((n, n))
+    for k in range(n):
+        c = chebyshev.cheb2poly(np.eye(n)[k])
+        m[: len(c), k] = c
+    return m
+
+
+def _horner(coef, x):
+    """Return the polynomial sum(coef[i] * x**i) in Horner form, for
+    coefficients that are numbers or expressions"""
+    expr = _coef(coef[-1])
+    for c in reversed(coef[:-1]):
+        expr = expr * x + _coef(c)
+    return expr
+
+
+def _coef(c):
+    return float(c) if isinstance(c, (float, int, np.number)) else c
+
+
+class HelmholtzPropertyTables(object):
+    """Tables of the (h, p) external functions of a pure component. Tables
+    use the external function units, kJ/kg for enthalpy and kPa for pressure.
+
+    If the table region reaches the saturation dome, it is split into
+    "liquid", "two_phase" and "vapor" regions up to the saturation pressure
+    limit, bounded by the saturation curves "liq" and "vap", and a
+    "high_pressure" region above it. Otherwise one region, "all", covers the
+    whole table region. A state is assigned to a region as follows:
+
+    - "high_pressure" if p is above the pressure range of the saturation curves
+    - "liquid" if h <= h_liq(p) - band
+    - "vapor" if h >= h_vap(p) + band
+    - the full EoS if h is within band of a saturation curve
+    - "two_phase" otherwise
+
+    The full EoS is also used in a region without a table, or whose table is
+    less accurate than max_rel_error.
+
+    Args:
+        pure_component (str): component name
+        pressure_range (tuple): (min, max) pressure of the table region
+        enthalpy_range (tuple): (min, max) enthalpy of the table region
+        regions (list): TableRegion objects
+        tables (dict): dicts of ChebyshevTable keyed by region name, keyed by
+            external function name
+        max_rel_error (float): tables with a larger relative error are not
+            used and the full EoS external function is used instead
+        curves (dict|None): liquid and vapor saturation enthalpy
+            ChebyshevCurve keyed by "liq" and "vap", if the region is split at
+            the saturation dome
+        band (float): width of the band around the saturation curves where the
+            full EoS is used
+
+    Returns:
+        HelmholtzPropertyTables
+    """
+
+    def __init__(
+        self,
+        pure_component,
+        pressure_range,
+        enthalpy_range,
+        regions,
+        tables,
+        max_rel_error=1e-4,
+        curves=None,
+        band=0.0,
+    ):
+        self.pure_component = pure_component
+        self.pressure_range = tuple(pressure_range)
+        self.enthalpy_range = tuple(enthalpy_range)
+        self.regions = {r.name: r for r in regions}
+        self.tables = tables
+        self.max_rel_error = max_rel_error
+        self.curves = curves
+        self.band = band
+
+    @classmethod
+    def build(
+        cls,
+        pure_component,
+        spec,
+        pressure_range,
+        enthalpy_range,
+        band=0.0,
+        pressure_crit=None,
+    ):
+        """Load the tables from the cache, or fit them with the external
+        functions and save them to the cache.
+
+        Args:
+            pure_component (str): component name
+            spec (HelmholtzTableSpec): tabulation options
+            pressure_range (tuple): (min, max) pressure in kPa
+            enthalpy_range (tuple): (min, max) enthalpy in kJ/kg
+            band (float): width of the band around the saturation curves
+                where the full EoS is used, in kJ/kg
+            pressure_crit (float|None): critical pressure in kPa, if None the
+                region is not split at the saturation dome
+
+        Returns:
+            HelmholtzPropertyTables
+        """
+        # This is imported here to avoid a circular import
+        # pylint: disable-next=import-outside-toplevel
+        from idaes.models.properties.general_helmholtz.helmholtz_batch import (
+            HelmholtzBatchEvaluator,
+        )
+
+        functions = spec.functions
+        if functions is None:
+            functions = available_hp_functions(pure_component)
+        key = {
+            "version": _cache_version,
+            "component": pure_component,
+            "pressure_range": [float(x) for x in pressure_range],
+            "enthalpy_range": [float(x) for x in enthalpy_range],
+            "degree": list(spec.degree),
+            "nodes_per_degree": spec.nodes_per_degree,
+            "saturation_band": float(band),
+            "saturation_pressure_limit": spec.saturation_pressure_limit,
+            "pressure_crit": None if pressure_crit is None else float(pressure_crit),
+        }
+        cache_dir = spec.cache_dir
+        if cache_dir is None:
+            cache_dir = default_cache_directory()
+        path = None
+        if spec.use_cache and cache_dir is not None:
+            digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode("utf-8"))
+            path = os.path.join(
+                cache_dir, f"{pure_component}_{digest.hexdigest()[:16]}.json"
+            )
+        tables = _read_cache(path, spec.max_rel_error)
+        evaluator = None
+        if tables is None:
+            evaluator = HelmholtzBatchEvaluator(pure_component)
+            saturation = None
+            if pressure_crit is not None:
+                saturation = (
+                    # pylint: disable-next=unnecessary-lambda
+                    lambda p: evaluator.call_function("h_liq_sat_p_func", p),
+                    # pylint: disable-next=unnecessary-lambda
+                    lambda p: evaluator.call_function("h_vap_sat_p_func", p),
+                    spec.saturation_pressure_limit * pressure_crit,
+                )
+            tables = cls.layout(
+                pure_component, spec, pressure_range, enthalpy_range, band, saturation
+            )
+        missing = [name for name in functions if name not in tables.tables]
+        if missing:
+            if evaluator is None:
+                evaluator = HelmholtzBatchEvaluator(pure_component)
+            tables.fit_functions(evaluator.call_function, missing, spec)
+            if path is not None:
+                _write_cache(path, key, tables)
+        tables.tables = {name: tables.tables[name] for name in functions}
+        return tables
+
+    @classmethod
+    def layout(
+        cls,
+        pure_component,
+        spec,
+        pressure_range,
+        enthalpy_range,
+        band=0.0,
+        saturation=None,
+    ):
+        """Create tables without any functions, with regions split at the
+        saturation curves if the table region reaches the saturation dome.
+
+        Args:
+            pure_component (str): component name
+            spec (HelmholtzTableSpec): tabulation options
+            pressure_range (tuple): (min, max) pressure in kPa
+            enthalpy_range (tuple): (min, max) enthalpy in kJ/kg
+            band (float): width of the band around the saturation curves
+                where the full EoS is used, in kJ/kg
+            saturation (tuple|None): (h_liq(p), h_vap(p), p_max), saturation
+                enthalpy functions evaluated on arrays and the highest pressure
+                at which to split the region, or None to not split it
+
+        Returns:
+            HelmholtzPropertyTables
+        """
+        p_lo, p_hi = pressure_range
+        h_lo, h_hi = enthalpy_range
+        args = (pure_component, pressure_range, enthalpy_range)
+        whole = [TableRegion("all", pressure_range, h_lo, h_hi)]
+        kwargs = {"max_rel_error": spec.max_rel_error}
+        if saturation is None or p_lo >= saturation[2]:
+            return cls(*args, whole, {}, **kwargs)
+
+        p_top = min(p_hi, saturation[2])
+        curves = {
+            name: ChebyshevCurve.fit(
+                name, fcn, (p_lo, p_top), spec.degree[0], spec.nodes_per_degree
+            )
+            for name, fcn in zip(("liq", "vap"), saturation[:2])
+        }
+        if not all(np.isfinite(c.max_abs_error) for c in curves.values()):
+            _log.warning(
+                f"Could not fit the saturation curves of {pure_component} for the "
+                f"property tables, the table region is not split at the "
+                f"saturation dome."
+            )
+            return cls(*args, whole, {}, **kwargs)
+
+        p = _unscale_log(np.linspace(-1, 1, _n_check_points), (p_lo, p_top))
+        h_liq = curves["liq"](p)
+        h_vap = curves["vap"](p)
+        if not np.any(np.maximum(h_liq - band, h_lo) < np.minimum(h_vap + band, h_hi)):
+            # The region does not reach the saturation dome
+            return cls(*args, whole, {}, **kwargs)
+
+        # The regions next to the dome are extended beyond the table region
+        # where needed, so their enthalpy range is not empty at any pressure.
+        margin = 0.01 * (h_hi - h_lo)
+        regions = []
+        if np.any(h_liq - band > h_lo):
+            lower = min(h_lo, np.min(h_liq) - band - margin)
+            regions.append(
+                TableRegion("liquid", (p_lo, p_top), lower, (curves["liq"], -band))
+            )
+        if np.any(np.maximum(h_liq + band, h_lo) < np.minimum(h_vap - band, h_hi)):
+            if np.min(h_vap - h_liq) > 2 * band:
+                regions.append(
+                    TableRegion(
+                        "two_phase",
+                        (p_lo, p_top),
+                        (curves["liq"], band),
+                        (curves["vap"], -band),
+                    )
+                )
+            else:
+                _log.warning(
+                    f"The saturation band of the {pure_component} property tables "
+                    f"is wider than the two-phase region, the full EoS is used "
+                    f"for two-phase states."
+                )
+        if np.any(h_vap + band < h_hi):
+            upper = max(h_hi, np.max(h_vap) + band + margin)
+            regions.append(
+                TableRegion("vapor", (p_lo, p_top), (curves["vap"], band), upper)
+            )
+        if p_hi > p_top:
+            regions.append(TableRegion("high_pressure", (p_top, p_hi), h_lo, h_hi))
+        return cls(*args, regions, {}, curves=curves, band=band, **kwargs)
+
+    def fit_functions(self, fcn, names, spec):
+        """Fit the tables of functions in each region.
+
+        Args:
+            fcn (callable): fcn(name, h, p) returns the values of the function
+                name for arrays of h and p
+            names (list): function names
+            spec (HelmholtzTableSpec): tabulation options
+
+        Returns:
+            None
+        """
+        for name in names:
+            self.tables[name] = {
+                region.name: ChebyshevTable.fit(
+                    # pylint: disable-next=cell-var-from-loop
+                    lambda h, p: fcn(name, h, p),
+                    region,
+                    spec.degree,
+                    spec.nodes_per_degree,
+                )
+                for region in self.regions.values()
+            }
+
+    def _used(self, name, region):
+        table = self.tables[name].get(region)
+        return table is not None and table.max_rel_error <= self.max_rel_error
+
+    def tabulated_functions(self):
+        """Return the names of functions with a table accurate enough to use in
+        at least one region"""
+        return [
+            name
+            for name in self.tables
+            if any(self._used(name, region) for region in self.regions)
+        ]
+
+    def error_bounds(self):
+        """Return the error bounds of the tables.
+
+        Returns:
+            dict: keyed by function name, dicts keyed by region name with
+            values (max absolute error in the external function units, max
+            relative error, True if the table is used)
+        """
+        return {
+            name: {
+                region: (
+                    table.max_abs_error,
+                    table.max_rel_error,
+                    self._used(name, region),
+                )
+                for region, table in tables.items()
+            }
+            for name, tables in self.tables.items()
+        }
+
+    def log_error_bounds(self, logger=None):
+        """Log the error bounds of the tables"""
+        if logger is None:
+            logger = _log
+        if self.curves is not None:
+            logger.info(
+                f"{self.pure_component} property tables are split at the "
+                f"saturation dome up to {self.curves['liq'].pressure_range[1]:.6g} "
+                f"kPa, regions: {', '.join(self.regions)}"
+            )
+        for name, bounds in self.error_bounds().items():
+            for region, (abs_err, rel_err, used) in bounds.items():
+                status = "tabulated" if used else "full EoS"
+                logger.info(
+                    f"{self.pure_component} {name} ({region}): max error "
+                    f"{abs_err:.3g} ({rel_err:.3g} relative), {status}"
+                )
+
+    def region_names(self, h, p):
+        """Return the names of the regions of arrays of states, or None for
+        states where the full EoS is used because they are close to the
+        saturation curves.
+
+        Args:
+            h (array): enthalpy in kJ/kg
+            p (array): pressure in kPa
+
+        Returns:
+            array: region names, with dtype object
+        """
+        h, p = np.broadcast_arrays(
+            np.asarray(h, dtype=float), np.asarray(p, dtype=float)
+        )
+        if self.curves is None:
+            return np.full(h.shape, next(iter(self.regions)), dtype=object)
+        band = self.band
+        h_liq = self.curves["liq"](p)
+        h_vap = self.curves["vap"](p)
+        names = np.full(h.shape, "two_phase", dtype=object)
+        # In reverse order of precedence, so the first matching condition wins
+        names[(h < h_liq + band) | (h > h_vap - band)] = None
+        names[h >= h_vap + band] = "vapor"
+        names[h <= h_liq - band] = "liquid"
+        names[p > self.curves["liq"].pressure_range[1]] = "high_pressure"
+        return names
+
+    def evaluate(self, name, h, p, eos=None):
+        """Evaluate a function at arrays of states, using the tables as the
+        state block expressions do.
+
+        Args:
+            name (str): function name
+            h (array): enthalpy in kJ/kg
+            p (array): pressure in kPa
+            eos (callable|None): eos(h, p) returns the function values for
+                arrays of states where the full EoS is used. If None, these
+                values are NaN.
+
+        Returns:
+            array: function values in the external function units
+
+        Raises:
+            ValueError: if a state is outside the table region
+        """
+        h, p = np.broadcast_arrays(
+            np.asarray(h, dtype=float), np.asarray(p, dtype=float)
+        )
+        for x, (lo, hi), what in (
+            (p, self.pressure_range, "pressure"),
+            (h, self.enthalpy_range, "enthalpy"),
+        ):
+            tol = _boundary_tolerance * (hi - lo)
+            if np.any((x < lo - tol) | (x > hi + tol)):
+                raise ValueError(
+                    f"The {what} of a state is outside the range of the "
+                    f"{self.pure_component} property tables, ({lo}, {hi})"
+                )
+        p = np.clip(p, *self.pressure_range)
+        h = np.clip(h, *self.enthalpy_range)
+        names = self.region_names(h, p)
+        result = np.full(h.shape, np.nan)
+        use_eos = np.ones(h.shape, dtype=bool)
+        for region in self.regions:
+            if self._used(name, region):
+                mask = names == region
+                result[mask] = self.tables[name][region](h[mask], p[mask])
+                use_eos[mask] = False
+        if eos is not None and np.any(use_eos):
+            result[use_eos] = eos(h[use_eos], p[use_eos])
+        return result
+
+    def add_functions(self, blk):
+        """Add callables for the tabulated functions to a block, with the
+        names and arguments of the external functions they replace, so
+        add_helmholtz_external_functions() only adds external functions for
+        the rest.
+
+        Args:
+            blk: block to add the functions to
+
+        Returns:
+            None
+        """
+        for name in self.tabulated_functions():
+            setattr(blk, name, TabulatedFunction(self, name, blk))
+
+    def _segments(self):
+        """Return the distinct pressure ranges of the regions"""
+        segments = []
+        for region in self.regions.values():
+            if region.pressure_range not in segments:
+                segments.append(region.pressure_range)
+        return segments
+
+    def scaled_state(self, blk, h, p):
+        """Return the scaled pressure and enthalpy of the tables, and the
+        saturation enthalpies. If h and p are the h_kJ_per_kg and p_kPa
+        expressions of the block, these are added to the block as
+        Expressions (table_scaled_pressure, table_enth_sat, and
+        table_scaled_enthalpy) and shared by all tables.
+
+        Args:
+            blk: block the functions were added to
+            h: enthalpy in kJ/kg, dimensionless
+            p: pressure in kPa, dimensionless
+
+        Returns:
+            _TableState
+        """
+        segments = self._segments()
+        shared = h is getattr(blk, "h_kJ_per_kg", None) and p is getattr(
+            blk, "p_kPa", None
+        )
+        state = _TableState(_dimensionless(h, _h_units), _dimensionless(p, _p_units))
+        if shared:
+            if blk.component("table_scaled_enthalpy") is not None:
+                return self._shared_state(blk, state, segments)
+            blk.table_scaled_pressure = pyo.Expression(
+                range(len(segments)),
+                doc="Scaled pressure for property tables",
+            )
+            if self.curves is not None:
+                blk.table_enth_sat = pyo.Expression(
+                    list(self.curves),
+                    doc="Saturation enthalpies for property tables [kJ/kg]",
+                )
+            blk.table_scaled_enthalpy = pyo.Expression(
+                list(self.regions),
+                doc="Scaled enthalpy for property tables",
+            )
+
+        for s, pressure_range in enumerate(segments):
+            x = _scale_log(state.p, pressure_range)
+            if shared:
+                blk.table_scaled_pressure[s] = x
+                x = blk.table_scaled_pressure[s]
+            state.xp[pressure_range] = x
+        if self.curves is not None:
+            xp = state.xp[self.curves["liq"].pressure_range]
+            for name, curve in self.curves.items():
+                expr = curve.expression(xp)
+                if shared:
+                    blk.table_enth_sat[name] = expr
+                    expr = blk.table_enth_sat[name]
+                state.enth_sat[name] = expr
+        for name, region in self.regions.items():
+            x = region.scaled_enthalpy(state.h, state.enth_sat)
+            if shared:
+                blk.table_scaled_enthalpy[name] = x
+                x = blk.table_scaled_enthalpy[name]
+            state.xh[name] = x
+        return state
+
+    def _shared_state(self, blk, state, segments):
+        for s, pressure_range in enumerate(segments):
+            state.xp[pressure_range] = blk.table_scaled_pressure[s]
+        if self.curves is not None:
+            for name in self.curves:
+                state.enth_sat[name] = blk.table_enth_sat[name]
+        for name in self.regions:
+            state.xh[name] = blk.table_scaled_enthalpy[name]
+        return state
+
+    def expression(self, blk, name, h, p, data_dir=None):
+        """Return an expression for a tabulated function, selecting the table
+        of the region of the state, or the full EoS external function.
+
+        Args:
+            blk: block the functions were added to
+            name (str): function name
+            h: enthalpy argument of the external function
+            p: pressure argument of the external function
+            data_dir: data directory argument of the external function
+
+        Returns:
+            expression
+        """
+        state = self.scaled_state(blk, h, p)
+        units = _external_function_map[name]["units"]
+        eos = []
+
+        def value(region):
+            if self._used(name, region):
+                table = self.tables[name][region]
+                xp = state.xp[table.region.pressure_range]
+                return table.expression(xp, state.xh[region]) * units
+            if not eos:
+                # Only add the external function if it is used
+                fcn = _eos_function(blk, name)
+                eos.append(fcn(self.pure_component, h, p, data_dir))
+            return eos[0]
+
+        if self.curves is None:
+            return value(next(iter(self.regions)))
+        h_liq = state.enth_sat["liq"]
+        h_vap = state.enth_sat["vap"]
+        band = self.band
+        expr = value("two_phase")
+        if band > 0:
+            expr = pyo.Expr_if(IF=state.h > h_vap - band, THEN=value(None), ELSE=expr)
+            expr = pyo.Expr_if(IF=state.h < h_liq + band, THEN=value(None), ELSE=expr)
+        expr = pyo.Expr_if(IF=state.h >= h_vap + band, THEN=value("vapor"), ELSE=expr)
+        expr = pyo.Expr_if(IF=state.h <= h_liq - band, THEN=value("liquid"), ELSE=expr)
+        if "high_pressure" in self.regions:
+            p_top = self.curves["liq"].pressure_range[1]
+            expr = pyo.Expr_if(
+                IF=state.p > p_top, THEN=value("high_pressure"), ELSE=expr
+            )
+        return expr
+
+    def to_dict(self):
+        """Return a dict of the regions and tables that can be written to
+        JSON"""
+        return {
+            "pressure_range": list(self.pressure_range),
+            "enthalpy_range": list(self.enthalpy_range),
+            "band": self.band,
+            "curves": None
+            if self.curves is None
+            else {k: c.to_dict() for k, c in self.curves.items()},
+            "regions": [r.to_dict() for r in self.regions.values()],
+            "tables": {
+                name: {region: t.to_dict() for region, t in tables.items()}
+                for name, tables in self.tables.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, pure_component, data, max_rel_error=1e-4):
+        """Create tables from the dict returned by to_dict()"""
+        curves = data["curves"]
+        if curves is not None:
+            curves = {k: ChebyshevCurve.from_dict(c) for k, c in curves.items()}
+        regions = [TableRegion.from_dict(r, curves) for r in data["regions"]]
+        by_name = {r.name: r for r in regions}
+        tables = {
+            name: {
+                region: ChebyshevTable.from_dict(t, by_name[region])
+                for region, t in tables.items()
+            }
+            for name, tables in data["tables"].items()
+        }
+        return cls(
+            pure_component,
+            data["pressure_range"],
+            data["enthalpy_range"],
+            regions,
+            tables,
+            max_rel_error=max_rel_error,
+            curves=curves,
+            band=data["band"],
+        )
+
+
+class _TableState(object):
+    """Dimensionless state and the expressions shared by the tables of a
+    state: scaled pressure keyed by pressure range, saturation enthalpies
+    keyed by curve name, and scaled enthalpy keyed by region name."""
+
+    def __init__(self, h, p):
+        self.h = h
+        self.p = p
+        self.xp = {}
+        self.enth_sat = {}
+        self.xh = {}
+
+
+def _dimensionless(x, units):
+    """Divide an expression in the external function argument units by the
+    units, so the tables get dimensionless arguments"""
+    if not _is_expression(x) or pyo.units.get_units(x) is None:
+        return x
+    return x / units
+
+
+def _eos_function(blk, name):
+    """Return the full EoS external function for a tabulated function,
+    adding it to the block as <name>_eos if needed"""
+    eos_name = f"{name}_eos"
+    fcn = blk.component(eos_name)
+    if fcn is None:
+        # This is imported here to avoid a circular import
+        # pylint: disable-next=import-outside-toplevel
+        from idaes.models.properties.general_helmholtz.helmholtz_functions import (
+            _flib,
+        )
+
+        fdict = _external_function_map[name]
+        fcn = pyo.ExternalFunction(
+            library=_flib,
+            function=fdict["fname"],
+            units=fdict["units"],
+            arg_units=fdict["arg_units"],
+            doc=fdict.get("doc", None),
+        )
+        blk.add_component(eos_name, fcn)
+    return fcn
+
+
+class TabulatedFunction(object):
+    """Drop in replacement for a Helmholtz external function that evaluates
+    property tables, and the external function where the tables are not used.
+
+    Args:
+        tables (HelmholtzPropertyTables): property tables
+        name (str): name of the replaced external function
+        blk: block the function is added to
+
+    Returns:
+        TabulatedFunction
+    """
+
+    def __init__(self, tables, name, blk):
+        self.tables = tables
+        self.name = name
+        self.blk = blk
+
+    def __call__(self, comp, h, p, data_dir=None):
+        if comp != self.tables.pure_component:
+            raise ValueError(
+                f"Property tables are for {self.tables.pure_component}, not {comp}"
+            )
+        return self.tables.expression(self.blk, self.name, h, p, data_dir)
+
+
+def available_hp_functions(pure_component):
+    """Return the names of the (h, p) external functions available for a
+    component.
+    """
+    functions = []
+    for name in _hp_functions:
+        check = _availability_checks.get(name.split("_")[0])
+        if check is None or check(pure_component):
+            functions.append(name)
+    return functions
+
+
+def _read_cache(path, max_rel_error):
+    if path is None or not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return HelmholtzPropertyTables.from_dict(
+            data["component"], data, max_rel_error=max_rel_error
+        )
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        _log.warning(f"Could not read property table cache {path}: {e}")
+        return None
+
+
+def _write_cache(path, key, tables):
+    data = dict(key)
+    data.update(tables.to_dict())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        _log.warning(f"Could not write property table cache {path}: {e}")
@@ -0,0 +1,152 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+import numpy as np
+import pytest
+
+import pyomo.environ as pyo
+import pyomo.common.unittest as unittest
+from pyomo.common.timing import TicTocTimer
+
+from idaes.core.util.exceptions import ConfigurationError
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.properties.general_helmholtz import (
+    HelmholtzBatchEvaluator,
+    HelmholtzParameterBlock,
+    HelmholtzThermoExpressions,
+    AmountBasis,
+    helmholtz_available as available,
+)
+
+
+@pytest.mark.unit
+def test_bad_component():
+    with pytest.raises(ConfigurationError, match="Component xyz not supported"):
+        HelmholtzBatchEvaluator("xyz")
+
+
+@pytest.fixture(scope="module")
+def model():
+    m = pyo.ConcreteModel()
+    m.hparam = HelmholtzParameterBlock(
+        pure_component="h2o", amount_basis=AmountBasis.MOLE
+    )
+    m.te = HelmholtzThermoExpressions(m, m.hparam)
+    return m
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not available(), reason="General Helmholtz not available")
+def test_ph(model):
+    te = model.te
+    evaluator = HelmholtzBatchEvaluator("h2o")
+    h = np.array([2000.0, 20000.0, 50000.0])  # J/mol
+    p = 101325.0  # Pa
+    props = evaluator.properties(["T", "x", "s", "cp", "h", "viscosity"], h=h, p=p)
+    assert props["h"] == pytest.approx(h)
+    for i, hi in enumerate(h):
+        state = dict(h=hi * pyo.units.J / pyo.units.mol, p=p * pyo.units.Pa)
+        assert props["T"][i] == pytest.approx(pyo.value(te.T(**state)), rel=1e-8)
+        assert props["x"][i] == pytest.approx(pyo.value(te.x(**state)), abs=1e-8)
+        assert props["s"][i] == pytest.approx(pyo.value(te.s(**state)), rel=1e-8)
+        assert props["cp"][i] == pytest.approx(pyo.value(te.cp(**state)), rel=1e-8)
+        assert props["viscosity"][i] == pytest.approx(
+            pyo.value(te.viscosity(**state)), rel=1e-8
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not available(), reason="General Helmholtz not available")
+def test_mass_basis_and_phase(model):
+    evaluator = HelmholtzBatchEvaluator("h2o", amount_basis=AmountBasis.MASS)
+    mw = pyo.value(model.hparam.mw)
+
+    props = evaluator.properties(["h", "p"], T=300.0, x=np.array([0.0, 1.0]))
+    assert props["h"] == pytest.approx([112.56e3, 2549.9e3], rel=1e-4)
+    assert props["p"] == pytest.approx(3536.8, rel=1e-3)
+
+    props = evaluator.properties("h", T=300.0, x=0.0, phase="vap")
+    assert props["h"] == pytest.approx(2549.9e3, rel=1e-4)
+
+    mole = HelmholtzBatchEvaluator("h2o")
+    h = mole.properties("h", T=300.0, x=0.0)["h"]
+    assert h == pytest.approx(112.56e3 * mw, rel=1e-4)
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not available(), reason="General Helmholtz not available")
+def test_broadcast():
+    evaluator = HelmholtzBatchEvaluator("h2o")
+    p = np.linspace(1e5, 1e6, 4)
+    h = np.linspace(5e3, 5e4, 3)[:, np.newaxis]
+    props = evaluator.properties(["T", "h"], h=h, p=p)
+    assert props["T"].shape == (3, 4)
+    assert props["h"].shape == (3, 4)
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not available(), reason="General Helmholtz not available")
+def test_bad_args():
+    evaluator = HelmholtzBatchEvaluator("h2o")
+    with pytest.raises(RuntimeError, match="state variable set"):
+        evaluator.properties("T", h=1.0, s=1.0)
+    with pytest.raises(ValueError, match="Property rho is not supported"):
+        evaluator.properties("rho", h=1.0, p=1.0)
+    with pytest.raises(ValueError, match="phase must be None, 'liq' or 'vap'"):
+        evaluator.properties("h", h=1.0, p=1.0, phase="sol")
+
+
+@pytest.mark.performance
+@unittest.skipIf(not available(), "General Helmholtz not available")
+class TestHelmholtzBatchPerformance(PerformanceBaseClass, unittest.TestCase):
+    """
+    Compare evaluating properties for many (h, p) states with the batch
+    evaluator to evaluating Pyomo expressions one point at a time.
+    """
+
+    def build_model(self):
+        m = pyo.ConcreteModel()
+        m.hparam = HelmholtzParameterBlock(
+            pure_component="h2o", amount_basis=AmountBasis.MOLE
+        )
+        m.h = pyo.Param(
+            mutable=True, initialize=1000, units=pyo.units.J / pyo.units.mol
+        )
+        m.p = pyo.Param(mutable=True, initialize=1e5, units=pyo.units.Pa)
+        te = HelmholtzThermoExpressions(m, m.hparam)
+        m.T = pyo.Expression(expr=te.T(h=m.h, p=m.p))
+        m.s = pyo.Expression(expr=te.s(h=m.h, p=m.p))
+        return m
+
+    def test_performance(self):
+        rng = np.random.default_rng(0)
+        n = 2000
+        h = rng.uniform(2e3, 6e4, n)
+        p = rng.uniform(1e4, 2e7, n)
+
+        timer = TicTocTimer()
+        m = self.build_model()
+        timer.tic(None)
+        expected = np.empty((n, 2))
+        for i in range(n):
+            m.h.value = h[i]
+            m.p.value = p[i]
+            expected[i, :] = pyo.value(m.T), pyo.value(m.s)
+        self.recordData("per point", timer.toc("per point"))
+
+        timer.tic(None)
+        evaluator = HelmholtzBatchEvaluator("h2o")
+        props = evaluator.properties(["T", "s"], h=h, p=p)
+        self.recordData("batch", timer.toc("batch"))
+
+        np.testing.assert_allclose(props["T"], expected[:, 0], rtol=1e-8)
+        np.testing.assert_allclose(props["s"], expected[:, 1], rtol=1e-8)
@@ -0,0 +1,473 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+import json
+
+import numpy as np
+import pytest
+
+import pyomo.environ as pyo
+from pyomo.core.expr.calculus.derivatives import differentiate
+from pyomo.util.check_units import assert_units_consistent
+
+from idaes.core.util.exceptions import ConfigurationError
+from idaes.models.properties.general_helmholtz import (
+    HelmholtzBatchEvaluator,
+    HelmholtzParameterBlock,
+    HelmholtzPropertyTables,
+    HelmholtzTableSpec,
+    AmountBasis,
+    StateVars,
+    helmholtz_available as available,
+)
+from idaes.models.properties.general_helmholtz.helmholtz_tables import (
+    ChebyshevCurve,
+    ChebyshevTable,
+    TableRegion,
+    TabulatedFunction,
+    tabulation_spec,
+)
+
+P_RANGE = (100.0, 5000.0)
+H_RANGE = (2800.0, 3500.0)
+
+
+def smooth(h, p):
+    return 300 + 0.3 * h + 20 * np.log(p) + 1e-5 * h**2 / np.sqrt(p)
+
+
+@pytest.fixture(scope="module")
+def region():
+    return TableRegion("all", P_RANGE, *H_RANGE)
+
+
+@pytest.fixture(scope="module")
+def table(region):
+    return ChebyshevTable.fit(smooth, region, (10, 8))
+
+
+@pytest.mark.unit
+def test_fit(table):
+    assert table.degree == (10, 8)
+    assert table.max_rel_error < 1e-8
+    rng = np.random.default_rng(3)
+    h = rng.uniform(*H_RANGE, 100)
+    p = rng.uniform(*P_RANGE, 100)
+    np.testing.assert_allclose(table(h, p), smooth(h, p), rtol=1e-8)
+
+
+@pytest.mark.unit
+def test_outside_region(table):
+    # the polynomials are not extrapolated
+    with pytest.raises(ValueError, match="pressure of a point is outside"):
+        table(3000.0, 6000.0)
+    with pytest.raises(ValueError, match="enthalpy of a point is outside"):
+        table([3000.0, 2700.0], 200.0)
+    assert table(H_RANGE[1], P_RANGE[0]) == pytest.approx(
+        smooth(H_RANGE[1], P_RANGE[0]), rel=1e-8
+    )
+
+
+@pytest.mark.unit
+def test_fit_errors(region):
+    kink = ChebyshevTable.fit(lambda h, p: np.abs(h - 3100.0) + 0 * p, region, (4, 4))
+    assert kink.max_abs_error > 1
+    assert kink.max_rel_error > 1e-3
+
+    undefined = ChebyshevTable.fit(
+        lambda h, p: np.where(h > 3000.0, np.nan, h) + 0 * p, region, (4, 4)
+    )
+    assert undefined.max_abs_error == np.inf
+
+
+@pytest.mark.unit
+def test_curved_region():
+    curve = ChebyshevCurve.fit("liq", lambda p: 400 + 60 * np.log(p), P_RANGE, 4)
+    assert curve.max_abs_error < 1e-9
+    assert curve(1000.0) == pytest.approx(400 + 60 * np.log(1000.0))
+
+    # the region between 300 and 10 below the curve
+    region = TableRegion("liquid", P_RANGE, 300.0, (curve, -10.0))
+    h, p = region.state(np.array([-1.0, 1.0, 1.0]), np.array([-1.0, -1.0, 1.0]))
+    np.testing.assert_allclose(p, [100.0, 5000.0, 5000.0])
+    np.testing.assert_allclose(h, [300.0, 300.0, 390 + 60 * np.log(5000.0)])
+
+    table = ChebyshevTable.fit(smooth, region, (8, 8))
+    assert table.max_rel_error < 1e-8
+    assert table(500.0, 1000.0) == pytest.approx(smooth(500.0, 1000.0), rel=1e-8)
+    with pytest.raises(ValueError, match="enthalpy of a point is outside"):
+        # above the curve
+        table(400 + 60 * np.log(1000.0), 1000.0)
+
+    with pytest.raises(ValueError, match="pressure range of the region"):
+        TableRegion("liquid", (100.0, 1000.0), 300.0, (curve, -10.0))
+
+
+@pytest.mark.unit
+def test_expression(table):
+    m = pyo.ConcreteModel()
+    m.h = pyo.Var(initialize=3210.0)
+    m.p = pyo.Var(initialize=1234.0)
+    region = table.region
+    xp = region.scaled_pressure(m.p)
+    xh = region.scaled_enthalpy(m.h, {})
+    m.f = pyo.Expression(expr=table.expression(xp, xh))
+    # the polynomial form matches the Chebyshev series
+    power = table.power_coef()
+    assert power.shape == table.coef.shape
+    assert pyo.value(m.f) == pytest.approx(table(3210.0, 1234.0), rel=1e-12)
+    assert pyo.value(m.f) == pytest.approx(smooth(3210.0, 1234.0), rel=1e-8)
+
+    # derivatives of the table are exact derivatives of the polynomial
+    dfdh = pyo.value(differentiate(m.f, wrt=m.h))
+    dfdp = pyo.value(differentiate(m.f, wrt=m.p))
+    eps = 1e-3
+    assert dfdh == pytest.approx(
+        (table(3210.0 + eps, 1234.0) - table(3210.0 - eps, 1234.0)) / 2 / eps,
+        rel=1e-6,
+    )
+    assert dfdp == pytest.approx(
+        (table(3210.0, 1234.0 + eps) - table(3210.0, 1234.0 - eps)) / 2 / eps,
+        rel=1e-6,
+    )
+
+
+@pytest.mark.unit
+def test_to_from_dict(table):
+    data = json.loads(json.dumps(table.to_dict()))
+    loaded = ChebyshevTable.from_dict(data, table.region)
+    np.testing.assert_array_equal(loaded.coef, table.coef)
+    assert loaded.max_rel_error == table.max_rel_error
+    assert loaded(3000.0, 200.0) == table(3000.0, 200.0)
+
+    failed = ChebyshevTable(np.zeros((2, 2)), table.region)
+    data = json.loads(json.dumps(failed.to_dict()))
+    assert ChebyshevTable.from_dict(data, table.region).max_rel_error == np.inf
+
+
+def state_block(tables):
+    m = pyo.ConcreteModel()
+    m.h = pyo.Var(initialize=3000.0, units=pyo.units.kJ / pyo.units.kg)
+    m.pressure = pyo.Var(initialize=2e6, units=pyo.units.Pa)
+    m.h_kJ_per_kg = pyo.Expression(expr=m.h)
+    m.p_kPa = pyo.Expression(expr=m.pressure / 1000 * pyo.units.kPa / pyo.units.Pa)
+    tables.add_functions(m)
+    return m
+
+
+@pytest.mark.unit
+def test_tables(table):
+    bad = ChebyshevTable(np.zeros((11, 9)), table.region, 1.0, 1e-2)
+    tables = HelmholtzPropertyTables(
+        "h2o",
+        P_RANGE,
+        H_RANGE,
+        [table.region],
+        {"t_hp_func": {"all": table}, "vf_hp_func": {"all": bad}},
+        max_rel_error=1e-4,
+    )
+    assert tables.tabulated_functions() == ["t_hp_func"]
+    bounds = tables.error_bounds()
+    assert bounds["t_hp_func"]["all"][2]
+    assert bounds["vf_hp_func"] == {"all": (1.0, 1e-2, False)}
+
+    m = state_block(tables)
+    assert not hasattr(m, "vf_hp_func")
+    m.T = pyo.Expression(expr=m.t_hp_func("h2o", m.h_kJ_per_kg, m.p_kPa, ""))
+    # the scaled state is a shared Expression on the block
+    assert len(m.table_scaled_pressure) == 1
+    assert list(m.table_scaled_enthalpy) == ["all"]
+    assert m.component("table_enth_sat") is None
+    assert pyo.value(m.T) == pytest.approx(smooth(3000.0, 2000.0), rel=1e-8)
+    assert pyo.units.get_units(m.T) == pyo.units.K
+    assert_units_consistent(m)
+    # the second function uses the same Expressions
+    m.T2 = pyo.Expression(expr=m.t_hp_func("h2o", m.h_kJ_per_kg, m.p_kPa, ""))
+    assert pyo.value(m.T2) == pyo.value(m.T)
+
+    # other arguments get their own scaled state
+    expr = m.t_hp_func("h2o", 3100.0, 150.0, "")
+    assert pyo.value(expr) == pytest.approx(smooth(3100.0, 150.0), rel=1e-8)
+
+    with pytest.raises(ValueError, match="Property tables are for h2o, not co2"):
+        m.t_hp_func("co2", m.h_kJ_per_kg, m.p_kPa, "")
+
+    with pytest.raises(ValueError, match="pressure of a state is outside"):
+        tables.evaluate("t_hp_func", 3000.0, 50.0)
+    np.testing.assert_allclose(
+        tables.evaluate("t_hp_func", [2800.0, 3500.0], [100.0, 5000.0]),
+        smooth(np.array([2800.0, 3500.0]), np.array([100.0, 5000.0])),
+        rtol=1e-8,
+    )
+    assert np.isnan(tables.evaluate("vf_hp_func", 3000.0, 200.0))
+
+
+# A function of (h, p) with a saturation dome: the saturation enthalpies are
+# 400 + 60 ln(p) and 2600 + 20 ln(p), and the slope of the function changes at
+# the saturation curves.
+def h_liq(p):
+    return 400 + 60 * np.log(p)
+
+
+def h_vap(p):
+    return 2600 + 20 * np.log(p)
+
+
+def dome_function(h, p):
+    t_sat = 300 + 20 * np.log(p)
+    return np.where(
+        h < h_liq(p),
+        t_sat + 0.25 * (h - h_liq(p)),
+        np.where(h > h_vap(p), t_sat + 0.5 * (h - h_vap(p)), t_sat),
+    )
+
+
+DOME_H_RANGE = (300.0, 3200.0)
+
+
+def dome_tables(band=0.0, p_max=1e4, degree=6):
+    spec = HelmholtzTableSpec(
+        pressure_range=(1e5, 5e6), enthalpy_range=DOME_H_RANGE, degree=degree
+    )
+    tables = HelmholtzPropertyTables.layout(
+        "h2o", spec, P_RANGE, DOME_H_RANGE, band, (h_liq, h_vap, p_max)
+    )
+    tables.fit_functions(lambda name, h, p: dome_function(h, p), ["t_hp_func"], spec)
+    return tables
+
+
+@pytest.mark.unit
+def test_split_at_saturation():
+    tables = dome_tables()
+    assert list(tables.regions) == ["liquid", "two_phase", "vapor"]
+    assert tables.tabulated_functions() == ["t_hp_func"]
+    bounds = tables.error_bounds()["t_hp_func"]
+    assert all(used for _, _, used in bounds.values())
+
+    rng = np.random.default_rng(5)
+    h = rng.uniform(*DOME_H_RANGE, 500)
+    p = rng.uniform(*P_RANGE, 500)
+    names = tables.region_names(h, p)
+    assert set(names) == {"liquid", "two_phase", "vapor"}
+    np.testing.assert_allclose(
+        tables.evaluate("t_hp_func", h, p), dome_function(h, p), rtol=1e-8
+    )
+
+    # without the split, the table is not accurate enough to use
+    spec = HelmholtzTableSpec(
+        pressure_range=(1e5, 5e6), enthalpy_range=DOME_H_RANGE, degree=6
+    )
+    whole = HelmholtzPropertyTables.layout("h2o", spec, P_RANGE, DOME_H_RANGE)
+    whole.fit_functions(lambda name, h, p: dome_function(h, p), ["t_hp_func"], spec)
+    assert list(whole.regions) == ["all"]
+    assert whole.tabulated_functions() == []
+
+    # the region does not reach the dome
+    vapor = HelmholtzPropertyTables.layout(
+        "h2o", spec, P_RANGE, (2900.0, 3200.0), 0.0, (h_liq, h_vap, 1e4)
+    )
+    assert list(vapor.regions) == ["all"]
+    assert vapor.curves is None
+
+
+@pytest.mark.unit
+def test_saturation_band():
+    tables = dome_tables(band=20.0, p_max=1000.0)
+    assert list(tables.regions) == ["liquid", "two_phase", "vapor", "high_pressure"]
+    # the high pressure table crosses the dome, so the full EoS is used
+    assert not tables.error_bounds()["t_hp_func"]["high_pressure"][2]
+
+    p = np.array([500.0, 500.0, 500.0, 500.0, 2000.0])
+    h = np.array([h_liq(500.0) - 25, h_liq(500.0) - 15, 1500.0, h_vap(500.0) + 5, 1500])
+    assert list(tables.region_names(h, p)) == [
+        "liquid",
+        None,
+        "two_phase",
+        None,
+        "high_pressure",
+    ]
+    values = tables.evaluate("t_hp_func", h, p)
+    assert np.isnan(values[[1, 3, 4]]).all()
+    np.testing.assert_allclose(
+        tables.evaluate("t_hp_func", h, p, eos=dome_function),
+        dome_function(h, p),
+        rtol=1e-8,
+    )
+
+    with pytest.raises(ValueError, match="saturation_band must not be negative"):
+        HelmholtzTableSpec((1e5, 1e6), (1, 2), saturation_band=-1)
+    with pytest.raises(ValueError, match="saturation_pressure_limit must be"):
+        HelmholtzTableSpec((1e5, 1e6), (1, 2), saturation_pressure_limit=1.5)
+
+
+@pytest.mark.unit
+def test_split_expression():
+    tables = dome_tables()
+    m = state_block(tables)
+    m.T = pyo.Expression(expr=m.t_hp_func("h2o", m.h_kJ_per_kg, m.p_kPa, ""))
+    assert set(m.table_enth_sat) == {"liq", "vap"}
+    assert list(m.table_scaled_enthalpy) == ["liquid", "two_phase", "vapor"]
+    # all regions have tables, so the external function is not needed
+    assert m.component("t_hp_func_eos") is None
+    assert_units_consistent(m)
+    for h, p in [(500.0, 300.0), (1500.0, 2000.0), (3100.0, 4000.0), (700.0, 150.0)]:
+        m.h.set_value(h)
+        m.pressure.set_value(p * 1000)
+        assert pyo.value(m.T) == pytest.approx(
+            tables.evaluate("t_hp_func", h, p), rel=1e-10
+        )
+        assert pyo.value(m.T) == pytest.approx(dome_function(h, p), rel=1e-8)
+
+    # with a band, the external function is added for the states near the dome
+    m = state_block(dome_tables(band=20.0, p_max=1000.0))
+    m.T = pyo.Expression(expr=m.t_hp_func("h2o", m.h_kJ_per_kg, m.p_kPa, ""))
+    assert isinstance(m.t_hp_func_eos, pyo.ExternalFunction)
+    assert_units_consistent(m)
+
+
+@pytest.mark.unit
+def test_tables_to_from_dict():
+    tables = dome_tables(band=20.0, p_max=1000.0)
+    data = json.loads(json.dumps(tables.to_dict()))
+    loaded = HelmholtzPropertyTables.from_dict("h2o", data)
+    assert list(loaded.regions) == list(tables.regions)
+    assert loaded.band == 20.0
+    h = np.array([400.0, 1500.0, 3000.0])
+    p = np.array([200.0, 500.0, 900.0])
+    np.testing.assert_array_equal(
+        loaded.evaluate("t_hp_func", h, p), tables.evaluate("t_hp_func", h, p)
+    )
+
+
+@pytest.mark.unit
+def test_spec():
+    spec = tabulation_spec({"pressure_range": (1e5, 1e6), "enthalpy_range": (1, 2)})
+    assert spec.degree == (16, 16)
+    assert tabulation_spec(spec) is spec
+    assert tabulation_spec(None) is None
+    with pytest.raises(ValueError, match="tabulation must be None"):
+        tabulation_spec(3)
+    with pytest.raises(ValueError, match="pressure_range must be"):
+        HelmholtzTableSpec((1e6, 1e5), (1, 2))
+    with pytest.raises(ValueError, match="pressure_range must be positive"):
+        HelmholtzTableSpec((0, 1e5), (1, 2))
+    with pytest.raises(ValueError, match="degree must be"):
+        HelmholtzTableSpec((1e5, 1e6), (1, 2), degree=(4, 0))
+    with pytest.raises(ValueError, match="h_func is not a function of enthalpy"):
+        HelmholtzTableSpec((1e5, 1e6), (1, 2), functions=["h_func"])
+
+
+@pytest.fixture(scope="module")
+def spec(tmp_path_factory):
+    # superheated steam, far from the saturation dome
+    return HelmholtzTableSpec(
+        pressure_range=(1e6, 5e6),
+        enthalpy_range=(3.1e6, 3.6e6),
+        degree=12,
+        functions=["t_hp_func", "s_hp_func", "v_hp_func", "vf_hp_func"],
+        cache_dir=str(tmp_path_factory.mktemp("tables")),
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not available(), reason="General Helmholtz not available")
+def test_state_block(spec):
+    m = pyo.ConcreteModel()
+    m.params = HelmholtzParameterBlock(
+        pure_component="h2o", amount_basis=AmountBasis.MASS, tabulation=spec
+    )
+    tables = m.params.property_tables
+    assert list(tables.regions) == ["all"]
+    assert set(tables.tabulated_functions()) >= {"t_hp_func", "s_hp_func"}
+    for bounds in tables.error_bounds().values():
+        abs_err, rel_err, used = bounds["all"]
+        assert rel_err < 1e-4 or not used
+
+    m.sb = m.params.build_state_block([0])
+    sb = m.sb[0]
+    assert isinstance(sb.t_hp_func, TabulatedFunction)
+    assert isinstance(sb.cp_hp_func, pyo.ExternalFunction)
+    # the state is bounded to the table region
+    assert sb.pressure.bounds == (1e6, 5e6)
+    assert sb.enth_mass.bounds == pytest.approx((3.1e6, 3.6e6))
+    assert 1e6 <= sb.pressure.value <= 5e6
+    assert 3.1e6 <= sb.enth_mass.value <= 3.6e6
+    sb.enth_mass.fix(3.3e6)
+    sb.pressure.fix(3e6)
+    sb.flow_mass.fix(1)
+
+    evaluator = HelmholtzBatchEvaluator("h2o", amount_basis=AmountBasis.MASS)
+    props = evaluator.properties(["T", "s"], h=3.3e6, p=3e6)
+    assert pyo.value(sb.temperature) == pytest.approx(props["T"], rel=1e-5)
+    assert pyo.value(sb.entr_mass) == pytest.approx(props["s"], rel=1e-4)
+
+    # the second parameter block loads the tables from the cache
+    m.params2 = HelmholtzParameterBlock(
+        pure_component="h2o", amount_basis=AmountBasis.MASS, tabulation=spec
+    )
+    np.testing.assert_array_equal(
+        m.params2.property_tables.tables["t_hp_func"]["all"].coef,
+        tables.tables["t_hp_func"]["all"].coef,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not available(), reason="General Helmholtz not available")
+def test_state_block_dome(tmp_path):
+    # liquid to superheated vapor, split at the saturation curves
+    spec = HelmholtzTableSpec(
+        pressure_range=(1e5, 5e6),
+        enthalpy_range=(3e5, 3.2e6),
+        degree=12,
+        functions=["t_hp_func", "vf_hp_func"],
+        cache_dir=str(tmp_path),
+        saturation_band=2e4,
+    )
+    m = pyo.ConcreteModel()
+    m.params = HelmholtzParameterBlock(
+        pure_component="h2o", amount_basis=AmountBasis.MASS, tabulation=spec
+    )
+    tables = m.params.property_tables
+    assert list(tables.regions) == ["liquid", "two_phase", "vapor"]
+    assert tables.band == pytest.approx(20.0)
+    assert "t_hp_func" in tables.tabulated_functions()
+
+    evaluator = HelmholtzBatchEvaluator("h2o", amount_basis=AmountBasis.MASS)
+    rng = np.random.default_rng(1)
+    h = rng.uniform(300.0, 3200.0, 200)
+    p = np.exp(rng.uniform(np.log(100.0), np.log(5000.0), 200))
+    for name in ("t_hp_func", "vf_hp_func"):
+        eos = lambda h, p: evaluator.call_function(name, h, p)
+        np.testing.assert_allclose(
+            tables.evaluate(name, h, p, eos=eos),
+            eos(h, p),
+            rtol=1e-3,
+            atol=1e-3,
+        )
+
+    m.sb = m.params.build_state_block([0])
+    sb = m.sb[0]
+    sb.enth_mass.fix(1.5e6)
+    sb.pressure.fix(1e6)
+    props = evaluator.properties(["T", "x"], h=1.5e6, p=1e6)
+    assert pyo.value(sb.temperature) == pytest.approx(props["T"], rel=1e-4)
+    assert pyo.value(sb.vapor_frac) == pytest.approx(props["x"], abs=1e-4)
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not available(), reason="General Helmholtz not available")
+def test_not_ph(spec):
+    m = pyo.ConcreteModel()
+    with pytest.raises(ConfigurationError, match="only supported with StateVars.PH"):
+        m.params = HelmholtzParameterBlock(
+            pure_component="h2o", state_vars=StateVars.TPX, tabulation=spec
+        )
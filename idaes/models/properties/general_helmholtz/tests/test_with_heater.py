@@ -18,6 +18,8 @@ Author: John Eslick
 """
 import pytest
 
+import pyomo.common.unittest as unittest
+
 from pyomo.environ import ConcreteModel, value
 
 from idaes.core import FlowsheetBlock
@@ -31,6 +33,7 @@ from idaes.models.properties.general_helmholtz import (
     StateVars,
 )
 from idaes.models.properties.general_helmholtz import helmholtz_available
+from idaes.core.util.performance import PerformanceBaseClass
 
 
 # -----------------------------------------------------------------------------
@@ -384,3 +387,25 @@ def test_heater_tpx_lg_phase():
     m.fs.heater.heat_duty[0].fix(100 * 50000)
 
     assert degrees_of_freedom(m) == -1
+
+
+def build_heater():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.properties = HelmholtzParameterBlock(pure_component="h2o")
+    m.fs.heater = Heater(property_package=m.fs.properties)
+    m.fs.heater.inlet.enth_mol[0].fix(4000)
+    m.fs.heater.inlet.flow_mol[0].fix(100)
+    m.fs.heater.inlet.pressure[0].fix(101325)
+    m.fs.heater.heat_duty[0].fix(100 * 20000)
+    return m
+
+
+@pytest.mark.skipif(not helmholtz_available(), reason="General Helmholtz not available")
+@pytest.mark.performance
+class TestHelmholtzHeaterPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_heater()
+
+    def initialize_model(self, model):
+        model.fs.heater.initialize()
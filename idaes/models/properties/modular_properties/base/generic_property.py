@@ -16,6 +16,8 @@ Framework for generic property packages
 # TODO: Look into protected access issues
 # pylint: disable=protected-access
 
+import numpy as np
+
 # Import Pyomo libraries
 from pyomo.environ import (
     Block,
@@ -34,6 +36,7 @@ from pyomo.environ import (
 from pyomo.common.config import ConfigBlock, ConfigDict, ConfigValue, In, Bool
 from pyomo.util.calc_var_value import calculate_variable_from_constraint
 from pyomo.contrib.incidence_analysis import solve_strongly_connected_components
+from pyomo.core.expr.visitor import identify_variables, identify_mutable_parameters
 
 # Import IDAES cores
 from idaes.core import (
@@ -78,6 +81,7 @@ from idaes.models.properties.modular_properties.base.generic_reaction import (
     equil_rxn_config,
 )
 from idaes.models.properties.modular_properties.base.utility import (
+    evaluate_array,
     get_method,
     get_phase_method,
     GenericPropertyPackageError,
@@ -254,6 +258,36 @@ class GenericParameterData(PhysicalParameterBlock):
         ),
     )
 
+    CONFIG.declare(
+        "shared_expressions",
+        ConfigValue(
+            default=False,
+            domain=Bool,
+            description="Share parameter-only subexpressions between state blocks",
+            doc="Flag indicating whether terms of state block properties that "
+            "only depend on parameters (such as the reference state terms and "
+            "unit conversions of pure component correlations and the component "
+            "coefficients of cubic equations of state) should be built once on "
+            "the parameter block and shared by all state blocks, rather than "
+            "built for every state block.",
+        ),
+    )
+
+    CONFIG.declare(
+        "parameter_tables",
+        ConfigValue(
+            default=False,
+            domain=Bool,
+            description="Store pure component parameters in tables",
+            doc="Flag indicating whether the scalar parameters created for each "
+            "component by the pure component property methods should be "
+            "collected in one indexed Reference for each parameter on the "
+            "parameter block, indexed by component. Pure component "
+            "correlations use the tables to convert units once per table "
+            "rather than once per component and state block.",
+        ),
+    )
+
     # Config arguments for inherent reactions
     CONFIG.declare(
         "reaction_basis",
@@ -979,6 +1013,9 @@ class GenericParameterData(PhysicalParameterBlock):
                     except AttributeError:
                         pass
 
+        if self.config.parameter_tables:
+            self._build_parameter_tables()
+
         # Call custom user parameter method
         self.parameters()
 
@@ -1037,6 +1074,42 @@ class GenericParameterData(PhysicalParameterBlock):
             None
         """
 
+    def _build_parameter_tables(self):
+        """
+        Collect the scalar Vars and mutable Params created on the Component
+        objects into one indexed Reference for each parameter on the
+        parameter_tables block, indexed by component. The parameters stay on
+        the Component objects, the tables refer to the same data objects.
+
+        Parameters with different units for different components are not
+        tabulated. Pure component methods use the tables to convert the units
+        of a correlation once for all components (see
+        convert_correlation_units).
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        tables = {}
+        for c in self.component_list:
+            cobj = self.get_component(c)
+            for ctype in (Var, Param):
+                for v in cobj.component_objects(ctype, descend_into=False):
+                    if v.is_indexed() or (ctype is Param and not v.mutable):
+                        continue
+                    tables.setdefault((ctype, v.local_name), {})[c] = v
+
+        self.parameter_tables = Block(
+            doc="Pure component parameters, indexed by component"
+        )
+        for (ctype, name), members in tables.items():
+            if len({str(v.get_units()) for v in members.values()}) > 1:
+                continue
+            self.parameter_tables.add_component(name, Reference(members, ctype=ctype))
+        # Unit conversion factors of correlations, see convert_correlation_units
+        self._parameter_table_conversions = {}
+
     @classmethod
     def define_metadata(cls, obj):
         """Define properties supported and units."""
@@ -1293,24 +1366,8 @@ class ModularPropertiesInitializer(InitializerBase):
 
         # ---------------------------------------------------------------------
         # If present, initialize bubble and dew point calculations
+        model._init_bubble_dew(list(model.values()))
         for k in model.values():
-            T_units = k.params.get_metadata().default_units.TEMPERATURE
-            # Bubble temperature initialization
-            if hasattr(k, "_mole_frac_tbub"):
-                model._init_Tbub(k, T_units)
-
-            # Dew temperature initialization
-            if hasattr(k, "_mole_frac_tdew"):
-                model._init_Tdew(k, T_units)
-
-            # Bubble pressure initialization
-            if hasattr(k, "_mole_frac_pbub"):
-                model._init_Pbub(k, T_units)
-
-            # Dew pressure initialization
-            if hasattr(k, "_mole_frac_pdew"):
-                model._init_Pdew(k, T_units)
-
             # Solve bubble and dew point constraints
             for c in k.component_objects(Constraint):
                 # Deactivate all constraints not associated with bubble and dew
@@ -1730,24 +1787,8 @@ class _GenericStateBlock(StateBlock):
 
         # ---------------------------------------------------------------------
         # If present, initialize bubble and dew point calculations
+        blk._init_bubble_dew(list(blk.values()))
         for k in blk.values():
-            T_units = k.params.get_metadata().default_units.TEMPERATURE
-            # Bubble temperature initialization
-            if hasattr(k, "_mole_frac_tbub"):
-                blk._init_Tbub(k, T_units)
-
-            # Dew temperature initialization
-            if hasattr(k, "_mole_frac_tdew"):
-                blk._init_Tdew(k, T_units)
-
-            # Bubble pressure initialization
-            if hasattr(k, "_mole_frac_pbub"):
-                blk._init_Pbub(k, T_units)
-
-            # Dew pressure initialization
-            if hasattr(k, "_mole_frac_pdew"):
-                blk._init_Pdew(k, T_units)
-
             # Solve bubble and dew point constraints
             for c in k.component_objects(Constraint):
                 # Deactivate all constraints not associated with bubble and dew
@@ -2038,6 +2079,188 @@ class _GenericStateBlock(StateBlock):
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="properties")
         init_log.info_high("State released.")
 
+    def _init_bubble_dew(self, blocks):
+        """
+        Calculate initial guesses for the bubble and dew point variables of a
+        list of StateBlockDatas. If the saturation pressures of the components
+        only depend on temperature and there are no Henry's law components,
+        the guesses for all the blocks are calculated together with NumPy.
+        Otherwise they are calculated one block at a time.
+
+        Args:
+            blocks: list of StateBlockDatas
+
+        Returns:
+            None
+        """
+        for attr, init, init_batch in (
+            ("_mole_frac_tbub", self._init_Tbub, self._init_Tbub_batch),
+            ("_mole_frac_tdew", self._init_Tdew, self._init_Tdew_batch),
+            ("_mole_frac_pbub", self._init_Pbub, self._init_Pbub_batch),
+            ("_mole_frac_pdew", self._init_Pdew, self._init_Pdew_batch),
+        ):
+            group = [k for k in blocks if hasattr(k, attr)]
+            if len(group) == 0:
+                continue
+            T_units = group[0].params.get_metadata().default_units.TEMPERATURE
+            if len(group) > 1:
+                templates = self._psat_templates(group)
+                if templates is not None:
+                    try:
+                        init_batch(group, templates)
+                        continue
+                    except (KeyError, TypeError):
+                        # Saturation pressure expressions include functions
+                        # NumPy can't evaluate, fall back to one at a time.
+                        pass
+            for k in group:
+                init(k, T_units)
+
+    @staticmethod
+    def _psat_templates(blocks):
+        # Return a dict, keyed by phase equilibrium pair, of the Raoult's law
+        # components and expressions for their saturation pressures and
+        # temperature derivatives, written for the temperature of the first
+        # block. Returns None if the expressions can't be evaluated for all the
+        # blocks by substituting temperature.
+        k0 = blocks[0]
+        if not isinstance(k0.temperature, Var):
+            return None
+        for k in blocks:
+            if k.params is not k0.params or not isinstance(k.temperature, Var):
+                return None
+        templates = {}
+        for pp in k0.params._pe_pairs:
+            raoult_comps, henry_comps = _valid_VL_component_list(k0, pp)
+            if raoult_comps == []:
+                continue
+            if henry_comps != []:
+                return None
+            psat = []
+            dpsat = []
+            for j in raoult_comps:
+                method = get_method(k0, "pressure_sat_comp", j)
+                cobj = k0.params.get_component(j)
+                psat.append(method(k0, cobj, k0.temperature))
+                dpsat.append(method(k0, cobj, k0.temperature, dT=True))
+            for expr in psat + dpsat:
+                if _depends_on_block(expr, k0, k0.temperature):
+                    return None
+            templates[pp] = (raoult_comps, psat, dpsat)
+        return templates
+
+    @staticmethod
+    def _gather_state(blocks, comps):
+        # Return arrays of pressure and mole fractions of the blocks
+        P = np.array([value(k.pressure) for k in blocks])
+        x = np.array([[value(k.mole_frac_comp[j]) for j in comps] for k in blocks])
+        return P, x
+
+    def _init_Tbub_batch(self, blocks, templates):
+        params = blocks[0].params
+        T_var = blocks[0].temperature
+        for pp, (comps, psat, dpsat) in templates.items():
+            P, x = self._gather_state(blocks, comps)
+
+            def residual(T, idx):
+                p = _evaluate_columns(psat, T_var, T)
+                dp = _evaluate_columns(dpsat, T_var, T)
+                f = np.sum(p * x[idx], axis=1) - P[idx]
+                df = np.sum(dp * x[idx], axis=1)
+                return f, df
+
+            # Start from the lowest component temperature_crit, see _init_Tbub
+            T0 = min(params.get_component(j).temperature_crit.value for j in comps)
+            T = _newton_with_step_limit(np.full(len(blocks), T0 - 1.0), residual)
+            y = x * _evaluate_columns(psat, T_var, T) / P[:, None]
+
+            for i, k in enumerate(blocks):
+                k.temperature_bubble[pp].value = float(T[i])
+                log_form = k.is_property_constructed("log_mole_frac_tbub")
+                for n, j in enumerate(comps):
+                    k._mole_frac_tbub[pp, j].value = float(y[i, n])
+                    if log_form:
+                        k.log_mole_frac_tbub[pp, j].value = value(
+                            log(k._mole_frac_tbub[pp, j])
+                        )
+
+    def _init_Tdew_batch(self, blocks, templates):
+        params = blocks[0].params
+        T_var = blocks[0].temperature
+        for pp, (comps, psat, dpsat) in templates.items():
+            P, x = self._gather_state(blocks, comps)
+
+            def residual(T, idx):
+                p = _evaluate_columns(psat, T_var, T)
+                dp = _evaluate_columns(dpsat, T_var, T)
+                f = P[idx] * np.sum(x[idx] / p, axis=1) - 1
+                df = -P[idx] * np.sum(x[idx] / p**2 * dp, axis=1)
+                return f, df
+
+            # Start from the bubble temperature if it was calculated, otherwise
+            # the lowest component temperature_crit, see _init_Tdew
+            T_crit = min(params.get_component(j).temperature_crit.value for j in comps)
+            T = np.array(
+                [
+                    k.temperature_bubble[pp].value
+                    if hasattr(k, "_mole_frac_tbub")
+                    and k.temperature_bubble[pp].value is not None
+                    else T_crit - 1.0
+                    for k in blocks
+                ],
+                dtype=float,
+            )
+            T = _newton_with_step_limit(T, residual)
+            y = x * P[:, None] / _evaluate_columns(psat, T_var, T)
+
+            for i, k in enumerate(blocks):
+                k.temperature_dew[pp].value = float(T[i])
+                log_form = k.is_property_constructed("log_mole_frac_tdew")
+                for n, j in enumerate(comps):
+                    k._mole_frac_tdew[pp, j].value = float(y[i, n])
+                    if log_form:
+                        k.log_mole_frac_tdew[pp, j].value = value(
+                            log(k._mole_frac_tdew[pp, j])
+                        )
+
+    def _init_Pbub_batch(self, blocks, templates):
+        T_var = blocks[0].temperature
+        T = np.array([value(k.temperature) for k in blocks])
+        for pp, (comps, psat, _) in templates.items():
+            _, x = self._gather_state(blocks, comps)
+            p = _evaluate_columns(psat, T_var, T)
+            P_bub = np.sum(x * p, axis=1)
+            y = x * p / P_bub[:, None]
+
+            for i, k in enumerate(blocks):
+                k.pressure_bubble[pp].value = float(P_bub[i])
+                log_form = k.is_property_constructed("log_mole_frac_pbub")
+                for n, j in enumerate(comps):
+                    k._mole_frac_pbub[pp, j].value = float(y[i, n])
+                    if log_form:
+                        k.log_mole_frac_pbub[pp, j].value = value(
+                            log(k._mole_frac_pbub[pp, j])
+                        )
+
+    def _init_Pdew_batch(self, blocks, templates):
+        T_var = blocks[0].temperature
+        T = np.array([value(k.temperature) for k in blocks])
+        for pp, (comps, psat, _) in templates.items():
+            _, x = self._gather_state(blocks, comps)
+            p = _evaluate_columns(psat, T_var, T)
+            P_dew = 1 / np.sum(x / p, axis=1)
+            y = x * P_dew[:, None] / p
+
+            for i, k in enumerate(blocks):
+                k.pressure_dew[pp].value = float(P_dew[i])
+                log_form = k.is_property_constructed("log_mole_frac_pdew")
+                for n, j in enumerate(comps):
+                    k._mole_frac_pdew[pp, j].value = float(y[i, n])
+                    if log_form:
+                        k.log_mole_frac_pdew[pp, j].value = value(
+                            log(k._mole_frac_pdew[pp, j])
+                        )
+
     def _init_Tbub(self, blk, T_units):
         for pp in blk.params._pe_pairs:
             raoult_comps, henry_comps = _valid_VL_component_list(blk, pp)
@@ -4869,6 +5092,48 @@ def _raise_dev_burnt_toast():
     )
 
 
+def _depends_on_block(expr, blk, exclude):
+    # Check if an expression includes variables or mutable parameters of a
+    # block, other than exclude
+    for v in list(identify_variables(expr)) + list(identify_mutable_parameters(expr)):
+        if v is exclude:
+            continue
+        b = v.parent_block()
+        while b is not None:
+            if b is blk:
+                return True
+            b = b.parent_block()
+    return False
+
+
+def _evaluate_columns(exprs, var, values):
+    # Evaluate each expression for an array of values of var, and return the
+    # results as the columns of a 2D array
+    return np.column_stack(
+        [
+            np.broadcast_to(evaluate_array(e, {id(var): values}), values.shape)
+            for e in exprs
+        ]
+    )
+
+
+def _newton_with_step_limit(T, residual):
+    # Vectorized version of the Newton solver used by _init_Tbub and _init_Tdew.
+    # Each point is iterated until its step is less than 0.1 or for at most 30
+    # iterations, with steps limited to 50. residual(T, idx) returns the
+    # residual and its derivative for the points idx.
+    active = np.arange(len(T))
+    for _ in range(30):
+        if len(active) == 0:
+            break
+        f, df = residual(T[active], active)
+        T1 = T[active] - np.clip(f / df, -50, 50)
+        err = np.abs(T1 - T[active])
+        T[active] = T1
+        active = active[err > 1e-1]
+    return T
+
+
 def _valid_VL_component_list(blk, pp):
     raoult_comps = []
     henry_comps = []
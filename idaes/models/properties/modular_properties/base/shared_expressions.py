@@ -0,0 +1,102 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Methods for building terms of state block properties that only depend on
+parameters once on the parameter block, rather than once for every state
+block.
+
+Property expressions are written separately for each state block, so terms
+that only involve parameters, like the reference state terms of pure component
+correlations or the component coefficients of cubic equations of state, are
+built again at every state point. If the shared_expressions option of the
+parameter block is set, the property methods build these terms as Expressions
+on the parameter block the first time they are needed, and all state blocks
+refer to them.
+"""
+from pyomo.environ import Expression, Reference
+
+
+def sharing_expressions(b):
+    """
+    Check whether the parameter block of state block b shares the parameter
+    terms of properties between state blocks.
+
+    Args:
+        b: state block
+
+    Returns:
+        bool
+    """
+    return getattr(b.params.config, "shared_expressions", False)
+
+
+def shared_parameter_expression(b, blk, name, rule, doc=None):
+    """
+    Return a term of a property of state block b which only depends on
+    parameters.
+
+    If the shared_expressions option of the parameter block is set, the term
+    is built once as Expression name on blk, a block of the parameter block
+    such as a component object, and this Expression is returned for all state
+    blocks. Otherwise the expression returned by rule is used directly.
+
+    Args:
+        b: state block
+        blk: block of the parameter block to add the Expression to
+        name: name of the Expression
+        rule: function without arguments returning the term
+        doc: doc string of the Expression
+
+    Returns:
+        Expression or expression
+    """
+    if not sharing_expressions(b):
+        return rule()
+    expr = blk.component(name)
+    if expr is None:
+        blk.add_component(name, Expression(expr=rule(), doc=doc))
+        expr = blk.component(name)
+    return expr
+
+
+def add_shared_parameter_expression(b, name, index, rule, doc=None):
+    """
+    Add an indexed Expression of terms which only depend on parameters to
+    state block b.
+
+    If the shared_expressions option of the parameter block is set, the
+    Expression is built once with the same name on the parameter block, and
+    the state block gets a Reference to it. Otherwise the Expression is built
+    on the state block.
+
+    Args:
+        b: state block
+        name: name of the Expression
+        index: index set of the Expression
+        rule: function of an index returning the term for that index
+        doc: doc string of the Expression
+
+    Returns:
+        None
+    """
+
+    def expression_rule(_, *idx):
+        return rule(*idx)
+
+    if not sharing_expressions(b):
+        b.add_component(name, Expression(index, rule=expression_rule, doc=doc))
+        return
+    params = b.params
+    if params.component(name) is None:
+        params.add_component(name, Expression(index, rule=expression_rule, doc=doc))
+    b.add_component(name, Reference(params.component(name)))
@@ -0,0 +1,148 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for batched bubble and dew point initial guesses of generic state blocks
+"""
+import copy
+
+import numpy as np
+import pytest
+
+from pyomo.environ import ConcreteModel
+import pyomo.common.unittest as unittest
+from pyomo.common.timing import TicTocTimer
+
+from idaes.core import FlowsheetBlock
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.properties.modular_properties.base.generic_property import (
+    GenericParameterBlock,
+)
+from idaes.models.properties.modular_properties.examples.BT_ideal import (
+    configuration,
+)
+from idaes.models.properties.modular_properties.phase_equil.bubble_dew import (
+    LogBubbleDew,
+)
+from idaes.models.properties.modular_properties.phase_equil.henry import (
+    ConstantH,
+    HenryType,
+)
+
+
+def build_model(n, config=configuration):
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.params = GenericParameterBlock(**config)
+    m.fs.props = m.fs.params.build_state_block(
+        range(n), defined_state=True, has_phase_equilibrium=True
+    )
+    rng = np.random.default_rng(42)
+    for k in m.fs.props.values():
+        x = rng.uniform(0.05, 0.95)
+        k.flow_mol.fix(1)
+        k.temperature.fix(rng.uniform(350, 380))
+        k.pressure.fix(rng.uniform(0.8e5, 1.5e5))
+        k.mole_frac_comp["benzene"].fix(x)
+        k.mole_frac_comp["toluene"].fix(1 - x)
+        # construct the bubble and dew pressures too
+        k.pressure_bubble
+        k.pressure_dew
+    return m
+
+
+bubble_dew_vars = [
+    "temperature_bubble",
+    "_mole_frac_tbub",
+    "temperature_dew",
+    "_mole_frac_tdew",
+    "pressure_bubble",
+    "_mole_frac_pbub",
+    "pressure_dew",
+    "_mole_frac_pdew",
+]
+
+
+def one_at_a_time(m):
+    T_units = m.fs.params.get_metadata().default_units.TEMPERATURE
+    for k in m.fs.props.values():
+        m.fs.props._init_Tbub(k, T_units)
+        m.fs.props._init_Tdew(k, T_units)
+        m.fs.props._init_Pbub(k, T_units)
+        m.fs.props._init_Pdew(k, T_units)
+
+
+def values(m, names):
+    return {
+        (name, i, idx): v.value
+        for i, k in m.fs.props.items()
+        for name in names
+        for idx, v in getattr(k, name).items()
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("log_form", [False, True])
+def test_batch_matches_one_at_a_time(log_form):
+    config = copy.deepcopy(configuration)
+    names = list(bubble_dew_vars)
+    if log_form:
+        config["bubble_dew_method"] = LogBubbleDew
+        names += [
+            "log_mole_frac_tbub",
+            "log_mole_frac_tdew",
+            "log_mole_frac_pbub",
+            "log_mole_frac_pdew",
+        ]
+    m = build_model(20, config)
+    assert m.fs.props._psat_templates(list(m.fs.props.values())) is not None
+    m.fs.props._init_bubble_dew(list(m.fs.props.values()))
+    batch = values(m, names)
+
+    m = build_model(20, config)
+    one_at_a_time(m)
+    expected = values(m, names)
+
+    assert batch.keys() == expected.keys()
+    for key, v in expected.items():
+        assert batch[key] == pytest.approx(v, rel=1e-10), key
+        assert type(batch[key]) is float
+
+
+@pytest.mark.unit
+def test_henry_falls_back():
+    config = copy.deepcopy(configuration)
+    config["components"]["benzene"]["henry_component"] = {
+        "Liq": {"method": ConstantH, "type": HenryType.Kpx}
+    }
+    config["components"]["benzene"]["parameter_data"]["henry_ref"] = {"Liq": 1e5}
+    m = build_model(3, config)
+    # Henry's law components are initialized one block at a time
+    assert m.fs.props._psat_templates(list(m.fs.props.values())) is None
+
+
+@pytest.mark.performance
+class TestBatchInitializationPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_model(500)
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        m = self.build_model()
+        timer.tic(None)
+        one_at_a_time(m)
+        self.recordData("one at a time", timer.toc("one at a time"))
+
+        m = self.build_model()
+        timer.tic(None)
+        m.fs.props._init_bubble_dew(list(m.fs.props.values()))
+        self.recordData("batch", timer.toc("batch"))
@@ -0,0 +1,175 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for storing pure component parameters of generic property packages in
+tables indexed by component
+"""
+import copy
+
+import pytest
+
+from pyomo.environ import ConcreteModel, Param, Var, units as pyunits, value
+from pyomo.util.check_units import assert_units_consistent
+import pyomo.common.unittest as unittest
+from pyomo.common.timing import TicTocTimer
+
+from idaes.core import FlowsheetBlock
+from idaes.core.util.model_serializer import from_json, to_json
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.properties.modular_properties.base.generic_property import (
+    GenericParameterBlock,
+)
+from idaes.models.properties.modular_properties.examples.BT_ideal import (
+    configuration,
+)
+
+
+def make_config(n, tables):
+    """Configuration with n components, alternately benzene and toluene"""
+    config = copy.deepcopy(configuration)
+    if n is not None:
+        config["components"] = {
+            f"c{i}": copy.deepcopy(
+                configuration["components"]["benzene" if i % 2 == 0 else "toluene"]
+            )
+            for i in range(n)
+        }
+    config["parameter_tables"] = tables
+    return config
+
+
+def build_model(n, tables, states=2):
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.params = GenericParameterBlock(**make_config(n, tables))
+    m.fs.props = m.fs.params.build_state_block(range(states), defined_state=True)
+    for k in m.fs.props.values():
+        k.temperature.fix(360)
+        k.pressure.fix(1e5)
+        k.enth_mol_phase
+        k.dens_mol_phase
+        k.pressure_sat_comp
+    return m
+
+
+def count_components(blk):
+    return sum(1 for _ in blk.component_objects(descend_into=True))
+
+
+@pytest.mark.unit
+def test_tables():
+    m = build_model(None, tables=True)
+    params = m.fs.params
+    tables = params.parameter_tables
+
+    assert isinstance(tables.pressure_crit, Var)
+    assert set(tables.pressure_crit) == {"benzene", "toluene"}
+    assert isinstance(tables.mw, Param)
+
+    # The parameters stay on the Component objects, the tables refer to them
+    assert params.benzene.component("pressure_crit") is params.benzene.pressure_crit
+    assert params.benzene.pressure_crit is tables.pressure_crit["benzene"]
+    assert params.toluene.mw is tables.mw["toluene"]
+    assert params.benzene.pressure_crit.fixed
+    assert value(tables.pressure_crit["benzene"]) == pytest.approx(48.9e5)
+    assert str(pyunits.get_units(tables.pressure_crit["benzene"])) == str(
+        params.benzene.pressure_crit.get_units()
+    )
+
+    # Changes to the tables are seen by the properties
+    p_sat = value(m.fs.props[0].pressure_sat_comp["toluene"])
+    tables.pressure_sat_comp_coeff_A["toluene"].fix(
+        value(params.toluene.pressure_sat_comp_coeff_A) + 0.1
+    )
+    assert value(m.fs.props[0].pressure_sat_comp["toluene"]) > p_sat
+
+
+@pytest.mark.unit
+def test_default():
+    m = build_model(None, tables=False)
+    assert m.fs.params.find_component("parameter_tables") is None
+    assert isinstance(m.fs.params.benzene.pressure_crit, Var)
+
+
+@pytest.mark.unit
+def test_same_values():
+    m = build_model(6, tables=True)
+    m_ref = build_model(6, tables=False)
+
+    # unit conversions of the correlations are calculated once per table
+    conversions = m.fs.params._parameter_table_conversions
+    assert ("cp_mol_liq_comp_coeff_1", "ENERGY_MOLE") in conversions
+    assert ("cp_mol_ig_comp_coeff_A", "ENERGY_MOLE") in conversions
+    assert not hasattr(m_ref.fs.params, "_parameter_table_conversions")
+    assert_units_consistent(m)
+
+    for i in m.fs.props:
+        for name in ["enth_mol_phase", "dens_mol_phase", "pressure_sat_comp"]:
+            for idx, e in getattr(m.fs.props[i], name).items():
+                ref = getattr(m_ref.fs.props[i], name)[idx]
+                assert value(e) == pytest.approx(value(ref), rel=1e-12)
+
+
+@pytest.mark.unit
+def test_components():
+    m = build_model(6, tables=True)
+    m_ref = build_model(6, tables=False)
+    params = m.fs.params
+    # the tables are references, so the parameters are only seen once
+    assert len(list(params.component_data_objects(Var))) == len(
+        list(m_ref.fs.params.component_data_objects(Var))
+    )
+    assert count_components(params) > count_components(m_ref.fs.params)
+
+    # the parameters are saved and loaded with the model
+    state = to_json(m, return_dict=True)
+    params.c0.pressure_crit.fix(1e5)
+    from_json(m, sd=state)
+    assert value(params.parameter_tables.pressure_crit["c0"]) == pytest.approx(48.9e5)
+
+
+@pytest.mark.unit
+def test_clone():
+    m = build_model(None, tables=True)
+    m2 = m.clone()
+    tables = m2.fs.params.parameter_tables
+    assert m2.fs.params.benzene.pressure_crit is tables.pressure_crit["benzene"]
+    tables.pressure_crit["benzene"].fix(50e5)
+    assert value(m.fs.params.benzene.pressure_crit) == pytest.approx(48.9e5)
+
+
+@pytest.mark.performance
+class TestParameterTablesPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_model(40, tables=True, states=20)
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        for tables in (False, True):
+            label = "tables" if tables else "no tables"
+            config = make_config(40, tables)
+            m = ConcreteModel()
+            timer.tic(None)
+            m.params = GenericParameterBlock(**config)
+            self.recordData(
+                f"parameter block ({label})", timer.toc(f"parameter block ({label})")
+            )
+            self.recordData(f"components ({label})", count_components(m.params))
+            timer.tic(None)
+            m.props = m.params.build_state_block(range(20), defined_state=True)
+            for k in m.props.values():
+                k.enth_mol_phase
+                k.pressure_sat_comp
+            self.recordData(
+                f"state blocks ({label})", timer.toc(f"state blocks ({label})")
+            )
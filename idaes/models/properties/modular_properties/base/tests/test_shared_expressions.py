@@ -0,0 +1,197 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for sharing parameter-only terms of properties between generic state
+blocks
+"""
+import copy
+import os
+
+import pytest
+
+from pyomo.environ import (
+    ConcreteModel,
+    Expression,
+    Objective,
+    Var,
+    value,
+)
+from pyomo.util.check_units import assert_units_consistent
+import pyomo.common.unittest as unittest
+from pyomo.common.tempfiles import TempfileManager
+from pyomo.common.timing import TicTocTimer
+
+from idaes.core import FlowsheetBlock
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.properties.modular_properties.base.generic_property import (
+    GenericParameterBlock,
+)
+from idaes.models.properties.modular_properties.base.shared_expressions import (
+    shared_parameter_expression,
+)
+from idaes.models.properties.modular_properties.eos.ceos import cubic_roots_available
+from idaes.models.properties.modular_properties.examples.BT_ideal import (
+    configuration,
+)
+from idaes.models.properties.modular_properties.examples.BT_PR import (
+    configuration as configuration_PR,
+)
+
+
+def build_model(
+    n, shared, points=((360, 1e5, 0.5), (370, 1.2e5, 0.3)), base=configuration
+):
+    config = copy.deepcopy(base)
+    config["shared_expressions"] = shared
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.params = GenericParameterBlock(**config)
+    m.fs.props = m.fs.params.build_state_block(range(n), defined_state=True)
+    for i, k in m.fs.props.items():
+        T, P, x = points[i % len(points)]
+        k.flow_mol.fix(1)
+        k.temperature.fix(T)
+        k.pressure.fix(P)
+        k.mole_frac_comp["benzene"].fix(x)
+        k.mole_frac_comp["toluene"].fix(1 - x)
+        k.enth_mol_phase
+        k.dens_mol_phase
+        k.pressure_sat_comp
+    return m
+
+
+props = ["enth_mol_phase", "enth_mol_phase_comp", "dens_mol_phase", "pressure_sat_comp"]
+
+
+@pytest.mark.unit
+def test_shared_parameter_expression():
+    m = build_model(2, shared=True)
+    m_ref = build_model(2, shared=False)
+    cobj = m.fs.params.benzene
+
+    def rule():
+        return 2 * cobj.pressure_crit
+
+    e = shared_parameter_expression(m.fs.props[0], cobj, "test_term", rule)
+    assert isinstance(cobj.test_term, Expression)
+    assert e is cobj.test_term
+    # later state blocks get the same Expression, rule is not called again
+    e1 = shared_parameter_expression(m.fs.props[1], cobj, "test_term", None)
+    assert e1 is e
+    assert value(e) == pytest.approx(2 * 48.9e5)
+
+    # without sharing the expression is returned as it is
+    cobj_ref = m_ref.fs.params.benzene
+    e = shared_parameter_expression(
+        m_ref.fs.props[0], cobj_ref, "test_term", lambda: 2 * cobj_ref.pressure_crit
+    )
+    assert cobj_ref.component("test_term") is None
+    assert value(e) == pytest.approx(2 * 48.9e5)
+
+
+@pytest.mark.unit
+def test_state_block():
+    m = build_model(4, shared=True)
+    m_ref = build_model(4, shared=False)
+
+    params = m.fs.params
+    # reference state terms are built once on the component objects
+    for j in params.component_list:
+        cobj = params.get_component(j)
+        assert isinstance(cobj.enth_mol_liq_comp_ref_term, Expression)
+        assert isinstance(cobj.enth_mol_ig_comp_ref_term, Expression)
+        # unit conversions are calculated once for each component
+        assert set(cobj._correlation_conversions) == {
+            ("cp_mol_liq_comp_coeff_1", "ENERGY_MOLE"),
+            ("cp_mol_ig_comp_coeff_A", "ENERGY_MOLE"),
+            ("dens_mol_liq_comp_coeff_1", "DENSITY_MOLE"),
+        }
+        # without sharing the correlations are built as before
+        cobj_ref = m_ref.fs.params.get_component(j)
+        assert cobj_ref.component("enth_mol_liq_comp_ref_term") is None
+        assert not hasattr(cobj_ref, "_correlation_conversions")
+    n_expressions = len(list(params.component_data_objects(Expression)))
+    m1 = build_model(1, shared=True)
+    assert len(list(m1.fs.params.component_data_objects(Expression))) == n_expressions
+    assert_units_consistent(m)
+
+    for i in m.fs.props:
+        for name in props:
+            for idx, e in getattr(m.fs.props[i], name).items():
+                ref = getattr(m_ref.fs.props[i], name)[idx]
+                assert value(e) == pytest.approx(value(ref), rel=1e-12)
+
+
+@pytest.mark.skipif(not cubic_roots_available(), reason="Cubic functions not available")
+@pytest.mark.unit
+def test_cubic():
+    m = build_model(2, shared=True, base=configuration_PR)
+    m_ref = build_model(2, shared=False, base=configuration_PR)
+    params = m.fs.params
+    # component coefficients of the EoS are built once on the parameter block
+    for name in ["PR_fw", "PR_a_crit", "PR_b"]:
+        shared = params.component(name)
+        assert isinstance(shared, Expression)
+        for k in m.fs.props.values():
+            for j in params.component_list:
+                assert getattr(k, name)[j] is shared[j]
+        assert params.component(name) is not None
+        assert m_ref.fs.params.component(name) is None
+        for j in params.component_list:
+            assert value(getattr(m.fs.props[0], name)[j]) == pytest.approx(
+                value(getattr(m_ref.fs.props[0], name)[j]), rel=1e-12
+            )
+    assert_units_consistent(m)
+
+    for i in m.fs.props:
+        for name in ["enth_mol_phase", "dens_mol_phase"]:
+            for idx, e in getattr(m.fs.props[i], name).items():
+                ref = getattr(m_ref.fs.props[i], name)[idx]
+                assert value(e) == pytest.approx(value(ref), rel=1e-10)
+
+
+def write_model(m, tmp_path, unfix_parameters):
+    m.fs.obj = Objective(
+        expr=sum(
+            k.enth_mol_phase["Liq"] + k.enth_mol_phase["Vap"] + k.dens_mol_phase["Liq"]
+            for k in m.fs.props.values()
+        )
+    )
+    for k in m.fs.props.values():
+        k.temperature.unfix()
+    if unfix_parameters:
+        for v in m.fs.params.component_data_objects(Var):
+            v.unfix()
+    fname = os.path.join(tmp_path, "model.nl")
+    m.write(fname, format="nl_v2", io_options={"symbolic_solver_labels": False})
+    return os.path.getsize(fname)
+
+
+@pytest.mark.performance
+class TestSharedExpressionsPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_model(200, shared=True)
+
+    def test_performance(self):
+        timer = TicTocTimer()
+        with TempfileManager.new_context() as tempfiles:
+            tmpdir = tempfiles.mkdtemp()
+            for shared in (False, True):
+                label = "shared" if shared else "not shared"
+                timer.tic(None)
+                m = build_model(200, shared=shared)
+                self.recordData(f"build ({label})", timer.toc(f"build ({label})"))
+                timer.tic(None)
+                size = write_model(m, tmpdir, unfix_parameters=True)
+                self.recordData(f"write nl ({label})", timer.toc(f"write nl ({label})"))
+                self.recordData(f"nl size ({label})", size)
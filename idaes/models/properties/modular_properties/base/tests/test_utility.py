@@ -19,6 +19,8 @@ import pytest
 
 from types import MethodType
 
+import numpy as np
+
 from idaes.models.properties.modular_properties.base.utility import (
     GenericPropertyPackageError,
     get_method,
@@ -27,10 +29,22 @@ from idaes.models.properties.modular_properties.base.utility import (
     get_bounds_from_config,
     get_concentration_term,
     ConcentrationForm,
+    evaluate_array,
 )
 
 from idaes.models.properties.modular_properties.base.generic_reaction import rxn_config
-from pyomo.environ import Block, units as pyunits, Var
+from pyomo.environ import (
+    Block,
+    ConcreteModel,
+    Expression,
+    ExternalFunction,
+    Expr_if,
+    Param,
+    exp,
+    log,
+    units as pyunits,
+    Var,
+)
 from pyomo.common.config import ConfigBlock, ConfigValue
 from idaes.core.util.exceptions import ConfigurationError, PropertyPackageError
 from idaes.core.util.misc import add_object_reference
@@ -559,3 +573,41 @@ class TestGetConcentrationTerm:
             get_concentration_term(frame2, "i1", log=True)
             is frame2.log_pressure_phase_comp
         )
+
+
+class TestEvaluateArray:
+    @pytest.mark.unit
+    def test_evaluate_array(self):
+        m = ConcreteModel()
+        m.T = Var(initialize=300, units=pyunits.K)
+        m.a = Param(initialize=2, mutable=True)
+        m.b = Var(initialize=-100)
+        m.e = Expression(
+            expr=exp(m.a + m.b * pyunits.K / m.T) * pyunits.Pa
+            + log(m.T / pyunits.K) ** 2 * pyunits.Pa
+            - abs(m.b) / m.T * pyunits.Pa * pyunits.K
+        )
+        T = np.array([250.0, 300.0, 400.0])
+        np.testing.assert_allclose(
+            evaluate_array(m.e, {id(m.T): T}),
+            np.exp(2 - 100 / T) + np.log(T) ** 2 - 100 / T,
+        )
+        # other components are evaluated at their current values
+        assert evaluate_array(m.e, {id(m.b): np.array([-100.0])})[0] == (
+            pytest.approx(m.e())
+        )
+        assert evaluate_array(m.a, {id(m.T): T}) == 2
+        np.testing.assert_array_equal(evaluate_array(m.T, {id(m.T): T}), T)
+
+        e = Expr_if(IF=m.T >= 300, THEN=m.T, ELSE=-m.T)
+        np.testing.assert_array_equal(
+            evaluate_array(e, {id(m.T): T}), [-250.0, 300.0, 400.0]
+        )
+
+    @pytest.mark.unit
+    def test_external_function(self):
+        m = ConcreteModel()
+        m.T = Var(initialize=300)
+        m.f = ExternalFunction(library="", function="f")
+        with pytest.raises(TypeError, match="Cannot evaluate"):
+            evaluate_array(m.f(m.T), {id(m.T): np.array([1.0])})
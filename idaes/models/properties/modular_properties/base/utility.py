@@ -24,13 +24,21 @@ Author: A Lee
 
 from enum import Enum
 
-from pyomo.environ import units as pyunits
+import numpy as np
+
+from pyomo.environ import units as pyunits, value
+from pyomo.common.numeric_types import native_types
+from pyomo.core.expr import numeric_expr
+from pyomo.core.expr.visitor import StreamBasedExpressionVisitor
 
 from idaes.core.util.exceptions import (
     BurntToast,
     ConfigurationError,
     PropertyPackageError,
 )
+from idaes.models.properties.modular_properties.base.shared_expressions import (
+    sharing_expressions,
+)
 import idaes.logger as idaeslog
 
 # Set up logger
@@ -58,6 +66,95 @@ class GenericPropertyPackageError(PropertyPackageError):
         )
 
 
+# NumPy versions of the functions of Pyomo UnaryFunctionExpressions
+_numpy_functions = {
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sqrt": np.sqrt,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "asinh": np.arcsinh,
+    "acosh": np.arccosh,
+    "atanh": np.arctanh,
+    "ceil": np.ceil,
+    "floor": np.floor,
+}
+
+
+class _ArrayEvaluationVisitor(StreamBasedExpressionVisitor):
+    def __init__(self, substitute):
+        super().__init__()
+        self.substitute = substitute
+
+    def _leaf_value(self, child):
+        if type(child) in native_types:
+            return child
+        if id(child) in self.substitute:
+            return self.substitute[id(child)]
+        return value(child)
+
+    def beforeChild(self, node, child, child_idx):
+        if type(child) in native_types or id(child) in self.substitute:
+            return False, self._leaf_value(child)
+        if not child.is_expression_type():
+            return False, value(child)
+        return True, None
+
+    def exitNode(self, node, data):
+        if node.is_named_expression_type():
+            return data[0]
+        if isinstance(node, numeric_expr.AbsExpression):
+            return np.abs(data[0])
+        if isinstance(node, numeric_expr.UnaryFunctionExpression):
+            return _numpy_functions[node.getname()](data[0])
+        if isinstance(node, numeric_expr.Expr_ifExpression):
+            return np.where(data[0], data[1], data[2])
+        if isinstance(
+            node,
+            (
+                numeric_expr.MaxExpression,
+                numeric_expr.MinExpression,
+                numeric_expr.ExternalFunctionExpression,
+            ),
+        ):
+            raise TypeError(f"Cannot evaluate {type(node).__name__} on arrays")
+        return node._apply_operation(data)
+
+
+def evaluate_array(expr, substitute):
+    """
+    Evaluate a Pyomo expression for arrays of values of some of its
+    variables or parameters, with NumPy, rather than setting the values and
+    evaluating the expression one point at a time. Other components are
+    evaluated at their current values, and units are ignored.
+
+    Args:
+        expr: Pyomo expression to evaluate
+        substitute: dict mapping id() of a variable or parameter data object
+            to the array of values to use for it
+
+    Returns:
+        array (or float if the expression does not depend on the substituted
+        components)
+
+    Raises:
+        KeyError or TypeError if the expression contains functions that cannot
+        be evaluated with NumPy
+    """
+    visitor = _ArrayEvaluationVisitor(substitute)
+    if type(expr) in native_types or not expr.is_expression_type():
+        return visitor._leaf_value(expr)
+    return visitor.walk_expression(expr)
+
+
 def get_method(self, config_arg, comp=None, phase=None):
     """
     Method to inspect configuration argument and return the user-defined
@@ -188,6 +285,59 @@ def get_component_object(self, comp):
     return self.params.get_component(comp)
 
 
+def convert_correlation_units(b, cobj, expr, parameter, factor_units, quantity):
+    """
+    Convert a pure component correlation to the derived units of a quantity,
+    where every term of the correlation has the units of one of the
+    component's parameters times factor_units.
+
+    pyunits.convert walks the whole expression to find its units, which is
+    most of the time taken to build the correlation. If the parameter block
+    has parameter tables (parameter_tables option) and the parameter is in a
+    table, all components share its units, so the conversion is calculated
+    once for the table and reused for all components and state blocks. If
+    the parameter block shares parameter terms between state blocks
+    (shared_expressions option), the conversion is calculated once for the
+    component and reused for all state blocks. Otherwise, this falls back to
+    pyunits.convert.
+
+    Args:
+        b: state block the correlation is built for
+        cobj: component object the correlation is for
+        expr: correlation expression
+        parameter: name of the parameter of cobj which sets the units of expr
+        factor_units: units of expr divided by the units of the parameter
+        quantity: name of the derived units to convert to, e.g. "ENERGY_MOLE"
+
+    Returns:
+        expression in the derived units of quantity
+    """
+    params = b.params
+    to_units = getattr(params.get_metadata().derived_units, quantity)
+    table = None
+    if getattr(params.config, "parameter_tables", False):
+        table = params.parameter_tables.component(parameter)
+    if table is not None and cobj.local_name in table:
+        conversions = params._parameter_table_conversions
+        param = table[cobj.local_name]
+    elif sharing_expressions(b):
+        conversions = getattr(cobj, "_correlation_conversions", None)
+        if conversions is None:
+            conversions = cobj._correlation_conversions = {}
+        param = getattr(cobj, parameter)
+    else:
+        return pyunits.convert(expr, to_units=to_units)
+
+    try:
+        conversion = conversions[parameter, quantity]
+    except KeyError:
+        from_units = pyunits.get_units(param) * factor_units
+        factor = pyunits.convert_value(1, from_units=from_units, to_units=to_units)
+        conversion = factor * to_units / from_units
+        conversions[parameter, quantity] = conversion
+    return expr * conversion
+
+
 def get_bounds_from_config(b, state, base_units):
     """
     Method to take a 3- or 4-tuple state definition config argument and return
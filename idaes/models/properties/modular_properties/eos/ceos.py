@@ -25,6 +25,7 @@ from enum import Enum
 from copy import deepcopy
 
 from pyomo.environ import (
+    Any,
     exp,
     Expression,
     log,
@@ -37,6 +38,9 @@ from idaes.models.properties.modular_properties.base.utility import (
     get_method,
     get_component_object as cobj,
 )
+from idaes.models.properties.modular_properties.base.shared_expressions import (
+    add_shared_parameter_expression,
+)
 
 from idaes.core.util.math import safe_log
 
@@ -149,30 +153,30 @@ class Cubic(EoSBase):
             return
 
         # Create expressions for coefficients
-        def rule_fw(m, j):
-            func_fw = getattr(m.params, cname + "_func_fw")
-            cobj = m.params.get_component(j)
+        # These only depend on parameters, so they can be shared by all state
+        # blocks (shared_expressions option)
+        def rule_fw(j):
+            func_fw = getattr(b.params, cname + "_func_fw")
+            cobj = b.params.get_component(j)
             return func_fw(cobj)
 
-        b.add_component(
-            cname + "_fw",
-            Expression(b.component_list, rule=rule_fw, doc="EoS S factor"),
+        add_shared_parameter_expression(
+            b, cname + "_fw", b.component_list, rule_fw, doc="EoS S factor"
         )
 
-        def rule_a_crit(m, j):
-            cobj = m.params.get_component(j)
+        def rule_a_crit(j):
+            cobj = b.params.get_component(j)
             return EoS_param[ctype]["omegaA"] * (
                 (Cubic.gas_constant(b) * cobj.temperature_crit) ** 2
                 / cobj.pressure_crit
             )
 
-        b.add_component(
+        add_shared_parameter_expression(
+            b,
             cname + "_a_crit",
-            Expression(
-                b.component_list,
-                rule=rule_a_crit,
-                doc="Component a coefficient at T_crit",
-            ),
+            b.component_list,
+            rule_a_crit,
+            doc="Component a coefficient at T_crit",
         )
 
         def rule_a(m, j):
@@ -222,8 +226,8 @@ class Cubic(EoSBase):
             ),
         )
 
-        def func_b(m, j):
-            cobj = m.params.get_component(j)
+        def func_b(j):
+            cobj = b.params.get_component(j)
             return (
                 EoS_param[ctype]["coeff_b"]
                 * Cubic.gas_constant(b)
@@ -231,9 +235,12 @@ class Cubic(EoSBase):
                 / cobj.pressure_crit
             )
 
-        b.add_component(
+        add_shared_parameter_expression(
+            b,
             cname + "_b",
-            Expression(b.component_list, rule=func_b, doc="Component b coefficient"),
+            b.component_list,
+            func_b,
+            doc="Component b coefficient",
         )
 
         if mixing_rule_a == MixingRuleA.default:
@@ -1002,16 +1009,14 @@ def _log_fug_coeff_phase_comp_eq(blk, p, j, pp):
     Beq = getattr(blk, "_" + cname + "_B_eq")
     delta_eq = getattr(blk, "_" + cname + "_delta_eq")
 
-    expr_write = CubicThermoExpressions(blk)
-    if pobj.is_vapor_phase():
-
-        def Zeq(p):
-            return expr_write.z_vap(eos=pobj._cubic_type, A=Aeq[pp, p], B=Beq[pp, p])
-
-    elif pobj.is_liquid_phase():
-
-        def Zeq(p):
-            return expr_write.z_liq(eos=pobj._cubic_type, A=Aeq[pp, p], B=Beq[pp, p])
+    Zeq = _shared_compress_fact(
+        blk,
+        "_" + cname + "_compress_fact_eq",
+        pp + (p,),
+        pobj,
+        Aeq[pp, p],
+        Beq[pp, p],
+    )
 
     return _log_fug_coeff_method(
         Aeq[pp, p],
@@ -1019,7 +1024,7 @@ def _log_fug_coeff_phase_comp_eq(blk, p, j, pp):
         bm[p],
         Beq[pp, p],
         delta_eq[pp, p, j],
-        Zeq(p),
+        Zeq,
         pobj._cubic_type,
     )
 
@@ -1045,22 +1050,53 @@ def _log_fug_coeff_phase_comp(blk, p, j):
     B = getattr(blk, cname + "_B")
     delta = getattr(blk, cname + "_delta")
 
-    expr_write = CubicThermoExpressions(blk)
-    if pobj.is_vapor_phase():
-
-        def Z(p):
-            return expr_write.z_vap(eos=pobj._cubic_type, A=A[p], B=B[p])
-
-    elif pobj.is_liquid_phase():
-
-        def Z(p):
-            return expr_write.z_liq(eos=pobj._cubic_type, A=A[p], B=B[p])
+    Z = _shared_compress_fact(blk, "_" + cname + "_compress_fact", p, pobj, A[p], B[p])
 
     return _log_fug_coeff_method(
-        A[p], b[j], bm[p], B[p], delta[p, j], Z(p), pobj._cubic_type
+        A[p], b[j], bm[p], B[p], delta[p, j], Z, pobj._cubic_type
     )
 
 
+def _shared_compress_fact(blk, name, idx, pobj, A, B):
+    """
+    Return the compressibility factor of phase pobj for A and B, as an element
+    of an Expression on the state block. The log fugacity coefficients of all
+    components refer to this element, and the NL writer writes Expressions
+    which are used more than once a single time, so the cubic root external
+    function is only called once for all components.
+
+    Args:
+        blk: state block
+        name: name of the Expression
+        idx: index of the element, A and B must be the same for each call
+            with the same index
+        pobj: phase object
+        A: dimensionless attraction parameter
+        B: dimensionless covolume parameter
+
+    Returns:
+        Expression element for the compressibility factor
+    """
+    comp = blk.component(name)
+    if comp is None:
+        comp = Expression(Any, doc="Compressibility factor shared by all components")
+        blk.add_component(name, comp)
+    if idx not in comp:
+        expr_write = CubicThermoExpressions(blk)
+        if pobj.is_vapor_phase():
+            comp[idx] = expr_write.z_vap(eos=pobj._cubic_type, A=A, B=B)
+        elif pobj.is_liquid_phase():
+            comp[idx] = expr_write.z_liq(eos=pobj._cubic_type, A=A, B=B)
+        else:
+            raise BurntToast(
+                "{} non-vapor or liquid phase called for cubic "
+                "EoS compressability factor. This should never "
+                "happen, so please contact the IDAES developers "
+                "with this bug.".format(blk.name)
+            )
+    return comp[idx]
+
+
 def _log_fug_coeff_method(A, b, bm, B, delta, Z, cubic_type):
     u = EoS_param[cubic_type]["u"]
     w = EoS_param[cubic_type]["w"]
@@ -1220,11 +1256,9 @@ def _bubble_dew_log_fug_coeff_method(blk, p, j, pp, pt_var):
         * sum(x[xidx, i] * sqrt(a(i)) * (1 - kappa[j, i]) for i in blk.component_list)
     )
 
-    expr_write = CubicThermoExpressions(blk)
-    if pobj.is_vapor_phase():
-        Z = expr_write.z_vap(eos=pobj._cubic_type, A=A, B=B)
-    elif pobj.is_liquid_phase():
-        Z = expr_write.z_liq(eos=pobj._cubic_type, A=A, B=B)
+    Z = _shared_compress_fact(
+        blk, "_" + cname + "_compress_fact_" + abbrv, pp + (p,), pobj, A, B
+    )
 
     return (
         _log_fug_coeff_method(A, b[j], bm, B, delta, Z, ctype)
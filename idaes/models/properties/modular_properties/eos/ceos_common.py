@@ -18,6 +18,10 @@ Common utilities for cubic EoS property packages.
 
 import enum
 import ctypes
+from collections import namedtuple
+
+import numpy as np
+
 from pyomo.environ import ExternalFunction, units as pyunits
 from pyomo.common.fileutils import find_library
 
@@ -149,3 +153,96 @@ class CubicThermoExpressions(object):
             c = A + w * B**2 - u * B - u * B**2
             d = -A * B - w * B**2 - w * B**3
         return self.blk.compress_fact_vap_func(b, c, d)
+
+
+CubicRoot = namedtuple(
+    "CubicRoot", ["z", "dz_dA", "dz_dB", "d2z_dA2", "d2z_dAdB", "d2z_dB2"]
+)
+CubicRoot.__doc__ = """Root of a cubic EoS and its first and second derivatives
+with respect to A and B."""
+
+
+def cubic_roots(A, B, eos=None, u=None, w=None, newton_steps=2):
+    """Calculate the liquid (smallest) and vapor (largest) real roots of the
+    cubic EoS
+
+        Z^3 - (1 + B - uB)Z^2 + (A + wB^2 - uB - uB^2)Z - AB - wB^2 - wB^3 = 0
+
+    for arrays of A and B in closed form, together with their first and second
+    derivatives with respect to A and B. If there is only one real root, it is
+    returned for both phases, like the cubic_root_l and cubic_root_h external
+    functions. This evaluates many states at once in NumPy, e.g. for
+    initialization, without calling the external functions.
+
+    Args:
+        A (array): dimensionless attraction parameter
+        B (array): dimensionless covolume parameter
+        eos (CubicType): type of cubic, or give u and w
+        u (float): u parameter of the cubic
+        w (float): w parameter of the cubic
+        newton_steps (int): Newton steps used to polish the closed form roots
+
+    Returns:
+        tuple: (liquid, vapor) CubicRoot tuples of arrays
+    """
+    if eos is not None:
+        u = EoS_param[eos]["u"]
+        w = EoS_param[eos]["w"]
+    if u is None or w is None:
+        raise RuntimeError("Please supply args: eos or {u, w}")
+    A, B = np.broadcast_arrays(np.asarray(A, dtype=float), np.asarray(B, dtype=float))
+    b = -(1.0 + B - u * B)
+    c = A + w * B**2 - u * B - u * B**2
+    d = -A * B - w * B**2 - w * B**3
+
+    # Roots of the depressed cubic t^3 + pt + q = 0, with Z = t - b/3
+    p = c - b**2 / 3
+    q = 2 * b**3 / 27 - b * c / 3 + d
+    disc = (q / 2) ** 2 + (p / 3) ** 3
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # one real root
+        sqrt_disc = np.sqrt(np.maximum(disc, 0))
+        one = np.cbrt(-q / 2 + sqrt_disc) + np.cbrt(-q / 2 - sqrt_disc)
+        # three real roots
+        r = 2 * np.sqrt(np.maximum(-p / 3, 0))
+        arg = np.where(r > 0, 3 * q / (p * r), 0)
+        theta = np.arccos(np.clip(arg, -1, 1)) / 3
+        high = r * np.cos(theta)
+        low = r * np.cos(theta - 4 * np.pi / 3)
+    three = disc <= 0
+    z_liq = np.where(three, low, one) - b / 3
+    z_vap = np.where(three, high, one) - b / 3
+
+    roots = []
+    for z in (z_liq, z_vap):
+        for _ in range(newton_steps):
+            f = ((z + b) * z + c) * z + d
+            df = (3 * z + 2 * b) * z + c
+            z = z - np.divide(f, df, out=np.zeros_like(f), where=df != 0)
+        roots.append(_cubic_root_derivatives(z, A, B, b, c, u, w))
+    return tuple(roots)
+
+
+def _cubic_root_derivatives(z, A, B, b, c, u, w):
+    # Implicit derivatives of F(Z, A, B) = Z^3 + bZ^2 + cZ + d = 0
+    F_Z = (3 * z + 2 * b) * z + c
+    F_ZZ = 6 * z + 2 * b
+    F_A = z - B
+    F_B = (
+        (u - 1) * z**2
+        + (2 * w * B - u - 2 * u * B) * z
+        - A
+        - 2 * w * B
+        - 3 * w * B**2
+    )
+    F_ZA = 1.0
+    F_ZB = 2 * (u - 1) * z + 2 * w * B - u - 2 * u * B
+    F_AB = -1.0
+    F_BB = 2 * (w - u) * z - 2 * w - 6 * w * B
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z_A = -F_A / F_Z
+        z_B = -F_B / F_Z
+        z_AA = -(F_ZZ * z_A**2 + 2 * F_ZA * z_A) / F_Z
+        z_AB = -(F_ZZ * z_A * z_B + F_ZA * z_B + F_ZB * z_A + F_AB) / F_Z
+        z_BB = -(F_ZZ * z_B**2 + 2 * F_ZB * z_B + F_BB) / F_Z
+    return CubicRoot(z, z_A, z_B, z_AA, z_AB, z_BB)
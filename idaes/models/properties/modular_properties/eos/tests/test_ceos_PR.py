@@ -964,6 +964,17 @@ def test_fug_coeff_phase_comp_Vap(m):
     )
 
 
+@pytest.mark.skipif(not cubic_roots_available(), reason="Cubic functions not available")
+@pytest.mark.unit
+def test_fug_coeff_phase_comp_shared_root(m):
+    # All components share one compressibility factor for the phase, and
+    # compress_fact_phase is not built for the other phases
+    f = {j: Cubic.fug_coeff_phase_comp(m.props[1], "Liq", j) for j in "abc"}
+    assert list(m.props[1]._PR_compress_fact) == ["Liq"]
+    assert m.props[1].component("compress_fact_phase") is None
+    assert pytest.approx(1.01213, rel=1e-5) == value(f["a"])
+
+
 @pytest.mark.skipif(not cubic_roots_available(), reason="Cubic functions not available")
 @pytest.mark.unit
 def test_fug_coeff_phase_comp_eq_Liq(m):
@@ -14,6 +14,8 @@
 Author: Andrew Lee
 """
 import pytest
+
+import pyomo.common.unittest as unittest
 from pyomo.environ import (
     check_optimal_termination,
     ConcreteModel,
@@ -43,6 +45,9 @@ from idaes.models.properties.modular_properties.phase_equil import SmoothVLE
 from idaes.models.properties.modular_properties.examples.BT_ideal import configuration
 
 from idaes.models.properties.tests.test_harness import PropertyTestHarness
+from idaes.core import FlowsheetBlock
+from idaes.core.util.performance import PerformanceBaseClass
+from idaes.models.unit_models import Heater
 
 
 # -----------------------------------------------------------------------------
@@ -366,3 +371,26 @@ class TestStateBlock(object):
     @pytest.mark.unit
     def test_report(self, model):
         model.props[1].report()
+
+
+def build_heater():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.props = GenericParameterBlock(**configuration)
+    m.fs.heater = Heater(property_package=m.fs.props, has_phase_equilibrium=True)
+    m.fs.heater.inlet.flow_mol.fix(1)
+    m.fs.heater.inlet.temperature.fix(360)
+    m.fs.heater.inlet.pressure.fix(101325)
+    m.fs.heater.inlet.mole_frac_comp[0, "benzene"].fix(0.5)
+    m.fs.heater.inlet.mole_frac_comp[0, "toluene"].fix(0.5)
+    m.fs.heater.heat_duty.fix(1000)
+    return m
+
+
+@pytest.mark.performance
+class TestBTIdealPerformance(PerformanceBaseClass, unittest.TestCase):
+    def build_model(self):
+        return build_heater()
+
+    def initialize_model(self, model):
+        model.fs.heater.initialize()
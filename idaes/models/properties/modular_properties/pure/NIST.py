@@ -26,6 +26,9 @@ All parameter indices and units based on conventions used by the source
 from pyomo.environ import Expression, log, Var, units as pyunits
 
 from idaes.core.util.misc import set_param_from_config
+from idaes.models.properties.modular_properties.base.utility import (
+    convert_correlation_units,
+)
 
 
 # -----------------------------------------------------------------------------
@@ -117,8 +120,14 @@ class NIST(object):
                 + cobj.cp_mol_ig_comp_coeff_E * t**-2
             )
 
-            units = b.params.get_metadata().derived_units
-            return pyunits.convert(cp, units.HEAT_CAPACITY_MOLE)
+            return convert_correlation_units(
+                b,
+                cobj,
+                cp,
+                "cp_mol_ig_comp_coeff_A",
+                pyunits.dimensionless,
+                "HEAT_CAPACITY_MOLE",
+            )
 
     class enth_mol_ig_comp:
         @staticmethod
@@ -148,8 +157,14 @@ class NIST(object):
                 - H
             )
 
-            units = b.params.get_metadata().derived_units
-            return pyunits.convert(h, units.ENERGY_MOLE)
+            return convert_correlation_units(
+                b,
+                cobj,
+                h,
+                "cp_mol_ig_comp_coeff_A",
+                pyunits.kiloK,
+                "ENERGY_MOLE",
+            )
 
     class entr_mol_ig_comp:
         @staticmethod
@@ -171,8 +186,14 @@ class NIST(object):
                 + cobj.cp_mol_ig_comp_coeff_G
             )
 
-            units = b.params.get_metadata().derived_units
-            return pyunits.convert(s, units.ENTROPY_MOLE)
+            return convert_correlation_units(
+                b,
+                cobj,
+                s,
+                "cp_mol_ig_comp_coeff_A",
+                pyunits.dimensionless,
+                "ENTROPY_MOLE",
+            )
 
     # -----------------------------------------------------------------------------
     # Antoine equation for saturation pressure
@@ -25,6 +25,13 @@ All parameter indices and units based on conventions used by the source
 from pyomo.environ import log, Var, Param, units as pyunits
 
 from idaes.core.util.misc import set_param_from_config
+from idaes.models.properties.modular_properties.base.utility import (
+    convert_correlation_units,
+)
+from idaes.models.properties.modular_properties.base.shared_expressions import (
+    sharing_expressions,
+    shared_parameter_expression,
+)
 
 from idaes.core.util.exceptions import ConfigurationError
 import idaes.logger as idaeslog
@@ -81,8 +88,14 @@ class Perrys(object):
                 + cobj.cp_mol_liq_comp_coeff_1
             )
 
-            units = b.params.get_metadata().derived_units
-            return pyunits.convert(cp, units.HEAT_CAPACITY_MOLE)
+            return convert_correlation_units(
+                b,
+                cobj,
+                cp,
+                "cp_mol_liq_comp_coeff_1",
+                pyunits.dimensionless,
+                "HEAT_CAPACITY_MOLE",
+            )
 
     class enth_mol_liq_comp:
         @staticmethod
@@ -113,14 +126,47 @@ class Perrys(object):
                 else 0 * units.ENERGY_MOLE
             )
 
+            if sharing_expressions(b):
+                # Build the terms at the reference temperature once on
+                # the component object (shared_expressions option)
+                def enth(T):
+                    return convert_correlation_units(
+                        b,
+                        cobj,
+                        (cobj.cp_mol_liq_comp_coeff_5 / 5) * T**5
+                        + (cobj.cp_mol_liq_comp_coeff_4 / 4) * T**4
+                        + (cobj.cp_mol_liq_comp_coeff_3 / 3) * T**3
+                        + (cobj.cp_mol_liq_comp_coeff_2 / 2) * T**2
+                        + cobj.cp_mol_liq_comp_coeff_1 * T,
+                        "cp_mol_liq_comp_coeff_1",
+                        pyunits.K,
+                        "ENERGY_MOLE",
+                    )
+
+                h_ref = shared_parameter_expression(
+                    b,
+                    cobj,
+                    "enth_mol_liq_comp_ref_term",
+                    lambda: enth(Tr),
+                    doc="Liquid phase enthalpy correlation @ Tref",
+                )
+
+                h = enth(T) - h_ref + h_form
+
+                return h
+
             h = (
-                pyunits.convert(
+                convert_correlation_units(
+                    b,
+                    cobj,
                     (cobj.cp_mol_liq_comp_coeff_5 / 5) * (T**5 - Tr**5)
                     + (cobj.cp_mol_liq_comp_coeff_4 / 4) * (T**4 - Tr**4)
                     + (cobj.cp_mol_liq_comp_coeff_3 / 3) * (T**3 - Tr**3)
                     + (cobj.cp_mol_liq_comp_coeff_2 / 2) * (T**2 - Tr**2)
                     + cobj.cp_mol_liq_comp_coeff_1 * (T - Tr),
-                    units.ENERGY_MOLE,
+                    "cp_mol_liq_comp_coeff_1",
+                    pyunits.K,
+                    "ENERGY_MOLE",
                 )
                 + h_form
             )
@@ -147,16 +193,55 @@ class Perrys(object):
             T = pyunits.convert(T, to_units=pyunits.K)
             Tr = pyunits.convert(b.params.temperature_ref, to_units=pyunits.K)
 
-            units = b.params.get_metadata().derived_units
+            if sharing_expressions(b):
+                # Build the terms at the reference temperature once on
+                # the component object (shared_expressions option)
+                def entr(poly):
+                    return convert_correlation_units(
+                        b,
+                        cobj,
+                        poly,
+                        "cp_mol_liq_comp_coeff_1",
+                        pyunits.dimensionless,
+                        "ENTROPY_MOLE",
+                    )
+
+                def poly(T):
+                    return (
+                        (cobj.cp_mol_liq_comp_coeff_5 / 4) * T**4
+                        + (cobj.cp_mol_liq_comp_coeff_4 / 3) * T**3
+                        + (cobj.cp_mol_liq_comp_coeff_3 / 2) * T**2
+                        + cobj.cp_mol_liq_comp_coeff_2 * T
+                    )
+
+                s_ref = shared_parameter_expression(
+                    b,
+                    cobj,
+                    "entr_mol_liq_comp_ref_term",
+                    lambda: entr(poly(Tr)),
+                    doc="Liquid phase entropy correlation @ Tref",
+                )
+
+                s = (
+                    entr(poly(T) + cobj.cp_mol_liq_comp_coeff_1 * log(T / Tr))
+                    - s_ref
+                    + cobj.entr_mol_form_liq_comp_ref
+                )
+
+                return s
 
             s = (
-                pyunits.convert(
+                convert_correlation_units(
+                    b,
+                    cobj,
                     (cobj.cp_mol_liq_comp_coeff_5 / 4) * (T**4 - Tr**4)
                     + (cobj.cp_mol_liq_comp_coeff_4 / 3) * (T**3 - Tr**3)
                     + (cobj.cp_mol_liq_comp_coeff_3 / 2) * (T**2 - Tr**2)
                     + cobj.cp_mol_liq_comp_coeff_2 * (T - Tr)
                     + cobj.cp_mol_liq_comp_coeff_1 * log(T / Tr),
-                    units.ENTROPY_MOLE,
+                    "cp_mol_liq_comp_coeff_1",
+                    pyunits.dimensionless,
+                    "ENTROPY_MOLE",
                 )
                 + cobj.entr_mol_form_liq_comp_ref
             )
@@ -203,9 +288,14 @@ class Perrys(object):
                 ** cobj.dens_mol_liq_comp_coeff_4
             )
 
-            units = b.params.get_metadata().derived_units
-
-            return pyunits.convert(rho, units.DENSITY_MOLE)
+            return convert_correlation_units(
+                b,
+                cobj,
+                rho,
+                "dens_mol_liq_comp_coeff_1",
+                pyunits.dimensionless,
+                "DENSITY_MOLE",
+            )
 
     class dens_mol_liq_comp_eqn_2:
         @staticmethod
@@ -246,9 +336,14 @@ class Perrys(object):
                 + (cobj.dens_mol_liq_comp_coeff_4) * T**3
             )
 
-            units = b.params.get_metadata().derived_units
-
-            return pyunits.convert(rho, units.DENSITY_MOLE)
+            return convert_correlation_units(
+                b,
+                cobj,
+                rho,
+                "dens_mol_liq_comp_coeff_1",
+                pyunits.dimensionless,
+                "DENSITY_MOLE",
+            )
 
     class dens_mol_liq_comp:
         @staticmethod
@@ -25,6 +25,13 @@ All parameter indices and units based on conventions used by the source
 from pyomo.environ import exp, log, Var, units as pyunits
 
 from idaes.core.util.misc import set_param_from_config
+from idaes.models.properties.modular_properties.base.utility import (
+    convert_correlation_units,
+)
+from idaes.models.properties.modular_properties.base.shared_expressions import (
+    sharing_expressions,
+    shared_parameter_expression,
+)
 
 
 # -----------------------------------------------------------------------------
@@ -70,8 +77,14 @@ class RPP4(object):
                 + cobj.cp_mol_ig_comp_coeff_A
             )
 
-            units = b.params.get_metadata().derived_units
-            return pyunits.convert(cp, units.HEAT_CAPACITY_MOLE)
+            return convert_correlation_units(
+                b,
+                cobj,
+                cp,
+                "cp_mol_ig_comp_coeff_A",
+                pyunits.dimensionless,
+                "HEAT_CAPACITY_MOLE",
+            )
 
     class enth_mol_ig_comp:
         @staticmethod
@@ -102,13 +115,45 @@ class RPP4(object):
                 else 0 * units.ENERGY_MOLE
             )
 
+            if sharing_expressions(b):
+                # Build the terms at the reference temperature once on
+                # the component object (shared_expressions option)
+                def enth(T):
+                    return convert_correlation_units(
+                        b,
+                        cobj,
+                        (cobj.cp_mol_ig_comp_coeff_D / 4) * T**4
+                        + (cobj.cp_mol_ig_comp_coeff_C / 3) * T**3
+                        + (cobj.cp_mol_ig_comp_coeff_B / 2) * T**2
+                        + cobj.cp_mol_ig_comp_coeff_A * T,
+                        "cp_mol_ig_comp_coeff_A",
+                        pyunits.K,
+                        "ENERGY_MOLE",
+                    )
+
+                h_ref = shared_parameter_expression(
+                    b,
+                    cobj,
+                    "enth_mol_ig_comp_ref_term",
+                    lambda: enth(Tr),
+                    doc="Ideal gas enthalpy correlation @ Tref",
+                )
+
+                h = enth(T) - h_ref + h_form
+
+                return h
+
             h = (
-                pyunits.convert(
+                convert_correlation_units(
+                    b,
+                    cobj,
                     (cobj.cp_mol_ig_comp_coeff_D / 4) * (T**4 - Tr**4)
                     + (cobj.cp_mol_ig_comp_coeff_C / 3) * (T**3 - Tr**3)
                     + (cobj.cp_mol_ig_comp_coeff_B / 2) * (T**2 - Tr**2)
                     + cobj.cp_mol_ig_comp_coeff_A * (T - Tr),
-                    units.ENERGY_MOLE,
+                    "cp_mol_ig_comp_coeff_A",
+                    pyunits.K,
+                    "ENERGY_MOLE",
                 )
                 + h_form
             )
@@ -135,15 +180,53 @@ class RPP4(object):
             T = pyunits.convert(T, to_units=pyunits.K)
             Tr = pyunits.convert(b.params.temperature_ref, to_units=pyunits.K)
 
-            units = b.params.get_metadata().derived_units
+            if sharing_expressions(b):
+                # Build the terms at the reference temperature once on
+                # the component object (shared_expressions option)
+                def entr(poly):
+                    return convert_correlation_units(
+                        b,
+                        cobj,
+                        poly,
+                        "cp_mol_ig_comp_coeff_A",
+                        pyunits.dimensionless,
+                        "ENTROPY_MOLE",
+                    )
+
+                def poly(T):
+                    return (
+                        (cobj.cp_mol_ig_comp_coeff_D / 3) * T**3
+                        + (cobj.cp_mol_ig_comp_coeff_C / 2) * T**2
+                        + cobj.cp_mol_ig_comp_coeff_B * T
+                    )
+
+                s_ref = shared_parameter_expression(
+                    b,
+                    cobj,
+                    "entr_mol_ig_comp_ref_term",
+                    lambda: entr(poly(Tr)),
+                    doc="Ideal gas entropy correlation @ Tref",
+                )
+
+                s = (
+                    entr(poly(T) + cobj.cp_mol_ig_comp_coeff_A * log(T / Tr))
+                    - s_ref
+                    + cobj.entr_mol_form_vap_comp_ref
+                )
+
+                return s
 
             s = (
-                pyunits.convert(
+                convert_correlation_units(
+                    b,
+                    cobj,
                     (cobj.cp_mol_ig_comp_coeff_D / 3) * (T**3 - Tr**3)
                     + (cobj.cp_mol_ig_comp_coeff_C / 2) * (T**2 - Tr**2)
                     + cobj.cp_mol_ig_comp_coeff_B * (T - Tr)
                     + cobj.cp_mol_ig_comp_coeff_A * log(T / Tr),
-                    units.ENTROPY_MOLE,
+                    "cp_mol_ig_comp_coeff_A",
+                    pyunits.dimensionless,
+                    "ENTROPY_MOLE",
                 )
                 + cobj.entr_mol_form_vap_comp_ref
             )
@@ -25,9 +25,19 @@ All parameter indices based on conventions used by the source
 from pyomo.environ import log, Var, units as pyunits
 
 from idaes.core.util.misc import set_param_from_config
+from idaes.models.properties.modular_properties.base.utility import (
+    convert_correlation_units,
+)
+from idaes.models.properties.modular_properties.base.shared_expressions import (
+    sharing_expressions,
+    shared_parameter_expression,
+)
 
 from idaes.core.util.constants import Constants as const
 
+# Units of the gas constant, which multiplies the heat capacity correlation
+_R_units = pyunits.J / pyunits.mol / pyunits.K
+
 
 # -----------------------------------------------------------------------------
 class RPP5(object):
@@ -78,8 +88,14 @@ class RPP5(object):
                 + cobj.cp_mol_ig_comp_coeff_a0
             ) * const.gas_constant
 
-            units = b.params.get_metadata().derived_units
-            return pyunits.convert(cp, units.HEAT_CAPACITY_MOLE)
+            return convert_correlation_units(
+                b,
+                cobj,
+                cp,
+                "cp_mol_ig_comp_coeff_a0",
+                _R_units,
+                "HEAT_CAPACITY_MOLE",
+            )
 
     class enth_mol_ig_comp:
         @staticmethod
@@ -102,10 +118,42 @@ class RPP5(object):
             T = pyunits.convert(T, to_units=pyunits.K)
             Tr = pyunits.convert(b.params.temperature_ref, to_units=pyunits.K)
 
-            units = b.params.get_metadata().derived_units
+            if sharing_expressions(b):
+                # Build the terms at the reference temperature once on
+                # the component object (shared_expressions option)
+                def enth(T):
+                    return convert_correlation_units(
+                        b,
+                        cobj,
+                        (
+                            (cobj.cp_mol_ig_comp_coeff_a4 / 5) * T**5
+                            + (cobj.cp_mol_ig_comp_coeff_a3 / 4) * T**4
+                            + (cobj.cp_mol_ig_comp_coeff_a2 / 3) * T**3
+                            + (cobj.cp_mol_ig_comp_coeff_a1 / 2) * T**2
+                            + cobj.cp_mol_ig_comp_coeff_a0 * T
+                        )
+                        * const.gas_constant,
+                        "cp_mol_ig_comp_coeff_a0",
+                        pyunits.K * _R_units,
+                        "ENERGY_MOLE",
+                    )
+
+                h_ref = shared_parameter_expression(
+                    b,
+                    cobj,
+                    "enth_mol_ig_comp_ref_term",
+                    lambda: enth(Tr),
+                    doc="Ideal gas enthalpy correlation @ Tref",
+                )
+
+                h = enth(T) - h_ref + cobj.enth_mol_form_vap_comp_ref
+
+                return h
 
             h = (
-                pyunits.convert(
+                convert_correlation_units(
+                    b,
+                    cobj,
                     (
                         (cobj.cp_mol_ig_comp_coeff_a4 / 5) * (T**5 - Tr**5)
                         + (cobj.cp_mol_ig_comp_coeff_a3 / 4) * (T**4 - Tr**4)
@@ -114,7 +162,9 @@ class RPP5(object):
                         + cobj.cp_mol_ig_comp_coeff_a0 * (T - Tr)
                     )
                     * const.gas_constant,
-                    units.ENERGY_MOLE,
+                    "cp_mol_ig_comp_coeff_a0",
+                    pyunits.K * _R_units,
+                    "ENERGY_MOLE",
                 )
                 + cobj.enth_mol_form_vap_comp_ref
             )
@@ -141,10 +191,47 @@ class RPP5(object):
             T = pyunits.convert(T, to_units=pyunits.K)
             Tr = pyunits.convert(b.params.temperature_ref, to_units=pyunits.K)
 
-            units = b.params.get_metadata().derived_units
+            if sharing_expressions(b):
+                # Build the terms at the reference temperature once on
+                # the component object (shared_expressions option)
+                def entr(poly):
+                    return convert_correlation_units(
+                        b,
+                        cobj,
+                        poly * const.gas_constant,
+                        "cp_mol_ig_comp_coeff_a0",
+                        _R_units,
+                        "ENTROPY_MOLE",
+                    )
+
+                def poly(T):
+                    return (
+                        (cobj.cp_mol_ig_comp_coeff_a4 / 4) * T**4
+                        + (cobj.cp_mol_ig_comp_coeff_a3 / 3) * T**3
+                        + (cobj.cp_mol_ig_comp_coeff_a2 / 2) * T**2
+                        + cobj.cp_mol_ig_comp_coeff_a1 * T
+                    )
+
+                s_ref = shared_parameter_expression(
+                    b,
+                    cobj,
+                    "entr_mol_ig_comp_ref_term",
+                    lambda: entr(poly(Tr)),
+                    doc="Ideal gas entropy correlation @ Tref",
+                )
+
+                s = (
+                    entr(poly(T) + cobj.cp_mol_ig_comp_coeff_a0 * log(T / Tr))
+                    - s_ref
+                    + cobj.entr_mol_form_vap_comp_ref
+                )
+
+                return s
 
             s = (
-                pyunits.convert(
+                convert_correlation_units(
+                    b,
+                    cobj,
                     (
                         (cobj.cp_mol_ig_comp_coeff_a4 / 4) * (T**4 - Tr**4)
                         + (cobj.cp_mol_ig_comp_coeff_a3 / 3) * (T**3 - Tr**3)
@@ -153,7 +240,9 @@ class RPP5(object):
                         + cobj.cp_mol_ig_comp_coeff_a0 * log(T / Tr)
                     )
                     * const.gas_constant,
-                    units.ENTROPY_MOLE,
+                    "cp_mol_ig_comp_coeff_a0",
+                    _R_units,
+                    "ENTROPY_MOLE",
                 )
                 + cobj.entr_mol_form_vap_comp_ref
             )